@@ -37,39 +37,39 @@ def mouse_scroll(amount):
     pyautogui.scroll(amount)
     return f"Scrolled {amount}"
 
+# Wall-clock budget for one on-screen text lookup
+OCR_TIMEOUT = 10.0
+
+def find_text_on_screen(target_text, screenshot=None, timeout=OCR_TIMEOUT):
+    """
+    Locate text on screen with the shared OCR service (engines stay loaded between calls).
+    Returns the (x, y) center of the first match, or None.
+    """
+    import numpy as np
+    import cv2
+    from core.vision.ocr_service import get_ocr_service
+
+    if screenshot is None:
+        # Capture screen
+        screenshot = cv2.cvtColor(np.array(pyautogui.screenshot()), cv2.COLOR_RGB2BGR)
+
+    target_text = target_text.lower()
+    for result in get_ocr_service().read(screenshot, timeout=timeout):
+        if target_text in result['detected_text'].lower():
+            x, y, w, h = result['bounding_box']
+            print(f"Found match: '{result['detected_text']}' at {result['bounding_box']}")
+            return x + w // 2, y + h // 2
+    return None
+
 def click_on_text(target_text):
     """
     Find specific text on screen and click it.
     """
     print(f"Automation: Searching screen for '{target_text}' to click...")
     try:
-        import easyocr
-        import numpy as np
-        import cv2
-        
-        # Capture screen
-        screenshot = pyautogui.screenshot()
-        screenshot_np = np.array(screenshot)
-        screenshot_cv = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-        
-        # OCR
-        reader = easyocr.Reader(['en'])
-        results = reader.readtext(screenshot_cv)
-        
-        target_text = target_text.lower()
-        best_match = None
-        
-        for (bbox, text, prob) in results:
-            if target_text in text.lower():
-                best_match = bbox
-                print(f"Found match: '{text}' at {bbox}")
-                break
-        
-        if best_match:
-            # bbox is [[x1,y1], [x2,y1], [x2,y2], [x1,y2]]
-            center_x = (best_match[0][0] + best_match[1][0]) // 2
-            center_y = (best_match[0][1] + best_match[2][1]) // 2
-            
+        match = find_text_on_screen(target_text)
+        if match:
+            center_x, center_y = match
             pyautogui.click(center_x, center_y)
             return f"Clicked on '{target_text}' at ({center_x}, {center_y})"
         
@@ -1,30 +1,29 @@
 import json
 import os
 
-from core.enhanced_memory import EnhancedMemory
+from core.enhanced_memory import get_memory
 
 def remember_user_preference(key, value):
     """Remember a user preference persistently"""
     print(f"Remembering preference: {key} = {value}")
-    mem = EnhancedMemory()
+    mem = get_memory()
     mem.remember_preference(key, value)
     return f"Remembered that {key} is {value}"
 
 def memorize_fact(fact):
     """Store a general fact in long-term memory"""
     print(f"Memorizing fact: {fact}")
-    mem = EnhancedMemory()
+    mem = get_memory()
     
     # Try to categorize it automatically or just save as a general fact
     # For now, we use the text as both subject and fact for simple retrieval
     mem.add_fact("general", fact)
-    mem.save_memory()
     return f"Fact committed to memory: {fact}"
 
 def recall_memory(key):
     """Recall information using semantic search or direct lookup"""
     print(f"Recalling memory: {key}")
-    mem = EnhancedMemory()
+    mem = get_memory()
     
     # 1. Try Semantic Search first (Powerful)
     results = mem.search_memory(key, top_k=1)
@@ -32,40 +31,37 @@ def recall_memory(key):
         return f"According to my records: {results[0]}"
     
     # 2. Direct lookup fallbacks
-    if 'preferences' in mem.long_term and key in mem.long_term['preferences']:
-        return f"{key} is {mem.long_term['preferences'][key]}"
-    
-    for subject, facts in mem.long_term.get('facts', {}).items():
-        if key.lower() in subject.lower():
-            return f"{subject}: {facts[-1]}"
-        for f in facts:
-            if key.lower() in f.lower():
-                return f"I found this: {f}"
+    with mem.lock:
+        if 'preferences' in mem.long_term and key in mem.long_term['preferences']:
+            return f"{key} is {mem.long_term['preferences'][key]}"
+        
+        for subject, facts in mem.long_term.get('facts', {}).items():
+            if key.lower() in subject.lower():
+                return f"{subject}: {facts[-1]}"
+            for f in facts:
+                if key.lower() in f.lower():
+                    return f"I found this: {f}"
 
     return f"I'm sorry Sir, I couldn't find any specific records regarding '{key}'."
 
 def update_memory(key, value):
     """Update a memory value"""
     print(f"Updating memory: {key} = {value}")
-    mem = EnhancedMemory()
+    mem = get_memory()
     mem.set(key, value)
     return f"Updated memory for {key}"
 
 def delete_memory(key):
     """Delete a memory"""
     print(f"Deleting memory: {key}")
-    mem = EnhancedMemory()
+    mem = get_memory()
     
     # Check preferences
-    if 'preferences' in mem.long_term and key in mem.long_term['preferences']:
-        del mem.long_term['preferences'][key]
-        mem.save_memory()
+    if mem.forget_preference(key):
         return f"Deleted preference for {key}"
     
     # Check general memory
-    if key in mem.long_term:
-        del mem.long_term[key]
-        mem.save_memory()
+    if mem.delete(key):
         return f"Deleted memory for {key}"
     
     return f"No memory found for {key}"
@@ -77,24 +73,23 @@ def forget_memory(key):
 def list_memories():
     """List all memories"""
     print("Listing all memories...")
-    mem = EnhancedMemory()
-    return json.dumps(mem.long_term, indent=2)
+    mem = get_memory()
+    with mem.lock:
+        return json.dumps(mem.long_term, indent=2)
 
 # ===== NEW: Session and Task Memory Actions =====
 
 def save_session_summary(summary):
     """Save a summary of the current session"""
     print(f"Saving session summary: {summary}")
-    from core.enhanced_memory import EnhancedMemory
-    mem = EnhancedMemory()
+    mem = get_memory()
     mem.add_session(summary)
     return "Session summary saved."
 
 def get_recent_sessions(count=5):
     """Get recent session summaries"""
     print(f"Getting {count} recent sessions...")
-    from core.enhanced_memory import EnhancedMemory
-    mem = EnhancedMemory()
+    mem = get_memory()
     sessions = mem.get_recent_sessions(count)
     if sessions:
         result = "\n".join([f"[{s['timestamp']}] {s['summary']}" for s in sessions])
@@ -104,24 +99,21 @@ def get_recent_sessions(count=5):
 def remember_task(task_name, description):
     """Remember an ongoing task"""
     print(f"Remembering task: {task_name}")
-    from core.enhanced_memory import EnhancedMemory
-    mem = EnhancedMemory()
+    mem = get_memory()
     mem.add_task(task_name, {'description': description, 'status': 'active'})
     return f"Task '{task_name}' remembered."
 
 def update_task_status(task_name, status):
     """Update task status"""
     print(f"Updating task {task_name} status: {status}")
-    from core.enhanced_memory import EnhancedMemory
-    mem = EnhancedMemory()
+    mem = get_memory()
     mem.update_task(task_name, {'status': status})
     return f"Task '{task_name}' updated."
 
 def recall_task(task_name):
     """Recall task details"""
     print(f"Recalling task: {task_name}")
-    from core.enhanced_memory import EnhancedMemory
-    mem = EnhancedMemory()
+    mem = get_memory()
     task = mem.get_task(task_name)
     if task:
         return f"Task '{task_name}': {task['data']}"
@@ -130,8 +122,7 @@ def recall_task(task_name):
 def list_tasks():
     """List all active tasks"""
     print("Listing all tasks...")
-    from core.enhanced_memory import EnhancedMemory
-    mem = EnhancedMemory()
+    mem = get_memory()
     tasks = mem.list_tasks()
     if tasks:
         return f"Active tasks: {', '.join(tasks)}"
@@ -140,16 +131,14 @@ def list_tasks():
 def complete_task(task_name):
     """Mark task as complete"""
     print(f"Completing task: {task_name}")
-    from core.memory import Memory
-    mem = EnhancedMemory()
+    mem = get_memory()
     mem.complete_task(task_name)
     return f"Task '{task_name}' marked as complete."
 
 def search_memories(query, top_k=3):
     """Search memories using semantic similarity"""
     print(f"Searching memories for: {query}")
-    from core.memory import Memory
-    mem = Memory()
+    mem = get_memory()
     results = mem.search_memory(query, top_k)
     if results:
         return "Relevant memories:\n" + "\n".join([f"- {r}" for r in results])
@@ -16,6 +16,7 @@ from core.vision.yolo_detector import YOLODetector
 from core.vision.scene_description import SceneDescriptor
 from core.vision.emotion_detector import EmotionDetector
 from core.vision.vision_manager import get_vision_manager
+from core.vision.vision_scheduler import VisionScheduler
 
 # Import camera utilities
 from vision.utils import get_camera
@@ -47,6 +48,7 @@ _ocr_engine = None
 _gesture_engine = None
 _pose_guard = None
 _tracker = None
+_vision_scheduler = None
 
 # Global vision thread state
 _vision_state = {
@@ -56,7 +58,10 @@ _vision_state = {
     "lock": threading.Lock(),
     "current_frame": None,  # Store latest frame for queries
     "latest_summary": "Vision system ready.",
+    "summary_time": 0.0, # Capture time of the frame the summary describes
+    "results": {}, # {analyzer: (frame_ts, result)}, newest frame wins
     "latest_gesture": {"success": False, "gesture": "None"},
+    "is_slouching": False,
     "last_update_time": 0,
     "history": [], # List of (timestamp, summary) tuples
     "object_stability": {}, # {obj_name: count} tracking
@@ -112,14 +117,15 @@ def _get_gesture_engine():
     global _gesture_engine
     if _gesture_engine is None:
         from core.vision.gesture_engine import GestureEngine
-        _gesture_engine = GestureEngine()
+        # LIVE_STREAM: MediaPipe tracks hands between frames and calls back with each result
+        _gesture_engine = GestureEngine(on_result=_on_gestures)
     return _gesture_engine
 
 def _get_pose_guard():
     global _pose_guard
     if _pose_guard is None:
         from core.vision.pose_guard import PostureGuard
-        _pose_guard = PostureGuard()
+        _pose_guard = PostureGuard(on_result=_on_posture)
     return _pose_guard
 
 # ============================================================================
@@ -210,7 +216,7 @@ def capture_photo(filename=None):
     
     # Wait for auto-exposure if just opened
     if not _vision_state["running"]:
-        time.sleep(1)
+        cam.wait_ready(frames=15)
     
     frame = cam.get_frame()
     if frame is not None:
@@ -363,8 +369,8 @@ def analyze_scene(prompt="What do you see?", **kwargs):
                 
                 if name != "Unknown":
                     # Fetch from EnhancedMemory if available
-                    from core.enhanced_memory import EnhancedMemory
-                    mem = EnhancedMemory()
+                    from core.enhanced_memory import get_memory
+                    mem = get_memory()
                     
                     details = ""
                     
@@ -714,8 +720,10 @@ def detect_emotion():
     if frame is None:
         return {"error": "Camera not active."}
     
+    # Emotion runs on the face pipeline's boxes, not on the whole frame
+    faces = _get_face_manager().detector.detect(frame)
     emotion_det = _get_emotion_detector()
-    result = emotion_det.detect_emotion(frame)
+    result = emotion_det.detect_emotion(frame, faces)
     
     if 'error' in result:
         return result
@@ -810,14 +818,13 @@ def read_text(prompt="Read the text.", **kwargs):
         _vision_state["active_modes"].remove("object_detection")
         
     print("OCR: Pausing other vision modes for dedicated Text Analysis...")
-    time.sleep(0.5) 
 
     try:
         vm = get_vision_manager()
         
         # 2. Capture Stable Frame
         print("OCR: Capturing stable frame for text...")
-        frame = vm.get_stable_frame(sample_count=4) # Reduced from 8 for faster response
+        frame = vm.get_stable_frame(sample_count=4, bundle=True) # Reduced from 8 for faster response
         
         if frame is None:
             _vision_state["active_modes"] = previous_modes
@@ -881,6 +888,8 @@ def repair_vision_system(**kwargs):
     global _ocr_engine, _yolo_detector, _scene_descriptor, _face_manager
     
     print("VISION REPAIR: Wiping engine instances and re-initializing environment...")
+    from core.vision.ocr_service import reset_ocr_service
+    reset_ocr_service()  # Shared by click_on_text too; reloads EasyOCR/Tesseract
     _ocr_engine = None
     _yolo_detector = None
     _scene_descriptor = None
@@ -1052,8 +1061,8 @@ def _get_current_frame(auto_close=False):
         if not cam.open_camera():
             return None
         opened_now = True
-        # If we just opened it, give it a moment for auto-exposure
-        time.sleep(0.5)
+        # If we just opened it, let a few frames through for auto-exposure
+        cam.wait_ready()
     
     frame = cam.get_frame()
     
@@ -1070,176 +1079,283 @@ def _start_vision_thread():
             _vision_state["thread"] = threading.Thread(target=_vision_loop, daemon=True)
             _vision_state["thread"].start()
 
-def _vision_loop():
-    """Background loop for real-time vision display"""
+# Target rates (runs per second) of the background analyzers; None = on demand only
+VISION_RATES = {
+    "objects": 5,
+    "faces": 2,
+    "emotion": 1,
+    "qr": 5,
+    "gestures": 15,
+    "posture": 5,
+    "scene": None,
+}
+
+# Active modes that enable each analyzer (objects always run: they feed the summary)
+_ANALYZER_MODES = {
+    "faces": {"face_recognition", "emotion_detection"},
+    "emotion": {"emotion_detection"},
+    "qr": {"qr_scanning"},
+    "gestures": {"gesture_control"},
+    "posture": {"posture_guard", "check_posture"},
+}
+
+_merge_lock = threading.Lock()
+
+def _merge_result(name, result, frame_ts):
+    """Store an analyzer result unless a result from a newer frame is already there"""
+    with _merge_lock:
+        previous = _vision_state["results"].get(name)
+        if previous is not None and previous[0] > frame_ts:
+            return False
+        _vision_state["results"][name] = (frame_ts, result)
+        return True
+
+def _set_summary(text, frame_ts):
+    """Newest frame wins: a slow analyzer never overwrites a summary of a newer frame"""
+    with _merge_lock:
+        if frame_ts >= _vision_state["summary_time"]:
+            _vision_state["latest_summary"] = text
+            _vision_state["summary_time"] = frame_ts
+
+def _latest_result(name):
+    with _merge_lock:
+        return _vision_state["results"].get(name, (0.0, None))[1]
+
+def _stable_objects():
+    with _merge_lock:
+        stability = dict(_vision_state["object_stability"])
+    return [obj for obj, count in stability.items()
+            if count >= _vision_state["stability_threshold"]]
+
+# --- Analyzers (run on scheduler workers; frame is the captured FrameBundle, read-only) ---
+
+def _analyze_objects(frame, frame_ts):
+    return _get_yolo_detector().detect(frame)
+
+def _on_objects(detect_res, frame, frame_ts):
+    if not _merge_result("objects", detect_res, frame_ts):
+        return
+    current_objects = set(detect_res.get('objects', []))
+
+    # Temporal Stability Filtering (over consecutive detector runs).
+    # The scene worker reads these counts too: update and snapshot them under the lock
+    with _merge_lock:
+        counts = _vision_state["object_stability"]
+        for obj in current_objects:
+            counts[obj] = counts.get(obj, 0) + 1
+        for obj in list(counts.keys()):
+            if obj not in current_objects:
+                counts[obj] -= 1
+                if counts[obj] <= 0:
+                    del counts[obj]
+        stability = dict(counts)
+
+    stable_objects = [obj for obj in detect_res.get('objects', []) if stability.get(obj, 0) >= _vision_state["stability_threshold"]]
+    if stable_objects:
+        from collections import Counter
+        counts = Counter(stable_objects)
+        _set_summary("Visible: " + ", ".join([f"{v} {k}" for k, v in counts.items()]), frame_ts)
+
+        # Periodic semantic summary (every 10s), computed by BLIP on its own worker
+        now = time.time()
+        if now - _vision_state["last_update_time"] > 10:
+            _vision_state["last_update_time"] = now
+            _get_vision_scheduler().request("scene")
+    else:
+        _set_summary("Nothing of interest detected.", frame_ts)
+
+def _analyze_scene(frame, frame_ts):
+    stable_objects = _stable_objects()
+    descriptor = _get_scene_descriptor()
+    context = descriptor.get_semantic_context(frame, stable_objects)
+
+    # Deep Verification: If a "cat" or "dog" is detected but confidence is on edge, verify with BLIP
+    if "cat" in stable_objects or "dog" in stable_objects:
+        vqa = descriptor.answer_question(frame, "Is there a cat or dog here?")
+        if "no" in vqa['answer'].lower():
+            print(f"Vision: Deep Verification filtered out false positive.")
+            return "I'm not entirely sure, but I see shapes that look like objects."
+    return context['summary']
+
+def _on_scene(summary, frame, frame_ts):
+    if not _merge_result("scene", summary, frame_ts):
+        return
+    _set_summary(summary, frame_ts)
+    _vision_state["history"].append((datetime.datetime.now(), summary))
+    if len(_vision_state["history"]) > 50: _vision_state["history"].pop(0)
+
+def _analyze_faces(frame, frame_ts):
+    return _get_face_manager().recognize_faces(frame)
+
+def _on_faces(results, frame, frame_ts):
+    if not _merge_result("faces", results, frame_ts):
+        return
+    for result in results:
+        # Proactive Learning Check
+        if result['name'] == "Unknown" and result['quality']['is_good']:
+            now = time.time()
+            if now - _face_learning_state["last_request_time"] > _face_learning_state["cooldown"] and not _face_learning_state["pending_name"]:
+                 print(f"Vision: Detected high-quality unknown face. Quality: {result['quality']['sharpness']:.1f}")
+                 _set_summary("I see an unknown person with clear visibility. I should ask for their name to remember them.", frame_ts)
+                 _face_learning_state["current_unknown_face"] = frame.image.copy()
+                 _face_learning_state["pending_name"] = True
+                 _face_learning_state["last_request_time"] = now
+
+def _analyze_emotion(frame, frame_ts):
+    # Tracked boxes from the faces analyzer (at most a frame or two old)
+    faces = _latest_result("faces")
+    if not faces:
+        return {'emotion': 'unknown', 'confidence': 0.0, 'error': 'No face detected in frame'}
+    return _get_emotion_detector().detect_emotion(frame, faces)
+
+def _analyze_qr(frame, frame_ts):
+    if qr_decode is None:
+        return []
+    return [{"data": obj.data.decode('utf-8'), "rect": tuple(obj.rect)} for obj in qr_decode(frame.gray)]
+
+def _on_qr(codes, frame, frame_ts):
+    if _merge_result("qr", codes, frame_ts) and codes:
+        _set_summary(f"Detected QR code: {codes[-1]['data']}", frame_ts)
+
+# Gestures and posture are only queued here; MediaPipe delivers their results
+# asynchronously (hands and pose in parallel) to _on_gestures / _on_posture.
+
+def _analyze_gestures(frame, frame_ts):
+    return _get_gesture_engine().submit(frame, frame_ts)
+
+def _on_gestures(res, frame_ts):
+    if not _merge_result("gestures", res, frame_ts) or not res["success"]:
+        return
+    # Store raw result for Heartbeat processing
+    _vision_state["latest_gesture"] = res
+
+    # Proactive Trigger: Thumbs up gives audio feedback
+    if res["gesture"] == "THUMBS_UP":
+        _set_summary("The user is giving a thumbs up. Acknowledged.", frame_ts)
+
+def _analyze_posture(frame, frame_ts):
+    return _get_pose_guard().submit(frame, frame_ts)
+
+def _on_posture(res, frame_ts):
+    if not _merge_result("posture", res, frame_ts) or not res["success"]:
+        return
+    _vision_state["is_slouching"] = res["is_slouching"]
+    if res["is_slouching"]:
+        _set_summary("User is slouching. I should politely recommend adjustment.", frame_ts)
+
+def _get_vision_scheduler():
+    """Lazy build the analyzer scheduler"""
+    global _vision_scheduler
+    if _vision_scheduler is None:
+        scheduler = VisionScheduler()
+        scheduler.add_analyzer("objects", _analyze_objects, VISION_RATES["objects"], _on_objects)
+        scheduler.add_analyzer("scene", _analyze_scene, VISION_RATES["scene"], _on_scene)
+        scheduler.add_analyzer("faces", _analyze_faces, VISION_RATES["faces"], _on_faces, enabled=False)
+        scheduler.add_analyzer("emotion", _analyze_emotion, VISION_RATES["emotion"],
+                               lambda res, frame, ts: _merge_result("emotion", res, ts), enabled=False)
+        scheduler.add_analyzer("qr", _analyze_qr, VISION_RATES["qr"], _on_qr, enabled=False)
+        scheduler.add_analyzer("gestures", _analyze_gestures, VISION_RATES["gestures"], enabled=False)
+        scheduler.add_analyzer("posture", _analyze_posture, VISION_RATES["posture"], enabled=False)
+        _vision_scheduler = scheduler
+    return _vision_scheduler
+
+def _sync_analyzers(scheduler, modes):
+    """Enable exactly the analyzers the active modes need"""
+    for name, needed_by in _ANALYZER_MODES.items():
+        scheduler.set_enabled(name, bool(modes & needed_by))
+
+def _draw_overlays(display_frame, modes):
+    """Draw the latest result of every active analyzer (each may be from a slightly older frame)"""
+    if "object_detection" in modes:
+        detect_res = _latest_result("objects")
+        if detect_res:
+            _get_yolo_detector().draw_detections(display_frame, detect_res)
+
+    if "face_recognition" in modes:
+        for result in _latest_result("faces") or []:
+            t, r, b, l = result['location']
+            name = result['name']
+            conf = result['confidence']
+            color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)
+            cv2.rectangle(display_frame, (l, t), (r, b), color, 2)
+            cv2.putText(display_frame, f"{name} ({conf:.2f})", (l, t-10),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+    if "emotion_detection" in modes:
+        result = _latest_result("emotion")
+        if result and result.get('success'):
+            cv2.putText(display_frame, f"Emotion: {result['emotion']} ({result['confidence']:.2f})",
+                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            for face in result['faces']:
+                t, r, b, l = face['location']
+                cv2.putText(display_frame, face['emotion'], (l, b + 20),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+    if "qr_scanning" in modes:
+        for code in _latest_result("qr") or []:
+            (x, y, w, h) = code["rect"]
+            cv2.rectangle(display_frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+            cv2.putText(display_frame, f"QR: {code['data']}", (x, y - 10),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
+
+    if "gesture_control" in modes:
+        res = _latest_result("gestures")
+        if res and res["success"]:
+            _get_gesture_engine().draw_landmarks(display_frame, res["landmarks"])
+            cv2.putText(display_frame, f"Gesture: {res['gesture']}",
+                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+    if "posture_guard" in modes or "check_posture" in modes:
+        res = _latest_result("posture")
+        if res and res["success"]:
+            _get_pose_guard().draw_pose(display_frame, res["landmarks"])
+            status = "SLOUCHING" if res["is_slouching"] else "GOOD"
+            color = (0, 0, 255) if res["is_slouching"] else (0, 255, 0)
+            cv2.putText(display_frame, f"Posture: {status}",
+                       (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+def _vision_loop(source=None, show=True):
+    """
+    Background loop: takes each new frame from the capture thread, hands it
+    to the analyzer scheduler and displays it with the latest results drawn on top.
+    The analyzers run on their own workers at VISION_RATES.
+    """
     cam = get_camera()
-    if not cam.open_camera():
+    if not cam.open_camera(source=source):
         print("Vision Loop: Could not open camera")
+        _vision_state["running"] = False
         return
-    
-    # Initialize detectors
-    face_mgr = None
-    yolo = None
-    emotion_det = None
-    gestures = None
-    poses = None
+
+    scheduler = _get_vision_scheduler()
+    scheduler.start()
     
     print("Vision Loop: Started")
     
+    last_id = 0
     while _vision_state["running"]:
-        frame = cam.get_frame()
-        if frame is None:
-            # Check if we should stop even if frame is none (to prevent hung thread)
-            if not _vision_state["running"]: break
-            time.sleep(0.05)
+        # Blocks until the capture thread publishes a newer frame
+        packet = cam.next_frame(last_id, timeout=0.5)
+        if packet is None:
+            if not cam.is_active: break
             continue
+        last_id = packet.frame_id
+        frame, frame_ts = packet.image, packet.timestamp
         
-        # Cache frame for queries
-        _vision_state["current_frame"] = frame.copy()
+        # Cache frame for queries (read-only and shared, no copy needed)
+        _vision_state["current_frame"] = frame
         
-        display_frame = frame.copy()
         modes = _vision_state["active_modes"].copy()
+        _sync_analyzers(scheduler, modes)
+        # Analyzers get the whole bundle so RGB/gray/scaled variants are computed once per frame
+        scheduler.submit_frame(packet, frame_ts)
         
-        # Object Detection & Summary
-        if yolo is None:
-            yolo = _get_yolo_detector()
-        
-        detect_res = yolo.detect(frame)
-        current_objects = set(detect_res.get('objects', []))
-        
-        # Temporal Stability Filtering
-        stable_objects = []
-        for obj in current_objects:
-            _vision_state["object_stability"][obj] = _vision_state["object_stability"].get(obj, 0) + 1
-            if _vision_state["object_stability"][obj] >= _vision_state["stability_threshold"]:
-                stable_objects.append(obj)
-        
-        # Cleanup stability for missing objects
-        for obj in list(_vision_state["object_stability"].keys()):
-            if obj not in current_objects:
-                _vision_state["object_stability"][obj] -= 1
-                if _vision_state["object_stability"][obj] <= 0:
-                    del _vision_state["object_stability"][obj]
-
-        if stable_objects:
-            from collections import Counter
-            counts = Counter(stable_objects)
-            summary = ", ".join([f"{v} {k}" for k, v in counts.items()])
-            
-            # Periodic semantic summary (every 10s)
-            now = time.time()
-            if now - _vision_state["last_update_time"] > 10:
-                descriptor = _get_scene_descriptor()
-                context = descriptor.get_semantic_context(frame, stable_objects)
-                
-                # Deep Verification: If a "cat" or "dog" is detected but confidence is on edge, verify with BLIP
-                if "cat" in stable_objects or "dog" in stable_objects:
-                    vqa = descriptor.answer_question(frame, "Is there a cat or dog here?")
-                    if "no" in vqa['answer'].lower():
-                        print(f"Vision: Deep Verification filtered out false positive.")
-                        _vision_state["latest_summary"] = "I'm not entirely sure, but I see shapes that look like objects."
-                    else:
-                        _vision_state["latest_summary"] = context['summary']
-                else:
-                    _vision_state["latest_summary"] = context['summary']
-                
-                _vision_state["history"].append((datetime.datetime.now(), _vision_state["latest_summary"]))
-                if len(_vision_state["history"]) > 50: _vision_state["history"].pop(0)
-                _vision_state["last_update_time"] = now
-            else:
-                _vision_state["latest_summary"] = f"Visible: {summary}"
-        else:
-            _vision_state["latest_summary"] = "Nothing of interest detected."
-
-        if "object_detection" in modes:
-            display_frame, _ = yolo.detect_and_draw(display_frame)
-        
-        # Face Recognition
-        if "face_recognition" in modes:
-            if face_mgr is None:
-                face_mgr = _get_face_manager()
-            
-            results = face_mgr.recognize_faces(frame)
-            for result in results:
-                t, r, b, l = result['location']
-                name = result['name']
-                conf = result['confidence']
-                
-                color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)
-                cv2.rectangle(display_frame, (l, t), (r, b), color, 2)
-                cv2.putText(display_frame, f"{name} ({conf:.2f})", (l, t-10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                
-                # Proactive Learning Check
-                if name == "Unknown" and result['quality']['is_good']:
-                    now = time.time()
-                    if now - _face_learning_state["last_request_time"] > _face_learning_state["cooldown"] and not _face_learning_state["pending_name"]:
-                         print(f"Vision: Detected high-quality unknown face. Quality: {result['quality']['sharpness']:.1f}")
-                         _vision_state["latest_summary"] = "I see an unknown person with clear visibility. I should ask for their name to remember them."
-                         _face_learning_state["current_unknown_face"] = frame.copy()
-                         _face_learning_state["pending_name"] = True
-                         _face_learning_state["last_request_time"] = now
-        
-        # Emotion Detection
-        if "emotion_detection" in modes:
-            if emotion_det is None:
-                emotion_det = _get_emotion_detector()
-            
-            result = emotion_det.detect_emotion(frame)
-            if result.get('success'):
-                emotion = result['emotion']
-                conf = result['confidence']
-                cv2.putText(display_frame, f"Emotion: {emotion} ({conf:.2f})",
-                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        if not show:
+            continue
         
-        # QR Scanning
-        if "qr_scanning" in modes:
-            if qr_decode is not None:
-                decoded_objects = qr_decode(frame)
-                for obj in decoded_objects:
-                    data = obj.data.decode('utf-8')
-                    (x, y, w, h) = obj.rect
-                    cv2.rectangle(display_frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
-                    cv2.putText(display_frame, f"QR: {data}", (x, y - 10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 2)
-                    _vision_state["latest_summary"] = f"Detected QR code: {data}"
-
-        # Gesture Recognition
-        if "gesture_control" in modes:
-            if gestures is None:
-                gestures = _get_gesture_engine()
-            
-            res = gestures.detect_gesture(frame)
-            if res["success"]:
-                gesture_name = res["gesture"]
-                gestures.draw_landmarks(display_frame, res["landmarks"])
-                cv2.putText(display_frame, f"Gesture: {gesture_name}",
-                           (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                
-                # Store raw result for Heartbeat processing
-                _vision_state["latest_gesture"] = res
-
-                # Proactive Trigger: Thumbs up gives audio feedback
-                if gesture_name == "THUMBS_UP":
-                    _vision_state["latest_summary"] = "The user is giving a thumbs up. Acknowledged."
-
-        # Posture Guard
-        if "posture_guard" in modes or "check_posture" in modes:
-            if poses is None:
-                poses = _get_pose_guard()
-            
-            res = poses.check_posture(frame)
-            if res["success"]:
-                poses.draw_pose(display_frame, res["landmarks"])
-                status = "SLOUCHING" if res["is_slouching"] else "GOOD"
-                color = (0, 0, 255) if res["is_slouching"] else (0, 255, 0)
-                cv2.putText(display_frame, f"Posture: {status}",
-                           (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-                
-                if res["is_slouching"]:
-                    _vision_state["latest_summary"] = "User is slouching. I should politely recommend adjustment."
+        display_frame = frame.copy()
+        _draw_overlays(display_frame, modes)
         
-        # Object Tracking
+        # Object Tracking (cheap, stays on the display thread: it must see every frame)
         if "object_tracking" in modes:
             if _tracker is not None:
                 success, bbox = _tracker.update(frame)
@@ -1251,7 +1367,7 @@ def _vision_loop():
                                (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
                 else:
                     _vision_state["active_modes"].discard("object_tracking")
-                    _vision_state["latest_summary"] = f"Lost track of {_vision_state.get('tracking_object_name', 'object')}."
+                    _set_summary(f"Lost track of {_vision_state.get('tracking_object_name', 'object')}.", frame_ts)
         
         # Show frame
         cv2.imshow("Jarvis Vision", display_frame)
@@ -1271,12 +1387,40 @@ def _vision_loop():
             break
     
     # Cleanup
+    scheduler.stop()
     cam.close_camera()
-    cv2.destroyAllWindows()
+    if show:
+        cv2.destroyAllWindows()
     _vision_state["running"] = False
-    _vision_state["latest_summary"] = "Camera is offline."
+    _set_summary("Camera is offline.", time.time())
     print("Vision Loop: Stopped")
 
+def get_vision_stats(**kwargs):
+    """Per-analyzer fps and latency of the background vision loop"""
+    if _vision_scheduler is None:
+        return {}
+    stats = _vision_scheduler.stats()
+    if _yolo_detector is not None and "objects" in stats:
+        stats["objects"]["detector"] = _yolo_detector.stats()
+    if _face_manager is not None and "faces" in stats:
+        stats["faces"]["pipeline"] = _face_manager.stats()
+    if _gesture_engine is not None and "gestures" in stats:
+        stats["gestures"]["mediapipe"] = _gesture_engine.stats()
+    if _pose_guard is not None and "posture" in stats:
+        stats["posture"]["mediapipe"] = _pose_guard.stats()
+    if _emotion_detector is not None and "emotion" in stats:
+        stats["emotion"]["model"] = _emotion_detector.stats()
+    return stats
+
+def set_vision_rate(analyzer, fps=None, **kwargs):
+    """Change an analyzer's target rate (fps=None: on demand only)"""
+    if analyzer not in VISION_RATES:
+        return f"Unknown vision analyzer: {analyzer}"
+    VISION_RATES[analyzer] = fps
+    if _vision_scheduler is not None:
+        _vision_scheduler.set_rate(analyzer, fps)
+    return f"{analyzer} now runs at {fps or 'on-demand'} fps."
+
 def get_vision_context():
     """Returns the latest vision summary for LLM context"""
     return _vision_state.get("latest_summary", "Camera is offline.")
@@ -1497,15 +1641,27 @@ def record_video(duration=10, filename=None):
     filepath = os.path.join(save_dir, filename)
     
     cam = get_camera()
+    # The vision thread opens the camera asynchronously: wait for its first frames
+    open_deadline = time.time() + 5.0
+    while not cam.wait_ready(frames=1, timeout=0.5):
+        if time.time() > open_deadline:
+            return "I couldn't access the camera to record video, sir."
+        time.sleep(0.05)
+
     fourcc = cv2.VideoWriter_fourcc(*'XVID')
     out = cv2.VideoWriter(filepath, fourcc, 20.0, (640, 480))
-    
+
     start_time = time.time()
+    last_id = 0
     while (time.time() - start_time) < duration:
-        frame = cam.get_frame()
-        if frame is not None:
-            out.write(frame)
-        time.sleep(0.05)
+        # Every captured frame exactly once
+        packet = cam.next_frame(last_id, timeout=0.5)
+        if packet is None:
+            if not cam.is_active:
+                time.sleep(0.05)  # next_frame returns at once while the camera is down
+            continue
+        last_id = packet.frame_id
+        out.write(packet.image)
     
     out.release()
     return f"Video saved to {filepath}"
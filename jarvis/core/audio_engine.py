@@ -9,6 +9,7 @@ from .voice.mic import Microphone
 from .voice.vad import VoiceActivityDetector
 from .voice.stt import SpeechToTextEngine
 from .voice.edge_tts_engine import EdgeTTSEngine, EDGE_TTS_AVAILABLE
+from .voice.sentence_segmenter import SentenceSegmenter
 from .router import Router
 from .voice.aec_enhanced import EnhancedAECWithNR
 from .voice.wake_word import MultiKeywordWakeWordDetector
@@ -43,9 +44,11 @@ class AudioEngine:
 
         # Core processing engines
         self.stt = SpeechToTextEngine()
+        self.stt.on_partial = self._on_partial_transcript
         print("AudioEngine: STT ready.")
         # Use Edge TTS for natural neural voice
         self.tts = EdgeTTSEngine(voice="guy", on_audio_chunk=self._on_tts_chunk)
+        self.tts.on_playback_start = self._on_first_audio
         print(f"AudioEngine: TTS ready (Edge TTS: {EDGE_TTS_AVAILABLE}).")
 
         if router:
@@ -73,6 +76,7 @@ class AudioEngine:
         # ENHANCED UTTERANCE CONTROL
         # Core Logic Parameters
         self.SAFE_MODE = True # Set to True to bypass advanced processing for stability
+        self.AEC_ENABLED = True # Frequency-domain AEC costs well under 1ms per frame, safe to keep on
         self.RMS_THRESHOLD = 30 # Lowered to extreme sensitivity (was 150)
         self.MIN_SPEECH_FRAMES = 1 # Instant capture
         self.MAX_SILENCE_FRAMES = 35 
@@ -82,7 +86,6 @@ class AudioEngine:
 
         # Enhanced speaker verification
         self.last_verified_speaker = None
-        self.verification_cooldown = 5.0  # seconds between verifications
         self.last_verification_time = 0.0
 
         # =============================
@@ -106,6 +109,7 @@ class AudioEngine:
         # This can be set to False after enrolling authorized speakers
 
         self.on_text_update = None
+        self.on_partial_transcript = None  # Live hypothesis while the user talks; "" when the utterance ends
         self.on_audio_level = None
         self.on_latency_update = None
         self.on_intent_detected = None
@@ -114,6 +118,13 @@ class AudioEngine:
         self.request_start_time = None
         self.last_intent = None
 
+        # Streaming reply: request whose segments are still arriving, and what was spoken
+        self.streaming_request_id = None
+        self.spoken_reply = ""
+
+        # Stable transcript prefix last handed to the NLU while the user was still talking
+        self.stable_prefix = ""
+
     # =====================================================================
     # ENHANCED UTILITY FUNCTIONS
     # =====================================================================
@@ -136,15 +147,16 @@ class AudioEngine:
         except:
             return 0.0
 
-    def _verify_speaker(self, audio_chunk):
-        """Verify speaker identity from audio chunk"""
+    def _verify_speaker(self, audio_chunk=None, wait=False):
+        """
+        Speaker identity over the rolling window of recent speech.
+        audio_chunk (optional) is added to the window first; the result is the
+        latest background verification, or a fresh one when wait=True.
+        """
         try:
-            # Convert audio to numpy array for processing
-            audio_data = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32)
-            audio_data = audio_data / 32768.0  # Normalize
-
-            # Perform speaker verification
-            is_auth, speaker_id, confidence = self.speaker_auth.authenticate(audio_data)
+            if audio_chunk:
+                self.speaker_auth.observe(audio_chunk)
+            is_auth, speaker_id, confidence = self.speaker_auth.authenticate_window(wait=wait)
 
             if is_auth and speaker_id:
                 self.last_verified_speaker = speaker_id
@@ -184,33 +196,129 @@ class AudioEngine:
                     break
 
                 req_id, text = item
+                segmenter = SentenceSegmenter()
+
+                def on_partial(delta, req_id=req_id, segmenter=segmenter):
+                    # Cut streamed text into clauses and hand each to the main loop for TTS
+                    if req_id != self.current_request_id:
+                        return
+                    for segment in segmenter.feed(delta):
+                        self._post_response(req_id, {"type": "segment", "text": segment})
 
                 try:
-                    response = self.router.route(text)
-                    self.response_queue.put((req_id, {"type": "response", "data": response}))
+                    response = self.router.route(text, on_partial=on_partial)
+                    for segment in segmenter.flush():
+                        self._post_response(req_id, {"type": "segment", "text": segment})
+                    self._post_response(req_id, {"type": "response", "data": response})
                 except Exception as e:
                     print(f"AudioEngine: Error in background thinking: {e}")
-                    self.response_queue.put((req_id, {"type": "error", "error": str(e)}))
+                    self._post_response(req_id, {"type": "error", "error": str(e)})
 
                 self.request_queue.task_done()
             except Exception as e:
                 print(f"AudioEngine: Thinking worker error: {e}")
 
+    def _post_response(self, req_id, result):
+        """Queue a thinking result and wake the main loop, which may be blocked on the mic"""
+        self.response_queue.put((req_id, result))
+        self.mic.wake()
+
+    def _on_partial_transcript(self, text, stable):
+        """STT decode thread: show the partial hypothesis and classify the stable prefix early"""
+        self._show_partial(text)
+        if stable and stable != self.stable_prefix:
+            self.stable_prefix = stable
+            prefetch_intent = getattr(self.router, "prefetch_intent", None)
+            if prefetch_intent:
+                try:
+                    prefetch_intent(stable)
+                except Exception as e:
+                    print(f"AudioEngine: Intent prefetch failed: {e}")
+
+    def _show_partial(self, text):
+        """Replace the GUI's live transcript line (kept out of the chat log); "" clears it"""
+        if self.on_partial_transcript:
+            try:
+                self.on_partial_transcript(text)
+            except Exception as e:
+                print(f"AudioEngine: GUI partial update failed: {e}")
+
+    def _on_first_audio(self):
+        """TTS started playing: report request -> first audio latency once per request"""
+        if self.request_start_time:
+            latency_ms = int((time.time() - self.request_start_time) * 1000)
+            self.request_start_time = None
+            print(f"AudioEngine: First-audio latency: {latency_ms}ms")
+            if self.on_latency_update:
+                try:
+                    self.on_latency_update(latency_ms)
+                except Exception as e:
+                    print(f"AudioEngine: GUI latency update failed: {e}")
+
+    def _cancel_response(self):
+        """Barge-in: drop the in-flight reply - LLM stream, queued segments and playback"""
+        self.current_request_id += 1
+        self.streaming_request_id = None
+        self.spoken_reply = ""
+        self.request_start_time = None
+        self.tts.stop_tts_stream()
+        cancel_generation = getattr(self.router, "cancel_generation", None)
+        if cancel_generation:
+            cancel_generation()
+
+    def _drain_responses(self):
+        """Handle every result queued by the thinking worker. True if any was handled."""
+        handled = False
+        while True:
+            try:
+                req_id, result = self.response_queue.get_nowait()
+            except queue.Empty:
+                return handled
+            self._process_thinking_result(req_id, result)
+            handled = True
+
     def _process_thinking_result(self, req_id, result):
         """Process the result from the background thread in the main loop"""
         if req_id != self.current_request_id:
             print(f"AudioEngine: Ignoring stale result (ID: {req_id} != {self.current_request_id})")
             return
 
+        if result.get("type") == "segment":
+            # Pipelined reply: speak each clause while the LLM keeps generating
+            if self.streaming_request_id != req_id:
+                self.streaming_request_id = req_id
+                self.spoken_reply = ""
+                self.state_controller.safe_state_transition(VoiceState.SPEAKING)
+                self.speech_start_time = time.time()
+            self.spoken_reply = f"{self.spoken_reply} {result['text']}".strip()
+            self.tts.enqueue(result["text"])
+            return
+
+        streamed = self.streaming_request_id == req_id
+        self.streaming_request_id = None
+
         if result.get("type") == "error":
             print(f"AudioEngine: Error processing request: {result.get('error')}")
-            self.state_controller.safe_state_transition(VoiceState.LISTENING)
+            if not streamed:
+                self.state_controller.safe_state_transition(VoiceState.LISTENING)
             return
 
         response = result.get("data")
         action = response.get("action")
         reply = response.get("text") or response.get("reply")
 
+        if streamed:
+            # Already (being) spoken; only the tail the router appended is left
+            if reply and self.on_text_update:
+                try:
+                    self.on_text_update("jarvis", reply)
+                except Exception as e:
+                    print(f"AudioEngine: GUI chat update failed: {e}")
+            spoken, self.spoken_reply = self.spoken_reply, ""
+            if reply and " ".join(reply.split()).startswith(spoken):
+                self.tts.enqueue(" ".join(reply.split())[len(spoken):])
+            return
+
         if action in ("go_to_sleep", "enable_sleep_mode"):
             self.state_controller.safe_state_transition(VoiceState.SLEEP)
             self.tts.start_tts_stream(
@@ -222,17 +330,6 @@ class AudioEngine:
             self.state_controller.safe_state_transition(VoiceState.SPEAKING)
             self.speech_start_time = time.time()
 
-            # Calculate and emit latency
-            if self.request_start_time:
-                latency_ms = int((time.time() - self.request_start_time) * 1000)
-                print(f"AudioEngine: Response latency: {latency_ms}ms")
-                if self.on_latency_update:
-                    try:
-                        self.on_latency_update(latency_ms)
-                    except Exception as e:
-                        print(f"AudioEngine: GUI latency update failed: {e}")
-                self.request_start_time = None
-
             if self.on_text_update:
                 try:
                     self.on_text_update("jarvis", reply)
@@ -288,6 +385,7 @@ class AudioEngine:
         self.is_running = False
         self.mic.stop()
         self.tts.stop_tts_stream()
+        self.speaker_auth.verifier.stop()
         # self.thinking_thread is daemon, will die with process
         # But we can try to be nice
         self.request_queue.put(None)
@@ -315,12 +413,16 @@ class AudioEngine:
                         # Apply noise suppression first
                         processed_chunk = self._apply_noise_suppression(chunk)
 
+                        # Keep recent sound in the speaker window so the wake word can be verified
+                        if self._calculate_rms(processed_chunk) > self.RMS_THRESHOLD * 0.3:
+                            self.speaker_auth.observe(processed_chunk)
+
                         # Check for wake word using enhanced detector
-                        is_wake_word, confidence = self.wake_word_detector.detect_wake_word(processed_chunk)
+                        is_wake_word, confidence = self.wake_word_detector.detect_wake_word(processed_chunk, seq=self.mic.last_seq)
 
                         if is_wake_word:
                             # Verify speaker if authentication is enabled
-                            is_auth, speaker_id, auth_confidence = self._verify_speaker(processed_chunk)
+                            is_auth, speaker_id, auth_confidence = self._verify_speaker(wait=True)
 
                             if is_auth or not self.speaker_auth.is_access_control_enabled():
                                 # Wake up the system
@@ -331,28 +433,18 @@ class AudioEngine:
                             else:
                                 # Unauthorized speaker
                                 print(f"Unauthorized wake word detected from unknown speaker")
-                        else:
-                            # Also check for traditional wake phrases as fallback
-                            rms = self._calculate_rms(processed_chunk)
-                            if rms > self.RMS_THRESHOLD * 0.3:  # Lower threshold in sleep mode
-                                # Check if it's speech-like
-                                if self.vad.is_speech(processed_chunk):
-                                    # Convert to text to check for wake phrases
-                                    # For now, just buffer and check for keywords
-                                    temp_buffer = [processed_chunk]
-                                    # This is a simplified check - in practice, you'd need a quick keyword spotter
-                                    # But for now, we'll rely on the enhanced wake word detector above
-                                    pass
-
-                    time.sleep(0.01)
+
                     continue
 
                 # ----------------------------------------------------------
                 # SPEAKING MODE - Enhanced with advanced interruption handling
                 # ----------------------------------------------------------
                 if state == VoiceState.SPEAKING:
-                    # TTS finished?
-                    if not self.tts.is_speaking():
+                    # More segments of a streaming reply?
+                    self._drain_responses()
+
+                    # TTS finished (and no more segments coming)?
+                    if not self.tts.is_speaking() and self.streaming_request_id is None:
                         # If speaker stopped, we return to LISTENING immediately
                         # and clear any stale reference audio
                         print("AudioEngine: TTS finished (Speaker Idle) → LISTENING")
@@ -361,13 +453,11 @@ class AudioEngine:
                         self.tts_energy = 0.0
                         self.speech_start_time = None
                         self.interrupt_frames = 0
-                        time.sleep(0.01)
                         continue
 
-                    # read mic
+                    # read mic (blocks until the next frame or a wake-up)
                     mic_chunk = self.mic.read_chunk()
                     if not mic_chunk:
-                        time.sleep(0.005)
                         continue
 
                     # get exactly 1024 bytes (512 samples) from ref_byte_buffer for AEC
@@ -382,7 +472,7 @@ class AudioEngine:
                         self.tts_energy = 0.0
 
                     # Enhanced AEC with double-talk detection
-                    if ref_chunk and not self.SAFE_MODE:
+                    if ref_chunk and self.AEC_ENABLED:
                         clean_chunk, echo_reduction_db = self.aec.process_with_noise_reduction(mic_chunk, ref_chunk)
                     else:
                         clean_chunk = mic_chunk
@@ -390,19 +480,6 @@ class AudioEngine:
                     clean_rms = self._calculate_rms(clean_chunk)
 
                     # ----------------- ENHANCED SIRI-LIKE INTERRUPTION ------------------
-                    # Check if interruption should be allowed based on speaker verification
-                    is_auth_speaker = False
-                    if time.time() - self.last_verification_time > self.verification_cooldown:
-                        is_auth, speaker_id, conf = self._verify_speaker(clean_chunk)
-                        is_auth_speaker = is_auth
-
-                    # Determine if interruption should be allowed
-                    interrupt_allowed = (
-                        is_auth_speaker or
-                        not self.speaker_auth.is_access_control_enabled() or
-                        self.allow_interruption_by_unknown
-                    )
-
                     interrupt_gate = max(
                         self.RMS_THRESHOLD * 0.7,
                         self.tts_energy * 1.15
@@ -411,7 +488,21 @@ class AudioEngine:
                     vad_speech = self.vad.is_speech(
                         clean_chunk,
                         strict=True,
-                        tts_energy=self.tts_energy
+                        tts_energy=self.tts_energy,
+                        seq=self.mic.last_seq
+                    )
+
+                    # Check if interruption should be allowed based on speaker verification
+                    # (speech frames feed the rolling window; the result comes from the background)
+                    is_auth_speaker = False
+                    if vad_speech:
+                        is_auth_speaker, speaker_id, conf = self._verify_speaker(clean_chunk)
+
+                    # Determine if interruption should be allowed
+                    interrupt_allowed = (
+                        is_auth_speaker or
+                        not self.speaker_auth.is_access_control_enabled() or
+                        self.allow_interruption_by_unknown
                     )
 
                     if vad_speech and clean_rms > interrupt_gate and interrupt_allowed:
@@ -421,7 +512,7 @@ class AudioEngine:
 
                     if self.interrupt_frames >= 3:
                         print("AudioEngine: USER INTERRUPTED (REAL SPEECH)")
-                        self.tts.stop_tts_stream()
+                        self._cancel_response()
                         self.stt.clear_buffer()
                         self.stt.buffer_frame(clean_chunk)
                         self.silence_frames = 0
@@ -429,7 +520,6 @@ class AudioEngine:
                         self.state_controller.safe_state_transition(VoiceState.LISTENING)
                         continue
 
-                    time.sleep(0.005)
                     continue
 
                 # ----------------------------------------------------------
@@ -439,7 +529,6 @@ class AudioEngine:
 
                     chunk = self.mic.read_chunk()
                     if not chunk:
-                        time.sleep(0.001)
                         continue
 
                     # Apply noise suppression
@@ -461,7 +550,7 @@ class AudioEngine:
                         is_speaking = False
                     else:
                         # Use VAD with lower sensitivity for better detection
-                        is_speaking = self.vad.is_speech(processed_chunk)
+                        is_speaking = self.vad.is_speech(processed_chunk, seq=self.mic.last_seq)
 
                     # Diagnostic logging once every 2 seconds
                     if time.time() - self.last_diagnostic_time > 2.0:
@@ -478,6 +567,7 @@ class AudioEngine:
 
                     # user is speaking
                     if is_speaking:
+                        self.speaker_auth.observe(processed_chunk)
                         self.speech_frames += 1
                         if self.speech_frames >= self.MIN_SPEECH_FRAMES or self.stt.buffer:
                             self.stt.buffer_frame(processed_chunk)
@@ -487,7 +577,7 @@ class AudioEngine:
                         # trailing silence detection
                         if self.stt.buffer:
                             self.silence_frames += 1
-                            self.stt.buffer_frame(processed_chunk)
+                            self.stt.buffer_frame(processed_chunk, is_speech=False)
 
                             if self.silence_frames > self.MAX_SILENCE_FRAMES:
                                 print("AudioEngine: end-of-speech → THINKING")
@@ -496,6 +586,8 @@ class AudioEngine:
                                 text = self.stt.transcribe_buffer()
                                 self.stt.clear_buffer()
                                 self.silence_frames = 0
+                                self.stable_prefix = ""
+                                self._show_partial("")
 
                                 if text and len(text) > 2:
                                     print("User:", text)
@@ -527,13 +619,9 @@ class AudioEngine:
                 # ----------------------------------------------------------
                 elif state == VoiceState.THINKING:
                     # Check for results FIRST (priority over interruption)
-                    try:
-                        req_id, result = self.response_queue.get_nowait()
-                        self._process_thinking_result(req_id, result)
+                    if self._drain_responses():
                         self.thinking_interrupt_frames = 0  # Reset interrupt counter
                         continue
-                    except queue.Empty:
-                        pass
 
                     # Check for user interruption (but require sustained speech)
                     chunk = self.mic.read_chunk()
@@ -541,15 +629,16 @@ class AudioEngine:
                         rms = self._calculate_rms(chunk)
                         # Require BOTH: high RMS AND VAD speech detection
                         # This prevents false triggers from background noise
-                        if rms > self.RMS_THRESHOLD * 2 and self.vad.is_speech(chunk):
+                        if rms > self.RMS_THRESHOLD * 2 and self.vad.is_speech(chunk, seq=self.mic.last_seq):
                             if not hasattr(self, 'thinking_interrupt_frames'):
                                 self.thinking_interrupt_frames = 0
                             self.thinking_interrupt_frames += 1
+                            self.speaker_auth.observe(chunk)
                             
                             # Require at least 5 consecutive speech frames (more than single noise spike)
                             if self.thinking_interrupt_frames >= 5:
                                 # Verify speaker during thinking mode to allow interruption
-                                is_auth, speaker_id, conf = self._verify_speaker(chunk)
+                                is_auth, speaker_id, conf = self._verify_speaker()
 
                                 interrupt_allowed = (
                                     is_auth or
@@ -559,6 +648,7 @@ class AudioEngine:
 
                                 if interrupt_allowed:
                                     print("AudioEngine: User interrupted thinking (sustained speech detected)")
+                                    self._cancel_response()
                                     self.stt.clear_buffer()
                                     self.stt.buffer_frame(chunk)
                                     self.state_controller.safe_state_transition(VoiceState.LISTENING)
@@ -569,8 +659,6 @@ class AudioEngine:
                             if hasattr(self, 'thinking_interrupt_frames'):
                                 self.thinking_interrupt_frames = 0
 
-                    time.sleep(0.01)
-
                 # ----------------------------------------------------------
                 # IDLE MODE
                 # ----------------------------------------------------------
@@ -580,7 +668,13 @@ class AudioEngine:
                     if not self.mic.stream or not self.mic.stream.is_active():
                         self.mic.start()
 
-                time.sleep(0.001)
+                # ----------------------------------------------------------
+                # Any other state (WAKE_WORD_DETECTED, PROCESSING, ...): nothing
+                # to do with the audio, but block on the next frame so the loop
+                # never spins
+                # ----------------------------------------------------------
+                else:
+                    self.mic.read_chunk()
 
             except Exception as e:
                 print("AudioEngine ERROR:", e)
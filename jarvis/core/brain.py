@@ -6,13 +6,13 @@ import requests
 import time
 import datetime
 from .briefing_manager import BriefingManager
-from .enhanced_memory import EnhancedMemory # Changed to use enhanced memory
+from .enhanced_memory import get_memory # Changed to use enhanced memory
 from .behavior_learning import BehaviorLearning
 
 class Brain:
     def __init__(self, memory=None):
         self.classifier = QueryClassifier()
-        self.memory = memory or EnhancedMemory() # Changed to use EnhancedMemory # Shared or new Memory instance
+        self.memory = memory or get_memory() # Shared EnhancedMemory instance
         self.local_brain = LocalBrain(self.memory) # Initialize LocalBrain with shared memory
         self.briefing_manager = BriefingManager(self.memory, self.local_brain.ollama)
         self.behavior_learning = BehaviorLearning(self.memory) # Initialize behavior learning
@@ -22,7 +22,7 @@ class Brain:
         
         print("Brain initialized with Local protocols.")
 
-    def think(self, text, short_term_memory=None, long_term_memory=None):
+    def think(self, text, short_term_memory=None, long_term_memory=None, on_partial=None):
         """
         Generate a conversational response for the user's input.
         
@@ -35,7 +35,7 @@ class Brain:
         self.behavior_learning.learn_from_interaction(text, "", datetime.datetime.now())
 
         # Generate conversational response via LocalBrain
-        local_response = self.local_brain.generate_chat_response(text)
+        local_response = self.local_brain.generate_chat_response(text, on_partial=on_partial)
 
         # Ensure it's JSON for the router
         if isinstance(local_response, dict):
@@ -5,11 +5,30 @@ from typing import List, Dict, Any, Optional
 import numpy as np
 from collections import defaultdict
 import re
+import threading
+import functools
+from .memory.journal import MemoryJournal
+from .memory.vector_store import VectorStore
+from .memory.embeddings import DEFAULT_MODEL, get_embeddings_model
+
+def _synchronized(method):
+    """Serialize access to the memory structures across threads"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class EnhancedMemory:
-    def __init__(self):
+    EMBEDDINGS_MODEL_NAME = DEFAULT_MODEL
+
+    def __init__(self, memory_file=None):
         self.config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
-        self.memory_file = os.path.join(self.config_dir, 'memory.json')
+        self.memory_file = memory_file or os.path.join(self.config_dir, 'memory.json')
+
+        # Per-mutation records go to a WAL next to memory.json; the full file
+        # is only rewritten by background compaction or save_memory()
+        self.journal = MemoryJournal(self.memory_file)
 
         # Core memory structures (Layered)
         self.working_memory = []  # ENTITIES/TOPICS in current 15s window
@@ -36,38 +55,43 @@ class EnhancedMemory:
             r"\b(maybe|perhaps|probably|i think|not sure|guess|assume|might)\b"
         ]
 
-        # Embeddings cache (optional, loaded on demand)
+        # Persistent embedding index (optional, opened on first search).
+        # Mutations queue documents in _index_pending; only those are
+        # re-embedded, everything else is served from disk.
         self.embeddings_model = None
-        self.memory_embeddings = []
-        self.memory_texts = []
+        self.vector_store = None
+        self._index_pending = {}
+        self._index_synced = False
+
+        # Guards the structures when one instance is shared (see get_memory())
+        self.lock = threading.RLock()
 
         self.load_memory()
 
     def load_memory(self):
-        """Load all memory from persistent storage"""
+        """Load all memory from persistent storage (snapshot + WAL replay)"""
         try:
-            if os.path.exists(self.memory_file):
-                with open(self.memory_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.long_term = data.get('long_term', {})
-                    self.short_term = data.get('short_term', [])
-                    self.sessions = data.get('sessions', [])
-                    self.tasks = data.get('tasks', {})
-                    
-                    # New Layered Structures
-                    self.working_memory = data.get('working_memory', [])
-                    self.episodic_memory = data.get('episodic_memory', [])
-                    self.semantic_memory = data.get('semantic_memory', {})
-
-                    # Load enhanced memory structures
-                    self.emotions = data.get('emotions', [])
-                    self.personality_profile = data.get('personality_profile', {})
-                    self.conversation_patterns = data.get('conversation_patterns', {})
-                    self.relationships = data.get('relationships', {})
-                    self.habits = data.get('habits', {})
-                    self.interests = set(data.get('interests', []))
-                    self.favorites = data.get('favorites', {})
-                    self.personal_history = data.get('personal_history', [])
+            data = self.journal.load()
+            if data is not None:
+                self.long_term = data.get('long_term', {})
+                self.short_term = data.get('short_term', [])
+                self.sessions = data.get('sessions', [])
+                self.tasks = data.get('tasks', {})
+                
+                # New Layered Structures
+                self.working_memory = data.get('working_memory', [])
+                self.episodic_memory = data.get('episodic_memory', [])
+                self.semantic_memory = data.get('semantic_memory', {})
+
+                # Load enhanced memory structures
+                self.emotions = data.get('emotions', [])
+                self.personality_profile = data.get('personality_profile', {})
+                self.conversation_patterns = data.get('conversation_patterns', {})
+                self.relationships = data.get('relationships', {})
+                self.habits = data.get('habits', {})
+                self.interests = set(data.get('interests', []))
+                self.favorites = data.get('favorites', {})
+                self.personal_history = data.get('personal_history', [])
             else:
                 self.long_term = {}
                 self.short_term = []
@@ -101,48 +125,81 @@ class EnhancedMemory:
             self.favorites = {}
             self.personal_history = []
 
+    def _to_dict(self):
+        """Collect every persisted structure into one dict"""
+        return {
+            'long_term': self.long_term,
+            'short_term': self.short_term,
+            'sessions': self.sessions,
+            'tasks': self.tasks,
+            'working_memory': self.working_memory,
+            'episodic_memory': self.episodic_memory,
+            'semantic_memory': self.semantic_memory,
+
+            # Save enhanced memory structures
+            'emotions': self.emotions,
+            'personality_profile': self.personality_profile,
+            'conversation_patterns': self.conversation_patterns,
+            'relationships': self.relationships,
+            'habits': self.habits,
+            'interests': list(self.interests),
+            'favorites': self.favorites,
+            'personal_history': self.personal_history
+        }
+
+    @_synchronized
     def save_memory(self):
-        """Save all memory to persistent storage"""
+        """
+        Write a full checkpoint of all memory to persistent storage.
+        Regular mutations are journaled via _record(); this is only needed
+        after editing the memory structures directly.
+        """
         try:
-            os.makedirs(self.config_dir, exist_ok=True)
-            data = {
-                'long_term': self.long_term,
-                'short_term': self.short_term,
-                'sessions': self.sessions,
-                'tasks': self.tasks,
-                'working_memory': self.working_memory,
-                'episodic_memory': self.episodic_memory,
-                'semantic_memory': self.semantic_memory,
-                
-                # Save enhanced memory structures
-                'emotions': self.emotions,
-                'personality_profile': self.personality_profile,
-                'conversation_patterns': self.conversation_patterns,
-                'relationships': self.relationships,
-                'habits': self.habits,
-                'interests': list(self.interests),
-                'favorites': self.favorites,
-                'personal_history': self.personal_history
-            }
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            self.journal.checkpoint(self._to_dict())
+            self._index_synced = False  # Structures may have been edited in place
             print("Enhanced Memory: Saved.")
         except Exception as e:
             print(f"Enhanced Memory: Failed to save: {e}")
 
+    def _record(self, op, *path, value=None, cap=None):
+        """Journal a single mutation (O(change) instead of a full rewrite)"""
+        try:
+            self.journal.append(op, list(path), value, cap)
+        except Exception as e:
+            print(f"Enhanced Memory: Failed to journal {op} {path}: {e}")
+
     # ===== Basic Key-Value Storage =====
 
     def get(self, key):
         """Get a value from long-term memory"""
         return self.long_term.get(key)
 
+    @_synchronized
     def set(self, key, value):
         """Set a value in long-term memory"""
         self.long_term[key] = value
-        self.save_memory()
+        self._record('put', 'long_term', key, value=value)
+        if key == 'facts':
+            self._index_synced = False
+        else:
+            self._index(f"long_term:{key}", f"{key}: {value}")
+
+    @_synchronized
+    def delete(self, key):
+        """Remove a key from long-term memory. Returns True if it existed."""
+        if key not in self.long_term:
+            return False
+        del self.long_term[key]
+        self._record('del', 'long_term', key)
+        if key == 'facts':
+            self._index_synced = False
+        else:
+            self._unindex(f"long_term:{key}")
+        return True
 
     # ===== Enhanced Memory Features =====
 
+    @_synchronized
     def remember_emotion(self, emotion, intensity=1, context=""):
         """Remember user's emotional state"""
         emotion_entry = {
@@ -157,7 +214,7 @@ class EnhancedMemory:
         if len(self.emotions) > 50:
             self.emotions = self.emotions[-50:]
         
-        self.save_memory()
+        self._record('append', 'emotions', value=emotion_entry, cap=50)
 
     def get_current_mood(self):
         """Get user's current mood based on recent emotions"""
@@ -175,27 +232,34 @@ class EnhancedMemory:
         else:
             return "neutral"
 
+    @_synchronized
     def remember_interest(self, interest):
         """Remember user's interests"""
         self.interests.add(interest.lower())
-        self.save_memory()
+        self._record('add', 'interests', value=interest.lower())
+        self._index_profile()
 
+    @_synchronized
     def remember_favorite(self, category, item):
         """Remember user's favorites"""
         if category not in self.favorites:
             self.favorites[category] = []
         if item not in self.favorites[category]:
             self.favorites[category].append(item)
-        self.save_memory()
+        self._record('put', 'favorites', category, value=self.favorites[category])
+        self._index_profile()
 
+    @_synchronized
     def remember_habit(self, habit, frequency="daily"):
         """Remember user's habits"""
         self.habits[habit] = {
             'frequency': frequency,
             'last_recorded': datetime.datetime.now().isoformat()
         }
-        self.save_memory()
+        self._record('put', 'habits', habit, value=self.habits[habit])
+        self._index_profile()
 
+    @_synchronized
     def remember_contact_info(self, contact_type, contact_value):
         """Remember contact information like email, phone, address"""
         if 'contact_info' not in self.long_term:
@@ -212,8 +276,11 @@ class EnhancedMemory:
             if contact_value not in self.long_term['contact_info'][contact_type]:
                 self.long_term['contact_info'][contact_type].append(contact_value)
 
-        self.save_memory()
+        self._record('put', 'long_term', 'contact_info', contact_type,
+                     value=self.long_term['contact_info'][contact_type])
+        self._index("long_term:contact_info", f"contact_info: {self.long_term['contact_info']}")
 
+    @_synchronized
     def remember_relationship(self, person, relationship_type, details="", source="manual", confidence=0.8):
         """Remember personal relationships"""
         self.relationships[person] = {
@@ -224,8 +291,9 @@ class EnhancedMemory:
             'timestamp': datetime.datetime.now().isoformat(),
             'last_interaction': datetime.datetime.now().isoformat()
         }
-        self.save_memory()
+        self._record('put', 'relationships', person, value=self.relationships[person])
 
+    @_synchronized
     def remember_personal_event(self, event_type, description, date=None):
         """Remember important personal events"""
         event = {
@@ -239,8 +307,9 @@ class EnhancedMemory:
         if len(self.personal_history) > 20:
             self.personal_history = self.personal_history[-20:]
         
-        self.save_memory()
+        self._record('append', 'personal_history', value=event, cap=20)
 
+    @_synchronized
     def analyze_personality(self):
         """Analyze user's personality based on interactions"""
         if not self.emotions:
@@ -269,7 +338,8 @@ class EnhancedMemory:
             'last_analysis': datetime.datetime.now().isoformat()
         }
         
-        self.save_memory()
+        self._record('put', 'personality_profile', value=self.personality_profile)
+        self._index_profile()
         return self.personality_profile
 
     def detect_conversation_pattern(self, user_input, ai_response):
@@ -288,15 +358,17 @@ class EnhancedMemory:
             self.conversation_patterns[pattern] = 0
         self.conversation_patterns[pattern] += 1
         
-        self.save_memory()
+        self._record('put', 'conversation_patterns', pattern, value=self.conversation_patterns[pattern])
 
+    @_synchronized
     def remember_context(self, text):
         """Add to short-term conversation memory"""
         self.short_term.append(text)
         if len(self.short_term) > 10:  # Keep last 10 interactions
             self.short_term.pop(0)
-        self.save_memory() # Auto-save context
+        self._record('append', 'short_term', value=text, cap=10) # Auto-save context
 
+    @_synchronized
     def remember_conversation(self, user_input, ai_response):
         """Main entry point for storing conversation turns across memory layers."""
         # 1. Update Working Memory (Entities/Pronouns window)
@@ -312,12 +384,12 @@ class EnhancedMemory:
         self.short_term.append(conversation_entry)
         if len(self.short_term) > 10:
             self.short_term.pop(0)
+        self._record('append', 'short_term', value=conversation_entry, cap=10)
 
         # 3. Process for Semantic Memory (Factual commit - with strict blockers)
         if not self.should_block_semantic_write(user_input):
             self.process_conversation_for_memory(user_input, ai_response)
 
-        self.save_memory()
         self.detect_conversation_pattern(user_input, ai_response)
         self.extract_interests_from_conversation(user_input)
 
@@ -336,6 +408,7 @@ class EnhancedMemory:
                     'entity': ent,
                     'timestamp': now.isoformat()
                 })
+        self._record('put', 'working_memory', value=self.working_memory)
 
     def should_block_semantic_write(self, text):
         """ BLOCK if it's a question or uncertain """
@@ -345,6 +418,7 @@ class EnhancedMemory:
                 return True
         return False
 
+    @_synchronized
     def remember_semantic_fact(self, subject, fact_text, confidence=0.4, confirmed=False):
         """ Store facts with confidence levels """
         subject = subject.lower()
@@ -370,6 +444,9 @@ class EnhancedMemory:
                 'mentions': 1,
                 'last_seen': datetime.datetime.now().isoformat()
             })
+        self._record('put', 'semantic_memory', subject, value=self.semantic_memory[subject])
+        if not exists:
+            self._index(f"semantic:{subject}:{fact_text.lower()}", f"{subject}: {fact_text}")
         
         print(f"Semantic Memory: Updated {subject} -> {fact_text}")
 
@@ -603,6 +680,7 @@ class EnhancedMemory:
 
         return "\n".join(context_parts)
 
+    @_synchronized
     def add_episodic_summary(self, summary, mood="neutral"):
         """ Summarize a session for episodic memory """
         entry = {
@@ -613,7 +691,7 @@ class EnhancedMemory:
         }
         self.episodic_memory.append(entry)
         self.prune_episodic_memory()
-        self.save_memory()
+        self._record('put', 'episodic_memory', value=self.episodic_memory)
 
     def prune_episodic_memory(self):
         """ Expire episodic memory older than 30 days """
@@ -621,18 +699,27 @@ class EnhancedMemory:
         self.episodic_memory = [e for e in self.episodic_memory 
                                if (now - datetime.datetime.fromisoformat(e['date'])).days < 30]
 
+    @_synchronized
     def forget_this(self, keyword):
         """ Professional 'Forget this' capability """
         keyword = keyword.lower()
         # Clear from long_term
-        if keyword in self.long_term: del self.long_term[keyword]
+        if keyword in self.long_term:
+            del self.long_term[keyword]
+            self._record('del', 'long_term', keyword)
+            self._unindex(f"long_term:{keyword}", prefix="fact:" if keyword == 'facts' else None)
         # Clear from semantic
-        if keyword in self.semantic_memory: del self.semantic_memory[keyword]
+        if keyword in self.semantic_memory:
+            del self.semantic_memory[keyword]
+            self._record('del', 'semantic_memory', keyword)
+            self._unindex(prefix=f"semantic:{keyword}:")
         # Search and remove from facts/relationships
-        self.relationships = {p: d for p, d in self.relationships.items() if keyword not in p.lower()}
-        self.save_memory()
+        for person in [p for p in self.relationships if keyword in p.lower()]:
+            del self.relationships[person]
+            self._record('del', 'relationships', person)
         return f"I have purged all records of {keyword} from my systems, Sir."
 
+    @_synchronized
     def add_fact(self, subject, fact):
         """Add a factual memory"""
         if 'facts' not in self.long_term:
@@ -640,7 +727,8 @@ class EnhancedMemory:
         if subject not in self.long_term['facts']:
             self.long_term['facts'][subject] = []
         self.long_term['facts'][subject].append(fact)
-        self.save_memory()
+        self._record('append', 'long_term', 'facts', subject, value=fact)
+        self._index(f"fact:{subject}:{len(self.long_term['facts'][subject]) - 1}", f"{subject}: {fact}")
 
     def get_facts(self, subject):
         """Get facts about a subject"""
@@ -648,12 +736,25 @@ class EnhancedMemory:
             return self.long_term['facts'][subject]
         return []
 
+    @_synchronized
     def remember_preference(self, category, preference):
         """Remember a user preference"""
         if 'preferences' not in self.long_term:
             self.long_term['preferences'] = {}
         self.long_term['preferences'][category] = preference
-        self.save_memory()
+        self._record('put', 'long_term', 'preferences', category, value=preference)
+        self._index("long_term:preferences", f"preferences: {self.long_term['preferences']}")
+
+    @_synchronized
+    def forget_preference(self, category):
+        """Remove a user preference. Returns True if it existed."""
+        preferences = self.long_term.get('preferences', {})
+        if category not in preferences:
+            return False
+        del preferences[category]
+        self._record('del', 'long_term', 'preferences', category)
+        self._index("long_term:preferences", f"preferences: {preferences}")
+        return True
 
     def get_preference(self, category):
         """Get a user preference"""
@@ -663,6 +764,7 @@ class EnhancedMemory:
 
     # ===== Session Management =====
 
+    @_synchronized
     def add_session(self, summary: str):
         """Save a session summary"""
         session = {
@@ -672,8 +774,10 @@ class EnhancedMemory:
         self.sessions.append(session)
         # Keep last 50 sessions
         if len(self.sessions) > 50:
-            self.sessions.pop(0)
-        self.save_memory()
+            evicted = self.sessions.pop(0)
+            self._unindex(f"session:{evicted['timestamp']}")
+        self._record('append', 'sessions', value=session, cap=50)
+        self._index(f"session:{session['timestamp']}", summary)
 
     def get_recent_sessions(self, count: int = 5) -> List[Dict]:
         """Get recent session summaries"""
@@ -681,6 +785,7 @@ class EnhancedMemory:
 
     # ===== Task Memory =====
 
+    @_synchronized
     def add_task(self, task_name: str, task_data: Dict[str, Any]):
         """Remember an ongoing task"""
         self.tasks[task_name] = {
@@ -688,24 +793,29 @@ class EnhancedMemory:
             'updated': datetime.datetime.now().isoformat(),
             'data': task_data
         }
-        self.save_memory()
+        self._record('put', 'tasks', task_name, value=self.tasks[task_name])
+        self._index(f"task:{task_name}", f"Task {task_name}: {self.tasks[task_name]['data']}")
 
+    @_synchronized
     def update_task(self, task_name: str, task_data: Dict[str, Any]):
         """Update an existing task"""
         if task_name in self.tasks:
             self.tasks[task_name]['updated'] = datetime.datetime.now().isoformat()
             self.tasks[task_name]['data'].update(task_data)
-            self.save_memory()
+            self._record('put', 'tasks', task_name, value=self.tasks[task_name])
+            self._index(f"task:{task_name}", f"Task {task_name}: {self.tasks[task_name]['data']}")
 
     def get_task(self, task_name: str) -> Optional[Dict]:
         """Retrieve a task"""
         return self.tasks.get(task_name)
 
+    @_synchronized
     def complete_task(self, task_name: str):
         """Mark a task as complete and archive it"""
         if task_name in self.tasks:
             del self.tasks[task_name]
-            self.save_memory()
+            self._record('del', 'tasks', task_name)
+            self._unindex(f"task:{task_name}")
 
     def list_tasks(self) -> List[str]:
         """List all active tasks"""
@@ -714,76 +824,121 @@ class EnhancedMemory:
     # ===== Semantic Search with Embeddings =====
 
     def _load_embeddings_model(self):
-        """Lazy load the sentence transformer model"""
+        """Lazy load the sentence transformer model (once per process)"""
         if self.embeddings_model is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-                self.embeddings_model = SentenceTransformer('all-MiniLM-L6-v2')
-                print("Memory: Embeddings model loaded.")
-            except ImportError:
-                print("Memory: sentence-transformers not installed. Semantic search disabled.")
-                return False
-        return True
-
-    def _build_embeddings_cache(self):
-        """Build embeddings cache from long-term memory"""
-        if not self._load_embeddings_model():
-            return
+            self.embeddings_model = get_embeddings_model(self.EMBEDDINGS_MODEL_NAME)
+        return self.embeddings_model is not None
+
+    def _open_vector_store(self):
+        """Open (or create) the on-disk embedding index next to memory.json"""
+        if self.vector_store is None:
+            dim = self.embeddings_model.get_sentence_embedding_dimension()
+            base_path = os.path.splitext(self.memory_file)[0] + '_vectors'
+            self.vector_store = VectorStore(base_path, dim, model_name=self.EMBEDDINGS_MODEL_NAME)
+            self._index_synced = False
+        return self.vector_store
+
+    def _profile_documents(self):
+        """Index documents for the personal profile (one per structure)"""
+        docs = {}
+        if self.personality_profile:
+            docs['profile:personality'] = f"Personality: {self.personality_profile}"
+        if self.interests:
+            docs['profile:interests'] = f"Interests: {', '.join(list(self.interests))}"
+        if self.favorites:
+            docs['profile:favorites'] = f"Favorites: {self.favorites}"
+        if self.habits:
+            docs['profile:habits'] = f"Habits: {self.habits}"
+        return docs
 
-        self.memory_texts = []
-        self.memory_embeddings = []
+    def _memory_documents(self):
+        """Everything searchable, as {doc_id: text}"""
+        docs = {}
 
-        # Add user preferences
+        # Long-term keys; facts are indexed one by one
         for key, value in self.long_term.items():
-            text = f"{key}: {value}"
-            self.memory_texts.append(text)
+            if key == 'facts' and isinstance(value, dict):
+                for subject, facts in value.items():
+                    for i, fact in enumerate(facts):
+                        docs[f"fact:{subject}:{i}"] = f"{subject}: {fact}"
+            else:
+                docs[f"long_term:{key}"] = f"{key}: {value}"
 
-        # Add session summaries
+        # Verified/semantic facts
+        for subject, facts in self.semantic_memory.items():
+            for f in facts:
+                docs[f"semantic:{subject}:{f['fact'].lower()}"] = f"{subject}: {f['fact']}"
+
+        # Session summaries
         for session in self.sessions:
-            self.memory_texts.append(session['summary'])
+            docs[f"session:{session['timestamp']}"] = session['summary']
 
-        # Add tasks
+        # Tasks
         for task_name, task_info in self.tasks.items():
-            text = f"Task {task_name}: {task_info['data']}"
-            self.memory_texts.append(text)
-
-        # Add personal information
-        if self.personality_profile:
-            self.memory_texts.append(f"Personality: {self.personality_profile}")
-        if self.interests:
-            self.memory_texts.append(f"Interests: {', '.join(list(self.interests))}")
-        if self.favorites:
-            self.memory_texts.append(f"Favorites: {self.favorites}")
-        if self.habits:
-            self.memory_texts.append(f"Habits: {self.habits}")
+            docs[f"task:{task_name}"] = f"Task {task_name}: {task_info['data']}"
+
+        docs.update(self._profile_documents())
+        return docs
+
+    def _index(self, doc_id, text):
+        """Queue a document for (re-)embedding on the next search"""
+        self._index_pending[doc_id] = text
+
+    def _unindex(self, doc_id=None, prefix=None):
+        """Remove documents from the index (no model needed)"""
+        if doc_id:
+            self._index_pending.pop(doc_id, None)
+        if prefix:
+            for pending_id in [d for d in self._index_pending if d.startswith(prefix)]:
+                del self._index_pending[pending_id]
+        if self.vector_store is None:
+            return  # Reconciled against memory when the store is opened
+        if doc_id:
+            self.vector_store.delete(doc_id)
+        if prefix:
+            self.vector_store.delete_prefix(prefix)
+
+    def _index_profile(self):
+        self._index_pending.update(self._profile_documents())
+
+    def _sync_index(self):
+        """Bring the vector store up to date, embedding only what changed"""
+        store = self._open_vector_store()
+
+        if not self._index_synced:
+            # Full reconcile: diff memory against what the store already holds
+            docs = self._memory_documents()
+            indexed = store.documents()
+            for doc_id in indexed.keys() - docs.keys():
+                store.delete(doc_id)
+            todo = {d: t for d, t in docs.items() if indexed.get(d) != t}
+            self._index_synced = True
+        else:
+            todo = {d: t for d, t in self._index_pending.items() if store.text_of.get(d) != t}
+        self._index_pending.clear()
 
-        if self.memory_texts:
-            self.memory_embeddings = self.embeddings_model.encode(self.memory_texts)
-            print(f"Memory: Built embeddings cache with {len(self.memory_texts)} items.")
+        if todo:
+            ids = list(todo.keys())
+            texts = [todo[d] for d in ids]
+            vectors = self.embeddings_model.encode(texts, normalize_embeddings=True)
+            store.upsert_many(ids, texts, vectors)
+            print(f"Memory: Indexed {len(ids)} items ({len(store)} total).")
 
     def search_memory(self, query: str, top_k: int = 3) -> List[str]:
         """Search memory using semantic similarity"""
         if not self._load_embeddings_model():
             return []
 
-        # Rebuild cache if needed
-        if not self.memory_embeddings or len(self.memory_embeddings) == 0:
-            self._build_embeddings_cache()
-
-        if not self.memory_texts:
-            return []
-
-        # Encode query
-        query_embedding = self.embeddings_model.encode([query])[0]
-
-        # Calculate similarities
-        similarities = np.dot(self.memory_embeddings, query_embedding)
+        with self.lock:
+            self._sync_index()
+            if len(self.vector_store) == 0:
+                return []
 
-        # Get top-k results
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-        results = [self.memory_texts[i] for i in top_indices]
+            # Encode query and take cosine top-k from the persistent index
+            query_embedding = self.embeddings_model.encode([query], normalize_embeddings=True)[0]
+            results = self.vector_store.search(query_embedding, top_k=top_k)
 
-        return results
+        return [text for _, text, _ in results]
 
     def get_memory_stats(self):
         """Get statistics about memory usage"""
@@ -805,12 +960,14 @@ class EnhancedMemory:
 
         return stats
 
+    @_synchronized
     def clear_short_term_memory(self):
         """Clear short-term memory"""
         self.short_term = []
         print("Short-term memory cleared.")
-        self.save_memory()
+        self._record('put', 'short_term', value=[])
 
+    @_synchronized
     def prepare_for_exit(self):
         """
         Prepare for program exit by clearing only temporary memory
@@ -830,16 +987,20 @@ class EnhancedMemory:
         self.save_memory()
         print("Temporary memory cleared. Episodic summary saved. Long-term memory preserved.")
 
+    @_synchronized
     def clear_long_term_memory(self, category=None):
         """Clear long-term memory, optionally by category"""
         if category:
             if category in self.long_term:
                 del self.long_term[category]
+                self._record('del', 'long_term', category)
+                self._index_synced = False
                 print(f"Long-term memory category '{category}' cleared.")
         else:
             self.long_term = {}
+            self._record('put', 'long_term', value={})
+            self._index_synced = False
             print("All long-term memory cleared.")
-        self.save_memory()
 
     def export_memory(self, filepath):
         """Export memory to a file"""
@@ -864,6 +1025,7 @@ class EnhancedMemory:
         except Exception as e:
             return f"Failed to export memory: {e}"
 
+    @_synchronized
     def import_memory(self, filepath):
         """Import memory from a file"""
         try:
@@ -884,4 +1046,25 @@ class EnhancedMemory:
             self.save_memory()
             return f"Memory imported from {filepath}"
         except Exception as e:
-            return f"Failed to import memory: {e}"
\ No newline at end of file
+            return f"Failed to import memory: {e}"
+
+
+# Process-wide memory service. The Router creates the instance; action
+# modules fetch it here instead of re-reading memory.json per call.
+_memory_instance = None
+_memory_instance_lock = threading.Lock()
+
+def get_memory() -> EnhancedMemory:
+    """Get or create the shared EnhancedMemory instance."""
+    global _memory_instance
+    if _memory_instance is None:
+        with _memory_instance_lock:
+            if _memory_instance is None:
+                _memory_instance = EnhancedMemory()
+    return _memory_instance
+
+def set_memory(memory: Optional[EnhancedMemory]):
+    """Install `memory` as the shared instance (None resets the registry)."""
+    global _memory_instance
+    with _memory_instance_lock:
+        _memory_instance = memory
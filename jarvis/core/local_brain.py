@@ -230,13 +230,14 @@ class LocalBrain:
         
         return response
 
-    def generate_chat_response(self, text: str) -> dict:
+    def generate_chat_response(self, text: str, on_partial=None) -> dict:
         """
         Generate a pure conversational response via templates or Ollama LLM.
         This is the primary method for handling CONVERSATION/CHAT intents.
         
         Args:
             text: User's input text
+            on_partial: Optional callback receiving reply text as the LLM streams it
             
         Returns:
             dict with 'text' key containing the response
@@ -286,7 +287,20 @@ class LocalBrain:
             "CRITICAL: Be concise but vibrant. NO flowery robotic greetings. Plain text ONLY."
         )
 
-        ollama_response = self.ollama.chat_with_context(text, context_str, system_instructions)
+        # Stream plain-text replies; replies that start like JSON are held back for the router
+        stream_mode = []
+        def forward(token):
+            if not stream_mode:
+                visible = token.lstrip()
+                if not visible:
+                    return
+                stream_mode.append("hold" if visible[0] in "{`" else "speak")
+            if stream_mode[0] == "speak":
+                on_partial(token)
+
+        ollama_response = self.ollama.chat_with_context(
+            text, context_str, system_instructions, on_token=forward if on_partial else None
+        )
 
         if "ERROR_CONNECTION" in ollama_response:
              return {"text": f"I can't reach the local brain server, {selected_name}. Please ensure Ollama is running."}
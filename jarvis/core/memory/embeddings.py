@@ -0,0 +1,20 @@
+import threading
+
+DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+
+# One SentenceTransformer per model name for the whole process
+_models = {}
+_lock = threading.Lock()
+
+def get_embeddings_model(name: str = DEFAULT_MODEL):
+    """Load a sentence-transformers model once. Returns None if unavailable."""
+    with _lock:
+        if name not in _models:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _models[name] = SentenceTransformer(name)
+                print(f"Memory: Embeddings model '{name}' loaded.")
+            except ImportError:
+                print("Memory: sentence-transformers not installed. Semantic search disabled.")
+                return None
+        return _models[name]
@@ -0,0 +1,244 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+
+def apply_record(state: Dict[str, Any], record: Dict[str, Any]):
+    """Apply a single journal record to a dict-shaped memory state"""
+    op = record.get("op")
+    path = record.get("path") or []
+    if not path:
+        return
+
+    # Walk to the parent container, creating dicts on the way
+    parent = state
+    for key in path[:-1]:
+        if not isinstance(parent.get(key), dict):
+            parent[key] = {}
+        parent = parent[key]
+    leaf = path[-1]
+
+    if op == "put":
+        parent[leaf] = record.get("value")
+    elif op == "del":
+        parent.pop(leaf, None)
+    elif op == "append":
+        items = parent.get(leaf)
+        if not isinstance(items, list):
+            items = []
+        items.append(record.get("value"))
+        cap = record.get("cap")
+        if cap and len(items) > cap:
+            items = items[-cap:]
+        parent[leaf] = items
+    elif op == "add":
+        # Set semantics on top of a JSON list
+        items = parent.get(leaf)
+        if not isinstance(items, list):
+            items = list(items) if items else []
+        if record.get("value") not in items:
+            items.append(record.get("value"))
+        parent[leaf] = items
+
+
+class MemoryJournal:
+    """
+    Snapshot + append-only write-ahead log for dict-shaped memory stores.
+
+    Every mutation is appended to the WAL as one JSON line, so the cost of a
+    save is proportional to the change rather than to the whole memory.
+    Once enough records pile up, a background thread folds them into the
+    snapshot (snapshot + WAL replay -> temp file -> atomic replace) and drops
+    the folded records from the WAL. load() replays whatever the snapshot
+    does not cover yet, and ignores a torn last line left by a crash.
+    """
+    SEQ_KEY = "_wal_seq"
+
+    def __init__(self, snapshot_path: str, wal_path: Optional[str] = None,
+                 compact_every: int = 500, indent: Optional[int] = 4, fsync: bool = False):
+        self.snapshot_path = snapshot_path
+        self.wal_path = wal_path or os.path.splitext(snapshot_path)[0] + ".wal"
+        self.compact_every = compact_every
+        self.indent = indent
+        self.fsync = fsync
+
+        self.seq = 0
+        self.pending = 0  # Records in the WAL not yet folded into the snapshot
+        self._lock = threading.Lock()          # Guards seq and the WAL handle
+        self._compact_lock = threading.Lock()  # Serializes snapshot writers
+        self._compactor = None
+        self._wal = None
+
+    # ===== Loading =====
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _read_wal(self) -> List[Dict[str, Any]]:
+        records = []
+        if not os.path.exists(self.wal_path):
+            return records
+        with open(self.wal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn write from a crash: everything after it is suspect
+                    print(f"Memory Journal: Ignoring torn WAL record in {self.wal_path}")
+                    break
+        return records
+
+    def _replay(self):
+        """Return (state, last_seq, replayed_count) from snapshot + WAL on disk"""
+        snapshot = self._read_snapshot()
+        records = self._read_wal()
+        if snapshot is None and not records:
+            return None, 0, 0
+
+        if snapshot is not None and not isinstance(snapshot, dict):
+            return snapshot, 0, 0  # Legacy non-journaled file, returned untouched
+
+        state = snapshot or {}
+        base_seq = state.pop(self.SEQ_KEY, 0)
+        last_seq = base_seq
+        replayed = 0
+        for record in records:
+            seq = record.get("seq", 0)
+            if seq <= base_seq:
+                continue
+            apply_record(state, record)
+            last_seq = seq
+            replayed += 1
+        return state, last_seq, replayed
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Load the snapshot and replay the WAL on top. Returns None if nothing is stored."""
+        state, last_seq, replayed = self._replay()
+        with self._lock:
+            self.seq = last_seq
+            self.pending = replayed
+        if replayed:
+            print(f"Memory Journal: Replayed {replayed} WAL records.")
+        return state
+
+    # ===== Writing =====
+
+    def _open_wal(self):
+        if self._wal is None:
+            directory = os.path.dirname(self.wal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._wal = open(self.wal_path, 'a', encoding='utf-8')
+        return self._wal
+
+    def append(self, op: str, path: List[str], value: Any = None, cap: Optional[int] = None):
+        """Journal one mutation. Serializes `value` immediately."""
+        self.append_many([(op, path, value, cap)])
+
+    def append_many(self, mutations: List[tuple]):
+        """Journal several (op, path, value, cap) mutations with a single flush"""
+        with self._lock:
+            lines = []
+            for op, path, value, cap in mutations:
+                self.seq += 1
+                record = {"seq": self.seq, "op": op, "path": path}
+                if op in ("put", "append", "add"):
+                    record["value"] = value
+                if cap:
+                    record["cap"] = cap
+                lines.append(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            wal = self._open_wal()
+            wal.write("".join(lines))
+            wal.flush()
+            if self.fsync:
+                os.fsync(wal.fileno())
+            self.pending += len(lines)
+            should_compact = self.compact_every and self.pending >= self.compact_every
+
+        if should_compact:
+            self.compact_async()
+
+    def _write_snapshot(self, state: Dict[str, Any], seq: int):
+        """Crash-safe snapshot write: temp file, fsync, atomic replace"""
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = dict(state)
+        data[self.SEQ_KEY] = seq
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=self.indent, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _truncate_wal(self, upto_seq: int):
+        """Drop WAL records already covered by the snapshot (called under _lock)"""
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        if not os.path.exists(self.wal_path):
+            return
+        keep = [r for r in self._read_wal() if r.get("seq", 0) > upto_seq]
+        if not keep:
+            os.remove(self.wal_path)
+        else:
+            tmp_path = self.wal_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in keep:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            os.replace(tmp_path, self.wal_path)
+        self.pending = len(keep)
+
+    def checkpoint(self, state: Dict[str, Any]):
+        """Synchronously write `state` as the new snapshot and empty the WAL"""
+        with self._compact_lock:
+            with self._lock:
+                seq = self.seq
+            self._write_snapshot(state, seq)
+            with self._lock:
+                self._truncate_wal(seq)
+
+    def compact(self):
+        """Fold the WAL into the snapshot using only what is on disk"""
+        with self._compact_lock:
+            with self._lock:
+                if self._wal is not None:
+                    self._wal.flush()
+            state, last_seq, replayed = self._replay()
+            if state is None or not replayed:
+                return
+            self._write_snapshot(state, last_seq)
+            with self._lock:
+                self._truncate_wal(last_seq)
+
+    def compact_async(self):
+        """Run compact() on a daemon thread unless one is already running"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact_safely, daemon=True)
+        self._compactor.start()
+
+    def _compact_safely(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"Memory Journal: Compaction failed: {e}")
+
+    def wait_for_compaction(self, timeout: Optional[float] = None):
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+
+    def close(self):
+        self.wait_for_compaction()
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
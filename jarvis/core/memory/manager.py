@@ -51,9 +51,10 @@ class MemoryManager:
             return {"success": True, "message": "Stored in Short-Term Memory"}
             
         elif memory_type == MemoryType.LONG_TERM:
-            # Check for existing
-            # TODO: Improve duplicate check with semantic search
-            self.ltm.add(entry)
+            # LTM reinforces exact and near-duplicate entries instead of storing them twice
+            stored = self.ltm.add(entry)
+            if stored is not entry:
+                return {"success": True, "message": f"Already in Long-Term Memory, reinforced: {stored.content}"}
             return {"success": True, "message": f"Persisted to Long-Term Memory: {content}"}
             
         elif memory_type == MemoryType.EPISODIC:
@@ -62,14 +63,15 @@ class MemoryManager:
             
         return {"success": False, "message": "Unknown memory type"}
 
-    def retrieve(self, query: str, include_stm=True) -> List[MemoryEntry]:
+    def retrieve(self, query: str, include_stm=True, threshold=0.3, top_k=5) -> List[MemoryEntry]:
         """
         Retrieve relevant memories across layers.
+        LTM hits scoring below `threshold` are dropped.
         """
         results = []
         
         # LTM Search (Semantic/Keyword)
-        ltm_results = self.ltm.search(query, threshold=0.3)
+        ltm_results = self.ltm.search(query, threshold=threshold, top_k=top_k)
         results.extend(ltm_results)
         
         # STM Search (Basic scan)
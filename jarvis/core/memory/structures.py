@@ -1,9 +1,14 @@
-import json
 import os
+import re
 import datetime
-from collections import deque
-from typing import List, Optional
+import threading
+from collections import deque, defaultdict
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
 from .entries import MemoryEntry, MemoryType, MemorySource
+from .journal import MemoryJournal
+from .vector_store import VectorStore
+from .embeddings import DEFAULT_MODEL, get_embeddings_model
 
 class ShortTermMemory:
     """
@@ -25,29 +30,40 @@ class ShortTermMemory:
     def clear(self):
         self.buffer.clear()
 
+def _load_entries(journal: MemoryJournal, label: str) -> List[MemoryEntry]:
+    """Load journaled entries, migrating the legacy plain-list file format"""
+    try:
+        data = journal.load()
+    except Exception as e:
+        print(f"Error loading {label} Memory: {e}")
+        return []
+    if data is None:
+        return []
+    if isinstance(data, list):
+        entries = [MemoryEntry.from_dict(d) for d in data]
+        journal.checkpoint({"entries": {e.id: e.to_dict() for e in entries}})
+        return entries
+    return [MemoryEntry.from_dict(d) for d in data.get("entries", {}).values()]
+
+def _tokenize(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+(?:'[a-z]+)?", text.lower())
+    return [w[:-2] if w.endswith("'s") else w for w in words]
+
 class EpisodicMemory:
     """
     Daily summaries of events. Append-only log.
     """
     def __init__(self, storage_path):
         self.storage_path = storage_path
+        self.journal = MemoryJournal(storage_path, indent=2)
         self.entries = self._load()
         
     def _load(self) -> List[MemoryEntry]:
-        if not os.path.exists(self.storage_path):
-            return []
-        try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [MemoryEntry.from_dict(d) for d in data]
-        except Exception as e:
-            print(f"Error loading Episodic Memory: {e}")
-            return []
+        return _load_entries(self.journal, "Episodic")
             
-    def _save(self):
+    def _save(self, entry: MemoryEntry):
         try:
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump([e.to_dict() for e in self.entries], f, indent=2)
+            self.journal.append("put", ["entries", entry.id], entry.to_dict())
         except Exception as e:
             print(f"Error saving Episodic Memory: {e}")
 
@@ -60,72 +76,177 @@ class EpisodicMemory:
             metadata={"importance": importance}
         )
         self.entries.append(entry)
-        self._save()
+        self._save(entry)
 
 class LongTermMemory:
     """
-    Fact and Preference storage. 
-    Uses simple list + JSON persistence for now.
-    TODO: Integrate Vector Search here.
+    Fact and Preference storage.
+    Entries are journaled to JSON and indexed twice: a VectorStore of
+    sentence embeddings (cosine top-k, near-duplicate detection on write)
+    and an inverted keyword index, used when no embedding model is available.
     """
-    def __init__(self, storage_path):
+    DUPLICATE_THRESHOLD = 0.92  # Cosine similarity above which a write reinforces an existing entry
+    PARTITION_MIN_SIZE = 20000  # Switch vector search to partitioned probing past this size
+    STOPWORDS = {
+        "a", "an", "the", "is", "are", "was", "were", "am", "be", "my", "your", "i", "me", "you",
+        "what", "who", "where", "when", "why", "how", "do", "does", "did", "of", "to", "in", "on",
+        "at", "for", "and", "or", "it", "that", "this", "any", "about", "tell", "remember"
+    }
+
+    def __init__(self, storage_path, embeddings_model=None, use_embeddings=True):
         self.storage_path = storage_path
+        self.journal = MemoryJournal(storage_path, indent=2)
         self.entries = self._load()
-        
-        # Placeholder for embeddings model
-        self.embeddings_model = None
-        self.vectors = None 
+        self._lock = threading.RLock()
+
+        self.by_id: Dict[str, MemoryEntry] = {e.id: e for e in self.entries}
+        self.by_content: Dict[str, MemoryEntry] = {e.content: e for e in self.entries}
+        self.keyword_index: Dict[str, Set[str]] = defaultdict(set)
+        for e in self.entries:
+            self._index_keywords(e)
+
+        # Embedding index, opened on first use (None model -> keyword-only)
+        self.embeddings_model = embeddings_model
+        self.use_embeddings = use_embeddings
+        self.vectors = None
         
     def _load(self) -> List[MemoryEntry]:
-        if not os.path.exists(self.storage_path):
-            return []
-        try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [MemoryEntry.from_dict(d) for d in data]
-        except Exception as e:
-            print(f"Error loading LongTerm Memory: {e}")
-            return []
+        return _load_entries(self.journal, "LongTerm")
             
-    def _save(self):
+    def _save(self, *entries: MemoryEntry):
         try:
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump([e.to_dict() for e in self.entries], f, indent=2)
+            self.journal.append_many([("put", ["entries", e.id], e.to_dict(), None) for e in entries])
         except Exception as e:
             print(f"Error saving LongTerm Memory: {e}")
 
-    def add(self, entry: MemoryEntry):
-        if entry.memory_type != MemoryType.LONG_TERM:
-             raise ValueError("LongTermMemory only accepts LONG_TERM entries")
-        
-        # Deduplication check (simple exact match)
-        for e in self.entries:
-            if e.content == entry.content:
-                # Update existing
-                e.last_accessed = datetime.datetime.now().isoformat()
-                e.confidence = min(1.0, e.confidence + 0.1) # Reinforce
-                self._save()
-                return
-                
-        self.entries.append(entry)
-        self._save()
-        
-    def search(self, query: str, threshold=0.0) -> List[MemoryEntry]:
-        # TODO: Implement semantic search
-        # For now, keyword matching
+    # ===== Indexes =====
+
+    def _index_keywords(self, entry: MemoryEntry):
+        for word in set(_tokenize(entry.content)):
+            self.keyword_index[word].add(entry.id)
+
+    def _encode(self, texts: List[str]):
+        return self.embeddings_model.encode(texts, normalize_embeddings=True)
+
+    def _ensure_vectors(self) -> bool:
+        """Open the vector index, embedding any entries it is missing"""
+        if self.vectors is not None:
+            return True
+        if not self.use_embeddings:
+            return False
+        if self.embeddings_model is None:
+            self.embeddings_model = get_embeddings_model()
+            if self.embeddings_model is None:
+                self.use_embeddings = False
+                return False
+
+        base_path = os.path.splitext(self.storage_path)[0] + "_vectors"
+        self.vectors = VectorStore(
+            base_path, self.embeddings_model.get_sentence_embedding_dimension(),
+            model_name=DEFAULT_MODEL, partition_min_size=self.PARTITION_MIN_SIZE
+        )
+        indexed = self.vectors.documents()
+        for doc_id in indexed.keys() - self.by_id.keys():
+            self.vectors.delete(doc_id)
+        missing = [e for e in self.entries if indexed.get(e.id) != e.content]
+        for start in range(0, len(missing), 256):
+            batch = missing[start:start + 256]
+            texts = [e.content for e in batch]
+            self.vectors.upsert_many([e.id for e in batch], texts, self._encode(texts))
+        return True
+
+    # ===== Writes =====
+
+    def add(self, entry: MemoryEntry) -> MemoryEntry:
+        """Store `entry`, or reinforce a (near-)duplicate. Returns the stored entry."""
+        return self.add_many([entry])[0]
+
+    def add_many(self, entries: List[MemoryEntry]) -> List[MemoryEntry]:
+        """Batch add(): one encode call, one index update and one journal write"""
+        for entry in entries:
+            if entry.memory_type != MemoryType.LONG_TERM:
+                raise ValueError("LongTermMemory only accepts LONG_TERM entries")
+
+        with self._lock:
+            vectors = None
+            if self._ensure_vectors():
+                vectors = self._encode([e.content for e in entries])
+
+            stored = []
+            changed: Dict[str, MemoryEntry] = {}
+            nearest, batch_sims = [None] * len(entries), None
+            if vectors is not None:
+                nearest = self.vectors.nearest_many(vectors, threshold=self.DUPLICATE_THRESHOLD)
+                batch_sims = vectors @ vectors.T
+            added: Dict[int, MemoryEntry] = {}  # Batch row -> new entry
+            is_added = np.zeros(len(entries), dtype=bool)
+            for i, entry in enumerate(entries):
+                duplicate = self.by_content.get(entry.content)
+                if duplicate is None and nearest[i] is not None:
+                    duplicate = self.by_id.get(nearest[i])
+                if duplicate is None and added:
+                    # Not indexed yet: compare against earlier entries of this batch
+                    sims = np.where(is_added[:i], batch_sims[i, :i], -np.inf)
+                    best = int(np.argmax(sims))
+                    if sims[best] >= self.DUPLICATE_THRESHOLD:
+                        duplicate = added[best]
+
+                if duplicate is not None:
+                    # Update existing
+                    duplicate.last_accessed = datetime.datetime.now().isoformat()
+                    duplicate.confidence = min(1.0, duplicate.confidence + 0.1) # Reinforce
+                    changed[duplicate.id] = duplicate
+                    stored.append(duplicate)
+                    continue
+
+                self.entries.append(entry)
+                self.by_id[entry.id] = entry
+                self.by_content[entry.content] = entry
+                self._index_keywords(entry)
+                changed[entry.id] = entry
+                added[i] = entry
+                is_added[i] = True
+                stored.append(entry)
+
+            if vectors is not None and added:
+                new = list(added.values())
+                self.vectors.upsert_many([e.id for e in new], [e.content for e in new], vectors[is_added])
+            self._save(*changed.values())
+            return stored
+
+    # ===== Reads =====
+
+    def search(self, query: str, threshold=0.0, top_k: int = 5) -> List[MemoryEntry]:
+        return [entry for entry, _ in self.search_with_scores(query, threshold, top_k)]
+
+    def search_with_scores(self, query: str, threshold=0.0, top_k: int = 5) -> List[Tuple[MemoryEntry, float]]:
+        """
+        Cosine top-k over the vector index when available, otherwise the
+        fraction of query keywords an entry contains. Scores below
+        `threshold` are dropped.
+        """
+        with self._lock:
+            if self._ensure_vectors():
+                hits = self.vectors.search(self._encode([query])[0], top_k=top_k, threshold=threshold)
+                return [(self.by_id[doc_id], score) for doc_id, _, score in hits if doc_id in self.by_id]
+            return self._keyword_search(query, threshold, top_k)
+
+    def _keyword_search(self, query: str, threshold, top_k) -> List[Tuple[MemoryEntry, float]]:
+        words = [w for w in dict.fromkeys(_tokenize(query)) if w not in self.STOPWORDS]
+        if not words:
+            return []
+        counts: Dict[str, int] = defaultdict(int)
+        for w in words:
+            for entry_id in self.keyword_index.get(w, ()):
+                counts[entry_id] += 1
+
         results = []
-        query_words = query.lower().split()
-        for entry in self.entries:
-            score = 0
-            content_lower = entry.content.lower()
-            for w in query_words:
-                if w in content_lower:
-                    score += 1
-            if score > 0:
-                results.append((score, entry))
-        
-        results.sort(key=lambda x: x[0], reverse=True)
-        return [r[1] for r in results]
+        for entry_id, count in counts.items():
+            score = count / len(words)
+            if score > 0 and score >= threshold:
+                results.append((self.by_id[entry_id], score))
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results[:top_k]
 
     def params(self):
-        return {"count": len(self.entries)}
+        return {"count": len(self.entries), "indexed": len(self.vectors) if self.vectors else 0}
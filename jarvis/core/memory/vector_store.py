@@ -0,0 +1,398 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .journal import MemoryJournal
+
+
+class VectorStore:
+    """
+    On-disk embedding index: a memory-mapped matrix (one row per document)
+    plus an id table journaled with MemoryJournal.
+
+    Rows are updated in place, deletions free the row for reuse, and the
+    matrix grows by doubling. search() scores the used rows with one
+    matrix-vector product and selects the top-k with np.argpartition.
+
+    Large stores can additionally be partitioned (spherical k-means over the
+    rows, IVF style). search() then only scores the rows of the `nprobe`
+    partitions closest to the query.
+    """
+    def __init__(self, base_path: str, dim: int, dtype=np.float32, model_name: str = "",
+                 initial_capacity: int = 256, partition_min_size: Optional[int] = None, nprobe: int = 16):
+        self.base_path = base_path
+        self.matrix_path = base_path + ".npy"
+        self.centroids_path = base_path + ".centroids.npy"
+        self.assign_path = base_path + ".assign.npy"
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.model_name = model_name
+        self.initial_capacity = initial_capacity
+        self.partition_min_size = partition_min_size  # None disables partitioning
+        self.nprobe = nprobe
+
+        self._lock = threading.RLock()
+        self.table = MemoryJournal(base_path + ".json", indent=None)
+
+        self.row_of: Dict[str, int] = {}   # doc id -> row
+        self.doc_of: Dict[int, str] = {}   # row -> doc id
+        self.text_of: Dict[str, str] = {}  # doc id -> indexed text
+        self.free_rows: List[int] = []
+        self.matrix = None
+        self.live = None  # Boolean mask of occupied rows
+        self.high_water = 0  # One past the highest row ever used; search() scores [:high_water]
+
+        # Partition index (optional)
+        self.centroids = None
+        self.assign = None  # row -> partition, -1 for free rows
+        self.partitioned_size = 0
+        self._partitioner = None
+        self._load()
+
+    # ===== Persistence =====
+
+    def _load(self):
+        state = None
+        try:
+            state = self.table.load()
+        except Exception as e:
+            print(f"VectorStore: Failed to read id table: {e}")
+
+        meta = (state or {}).get("meta", {})
+        compatible = (
+            state is not None and os.path.exists(self.matrix_path)
+            and meta.get("dim") == self.dim and meta.get("dtype") == self.dtype.name
+            and meta.get("model") == self.model_name
+        )
+        if compatible:
+            try:
+                self.matrix = np.load(self.matrix_path, mmap_mode='r+')
+                compatible = self.matrix.shape[1] == self.dim and self.matrix.dtype == self.dtype
+            except Exception as e:
+                print(f"VectorStore: Failed to map {self.matrix_path}: {e}")
+                compatible = False
+
+        if not compatible:
+            self.reset()
+            return
+
+        self.live = np.zeros(self.matrix.shape[0], dtype=bool)
+        for row_key, (doc_id, text) in state.get("rows", {}).items():
+            row = int(row_key)
+            if row >= self.matrix.shape[0]:
+                continue
+            self.row_of[doc_id] = row
+            self.doc_of[row] = doc_id
+            self.text_of[doc_id] = text
+            self.live[row] = True
+        self.free_rows = [r for r in range(self.matrix.shape[0] - 1, -1, -1) if not self.live[r]]
+        self.high_water = max(self.doc_of, default=-1) + 1
+        self._load_partitions(meta.get("partitioned_size", 0))
+
+    def _load_partitions(self, partitioned_size):
+        if not partitioned_size or not os.path.exists(self.centroids_path) or not os.path.exists(self.assign_path):
+            return
+        try:
+            centroids = np.load(self.centroids_path)
+            assign = np.load(self.assign_path, mmap_mode='r+')
+        except Exception as e:
+            print(f"VectorStore: Failed to load partitions: {e}")
+            return
+        if centroids.shape[1] != self.dim or assign.shape[0] != self.matrix.shape[0]:
+            return
+        self.centroids = centroids
+        self.assign = assign
+        self.partitioned_size = partitioned_size
+
+    def _drop_partitions(self):
+        self.centroids = None
+        self.assign = None
+        self.partitioned_size = 0
+        for path in (self.centroids_path, self.assign_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def reset(self):
+        """Drop every vector and start a fresh, empty store"""
+        with self._lock:
+            self.row_of.clear()
+            self.doc_of.clear()
+            self.text_of.clear()
+            self.high_water = 0
+            self._drop_partitions()
+            self._allocate(self.initial_capacity)
+            self.table.checkpoint({"meta": self._meta(), "rows": {}})
+
+    def _meta(self):
+        return {"dim": self.dim, "dtype": self.dtype.name, "model": self.model_name,
+                "partitioned_size": self.partitioned_size}
+
+    @staticmethod
+    def _write_grown(path, old, shape, dtype, fill):
+        """Write a larger copy of the .npy memmap at `path` next to it, keeping old rows; returns its path"""
+        tmp_path = path + ".tmp"
+        new = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=shape)
+        new[:] = fill
+        if old is not None:
+            rows = min(old.shape[0], shape[0])
+            new[:rows] = old[:rows]
+        new.flush()
+        del new
+        return tmp_path
+
+    @staticmethod
+    def _swap_in(tmp_path, path):
+        """Move a file written by _write_grown over `path` and map it.
+        Every mapping of `path` must already be released (required on Windows)."""
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode='r+')
+
+    def _allocate(self, capacity: int):
+        """(Re)create the matrix file with `capacity` rows, keeping existing rows"""
+        directory = os.path.dirname(self.matrix_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        old, self.matrix = self.matrix, None
+        tmp_path = self._write_grown(self.matrix_path, old if self.row_of else None,
+                                     (capacity, self.dim), self.dtype, 0)
+        # Drop the last reference to the old mapping before its file is replaced
+        old = None
+        self.matrix = self._swap_in(tmp_path, self.matrix_path)
+        if self.assign is not None:
+            old, self.assign = self.assign, None
+            tmp_path = self._write_grown(self.assign_path, old, (capacity,), np.int32, -1)
+            old = None
+            self.assign = self._swap_in(tmp_path, self.assign_path)
+
+        live = np.zeros(capacity, dtype=bool)
+        for row in self.doc_of:
+            live[row] = True
+        self.live = live
+        self.free_rows = [r for r in range(capacity - 1, -1, -1) if not live[r]]
+
+    def flush(self):
+        with self._lock:
+            if self.matrix is not None:
+                self.matrix.flush()
+            if self.assign is not None:
+                self.assign.flush()
+
+    def close(self):
+        if self._partitioner is not None:
+            self._partitioner.join()
+        self.flush()
+        self.table.close()
+
+    # ===== Mutation =====
+
+    def upsert(self, doc_id: str, text: str, vector):
+        self.upsert_many([doc_id], [text], np.asarray(vector).reshape(1, -1))
+
+    def upsert_many(self, doc_ids: List[str], texts: List[str], vectors):
+        """Insert or overwrite rows for the given documents"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            new_ids = [d for d in dict.fromkeys(doc_ids) if d not in self.row_of]
+            if len(new_ids) > len(self.free_rows):
+                capacity = self.matrix.shape[0]
+                while capacity - len(self.row_of) < len(new_ids):
+                    capacity *= 2
+                self._allocate(capacity)
+
+            records = []
+            rows = []
+            for doc_id, text, vector in zip(doc_ids, texts, vectors):
+                row = self.row_of.get(doc_id)
+                if row is None:
+                    row = self.free_rows.pop()  # Lowest free row keeps the matrix dense
+                    self.row_of[doc_id] = row
+                    self.doc_of[row] = doc_id
+                    self.live[row] = True
+                    self.high_water = max(self.high_water, row + 1)
+                self.matrix[row] = vector
+                self.text_of[doc_id] = text
+                rows.append(row)
+                records.append(("put", ["rows", str(row)], [doc_id, text], None))
+            if self.centroids is not None and rows:
+                self.assign[rows] = np.argmax(vectors[:len(rows)] @ self.centroids.T, axis=1)
+            self.table.append_many(records)
+            self.matrix.flush()
+
+        self._maybe_partition()
+
+    def delete(self, doc_id: str) -> bool:
+        with self._lock:
+            row = self.row_of.pop(doc_id, None)
+            if row is None:
+                return False
+            del self.doc_of[row]
+            self.text_of.pop(doc_id, None)
+            self.live[row] = False
+            self.matrix[row] = 0
+            if self.assign is not None:
+                self.assign[row] = -1
+            self.free_rows.append(row)
+            self.table.append("del", ["rows", str(row)])
+            return True
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every document whose id starts with `prefix`"""
+        with self._lock:
+            doomed = [d for d in self.row_of if d.startswith(prefix)]
+            for doc_id in doomed:
+                self.delete(doc_id)
+            return len(doomed)
+
+    # ===== Partitioning =====
+
+    def _maybe_partition(self):
+        """Rebuild partitions in the background once the store has grown enough"""
+        if self.partition_min_size is None or len(self.row_of) < self.partition_min_size:
+            return
+        if self.partitioned_size and len(self.row_of) < 2 * self.partitioned_size:
+            return
+        if self._partitioner is not None and self._partitioner.is_alive():
+            return
+        self._partitioner = threading.Thread(target=self.build_partitions, daemon=True)
+        self._partitioner.start()
+
+    def build_partitions(self, n_lists: Optional[int] = None, iterations: int = 8, sample_size: int = 20000):
+        """Cluster the rows with spherical k-means and assign every row to a partition"""
+        with self._lock:
+            rows = np.flatnonzero(self.live[:self.high_water])
+            if len(rows) == 0:
+                return
+            rng = np.random.default_rng(0)
+            sample = np.sort(rng.choice(rows, min(sample_size, len(rows)), replace=False))
+            data = np.asarray(self.matrix[sample], dtype=np.float32)
+            capacity = self.matrix.shape[0]
+            size = len(rows)
+
+        n_lists = n_lists or max(1, int(np.sqrt(size)))
+        n_lists = min(n_lists, len(data))
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            order = np.argsort(labels, kind='stable')
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.add.reduceat(data[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids[present] = sums / np.maximum(norms, 1e-9)
+
+        with self._lock:
+            assign = np.full(self.matrix.shape[0], -1, dtype=np.int32)
+            n = self.high_water
+            for start in range(0, n, 8192):
+                stop = min(n, start + 8192)
+                block = np.asarray(self.matrix[start:stop], dtype=np.float32)
+                assign[start:stop] = np.argmax(block @ centroids.T, axis=1)
+            assign[:n][~self.live[:n]] = -1
+
+            np.save(self.centroids_path, centroids)
+            self.assign = None
+            tmp_path = self._write_grown(self.assign_path, assign, (self.matrix.shape[0],), np.int32, -1)
+            self.assign = self._swap_in(tmp_path, self.assign_path)
+            self.centroids = centroids
+            self.partitioned_size = len(self.row_of)
+            self.table.append("put", ["meta", "partitioned_size"], self.partitioned_size)
+        print(f"VectorStore: Partitioned {size} rows into {n_lists} lists (capacity {capacity}).")
+
+    # ===== Query =====
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.row_of
+
+    def documents(self) -> Dict[str, str]:
+        """Snapshot of doc id -> indexed text"""
+        with self._lock:
+            return dict(self.text_of)
+
+    def _candidate_rows(self, query):
+        """Rows to score: the nprobe nearest partitions, or everything"""
+        n = self.high_water
+        if self.centroids is None or self.nprobe >= len(self.centroids):
+            rows = None
+        else:
+            centroid_scores = self.centroids @ query
+            probe = np.argpartition(-centroid_scores, self.nprobe - 1)[:self.nprobe]
+            rows = np.flatnonzero(np.isin(self.assign[:n], probe))
+        return rows
+
+    def search(self, query_vector, top_k: int = 3, threshold: Optional[float] = None) -> List[Tuple[str, str, float]]:
+        """Return [(doc_id, text, score)] for the best `top_k` live rows"""
+        query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if not self.row_of:
+                return []
+            n = self.high_water
+            rows = self._candidate_rows(query)
+            if rows is None:
+                scores = np.asarray(self.matrix[:n] @ query.astype(self.dtype, copy=False), dtype=np.float32)
+                scores[~self.live[:n]] = -np.inf
+                rows = np.arange(n)
+            else:
+                scores = np.asarray(self.matrix[rows] @ query.astype(self.dtype, copy=False), dtype=np.float32)
+
+            k = min(top_k, len(scores))
+            if k == 0:
+                return []
+            if k < len(scores):
+                best = np.argpartition(-scores, k - 1)[:k]
+            else:
+                best = np.arange(len(scores))
+            best = best[np.argsort(-scores[best])]
+
+            results = []
+            for i in best:
+                score = float(scores[i])
+                if not np.isfinite(score) or (threshold is not None and score < threshold):
+                    continue
+                doc_id = self.doc_of[int(rows[i])]
+                results.append((doc_id, self.text_of[doc_id], score))
+            return results
+
+    def nearest_many(self, query_vectors, threshold: Optional[float] = None, block: int = 512) -> List[Optional[str]]:
+        """Best doc id per query row (None below `threshold`), scored a block of queries at a time"""
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        with self._lock:
+            if not self.row_of:
+                return [None] * len(queries)
+            n = self.high_water
+            best_score = np.full(len(queries), -np.inf, dtype=np.float32)
+            best_row = np.zeros(len(queries), dtype=np.int64)
+            cast = queries.astype(self.dtype, copy=False)
+
+            if self.centroids is None or self.nprobe >= len(self.centroids):
+                dead = ~self.live[:n]
+                for start in range(0, len(queries), block):
+                    scores = np.asarray(cast[start:start + block] @ self.matrix[:n].T, dtype=np.float32)
+                    scores[:, dead] = -np.inf
+                    top = np.argmax(scores, axis=1)
+                    best_row[start:start + block] = top
+                    best_score[start:start + block] = scores[np.arange(len(top)), top]
+            else:
+                # Score each probed partition once against all queries probing it
+                probes = np.argpartition(-(queries @ self.centroids.T), self.nprobe - 1, axis=1)[:, :self.nprobe]
+                assign = np.asarray(self.assign[:n])
+                order = np.argsort(assign, kind="stable")
+                bounds = np.searchsorted(assign[order], np.arange(len(self.centroids) + 1))
+                for p in np.unique(probes):
+                    rows = order[bounds[p]:bounds[p + 1]]
+                    if not len(rows):
+                        continue
+                    q = np.flatnonzero((probes == p).any(axis=1))
+                    scores = np.asarray(cast[q] @ self.matrix[rows].T, dtype=np.float32)
+                    top = np.argmax(scores, axis=1)
+                    top_scores = scores[np.arange(len(top)), top]
+                    better = top_scores > best_score[q]
+                    best_score[q[better]] = top_scores[better]
+                    best_row[q[better]] = rows[top[better]]
+
+            results = []
+            for row, score in zip(best_row, best_score):
+                ok = np.isfinite(score) and (threshold is None or score >= threshold)
+                results.append(self.doc_of[int(row)] if ok else None)
+            return results
@@ -2,6 +2,7 @@ import json
 import re
 from typing import Optional, Dict, Any, List
 from .intents import Intent, IntentType
+from .rule_dispatcher import RuleDispatcher
 
 class NLUEngine:
     """
@@ -247,6 +248,9 @@ class NLUEngine:
             (r"(?:turn\s+)?(?:on|off|enable|disable)\s+hotspot", IntentType.SYSTEM_HOTSPOT, lambda m: {"state": "on" if "on" in m.group(0) or "enable" in m.group(0) else "off"}),
         ]
 
+        # Compile once and index rules by trigger words
+        self.dispatcher = RuleDispatcher(self.rules)
+
     def parse(self, text: str, context: Optional[str] = None) -> Intent:
         text = text.strip()
         
@@ -267,26 +271,31 @@ class NLUEngine:
         )
 
     def _check_rules(self, text: str) -> Optional[Intent]:
-        text_lower = text.lower()
-        for pattern, intent_type, slot_extractor in self.rules:
-            # Use search instead of match to handle prefixes like "can you", "jarvis", "please"
-            match = re.search(pattern, text_lower)
-            if match:
-                slots = slot_extractor(match)
-                
-                # Default dangerous check
-                requires_conf = False
-                if intent_type in [IntentType.FILE_DELETE]:
-                    requires_conf = True
-                
-                return Intent(
-                    intent_type=intent_type,
-                    confidence=1.0,
-                    slots=slots,
-                    requires_confirmation=requires_conf,
-                    original_text=text
-                )
-        return None
+        # Uses search instead of match to handle prefixes like "can you", "jarvis", "please"
+        result = self.dispatcher.match(text.lower())
+        if result is None:
+            return None
+
+        rule_id, match = result
+        _, intent_type, slot_extractor = self.rules[rule_id]
+        slots = slot_extractor(match)
+
+        # Default dangerous check
+        requires_conf = False
+        if intent_type in [IntentType.FILE_DELETE]:
+            requires_conf = True
+
+        return Intent(
+            intent_type=intent_type,
+            confidence=1.0,
+            slots=slots,
+            requires_confirmation=requires_conf,
+            original_text=text
+        )
+
+    def rule_stats(self) -> List[Dict[str, Any]]:
+        """Per-rule hit counters and regex timing"""
+        return self.dispatcher.stats()
 
     def _query_llm(self, text: str, context: Optional[str]) -> Intent:
         system_prompt = (
@@ -20,6 +20,7 @@ class IntentClassifier:
     def __init__(self):
         self.context = get_context_manager()
         self.nlu_engine = NLUEngine()  # Core slot extraction engine
+        self._prefetched = None  # (text, Intent) parsed ahead of the final transcript
         
     def classify(self, text: str) -> Dict[str, Any]:
         """
@@ -34,7 +35,12 @@ class IntentClassifier:
         # ---------------------------------------------------------
         # STEP 1: Get base classification from NLUEngine (regex + LLM)
         # ---------------------------------------------------------
-        intent = self.nlu_engine.parse(text)
+        prefetched = self._prefetched
+        if prefetched and prefetched[0] == text.strip():
+            self._prefetched = None
+            intent = prefetched[1]
+        else:
+            intent = self.nlu_engine.parse(text)
         result = intent.to_dict()
         
         # ---------------------------------------------------------
@@ -49,6 +55,14 @@ class IntentClassifier:
         
         return result
     
+    def prefetch(self, text: str):
+        """
+        Parse a stable transcript prefix ahead of time. classify() reuses it
+        when the final transcript turns out to be the same text; context
+        overrides are still applied at classify() time.
+        """
+        self._prefetched = (text.strip(), self.nlu_engine.parse(text))
+    
     def _apply_context_overrides(self, result: Dict[str, Any], text_lower: str) -> Dict[str, Any]:
         """
         Apply context-aware intelligence on top of base classification.
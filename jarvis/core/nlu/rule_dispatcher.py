@@ -0,0 +1,155 @@
+import re
+import time
+from typing import Optional, List, Dict, Any, FrozenSet, Iterable, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+def _best(candidates: Iterable[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """Most selective trigger set: longest shortest-string, then fewest strings"""
+    return max(candidates, key=lambda s: (min(map(len, s)), -len(s)), default=None)
+
+def _literal_sets(items):
+    """Yield trigger sets for a parsed sequence; any match contains a string of each set"""
+    run = ""
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run += chr(av)
+            continue
+        if run:
+            yield frozenset([run])
+            run = ""
+
+        found = None
+        if op is sre_parse.SUBPATTERN:
+            found = _best(_literal_sets(av[-1]))
+        elif op is sre_parse.BRANCH:
+            alternatives = [_best(_literal_sets(alt)) for alt in av[1]]
+            if all(alternatives):
+                found = frozenset().union(*alternatives)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            found = _best(_literal_sets(av[2]))
+        if found:
+            yield found
+    if run:
+        yield frozenset([run])
+
+def required_literals(pattern: str) -> Optional[FrozenSet[str]]:
+    """
+    Literal strings of which every match of `pattern` contains at least one.
+    None when no such set can be derived (the rule must always be tried).
+    """
+    try:
+        literals = _best(_literal_sets(sre_parse.parse(pattern)))
+    except Exception:
+        return None
+    if not literals:
+        return None
+    # "wi" already covers "wifi" and "wireless"
+    return frozenset(s for s in literals if not any(o != s and o in s for o in literals))
+
+class TriggerIndex:
+    """Aho-Corasick automaton: one scan of the text finds every rule whose trigger occurs"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[FrozenSet[int]] = [frozenset()]
+
+    def add(self, word: str, rule_id: int):
+        state = 0
+        for ch in word:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(frozenset())
+            state = nxt
+        self.out[state] = self.out[state] | {rule_id}
+
+    def build(self):
+        """Compute failure links (BFS) and fold suffix outputs into each state"""
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] | self.out[self.fail[nxt]]
+                queue.append(nxt)
+
+    def scan(self, text: str) -> set:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        found = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+class RuleDispatcher:
+    """
+    Precompiled (pattern, IntentType, extractor) rules.
+
+    A trigger index prefilters the rules whose anchor words occur in the
+    text; the survivors are tried in their original order, so the first
+    rule that matches still wins exactly as with a plain loop.
+    """
+
+    def __init__(self, rules: List[tuple]):
+        self.rules = rules
+        self.compiled = [re.compile(pattern) for pattern, _, _ in rules]
+        self.index = TriggerIndex()
+        self.always: List[int] = []  # Rules without a derivable trigger
+        for rule_id, (pattern, _, _) in enumerate(rules):
+            literals = required_literals(pattern)
+            if literals is None:
+                self.always.append(rule_id)
+                continue
+            for literal in literals:
+                self.index.add(literal, rule_id)
+        self.index.build()
+
+        self.hits = [0] * len(rules)
+        self.evaluations = [0] * len(rules)
+        self.seconds = [0.0] * len(rules)
+
+    def match(self, text: str) -> Optional[Tuple[int, re.Match]]:
+        """(rule_id, match) of the first matching rule, or None"""
+        candidates = self.index.scan(text)
+        candidates.update(self.always)
+        for rule_id in sorted(candidates):
+            start = time.perf_counter()
+            match = self.compiled[rule_id].search(text)
+            self.seconds[rule_id] += time.perf_counter() - start
+            self.evaluations[rule_id] += 1
+            if match:
+                self.hits[rule_id] += 1
+                return rule_id, match
+        return None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-rule hit/evaluation counters and mean regex time"""
+        return [
+            {
+                "rule": rule_id,
+                "pattern": pattern,
+                "intent": intent_type.name,
+                "hits": self.hits[rule_id],
+                "evaluations": self.evaluations[rule_id],
+                "avg_us": self.seconds[rule_id] / self.evaluations[rule_id] * 1e6 if self.evaluations[rule_id] else 0.0,
+            }
+            for rule_id, (pattern, intent_type, _) in enumerate(self.rules)
+        ]
+
+    def reset_stats(self):
+        n = len(self.rules)
+        self.hits, self.evaluations, self.seconds = [0] * n, [0] * n, [0.0] * n
@@ -1,47 +1,148 @@
 import requests
 import json
 import time
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
 
 class OllamaBrain:
     """Interface to local Ollama LLM for reasoning and chat."""
-    
+
     def __init__(self, model="gemma3:1b", base_url="http://localhost:11434"):
         self.model = model
         self.base_url = base_url
         self.generate_url = f"{base_url}/api/generate"
+
+        # Pooled keep-alive connections instead of a new TCP connection per call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Barge-in: cancel() bumps the generation and closes in-flight responses
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._active = set()
+
+        # Metrics of the most recent generation (ttft, tokens, tokens_per_sec, ...)
+        self.last_metrics = {}
         print(f"OllamaBrain initialized with model: {self.model}")
 
-    def chat_with_context(self, user_input, context, system_instruction=None):
-        """
-        Send a message to Ollama using generate endpoint for maximum compatibility.
-        """
+    def _build_prompt(self, user_input, context, system_instruction=None):
         prompt = ""
         if system_instruction:
             prompt += f"System: {system_instruction}\n"
         if context:
             prompt += f"Context: {context}\n"
         prompt += f"User: {user_input}\nAssistant:"
+        return prompt
 
-        print(f"DEBUG: Calling Ollama Generate ({self.generate_url}) for model: {self.model}...")
-        
+    def stream_generate(self, payload, timeout=90):
+        """
+        POST `payload` with "stream": true and yield response tokens as they arrive.
+        Stops early (without raising) when cancel() is called.
+        Network errors propagate as requests exceptions.
+        """
+        payload = dict(payload, model=payload.get("model", self.model), stream=True)
+        with self._lock:
+            generation = self._generation
+
+        metrics = {"ttft": None, "tokens": 0, "tokens_per_sec": 0.0, "duration": 0.0, "cancelled": False}
+        self.last_metrics = metrics
+        start_time = time.perf_counter()
+        response = self.session.post(self.generate_url, json=payload, stream=True, timeout=(5, timeout))
+        with self._lock:
+            self._active.add(response)
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if generation != self._generation:
+                    break
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+
+                token = chunk.get("response", "")
+                if token:
+                    if metrics["ttft"] is None:
+                        metrics["ttft"] = time.perf_counter() - start_time
+                    metrics["tokens"] += 1
+                    yield token
+
+                # Ollama reports exact counts on the final chunk; keep reading to the
+                # end of the body so the connection goes back to the pool
+                if chunk.get("done") and chunk.get("eval_count") and chunk.get("eval_duration"):
+                    metrics["tokens"] = chunk["eval_count"]
+                    metrics["tokens_per_sec"] = chunk["eval_count"] / (chunk["eval_duration"] / 1e9)
+        except requests.exceptions.ConnectionError as e:
+            # Reading from a response closed by cancel() fails; that is not an error
+            if generation != self._generation:
+                return
+            # A stalled stream surfaces as ConnectionError(ReadTimeoutError)
+            if e.args and isinstance(e.args[0], ReadTimeoutError):
+                raise requests.exceptions.ReadTimeout(e) from e
+            raise
+        except Exception:
+            if generation == self._generation:
+                raise
+        finally:
+            with self._lock:
+                self._active.discard(response)
+            response.close()
+
+            metrics["cancelled"] = generation != self._generation
+            metrics["duration"] = time.perf_counter() - start_time
+            if not metrics["tokens_per_sec"] and metrics["ttft"] is not None:
+                streaming_time = metrics["duration"] - metrics["ttft"]
+                if streaming_time > 0:
+                    metrics["tokens_per_sec"] = metrics["tokens"] / streaming_time
+            ttft = f"{metrics['ttft']:.2f}s" if metrics["ttft"] is not None else "n/a"
+            print(f"DEBUG: Ollama stream: TTFT {ttft}, {metrics['tokens']} tokens, "
+                  f"{metrics['tokens_per_sec']:.1f} tok/s{' (cancelled)' if metrics['cancelled'] else ''}")
+
+    def stream_chat(self, user_input, context, system_instruction=None):
+        """Streaming chat_with_context(): yields tokens as Ollama produces them."""
         payload = {
             "model": self.model,
-            "prompt": prompt,
-            "stream": False,
+            "prompt": self._build_prompt(user_input, context, system_instruction),
             "options": {
                 "temperature": 0.7,
                 "repeat_penalty": 1.1,
                 "num_predict": 256
             }
         }
-        
+        return self.stream_generate(payload, timeout=90)
+
+    def cancel(self):
+        """Abort every in-flight generation (e.g. when the user barges in)."""
+        with self._lock:
+            self._generation += 1
+            active = list(self._active)
+        for response in active:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def chat_with_context(self, user_input, context, system_instruction=None, on_token=None):
+        """
+        Send a message to Ollama using generate endpoint for maximum compatibility.
+        `on_token` (optional) receives each token as it streams in.
+        """
+        print(f"DEBUG: Calling Ollama Generate ({self.generate_url}) for model: {self.model}...")
+
         try:
-            start_time = time.time()
-            response = requests.post(self.generate_url, json=payload, timeout=90)
-            print(f"DEBUG: Ollama responded in {time.time() - start_time:.2f}s with status {response.status_code}")
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "Error: No response content from Ollama.")
+            tokens = []
+            for token in self.stream_chat(user_input, context, system_instruction):
+                tokens.append(token)
+                if on_token:
+                    on_token(token)
+            text = "".join(tokens)
+            if self.last_metrics.get("cancelled"):
+                return ""
+            return text or "Error: No response content from Ollama."
         except requests.exceptions.ConnectionError:
             print("ERROR: Ollama connection failed. Is the server running?")
             return "ERROR_CONNECTION"
@@ -54,24 +155,20 @@ class OllamaBrain:
 
     def generate_response(self, prompt, system=None):
         """Simple generation without history."""
-        url = f"{self.base_url}/api/generate"
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "system": system,
-            "stream": False
+            "system": system
         }
         try:
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            return response.json().get("response", "")
+            return "".join(self.stream_generate(payload, timeout=30))
         except Exception as e:
             return f"Ollama Gen Error: {str(e)}"
 
     def check_health(self):
         """Verify Ollama is reachable."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -3,7 +3,7 @@ import inspect
 import datetime
 import atexit
 from .brain import Brain
-from .enhanced_memory import EnhancedMemory
+from .enhanced_memory import get_memory
 
 # Import all action modules
 from actions import (
@@ -14,7 +14,7 @@ from actions import (
 
 class Router:
     def __init__(self):
-        self.memory = EnhancedMemory() # Keep for legacy, but transition to Manager
+        self.memory = get_memory() # Process-wide instance shared with action modules
         from .memory.manager import MemoryManager
         self.memory_manager = MemoryManager()
         
@@ -307,7 +307,11 @@ class Router:
         return media_actions.play_music()
 
 
-    def route(self, text):
+    def route(self, text, on_partial=None):
+        """
+        Handle one user utterance and return the response dict.
+        `on_partial` (optional) receives conversational reply text as the LLM streams it.
+        """
         print(f"User Input: {text}")
 
         # Update personality profile based on recent interactions
@@ -363,7 +367,7 @@ class Router:
         # 3. Execution Logic
         if intent_type in ["CHAT", "CONVERSATION", "UNKNOWN"]:
             # Fallback to LLM (Brain) for conversational responses
-            llm_response = self.brain.think(text, self.memory.short_term, self.memory.long_term)
+            llm_response = self.brain.think(text, self.memory.short_term, self.memory.long_term, on_partial=on_partial)
             try:
                 clean = llm_response.replace("```json", "").replace("```", "").strip()
                 if clean.startswith("{"):
@@ -487,6 +491,17 @@ class Router:
         main_action = actions_to_run[0].get("action") if actions_to_run else None
         return {"text": final_text, "action": main_action}
 
+    def prefetch_intent(self, text):
+        """Classify a stable transcript prefix while the user is still speaking."""
+        from .nlu.intent_classifier import get_classifier
+        get_classifier().prefetch(text)
+
+    def cancel_generation(self):
+        """Abort a streaming LLM reply (barge-in)."""
+        local_brain = getattr(self.brain, "local_brain", None)
+        if local_brain is not None:
+            local_brain.ollama.cancel()
+
     def _handle_intent_object(self, intent_data):
         intent_type = intent_data.get("intent")
         slots = intent_data.get("slots", {})
@@ -1,131 +1,306 @@
 """
-Emotion Detector - Facial emotion recognition using DeepFace
+Emotion Detector - Facial emotion recognition on face crops
 Detects emotions: happy, sad, angry, neutral, surprise, fear, disgust
+Faces come from the face pipeline; all crops of a frame go through each
+requested head in one batch. Emotion runs on a small FER+ ONNX model when
+onnxruntime is available (no TensorFlow), DeepFace's heads otherwise;
+age and gender are DeepFace heads loaded only when asked for.
 """
 
+import os
+import time
+import threading
+
 import cv2
 import numpy as np
 
+from .frame_bundle import as_bundle
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
 try:
     from deepface import DeepFace
     DEEPFACE_AVAILABLE = True
 except ImportError:
     DEEPFACE_AVAILABLE = False
-    print("[EmotionDetector] Warning: deepface not installed. Emotion detection disabled.")
+
+if not (ONNX_AVAILABLE or DEEPFACE_AVAILABLE):
+    print("[EmotionDetector] Warning: neither onnxruntime nor deepface installed. Emotion detection disabled.")
+
+FERPLUS_URL = "https://github.com/onnx/models/raw/main/validated/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx"
+# FER+ classes, named as DeepFace names them
+FERPLUS_LABELS = ['neutral', 'happy', 'surprise', 'sad', 'angry', 'disgust', 'fear', 'contempt']
+DEEPFACE_EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+ACTIONS = ('emotion', 'age', 'gender')
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(logits)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _emotion_fields(probs, labels):
+    """DeepFace-style emotion fields for one face (scores in percent)"""
+    scores = {label: float(p) * 100 for label, p in zip(labels, probs)}
+    best = int(np.argmax(probs))
+    return {'emotion': labels[best], 'confidence': float(probs[best]), 'all_emotions': scores}
+
+
+class OnnxEmotionHead:
+    """FER+ (64x64 grayscale) through onnxruntime"""
+
+    action = 'emotion'
+    name = 'ferplus-onnx'
+
+    def __init__(self, model_path):
+        if not os.path.exists(model_path):
+            self._download(model_path)
+        self.session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # The zoo export has a fixed batch of 1; a re-exported dynamic model takes the whole batch
+        self.fixed_batch = model_input.shape[0] == 1
+
+    @staticmethod
+    def _download(model_path):
+        import requests
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        print(f"[EmotionDetector] Downloading FER+ model to {model_path}...")
+        response = requests.get(FERPLUS_URL, timeout=60)
+        response.raise_for_status()
+        with open(model_path, 'wb') as f:
+            f.write(response.content)
+
+    def predict(self, crops):
+        batch = np.stack([
+            cv2.resize(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY), (64, 64), interpolation=cv2.INTER_AREA)
+            for crop in crops
+        ]).astype(np.float32)[:, None]
+        if self.fixed_batch:
+            logits = np.concatenate([self.session.run(None, {self.input_name: batch[i:i + 1]})[0]
+                                     for i in range(len(batch))])
+        else:
+            logits = self.session.run(None, {self.input_name: batch})[0]
+        probs = _softmax(logits.reshape(len(crops), -1))
+        return [_emotion_fields(p, FERPLUS_LABELS) for p in probs]
+
+
+class DeepFaceHead:
+    """One DeepFace facial-attribute model (Emotion, Age or Gender) run on a batch"""
+
+    MODELS = {'emotion': 'Emotion', 'age': 'Age', 'gender': 'Gender'}
+
+    def __init__(self, action):
+        self.action = action
+        self.name = f"deepface-{action}"
+        client = DeepFace.build_model(model_name=self.MODELS[action], task="facial_attribute")
+        self.model = getattr(client, 'model', client)
+
+    def _run(self, batch):
+        return np.asarray(self.model(batch, training=False))
+
+    def predict(self, crops):
+        if self.action == 'emotion':
+            # 48x48 grayscale in [0, 1], as DeepFace preprocesses it
+            batch = np.stack([
+                cv2.resize(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY), (48, 48), interpolation=cv2.INTER_AREA)
+                for crop in crops
+            ]).astype(np.float32)[..., None] / 255.0
+            return [_emotion_fields(p, DEEPFACE_EMOTIONS) for p in self._run(batch)]
+
+        # Age and gender share the 224x224 BGR input
+        batch = np.stack([cv2.resize(crop, (224, 224), interpolation=cv2.INTER_AREA)
+                          for crop in crops]).astype(np.float32) / 255.0
+        probs = self._run(batch)
+        if self.action == 'age':
+            ages = probs @ np.arange(probs.shape[1])
+            return [{'age': int(round(float(age)))} for age in ages]
+        return [{'gender': 'Woman' if p[0] >= p[1] else 'Man',
+                 'all_genders': {'Woman': float(p[0]) * 100, 'Man': float(p[1]) * 100}} for p in probs]
 
 
 class EmotionDetector:
-    """DeepFace-based emotion recognition"""
-    
-    def __init__(self):
-        """Initialize Emotion Detector"""
-        if not DEEPFACE_AVAILABLE:
-            print("[EmotionDetector] DeepFace not available")
+    """Batched emotion (and optional age/gender) analysis of detected faces"""
+
+    def __init__(self, backend="auto", model_path=None, margin=0.15):
+        """
+        Initialize Emotion Detector
+
+        Args:
+            backend: "onnx", "deepface" or "auto" (ONNX when onnxruntime is installed)
+            model_path: FER+ ONNX file (downloaded to models/emotion/ when missing)
+            margin: Fraction of the face box added on each side of a crop
+        """
+        self.backend = backend
+        self.model_path = model_path or os.path.join(os.getcwd(), 'models', 'emotion', 'emotion-ferplus-8.onnx')
+        self.margin = margin
+        self.heads = {}  # action -> head, loaded on first use
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.faces_analyzed = 0
+        self.inference_s = 0.0
+
+        if not (ONNX_AVAILABLE or DEEPFACE_AVAILABLE):
+            print("[EmotionDetector] No emotion backend available")
             return
-        
+
         print("[EmotionDetector] Initialized (will analyze on request)")
-    
-    def detect_emotion(self, frame):
+
+    def _load_head(self, action):
+        if action == 'emotion' and ONNX_AVAILABLE and self.backend in ("auto", "onnx"):
+            try:
+                return OnnxEmotionHead(self.model_path)
+            except Exception as e:
+                if self.backend == "onnx" or not DEEPFACE_AVAILABLE:
+                    raise
+                print(f"[EmotionDetector] ONNX model unavailable ({e}), using DeepFace")
+        if not DEEPFACE_AVAILABLE:
+            raise RuntimeError(f"No backend for '{action}' (DeepFace not installed)")
+        return DeepFaceHead(action)
+
+    def _head(self, action):
+        head = self.heads.get(action)
+        if head is None:
+            head = self.heads[action] = self._load_head(action)
+            print(f"[EmotionDetector] Loaded {head.name}")
+        return head
+
+    def _crop(self, image, location):
+        top, right, bottom, left = location
+        h, w = image.shape[:2]
+        pad_y = int((bottom - top) * self.margin)
+        pad_x = int((right - left) * self.margin)
+        return image[max(0, top - pad_y):min(h, bottom + pad_y), max(0, left - pad_x):min(w, right + pad_x)]
+
+    def analyze_faces(self, frame, faces=None, actions=('emotion',)):
         """
-        Detect emotion from face in frame
-        
+        Analyze every given face of a frame, one batched inference per head
+
         Args:
-            frame: OpenCV BGR frame
-            
+            frame: OpenCV BGR frame or FrameBundle
+            faces: (top, right, bottom, left) boxes or face-pipeline results
+                   (dicts with 'location'); None = the frame is one face crop
+            actions: Any of 'emotion', 'age', 'gender'
+
         Returns:
-            dict with emotion, confidence, and additional attributes
+            List of dicts (one per usable face) with location, the requested
+            attributes and track_id when the face came from the tracker
         """
-        if not DEEPFACE_AVAILABLE:
+        image = as_bundle(frame).image
+        if faces is None:
+            h, w = image.shape[:2]
+            faces = [(0, w, h, 0)]
+
+        entries, crops = [], []
+        for face in faces:
+            location = tuple(int(v) for v in (face['location'] if isinstance(face, dict) else face))
+            crop = self._crop(image, location)
+            if crop.shape[0] < 8 or crop.shape[1] < 8:
+                continue
+            entry = {'location': location, 'success': True}
+            if isinstance(face, dict) and 'track_id' in face:
+                entry['track_id'] = face['track_id']
+            entries.append(entry)
+            crops.append(crop)
+        if not crops:
+            return []
+
+        with self.lock:
+            start = time.perf_counter()
+            for action in actions:
+                for entry, fields in zip(entries, self._head(action).predict(crops)):
+                    entry.update(fields)
+            self.inference_s += time.perf_counter() - start
+            self.batches += 1
+            self.faces_analyzed += len(crops)
+        return entries
+
+    def detect_emotion(self, frame, faces=None, actions=('emotion',)):
+        """
+        Detect emotion from the faces in a frame
+
+        Args:
+            frame: OpenCV BGR frame or FrameBundle
+            faces: Face boxes or face-pipeline results (None = frame is a face crop)
+            actions: Heads to run; age and gender are loaded on demand
+
+        Returns:
+            dict with emotion and confidence of the largest face, the requested
+            attributes, and 'faces' with the result of every face
+        """
+        if not (ONNX_AVAILABLE or DEEPFACE_AVAILABLE):
             return {
                 'emotion': 'unknown',
                 'confidence': 0.0,
-                'error': 'DeepFace not available'
+                'error': 'No emotion backend available'
             }
-        
+
         try:
-            # DeepFace.analyze requires RGB or BGR, it handles conversion internally
-            # enforce_detection=False allows it to work even if face detection is uncertain
-            analysis = DeepFace.analyze(
-                frame,
-                actions=['emotion', 'age', 'gender'],
-                enforce_detection=False,
-                silent=True
-            )
-            
-            # Handle both single face and multiple faces return format
-            if isinstance(analysis, list):
-                if len(analysis) == 0:
-                    return {
-                        'emotion': 'unknown',
-                        'confidence': 0.0,
-                        'error': 'No face detected'
-                    }
-                analysis = analysis[0]  # Use first face
-            
-            # Get dominant emotion
-            emotion_scores = analysis.get('emotion', {})
-            dominant_emotion = analysis.get('dominant_emotion', 'unknown')
-            
-            # Get confidence for dominant emotion
-            confidence = emotion_scores.get(dominant_emotion, 0.0) / 100.0  # Convert to 0-1
-            
-            # Additional attributes
-            age = analysis.get('age', 'unknown')
-            gender = analysis.get('dominant_gender', 'unknown')
-            
+            results = self.analyze_faces(frame, faces, actions)
+        except Exception as e:
             return {
-                'emotion': dominant_emotion,
-                'confidence': confidence,
-                'all_emotions': emotion_scores,
-                'age': age,
-                'gender': gender,
-                'success': True
+                'emotion': 'unknown',
+                'confidence': 0.0,
+                'error': f'Emotion detection failed: {e}'
             }
-            
-        except Exception as e:
-            # Common errors: no face detected, model loading issues
-            error_msg = str(e)
-            
-            if 'Face could not be detected' in error_msg or 'no face' in error_msg.lower():
-                return {
-                    'emotion': 'unknown',
-                    'confidence': 0.0,
-                    'error': 'No face detected in frame'
-                }
-            
+
+        if not results:
             return {
                 'emotion': 'unknown',
                 'confidence': 0.0,
-                'error': f'Emotion detection failed: {error_msg}'
+                'error': 'No face detected in frame'
+            }
+
+        def area(result):
+            top, right, bottom, left = result['location']
+            return (right - left) * (bottom - top)
+
+        primary = max(results, key=area)
+        return {**primary, 'faces': results}
+
+    def stats(self):
+        """Faces analyzed, batches and mean inference cost per face"""
+        with self.lock:
+            return {
+                'heads': {action: head.name for action, head in self.heads.items()},
+                'batches': self.batches,
+                'faces': self.faces_analyzed,
+                'ms_per_face': self.inference_s * 1000 / max(1, self.faces_analyzed),
             }
-    
+
     def get_emotion_label(self, emotion, confidence):
         """
         Format emotion for user-friendly display
-        
+
         Args:
             emotion: Emotion name
             confidence: Confidence score (0-1)
-            
+
         Returns:
             Formatted string
         """
         confidence_pct = int(confidence * 100)
-        
+
         if confidence < 0.5:
             return f"Possibly {emotion} ({confidence_pct}% confident)"
         elif confidence < 0.7:
             return f"{emotion.capitalize()} ({confidence_pct}% confident)"
         else:
             return f"Clearly {emotion} ({confidence_pct}% confident)"
-    
-    def analyze_multiple_frames(self, frames):
+
+    def analyze_multiple_frames(self, frames, faces=None):
         """
         Analyze emotion across multiple frames for more stable results
-        
+
         Args:
             frames: List of OpenCV BGR frames
-            
+            faces: Face boxes, applied to every frame (None = frames are face crops)
+
         Returns:
             dict with averaged emotion results
         """
@@ -135,38 +310,38 @@ class EmotionDetector:
                 'confidence': 0.0,
                 'error': 'No frames provided'
             }
-        
+
         emotion_counts = {}
         total_confidence = 0.0
         successful_frames = 0
-        
+
         for frame in frames:
-            result = self.detect_emotion(frame)
-            
+            result = self.detect_emotion(frame, faces)
+
             if result.get('success'):
                 emotion = result['emotion']
                 confidence = result['confidence']
-                
+
                 if emotion not in emotion_counts:
                     emotion_counts[emotion] = []
-                
+
                 emotion_counts[emotion].append(confidence)
                 total_confidence += confidence
                 successful_frames += 1
-        
+
         if successful_frames == 0:
             return {
                 'emotion': 'unknown',
                 'confidence': 0.0,
                 'error': 'No successful detections'
             }
-        
+
         # Find most common emotion weighted by confidence
-        dominant_emotion = max(emotion_counts.items(), 
+        dominant_emotion = max(emotion_counts.items(),
                              key=lambda x: sum(x[1]) / len(x[1]))[0]
-        
+
         avg_confidence = sum(emotion_counts[dominant_emotion]) / len(emotion_counts[dominant_emotion])
-        
+
         return {
             'emotion': dominant_emotion,
             'confidence': avg_confidence,
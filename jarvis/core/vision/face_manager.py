@@ -5,21 +5,95 @@ Uses face_recognition library to identify and remember people
 
 import os
 import pickle
+import threading
 import numpy as np
 import cv2
 import face_recognition
 from pathlib import Path
 
+from .face_tracker import FaceTracker, nearest_known
+from .frame_bundle import as_bundle
+
+YUNET_URL = "https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/face_detection_yunet_2023mar.onnx"
+
+
+class FaceDetector:
+    """
+    Fast face boxes on a downscaled frame: OpenCV's YuNet when its model is
+    available, dlib HOG (face_recognition) otherwise. Boxes are returned as
+    (top, right, bottom, left) in full-frame pixels.
+    """
+
+    def __init__(self, detect_width=320, model_path=None, score_threshold=0.7):
+        self.detect_width = detect_width
+        self.model_path = model_path or os.path.join(os.getcwd(), 'models', 'face', 'face_detection_yunet_2023mar.onnx')
+        self.score_threshold = score_threshold
+        self.input_size = None
+        self.yunet = self._load_yunet()
+        self.name = "yunet" if self.yunet is not None else "hog"
+
+    def _load_yunet(self):
+        if not hasattr(cv2, "FaceDetectorYN"):
+            return None
+        if not os.path.exists(self.model_path):
+            self._download()
+        try:
+            return cv2.FaceDetectorYN.create(self.model_path, "", (self.detect_width, self.detect_width),
+                                             self.score_threshold, 0.3, 50)
+        except Exception as e:
+            print(f"[FaceManager] YuNet unavailable ({e}), using HOG detector")
+            return None
+
+    def _download(self):
+        import requests
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        print(f"[FaceManager] Downloading YuNet face detector to {self.model_path}...")
+        try:
+            response = requests.get(YUNET_URL, timeout=30)
+            response.raise_for_status()
+            with open(self.model_path, 'wb') as f:
+                f.write(response.content)
+        except Exception as e:
+            print(f"[FaceManager] Download failed: {e}")
+
+    def detect(self, frame):
+        bundle = as_bundle(frame)
+        h, w = bundle.shape[:2]
+        scale = min(1.0, self.detect_width / w)
+
+        if self.yunet is not None:
+            small = bundle.scaled(scale)
+            size = (small.shape[1], small.shape[0])
+            if size != self.input_size:
+                self.yunet.setInputSize(size)
+                self.input_size = size
+            _, faces = self.yunet.detect(small)
+            boxes = [] if faces is None else [
+                (y, x + bw, y + bh, x) for x, y, bw, bh in faces[:, :4]
+            ]
+        else:
+            boxes = face_recognition.face_locations(bundle.scaled_rgb(scale))
+
+        # Scale back to the full frame and clip
+        locations = []
+        for top, right, bottom, left in boxes:
+            top, right = max(0, int(top / scale)), min(w, int(right / scale))
+            bottom, left = min(h, int(bottom / scale)), max(0, int(left / scale))
+            if right > left and bottom > top:
+                locations.append((top, right, bottom, left))
+        return locations
+
 
 class FaceManager:
     """Manages face recognition with persistent storage"""
     
-    def __init__(self, faces_dir="faces"):
+    def __init__(self, faces_dir="faces", detect_width=320):
         """
         Initialize Face Manager
         
         Args:
             faces_dir: Directory containing face images (relative to project root)
+            detect_width: Frame width the face detector runs at
         """
         # Get project root (3 levels up from core/vision/)
         project_root = Path(__file__).parent.parent.parent.parent
@@ -32,6 +106,15 @@ class FaceManager:
         # Cache for face encodings
         self.known_face_encodings = []
         self.known_face_names = []
+        self.known_matrix = np.zeros((0, 128))  # All encodings as one contiguous array
+        
+        # Detect -> track -> encode only when a track needs it
+        self.detector = FaceDetector(detect_width)
+        self.tracker = FaceTracker()
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.faces_seen = 0
+        self.encodings_run = 0
         
         # Load existing faces
         self._load_faces()
@@ -47,6 +130,7 @@ class FaceManager:
                     data = pickle.load(f)
                     self.known_face_encodings = data['encodings']
                     self.known_face_names = data['names']
+                self._rebuild_matrix()
                 print(f"[FaceManager] Loaded {len(self.known_face_names)} faces from cache")
                 return
             except Exception as e:
@@ -93,8 +177,15 @@ class FaceManager:
         # Save to cache
         self._save_cache()
     
+    def _rebuild_matrix(self):
+        """Refresh the known-encoding matrix and drop identities tracked under the old set"""
+        with self.lock:
+            self.known_matrix = np.array(self.known_face_encodings, dtype=np.float64).reshape(-1, 128)
+            self.tracker.reset()
+    
     def _save_cache(self):
         """Save encodings to cache file"""
+        self._rebuild_matrix()
         try:
             with open(self.encodings_file, 'wb') as f:
                 pickle.dump({
@@ -110,7 +201,7 @@ class FaceManager:
         Evaluate if a face in the frame is of good quality for learning.
         
         Args:
-            frame: OpenCV BGR frame
+            frame: OpenCV BGR frame or FrameBundle
             location: Tuple of (top, right, bottom, left)
             
         Returns:
@@ -131,8 +222,7 @@ class FaceManager:
         
         # 2. Check sharpness (Variance of Laplacian)
         try:
-            face_img = frame[top:bottom, left:right]
-            gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+            gray = as_bundle(frame).gray[top:bottom, left:right]
             sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
             
             # Threshold for "Good" sharpness is around 100 on average cameras
@@ -159,58 +249,58 @@ class FaceManager:
         """
         Recognize faces in a frame
         
+        Faces are detected on a downscaled frame and tracked across calls;
+        only new tracks, stale identities or clearly sharper views are
+        re-encoded, so a person sitting still costs a detection per frame.
+        
         Args:
-            frame: OpenCV BGR frame
+            frame: OpenCV BGR frame or FrameBundle
             
         Returns:
-            List of dicts with keys: name, location, confidence, quality
+            List of dicts with keys: name, location, confidence, quality, track_id
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame = as_bundle(frame)
+        locations = self.detector.detect(frame)
         
-        # Resize frame for faster processing (0.5 size for better accuracy than 0.25)
-        small_frame = cv2.resize(rgb_frame, (0, 0), fx=0.5, fy=0.5)
-        
-        # Find faces and encodings
-        face_locations = face_recognition.face_locations(small_frame)
-        face_encodings = face_recognition.face_encodings(small_frame, face_locations)
-        
-        results = []
-        
-        for encoding, location in zip(face_encodings, face_locations):
-            # Scale back location to original frame size
-            top, right, bottom, left = location
-            top *= 2
-            right *= 2
-            bottom *= 2
-            left *= 2
-            full_loc = (top, right, bottom, left)
-            
-            # Evaluate quality
-            quality = self.evaluate_face_quality(frame, full_loc)
+        with self.lock:
+            self.frames += 1
+            self.faces_seen += len(locations)
+            tracks = self.tracker.update(locations)
+            qualities = [self.evaluate_face_quality(frame, loc) for loc in locations]
             
-            # Compare with known faces
-            name = "Unknown"
-            confidence = 0.0
-            
-            if self.known_face_encodings:
-                distances = face_recognition.face_distance(self.known_face_encodings, encoding)
-                if len(distances) > 0:
-                    best_match_idx = np.argmin(distances)
-                    confidence = 1 - distances[best_match_idx]
-                    
+            stale = [(track, quality) for track, quality in zip(tracks, qualities)
+                     if self.tracker.needs_encoding(track, quality['sharpness'])]
+            if stale:
+                encodings = face_recognition.face_encodings(frame.rgb, [t.location for t, _ in stale])
+                self.encodings_run += len(encodings)
+                
+                # Compare with all known faces in one pass
+                indices, distances = nearest_known(self.known_matrix, encodings)
+                for (track, quality), idx, distance in zip(stale, indices, distances):
+                    confidence = max(0.0, 1 - float(distance))
                     # Threshold for recognition (0.5 = 50% similar, more permissive for webcam/DroidCam)
-                    if confidence > 0.5:
-                        name = self.known_face_names[best_match_idx]
+                    name = self.known_face_names[idx] if confidence > 0.5 else "Unknown"
+                    self.tracker.assign(track, name, confidence, quality['sharpness'])
             
-            results.append({
-                'name': name,
-                'location': full_loc,
-                'confidence': float(confidence),
-                'quality': quality
-            })
-        
-        return results
+            return [{
+                'name': track.name,
+                'location': track.location,
+                'confidence': float(track.confidence),
+                'quality': quality,
+                'track_id': track.track_id
+            } for track, quality in zip(tracks, qualities)]
+    
+    def stats(self):
+        """Frames and faces processed vs face encodings actually computed"""
+        with self.lock:
+            return {
+                'detector': self.detector.name,
+                'frames': self.frames,
+                'faces': self.faces_seen,
+                'encodings': self.encodings_run,
+                'tracks': len(self.tracker.tracks),
+                'known': len(self.known_face_names),
+            }
     
     def learn_face(self, frame, person_name):
         """
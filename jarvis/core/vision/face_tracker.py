@@ -0,0 +1,147 @@
+"""
+Face Tracker - Carries face identities across frames
+Detections are matched to tracks by IoU (centroid distance as a fallback
+for fast motion), so a face is only re-encoded when its track is new,
+its identity is stale, or a sharper view of it turns up.
+"""
+
+import time
+import itertools
+
+import numpy as np
+
+
+def box_iou_matrix(a, b):
+    """IoU between (N, 4) and (M, 4) arrays of (top, right, bottom, left) boxes"""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    top = np.maximum(a[:, None, 0], b[None, :, 0])
+    right = np.minimum(a[:, None, 1], b[None, :, 1])
+    bottom = np.minimum(a[:, None, 2], b[None, :, 2])
+    left = np.maximum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    area_a = (a[:, 1] - a[:, 3]) * (a[:, 2] - a[:, 0])
+    area_b = (b[:, 1] - b[:, 3]) * (b[:, 2] - b[:, 0])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def nearest_known(matrix, encodings):
+    """
+    Closest row of `matrix` (N, D) for each of `encodings` (M, D), in one
+    vectorized pass. Returns (indices, distances); distances are inf when N == 0.
+    """
+    encodings = np.asarray(encodings, dtype=np.float64)
+    count = len(encodings)
+    if matrix.size == 0 or count == 0:
+        return np.zeros(count, dtype=np.intp), np.full(count, np.inf)
+    encodings = encodings.reshape(count, matrix.shape[1])
+    sq = (np.einsum('ij,ij->i', encodings, encodings)[:, None]
+          + np.einsum('ij,ij->i', matrix, matrix)[None, :]
+          - 2.0 * encodings @ matrix.T)
+    distances = np.sqrt(np.clip(sq, 0, None))
+    idx = distances.argmin(axis=1)
+    return idx, distances[np.arange(len(idx)), idx]
+
+
+class FaceTrack:
+    """One face followed across frames, with the identity from its last encoding"""
+
+    def __init__(self, track_id, location, now):
+        self.track_id = track_id
+        self.location = location
+        self.name = "Unknown"
+        self.confidence = 0.0
+        self.encoded_at = None  # None = never encoded
+        self.encoded_sharpness = 0.0
+        self.quality = None
+        self.first_seen = now
+        self.last_seen = now
+        self.hits = 1
+
+    def centroid(self):
+        top, right, bottom, left = self.location
+        return (left + right) / 2.0, (top + bottom) / 2.0
+
+    def size(self):
+        top, right, bottom, left = self.location
+        return max(right - left, bottom - top)
+
+
+class FaceTracker:
+    """
+    Greedy IoU tracker for face boxes.
+
+    update(locations) returns the track of every detection, creating tracks
+    for unmatched ones; tracks not seen for `max_age` seconds are dropped.
+    needs_encoding(track, sharpness) implements the re-encode policy.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_centroid_shift=1.0, max_age=1.0,
+                 reencode_s=3.0, unknown_reencode_s=1.0, sharpness_gain=1.3):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_shift = max_centroid_shift  # In face sizes
+        self.max_age = max_age
+        self.reencode_s = reencode_s
+        self.unknown_reencode_s = unknown_reencode_s
+        self.sharpness_gain = sharpness_gain
+        self.tracks = {}
+        self._ids = itertools.count(1)
+
+    def update(self, locations, now=None):
+        now = time.monotonic() if now is None else now
+        for track_id in [t for t, track in self.tracks.items() if now - track.last_seen > self.max_age]:
+            del self.tracks[track_id]
+
+        tracks = list(self.tracks.values())
+        assigned = [None] * len(locations)
+        if tracks and locations:
+            iou = box_iou_matrix([t.location for t in tracks], locations)
+            # Centroid fallback: a small, fast-moving face can lose all overlap between frames
+            boxes = np.asarray(locations, dtype=np.float32)
+            centers = np.stack(((boxes[:, 1] + boxes[:, 3]) / 2, (boxes[:, 0] + boxes[:, 2]) / 2), axis=1)
+            track_centers = np.array([t.centroid() for t in tracks], dtype=np.float32)
+            sizes = np.array([max(1.0, t.size()) for t in tracks], dtype=np.float32)
+            shift = np.linalg.norm(track_centers[:, None] - centers[None], axis=2) / sizes[:, None]
+            score = np.where(iou >= self.iou_threshold, 1.0 + iou,
+                             np.where(shift <= self.max_centroid_shift, 1.0 - shift, 0.0))
+
+            used_tracks = set()
+            for flat in np.argsort(-score, axis=None):
+                i, j = np.unravel_index(flat, score.shape)
+                if score[i, j] <= 0:
+                    break
+                if i in used_tracks or assigned[j] is not None:
+                    continue
+                used_tracks.add(i)
+                assigned[j] = tracks[i]
+
+        result = []
+        for location, track in zip(locations, assigned):
+            if track is None:
+                track = FaceTrack(next(self._ids), location, now)
+                self.tracks[track.track_id] = track
+            else:
+                track.location = location
+                track.last_seen = now
+                track.hits += 1
+            result.append(track)
+        return result
+
+    def needs_encoding(self, track, sharpness=0.0, now=None):
+        """New track, stale identity, or a clearly sharper view than the one encoded"""
+        now = time.monotonic() if now is None else now
+        if track.encoded_at is None:
+            return True
+        interval = self.unknown_reencode_s if track.name == "Unknown" else self.reencode_s
+        if now - track.encoded_at >= interval:
+            return True
+        return sharpness > track.encoded_sharpness * self.sharpness_gain
+
+    def assign(self, track, name, confidence, sharpness=0.0, now=None):
+        track.name = name
+        track.confidence = confidence
+        track.encoded_at = time.monotonic() if now is None else now
+        track.encoded_sharpness = sharpness
+
+    def reset(self):
+        self.tracks.clear()
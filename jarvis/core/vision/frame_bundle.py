@@ -0,0 +1,162 @@
+"""
+Frame Bundle - One captured frame and its derived images
+Every analyzer needs some variant of the same frame (RGB, gray, a smaller
+copy, sharpness, a MediaPipe image). The bundle computes each variant the
+first time it is asked for and hands the same result to everyone after.
+"""
+
+import threading
+
+import numpy as np
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+def to_gray(image):
+    if image.ndim == 2:
+        return image
+    if CV2_AVAILABLE:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return (image[..., 0] * 0.114 + image[..., 1] * 0.587 + image[..., 2] * 0.299).astype(np.uint8)
+
+
+def to_rgb(image):
+    if CV2_AVAILABLE:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return np.ascontiguousarray(image[..., ::-1])
+
+
+def resize(image, scale):
+    if CV2_AVAILABLE:
+        return cv2.resize(image, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    h, w = image.shape[:2]
+    rows = (np.arange(int(h * scale)) / scale).astype(np.intp)
+    cols = (np.arange(int(w * scale)) / scale).astype(np.intp)
+    return image[rows][:, cols]
+
+
+def sharpness(image):
+    """Variance of the Laplacian of the grayscale image (higher = sharper)"""
+    gray = to_gray(image)
+    if CV2_AVAILABLE:
+        return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    gray = gray.astype(np.float64)
+    lap = (gray[1:-1, :-2] + gray[1:-1, 2:] + gray[:-2, 1:-1] + gray[2:, 1:-1] - 4 * gray[1:-1, 1:-1])
+    return float(lap.var())
+
+
+def perceptual_hash(image, size=32, dead_zone=2.0):
+    """
+    Difference hash of an image (any size, BGR or gray) as packed bits.
+
+    The image is block-averaged to size x (size + 1) and every horizontal
+    neighbour pair contributes two bits: brighter by more than `dead_zone`
+    and darker by more than it. The dead zone keeps sensor noise on flat
+    paper from flipping bits, so two captures of the same page hash alike.
+    """
+    # Subsample large frames first; block means over ~256 px are plenty for the hash
+    step = max(1, min(image.shape[:2]) // 256)
+    image = image[::step, ::step]
+    gray = image.mean(axis=2) if image.ndim == 3 else image.astype(np.float32)
+    h, w = gray.shape
+    rows = np.linspace(0, h, size + 1).astype(int)
+    cols = np.linspace(0, w, size + 2).astype(int)
+    # Block means via cumulative sums (works for any image size)
+    integral = np.pad(gray.astype(np.float64).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    sums = (integral[rows[1:]][:, cols[1:]] - integral[rows[:-1]][:, cols[1:]]
+            - integral[rows[1:]][:, cols[:-1]] + integral[rows[:-1]][:, cols[:-1]])
+    areas = np.outer(np.diff(rows), np.diff(cols))
+    small = sums / np.maximum(areas, 1)
+    diff = small[:, 1:] - small[:, :-1]
+    return np.packbits(np.concatenate(((diff > dead_zone).ravel(), (diff < -dead_zone).ravel())))
+
+
+class FrameBundle:
+    """
+    A captured BGR frame (read-only), its capture id and time, and lazily
+    memoized variants: rgb, gray, half, quarter, scaled(s), sharpness,
+    phash and mp_image. Variants are derived from the shared frame and are
+    read-only too; copy before drawing.
+    """
+
+    __slots__ = ("image", "frame_id", "timestamp", "_variants", "_lock")
+
+    def __init__(self, image, frame_id=0, timestamp=0.0):
+        self.image = image
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self._variants = {}
+        self._lock = threading.RLock()
+
+    def _get(self, key, compute):
+        variant = self._variants.get(key)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(key)
+                if variant is None:
+                    variant = compute()
+                    if isinstance(variant, np.ndarray):
+                        variant.flags.writeable = False
+                    self._variants[key] = variant
+        return variant
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def rgb(self):
+        return self._get("rgb", lambda: to_rgb(self.image))
+
+    @property
+    def gray(self):
+        return self._get("gray", lambda: to_gray(self.image))
+
+    def scaled(self, scale):
+        """BGR frame resized by `scale` (1.0 = the frame itself)"""
+        if scale >= 1.0:
+            return self.image
+        return self._get(("scaled", round(scale, 4)), lambda: resize(self.image, scale))
+
+    def scaled_rgb(self, scale):
+        if scale >= 1.0:
+            return self.rgb
+        return self._get(("scaled_rgb", round(scale, 4)), lambda: to_rgb(self.scaled(scale)))
+
+    @property
+    def half(self):
+        return self.scaled(0.5)
+
+    @property
+    def quarter(self):
+        return self._get(("scaled", 0.25), lambda: resize(self.half, 0.5))
+
+    @property
+    def sharpness(self):
+        return self._get("sharpness", lambda: sharpness(self.gray))
+
+    @property
+    def phash(self):
+        return self._get("phash", lambda: perceptual_hash(self.image))
+
+    @property
+    def mp_image(self):
+        """mediapipe.Image (SRGB) over the shared RGB variant"""
+        def wrap():
+            import mediapipe as mp
+            return mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(self.rgb))
+        return self._get("mp_image", wrap)
+
+
+def as_bundle(frame):
+    """FrameBundle for a frame that may already be one (raw arrays get a fresh bundle)"""
+    return frame if isinstance(frame, FrameBundle) else FrameBundle(frame)
+
+
+def as_image(frame):
+    """The BGR ndarray of a frame or FrameBundle"""
+    return frame.image if isinstance(frame, FrameBundle) else frame
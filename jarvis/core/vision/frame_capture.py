@@ -0,0 +1,172 @@
+"""
+Frame Capture - One thread owns the video device
+Frames are published as read-only FrameBundles with an id and timestamp; a
+short ring of recent frames serves "sharpest of the last N" without new captures.
+"""
+
+import time
+import threading
+from collections import deque
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+from .frame_bundle import FrameBundle
+
+
+class VideoFileSource:
+    """A video file played like a camera (paced to its own fps unless realtime=False)"""
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self.finished = False
+        self.start_time = None
+        self.index = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        ok, image = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, image = self.cap.read()
+        if not ok:
+            self.finished = True
+            return False, None
+        if self.realtime:
+            delay = self.start_time + self.index / self.fps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self.index += 1
+        return True, image
+
+    def release(self):
+        self.cap.release()
+
+
+class FrameCapture:
+    """
+    Capture thread for any source with read() -> (ok, image), e.g. a
+    cv2.VideoCapture, VideoFileSource or SyntheticVideoSource.
+
+    Every frame read is frozen (writeable=False) and becomes the latest
+    frame by reference swap, so consumers share it without copying and can
+    hold it as long as they like; the previous frames stay in a ring of
+    `ring_size` for sharpest-frame selection. Consumers that need to draw
+    must copy.
+    """
+
+    def __init__(self, source, ring_size=8):
+        self.source = source
+        self.ring = deque(maxlen=ring_size)
+        self.cond = threading.Condition()
+        self.frame_id = 0
+        self.running = False
+        self.thread = None
+
+        # Counters
+        self.read_errors = 0
+        self.capture_times = deque(maxlen=30)
+
+    def start(self):
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name="frame-capture", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+
+    def _run(self):
+        failures = 0
+        while self.running:
+            try:
+                ok, image = self.source.read()
+            except Exception as e:
+                print(f"FrameCapture: Read error: {e}")
+                ok, image = False, None
+
+            if not ok or image is None:
+                if getattr(self.source, "finished", False):
+                    print("FrameCapture: Source finished")
+                    break
+                self.read_errors += 1
+                failures += 1
+                # Back off on a stalled device instead of spinning
+                time.sleep(min(0.5, 0.01 * failures))
+                continue
+            failures = 0
+
+            image.flags.writeable = False
+            timestamp = time.time()
+            with self.cond:
+                self.frame_id += 1
+                self.ring.append(FrameBundle(image, self.frame_id, timestamp))
+                self.capture_times.append(time.monotonic())
+                self.cond.notify_all()
+
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+    # ---------------------------------------------------------
+    # Consumers
+    # ---------------------------------------------------------
+
+    def latest(self):
+        """Newest FrameBundle, or None before the first one"""
+        with self.cond:
+            return self.ring[-1] if self.ring else None
+
+    def wait_for(self, after_id=0, timeout=1.0):
+        """Newest FrameBundle once one newer than `after_id` exists; None on timeout"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.frame_id > after_id or not self.running, timeout)
+            if self.frame_id > after_id and self.ring:
+                return self.ring[-1]
+            return None
+
+    def recent(self, n):
+        """Up to n newest FrameBundles, oldest first"""
+        with self.cond:
+            return list(self.ring)[-n:]
+
+    def sharpest(self, n=4, timeout=0.5):
+        """Sharpest of the last n frames, waiting up to `timeout` for the ring to hold n"""
+        with self.cond:
+            self.cond.wait_for(lambda: len(self.ring) >= min(n, self.ring.maxlen) or not self.running, timeout)
+            frames = list(self.ring)[-n:]
+        if not frames:
+            return None
+        return max(frames, key=lambda f: f.sharpness)
+
+    def fps(self):
+        with self.cond:
+            if len(self.capture_times) < 2:
+                return 0.0
+            span = self.capture_times[-1] - self.capture_times[0]
+            return (len(self.capture_times) - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        return {
+            "frames": self.frame_id,
+            "fps": round(self.fps(), 2),
+            "read_errors": self.read_errors,
+            "running": self.running,
+        }
@@ -5,8 +5,15 @@ from mediapipe.tasks.python import vision
 import numpy as np
 import os
 
+from .mediapipe_runner import MediaPipeRunner
+
 class GestureEngine:
-    def __init__(self):
+    def __init__(self, running_mode="live_stream", on_result=None):
+        """
+        Args:
+            running_mode: "live_stream" (async, tracked), "video" (sync, tracked) or "image"
+            on_result: fn(result, frame_ts) called with every recognized frame
+        """
         # Path to the model file
         model_path = os.path.join(os.getcwd(), 'models', 'mediapipe', 'gesture_recognizer.task')
         
@@ -15,25 +22,35 @@ class GestureEngine:
             self.recognizer = None
             return
 
-        base_options = python.BaseOptions(model_asset_path=model_path)
-        options = vision.GestureRecognizerOptions(base_options=base_options)
-        self.recognizer = vision.GestureRecognizer.create_from_options(options)
+        self.recognizer = MediaPipeRunner(vision.GestureRecognizer, vision.GestureRecognizerOptions,
+                                          model_path, "recognize", self._parse, running_mode, on_result)
         
-        print("GestureEngine: Modern MediaPipe Tasks Recognizer initialized.")
+        print(f"GestureEngine: Modern MediaPipe Tasks Recognizer initialized ({running_mode} mode).")
 
-    def detect_gesture(self, frame):
+    def submit(self, frame, frame_ts=None):
         """
-        Detects hand gestures using modern MediaPipe Tasks.
+        Queue a frame without waiting (live_stream mode); the result goes to
+        on_result. In video/image mode the frame is recognized right away.
+        """
+        if self.recognizer is None or frame is None:
+            return None
+        return self.recognizer.submit(frame, frame_ts)
+
+    def detect_gesture(self, frame, frame_ts=None, timeout=1.0):
+        """
+        Detects hand gestures using modern MediaPipe Tasks (waits for the result).
         """
         if self.recognizer is None or frame is None:
             return {"success": False, "gesture": "None"}
 
-        # Task API requires MediaPipe Image object
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        
-        # Recognize gestures
-        recognition_result = self.recognizer.recognize(mp_image)
+        result = self.recognizer.run(frame, frame_ts, timeout)
+        return result or {"success": False, "gesture": "None"}
+
+    def stats(self):
+        return self.recognizer.stats() if self.recognizer else {}
 
+    def _parse(self, recognition_result):
+        """Top gesture of a GestureRecognizerResult as our result dict"""
         if recognition_result.gestures:
             # Get the top gesture
             top_gesture = recognition_result.gestures[0][0]
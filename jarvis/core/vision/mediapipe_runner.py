@@ -0,0 +1,135 @@
+"""
+MediaPipe Runner - One MediaPipe Tasks model in IMAGE, VIDEO or LIVE_STREAM mode
+VIDEO and LIVE_STREAM let MediaPipe track hands/poses between frames instead
+of running palm/pose detection on every frame; LIVE_STREAM also returns
+immediately and delivers results through a callback on MediaPipe's thread.
+"""
+
+import time
+import threading
+
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+from .frame_bundle import as_bundle
+
+RUNNING_MODES = {
+    "image": vision.RunningMode.IMAGE,
+    "video": vision.RunningMode.VIDEO,
+    "live_stream": vision.RunningMode.LIVE_STREAM,
+}
+
+
+class MediaPipeRunner:
+    """
+    Feeds frames to a MediaPipe task with strictly increasing millisecond
+    timestamps (taken from the frames' capture times) and hands every parsed
+    result to on_result(result, frame_ts).
+
+    task_cls/options_cls: e.g. vision.GestureRecognizer / GestureRecognizerOptions
+    method: the task's IMAGE-mode call ("recognize" or "detect"); the VIDEO
+            and LIVE_STREAM calls are method + "_for_video" / "_async"
+    parse: fn(task_result) -> result dict (called in frame order)
+    """
+
+    def __init__(self, task_cls, options_cls, model_path, method, parse,
+                 running_mode="live_stream", on_result=None, **options):
+        self.running_mode = running_mode
+        self.parse = parse
+        self.on_result = on_result
+        mode = RUNNING_MODES[running_mode]
+        if mode == vision.RunningMode.LIVE_STREAM:
+            options["result_callback"] = self._on_async
+        self.task = task_cls.create_from_options(options_cls(
+            base_options=python.BaseOptions(model_asset_path=model_path), running_mode=mode, **options))
+        self._call = getattr(self.task, {"image": method, "video": method + "_for_video",
+                                         "live_stream": method + "_async"}[running_mode])
+
+        self.lock = threading.Lock()  # Timestamps must reach the task in the order they were issued
+        self.cond = threading.Condition()
+        self.last_ms = -1
+        self.pending = {}  # timestamp_ms -> (frame_ts, submitted_at) of frames in flight
+        self.latest = None  # (timestamp_ms, frame_ts, result) of the newest delivered frame
+        self.submitted = 0
+        self.completed = 0
+        self.avg_latency = 0.0
+
+    @property
+    def is_async(self):
+        return self.running_mode == "live_stream"
+
+    def submit(self, frame, frame_ts=None):
+        """
+        Queue a frame (FrameBundle or BGR array). In LIVE_STREAM mode this
+        returns None at once; otherwise it returns the parsed result.
+        Either way the result also goes to on_result.
+        """
+        return self._submit(frame, frame_ts)[1]
+
+    def run(self, frame, frame_ts=None, timeout=1.0):
+        """Submit a frame and wait for its result (None if MediaPipe dropped it or timed out)"""
+        timestamp_ms, result = self._submit(frame, frame_ts)
+        if not self.is_async:
+            return result
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.latest and self.latest[0] >= timestamp_ms, timeout):
+                return None
+            return self.latest[2] if self.latest[0] == timestamp_ms else None
+
+    def _submit(self, frame, frame_ts):
+        bundle = as_bundle(frame)
+        if frame_ts is None:
+            frame_ts = bundle.timestamp or time.time()
+        mp_image = bundle.mp_image
+        with self.lock:
+            timestamp_ms = max(int(frame_ts * 1000), self.last_ms + 1)
+            self.last_ms = timestamp_ms
+            submitted_at = time.monotonic()
+            self.submitted += 1
+            if self.running_mode == "image":
+                raw = self._call(mp_image)
+            elif self.running_mode == "video":
+                raw = self._call(mp_image, timestamp_ms)
+            else:
+                with self.cond:
+                    self.pending[timestamp_ms] = (frame_ts, submitted_at)
+                self._call(mp_image, timestamp_ms)
+                return timestamp_ms, None
+            return timestamp_ms, self._deliver(raw, timestamp_ms, frame_ts, submitted_at)
+
+    def _on_async(self, raw, output_image, timestamp_ms):
+        with self.cond:
+            frame_ts, submitted_at = self.pending.pop(timestamp_ms, (timestamp_ms / 1000.0, time.monotonic()))
+            # LIVE_STREAM drops frames while busy; they never get a callback
+            for stale in [ts for ts in self.pending if ts < timestamp_ms]:
+                del self.pending[stale]
+        self._deliver(raw, timestamp_ms, frame_ts, submitted_at)
+
+    def _deliver(self, raw, timestamp_ms, frame_ts, submitted_at):
+        result = self.parse(raw)
+        latency = time.monotonic() - submitted_at
+        with self.cond:
+            self.completed += 1
+            self.avg_latency = latency if self.completed == 1 else 0.9 * self.avg_latency + 0.1 * latency
+            self.latest = (timestamp_ms, frame_ts, result)
+            self.cond.notify_all()
+        if self.on_result:
+            try:
+                self.on_result(result, frame_ts)
+            except Exception as e:
+                print(f"MediaPipeRunner: result handler failed: {e}")
+        return result
+
+    def stats(self):
+        """Running mode, frames submitted vs completed and mean submit-to-result latency"""
+        with self.cond:
+            return {
+                "running_mode": self.running_mode,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "in_flight": len(self.pending),
+                "avg_latency_ms": round(self.avg_latency * 1000, 1),
+            }
+
+    def close(self):
+        self.task.close()
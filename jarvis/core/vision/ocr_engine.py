@@ -1,13 +1,15 @@
 import cv2
-import os
 import numpy as np
 import json
 import logging
 import time
 import datetime
-import traceback
-import sys
-from collections import deque
+import threading
+from collections import deque, OrderedDict
+from concurrent.futures import wait
+
+from .frame_bundle import FrameBundle, as_bundle, perceptual_hash
+from .ocr_service import get_ocr_service
 
 # Initialize Logger
 logging.basicConfig(level=logging.INFO)
@@ -45,70 +47,120 @@ class VisualShortTermMemory:
     def get_last(self):
         return self.memory[0] if self.memory else None
 
+def thumbnail(image, width=160):
+    """Block-mean grayscale copy (about `width` px wide) for pixel-level cache checks"""
+    gray = image.mean(axis=2) if image.ndim == 3 else image.astype(np.float32)
+    f = max(1, gray.shape[1] // width)
+    h, w = gray.shape[0] // f * f, gray.shape[1] // f * f
+    return gray[:h, :w].reshape(h // f, f, w // f, f).mean(axis=(1, 3)).astype(np.float32)
+
+def local_difference(a, b, block=8):
+    """
+    Largest mean absolute difference over block x block tiles of two
+    thumbnails, after removing any global brightness shift. One changed
+    word stands out in its tile even though the whole-image mean barely moves.
+    """
+    d = np.abs((a - a.mean()) - (b - b.mean()))
+    h, w = d.shape[0] // block * block, d.shape[1] // block * block
+    if h == 0 or w == 0:
+        return float(d.mean())
+    return float(d[:h, :w].reshape(h // block, block, w // block, block).mean(axis=(1, 3)).max())
+
+class OCRCache:
+    """
+    OCR results keyed by perceptual hash. A lookup returns the results of
+    a previous image of the same kind (tag) and shape whose hash differs in
+    at most `max_distance` of its bits and whose thumbnail matches tile by
+    tile (within `max_pixel_diff` gray levels), so a repeated question
+    about an unchanged page skips OCR but a page with one word changed does not.
+    """
+    def __init__(self, max_items=64, max_distance=0.02, max_age=300.0, max_pixel_diff=6.0):
+        self.entries = OrderedDict()  # (tag, shape, hash bytes) -> (hash, thumbnail, results, time)
+        self.max_items = max_items
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.max_pixel_diff = max_pixel_diff
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tag, image, h=None):
+        """(results or None, hash) - pass the hash back to put()"""
+        h = perceptual_hash(image) if h is None else h
+        limit = int(self.max_distance * h.size * 8)
+        now = time.time()
+        thumb = None
+        with self.lock:
+            candidates = []
+            for key, (other, _, _, stamp) in self.entries.items():
+                if key[0] != tag or key[1] != image.shape or now - stamp > self.max_age:
+                    continue
+                dist = int(np.unpackbits(np.bitwise_xor(h, other)).sum())
+                if dist <= limit:
+                    candidates.append((dist, key))
+            # The hash only shortlists; a hit must also match pixel by pixel
+            for _, key in sorted(candidates, key=lambda c: c[0]):
+                thumb = thumbnail(image) if thumb is None else thumb
+                if local_difference(thumb, self.entries[key][1]) <= self.max_pixel_diff:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.entries[key][2], h
+            self.misses += 1
+            return None, h
+
+    def put(self, tag, image, h, results):
+        thumb = thumbnail(image)
+        with self.lock:
+            self.entries[(tag, image.shape, h.tobytes())] = (h, thumb, results, time.time())
+            while len(self.entries) > self.max_items:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
 class OCREngine:
     """
     Robust OCR Engine for JARVIS Vision.
     Supports text detection (CRAFT/EAST) and recognition (Tesseract/CRNN).
     Includes advanced specific preprocessing pipeline and memory.
     """
-    def __init__(self, preferred_method="easyocr"):
+    def __init__(self, preferred_method="easyocr", service=None):
         self.preferred_method = preferred_method
-        self.reader = None
-        self._tesseract_available = False
-        self._easyocr_available = False
+        # EasyOCR/Tesseract live in the process-wide OCR service (loaded once, shared)
+        self._service = service
         
         # Init Memory
         self.memory = VisualShortTermMemory()
-        
-        # Check EasyOCR (PRIORITY)
-        try:
-            print("Vision: Attempting to import easyocr...")
-            import easyocr
-            print("Vision: Initializing EasyOCR Reader (Neural System)...")
-            try:
-                # Attempt GPU first
-                self.reader = easyocr.Reader(['en'], gpu=True, verbose=False) 
-                print("OCREngine: EasyOCR initialized successfully on GPU/CUDA.")
-            except Exception as gpu_err:
-                print(f"OCREngine: GPU Init failed ({gpu_err}), falling back to CPU...")
-                self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-                print("OCREngine: EasyOCR initialized successfully on CPU.")
-            
-            self._easyocr_available = True
-            logger.info("OCREngine: EasyOCR initialized successfully.")
-        except ImportError as ie:
-            print(f"EasyOCR ImportError: {ie}")
-            logger.warning(f"EasyOCR ImportError: {ie}")
-            logger.info(f"Python sys.path: {sys.path}")
-            logger.warning("EasyOCR not installed or dependency missing.")
-        except Exception as e:
-             print(f"EasyOCR Init Failed: {e}")
-             logger.error(f"EasyOCR Init Failed: {e}. Falling back.")
-             traceback.print_exc()
-            
-        # Check Pytesseract (FALLBACK)
-        try:
-            import pytesseract
-            # On Windows, it often requires manual path config if not in ENV
-            try:
-                pytesseract.get_tesseract_version()
-                self._tesseract_available = True
-                logger.info("Vision: Tesseract OCR available.")
-            except:
-                # Common windows path
-                tessa_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-                if os.path.exists(tessa_path):
-                    pytesseract.pytesseract.tesseract_cmd = tessa_path
-                    self._tesseract_available = True
-                    logger.info("Vision: Tesseract OCR found at default Windows path.")
-                else:
-                    logger.warning("Tesseract binary not found.")
-        except (ImportError, Exception):
-            logger.warning("Tesseract module error.")
-
-        if not self._easyocr_available and not self._tesseract_available:
+        self.cache = OCRCache()
+
+        if not self.service.available:
             logger.critical("CRITICAL: No OCR engine available!")
 
+    @property
+    def service(self):
+        return self._service or get_ocr_service()
+
+    @property
+    def reader(self):
+        return self.service.reader
+
+    @property
+    def _easyocr_available(self):
+        return self.service.easyocr_available
+
+    @property
+    def _tesseract_available(self):
+        return self.service.tesseract_available
+
+    def _gray(self, frame):
+        """Grayscale of an image, or the shared gray variant of a FrameBundle"""
+        if isinstance(frame, FrameBundle):
+            return frame.gray
+        if len(frame.shape) == 3:
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
     def preprocess_advanced(self, frame, method="standard"):
         """
         Apply separate pipelines for preprocessing.
@@ -116,29 +168,22 @@ class OCREngine:
         try:
             if method == "standard":
                 # Just Grayscale
-                if len(frame.shape) == 3:
-                    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                return frame
+                return self._gray(frame)
                 
             elif method == "contrast":
                 # Grayscale + CLAHE (Contrast Limited Adaptive Histogram Equalization)
-                if len(frame.shape) == 3:
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                else:
-                    gray = frame
+                gray = self._gray(frame)
                 clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
                 return clahe.apply(gray)
                 
             elif method == "upscale":
                 # Resize 2x for small text
+                frame = as_bundle(frame).image
                 return cv2.resize(frame, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
                 
             elif method == "binary":
                 # Adaptive Thresholding
-                if len(frame.shape) == 3:
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                else:
-                    gray = frame
+                gray = self._gray(frame)
                 return cv2.adaptiveThreshold(
                     gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
                     cv2.THRESH_BINARY, 11, 2
@@ -156,10 +201,8 @@ class OCREngine:
         """
         try:
             # 1. Grayscale & Blur
-            if len(frame.shape) == 3:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = frame
+            gray = self._gray(frame)
+            frame = as_bundle(frame).image
             blur = cv2.GaussianBlur(gray, (7, 7), 0)
             
             # 2. Threshold
@@ -214,16 +257,34 @@ class OCREngine:
         """
         Main function to detect text regions and perform OCR.
         Optimized: Quick check -> Regional isolation -> Regional enhancement.
+        
+        `timeout` is a wall-clock budget for the whole call: whatever has
+        been read when it runs out is returned. Results are cached by
+        perceptual hash, so an unchanged frame is answered from the cache.
         """
-        start_time = time.time()
+        deadline = time.time() + timeout
         if frame is None:
             return []
+        bundle = as_bundle(frame)
+
+        cached, frame_hash = self.cache.get("frame", bundle.image, bundle.phash)
+        if cached is not None:
+            logger.info("OCR: Unchanged frame, answered from cache.")
+            return cached
+
+        results = self._detect_and_read(bundle, deadline)
+        if time.time() < deadline:
+            # A pass cut short by the budget is not the answer for this frame
+            self.cache.put("frame", bundle.image, frame_hash, results)
+        return results
 
+    def _detect_and_read(self, bundle, deadline):
         all_results = []
+        frame = bundle.image
         
         # Pipeline 1: Raw/Standard (Fastest)
         print("OCR: Attempting Pass 1 (Standard Core)...")
-        results = self._process_frame(frame)
+        results = self._read_all([bundle], deadline)[0]
         
         if self._has_valid_text(results):
             final_text = " ".join([r['detected_text'] for r in results if r.get('confidence', 0) > 0.3])
@@ -233,36 +294,37 @@ class OCREngine:
             return results
 
         # CHECK TIMEOUT
-        if time.time() - start_time > timeout:
+        if time.time() > deadline:
             return []
 
-        # Pipeline 2: Document Mode (Region Isolation)
+        # Pipeline 2: Document Mode (Region Isolation), regions read in parallel
         print("OCR: Attempting Pass 2 (Region Isolation)...")
-        regions = self._isolate_text_regions(frame)
+        regions = self._isolate_text_regions(bundle)[:2]
         
         if regions:
-            for i, crop in enumerate(regions[:2]):
-                if time.time() - start_time > timeout: break
-                
-                print(f"OCR: Scanning Region {i+1} (Enhanced)...")
-                enhanced = self.preprocess_advanced(crop, "contrast")
-                r_res = self._process_frame(enhanced)
-                
-                if not self._has_valid_text(r_res):
-                    print(f"OCR: Scanning Region {i+1} (Upscaled)...")
-                    upscaled = self.preprocess_advanced(crop, "upscale")
-                    r_res = self._process_frame(upscaled)
-                
+            print(f"OCR: Scanning {len(regions)} region(s) (Enhanced)...")
+            enhanced = [self.preprocess_advanced(crop, "contrast") for crop in regions]
+            region_results = self._read_all(enhanced, deadline)
+            
+            retry = [crop for crop, r_res in zip(regions, region_results) if not self._has_valid_text(r_res)]
+            if retry and time.time() < deadline:
+                print(f"OCR: Scanning {len(retry)} region(s) (Upscaled)...")
+                upscaled = self._read_all([self.preprocess_advanced(crop, "upscale") for crop in retry], deadline)
+                upscaled = iter(upscaled)
+                region_results = [next(upscaled) if not self._has_valid_text(r_res) else r_res
+                                  for r_res in region_results]
+            
+            for r_res in region_results:
                 all_results.extend(r_res)
 
         # Pipeline 3: Global Adaptive Binary (Great for black text on white paper)
-        if not self._has_valid_text(all_results) and time.time() - start_time < timeout:
+        if not self._has_valid_text(all_results) and time.time() < deadline:
             print("OCR: Attempting Pass 3 (Global Binary)...")
-            binary = self.preprocess_advanced(frame, "binary")
-            all_results.extend(self._process_frame(binary))
+            binary = self.preprocess_advanced(bundle, "binary")
+            all_results.extend(self._read_all([binary], deadline)[0])
 
         # Pipeline 4: Full-Center Upscale (Focus on where user likely holds paper)
-        if not self._has_valid_text(all_results) and time.time() - start_time < timeout:
+        if not self._has_valid_text(all_results) and time.time() < deadline:
             print("OCR: Attempting Pass 4 (Center Zoom 2.5x)...")
             h, w = frame.shape[:2]
             # Focus on center 70%
@@ -271,7 +333,7 @@ class OCREngine:
             center_crop = frame[ch1:ch2, cw1:cw2]
             
             zoom = cv2.resize(center_crop, None, fx=2.5, fy=2.5, interpolation=cv2.INTER_CUBIC)
-            all_results.extend(self._process_frame(zoom))
+            all_results.extend(self._read_all([zoom], deadline)[0])
         
         # Final Verification (Lowered to 0.25)
         valid_final = [r for r in all_results if r.get('confidence', 0) > 0.2]
@@ -283,51 +345,43 @@ class OCREngine:
             
         return all_results
 
-    def _process_frame(self, frame):
-        """Internal helper to run the engine on a specific image frame"""
-        results = []
-        
-        try:
-            if self._easyocr_available:
-                # EasyOCR sometimes misses on first hit if model is still loading or thread contention
-                for _ in range(2):
-                    raw_results = self.reader.readtext(frame)
-                    if raw_results: break
-                    time.sleep(0.1)
-
-                for (bbox, text, prob) in raw_results:
-                    (tl, tr, br, bl) = bbox
-                    results.append({
-                        "detected_text": text,
-                        "bounding_box": [int(tl[0]), int(tl[1]), int(br[0] - tl[0]), int(br[1] - tl[1])],
-                        "confidence": float(prob),
-                        "engine": "easyocr"
-                    })
-            
-            elif self._tesseract_available:
-                import pytesseract
-                # Convert to RGB if standard generic frame, Tesseract expects RGB/Gray
-                # If frame is grayscale (2D), skip conversion
-                if len(frame.shape) == 3:
-                     rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                else:
-                     rgb = frame
-                     
-                data = pytesseract.image_to_data(rgb, output_type=pytesseract.Output.DICT)
-                for i in range(len(data['text'])):
-                    text = data['text'][i].strip()
-                    if text:
-                        results.append({
-                            "detected_text": text,
-                            "bounding_box": [data['left'][i], data['top'][i], data['width'][i], data['height'][i]],
-                            "confidence": float(data['conf'][i]) / 100.0,
-                            "engine": "tesseract"
-                        })
-        except Exception as e:
-            logger.error(f"OCR Scan Error: {e}")
-            
+    def _read_all(self, images, deadline):
+        """
+        OCR several independent images in one OCR service request and
+        return one result list per image (cached by perceptual hash);
+        images not finished by the deadline yield [] (a read already under
+        way still completes in the background and lands in the cache).
+        """
+        bundles = [as_bundle(image) for image in images]
+        results, misses = [], []
+        for bundle in bundles:
+            cached, image_hash = self.cache.get("image", bundle.image, bundle.phash)
+            results.append(cached)
+            if cached is None:
+                misses.append((len(results) - 1, bundle, image_hash))
+        if not misses:
+            return results
+
+        futures = self.service.submit([bundle for _, bundle, _ in misses], deadline)
+        for (_, bundle, image_hash), future in zip(misses, futures):
+            future.add_done_callback(lambda f, b=bundle, h=image_hash: self._cache_result(f, b, h))
+        wait(futures, timeout=max(0.0, deadline - time.time()))
+        for (i, _, _), future in zip(misses, futures):
+            if future.done() and not future.cancelled() and future.exception() is None:
+                results[i] = future.result()
+            else:
+                logger.warning("OCR: Pass skipped, wall-clock budget exhausted.")
+                results[i] = []
         return results
 
+    def _cache_result(self, future, bundle, image_hash):
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put("image", bundle.image, image_hash, future.result())
+
+    def _process_frame(self, frame):
+        """Internal helper to run the engine on a specific image frame (cached by perceptual hash)"""
+        return self._read_all([frame], time.time() + 60.0)[0]
+
     def _has_valid_text(self, results):
         """Heuristic to check if results look like readable text, not noise"""
         if not results: return False
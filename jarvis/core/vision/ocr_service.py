@@ -0,0 +1,306 @@
+"""
+OCR Service - One long-lived pool of warmed-up OCR engines for every caller
+click_on_text, read_screen, document_scan and OCREngine all queue images
+here instead of building their own EasyOCR Reader. Requests carry a
+deadline: the earliest deadline is served first, queued images are
+batched into one EasyOCR pass, and work whose deadline passed while it
+waited is dropped instead of run.
+"""
+
+import os
+import time
+import queue
+import itertools
+import threading
+import logging
+import traceback
+from concurrent.futures import Future, wait
+
+import cv2
+import numpy as np
+
+from .frame_bundle import as_bundle
+
+logger = logging.getLogger("OCRService")
+
+
+class OCRService:
+    """
+    Worker threads sharing one EasyOCR Reader (Tesseract as fallback).
+
+    submit(images, deadline) returns one Future per image; read() and
+    read_batch() wait for them up to the deadline. Results are lists of
+    {detected_text, bounding_box [x, y, w, h], confidence, engine}.
+    """
+
+    def __init__(self, workers=2, languages=('en',), gpu=True, max_batch=8, max_padding=2.0):
+        self.languages = list(languages)
+        self.gpu = gpu
+        self.max_batch = max_batch
+        self.max_padding = max_padding  # Padded batch area / real image area allowed
+        self.reader = None
+        self.easyocr_available = False
+        self.tesseract_available = False
+        self._load_engines()
+
+        self.queue = queue.PriorityQueue()  # (deadline, seq, image, future)
+        self._seq = itertools.count()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.images = 0
+        self.batches = 0
+        self.expired = 0
+        self.threads = [threading.Thread(target=self._worker, name=f"ocr-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def _load_engines(self):
+        # Check EasyOCR (PRIORITY)
+        try:
+            import easyocr
+            print("OCRService: Initializing EasyOCR Reader (Neural System)...")
+            try:
+                # Attempt GPU first
+                self.reader = easyocr.Reader(self.languages, gpu=self.gpu, verbose=False)
+            except Exception as gpu_err:
+                print(f"OCRService: GPU Init failed ({gpu_err}), falling back to CPU...")
+                self.reader = easyocr.Reader(self.languages, gpu=False, verbose=False)
+            # Warm-up: the first readtext pays for lazy model setup
+            warm = np.full((64, 256, 3), 255, dtype=np.uint8)
+            cv2.putText(warm, "JARVIS", (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+            self.reader.readtext(warm)
+            self.easyocr_available = True
+            print("OCRService: EasyOCR ready.")
+        except ImportError as ie:
+            logger.warning(f"EasyOCR not installed or dependency missing: {ie}")
+        except Exception as e:
+            logger.error(f"EasyOCR Init Failed: {e}. Falling back.")
+            traceback.print_exc()
+
+        # Check Pytesseract (FALLBACK)
+        try:
+            import pytesseract
+            # On Windows, it often requires manual path config if not in ENV
+            try:
+                pytesseract.get_tesseract_version()
+                self.tesseract_available = True
+                logger.info("OCRService: Tesseract OCR available.")
+            except Exception:
+                # Common windows path
+                tessa_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+                if os.path.exists(tessa_path):
+                    pytesseract.pytesseract.tesseract_cmd = tessa_path
+                    self.tesseract_available = True
+                    logger.info("OCRService: Tesseract OCR found at default Windows path.")
+                else:
+                    logger.warning("Tesseract binary not found.")
+        except Exception:
+            logger.warning("Tesseract module error.")
+
+        if not self.easyocr_available and not self.tesseract_available:
+            logger.critical("CRITICAL: No OCR engine available!")
+
+    @property
+    def available(self):
+        return self.easyocr_available or self.tesseract_available
+
+    # ---------------------------------------------------------
+    # Requests
+    # ---------------------------------------------------------
+
+    def submit(self, images, deadline=None):
+        """Queue images (arrays or FrameBundles); one Future per image"""
+        deadline = float('inf') if deadline is None else deadline
+        futures = []
+        with self.lock:
+            self.requests += 1
+        for image in images:
+            future = Future()
+            self.queue.put((deadline, next(self._seq), image, future))
+            futures.append(future)
+        return futures
+
+    def read_batch(self, images, deadline=None):
+        """
+        OCR several images and return one result list per image; images
+        not read by the deadline yield [] (a pass already running still
+        completes and resolves its Future).
+        """
+        futures = self.submit(images, deadline)
+        wait(futures, timeout=None if deadline is None else max(0.0, deadline - time.time()))
+        results = []
+        for future in futures:
+            if future.done() and future.exception() is None:
+                results.append(future.result())
+            else:
+                results.append([])
+        return results
+
+    def read(self, image, timeout=None):
+        """OCR one image, waiting at most `timeout` seconds ([] if it runs out)"""
+        deadline = None if timeout is None else time.time() + timeout
+        return self.read_batch([image], deadline)[0]
+
+    # ---------------------------------------------------------
+    # Workers
+    # ---------------------------------------------------------
+
+    def _worker(self):
+        while True:
+            items = [self.queue.get()]
+            if items[0][3] is None:
+                return
+            # Batch whatever else is already waiting
+            while len(items) < self.max_batch:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[3] is None:
+                    self.queue.put(item)  # Leave the stop marker for the next loop
+                    break
+                items.append(item)
+
+            now = time.time()
+            live = []
+            for deadline, _, image, future in items:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if deadline < now:
+                    future.set_exception(TimeoutError("OCR deadline passed while queued"))
+                    with self.lock:
+                        self.expired += 1
+                else:
+                    live.append((image, future))
+            if not live:
+                continue
+
+            with self.lock:
+                self.images += len(live)
+                self.batches += 1
+            try:
+                if self.easyocr_available:
+                    for group in self._group([(as_bundle(image).image, future) for image, future in live]):
+                        self._run_easyocr(group)
+                else:
+                    for image, future in live:
+                        future.set_result(self._run_tesseract(image) if self.tesseract_available else [])
+            except Exception as e:
+                logger.error(f"OCR Scan Error: {e}")
+                for _, future in live:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _group(self, items):
+        """Split (array, future) pairs into groups that can share one padded canvas without much waste"""
+        groups = []
+        for array, future in items:
+            for group in groups:
+                if group[0][0].ndim != array.ndim:
+                    continue
+                shapes = [a.shape for a, _ in group] + [array.shape]
+                canvas = max(s[0] for s in shapes) * max(s[1] for s in shapes) * len(shapes)
+                if canvas <= self.max_padding * sum(s[0] * s[1] for s in shapes):
+                    group.append((array, future))
+                    break
+            else:
+                groups.append([(array, future)])
+        return groups
+
+    def _run_easyocr(self, group):
+        if len(group) == 1:
+            array, future = group[0]
+            future.set_result(self._to_results(self.reader.readtext(array), array.shape))
+            return
+
+        # Pad every image (bottom/right) to the largest one so they go through detection together
+        height = max(a.shape[0] for a, _ in group)
+        width = max(a.shape[1] for a, _ in group)
+        canvases = []
+        for array, _ in group:
+            canvas = np.full((height, width) + array.shape[2:], int(np.median(array)), dtype=array.dtype)
+            canvas[:array.shape[0], :array.shape[1]] = array
+            canvases.append(canvas)
+        raw_batch = self.reader.readtext_batched(canvases, batch_size=len(canvases))
+        for (array, future), raw in zip(group, raw_batch):
+            future.set_result(self._to_results(raw, array.shape))
+
+    def _to_results(self, raw_results, shape):
+        results = []
+        for (bbox, text, prob) in raw_results:
+            (tl, tr, br, bl) = bbox
+            if tl[0] >= shape[1] or tl[1] >= shape[0]:
+                continue  # Found in the padding
+            results.append({
+                "detected_text": text,
+                "bounding_box": [int(tl[0]), int(tl[1]), int(br[0] - tl[0]), int(br[1] - tl[1])],
+                "confidence": float(prob),
+                "engine": "easyocr"
+            })
+        return results
+
+    def _run_tesseract(self, image):
+        import pytesseract
+        bundle = as_bundle(image)
+        # Tesseract expects RGB or gray
+        rgb = bundle.rgb if bundle.image.ndim == 3 else bundle.image
+        data = pytesseract.image_to_data(rgb, output_type=pytesseract.Output.DICT)
+        results = []
+        for i in range(len(data['text'])):
+            text = data['text'][i].strip()
+            if text:
+                results.append({
+                    "detected_text": text,
+                    "bounding_box": [data['left'][i], data['top'][i], data['width'][i], data['height'][i]],
+                    "confidence": float(data['conf'][i]) / 100.0,
+                    "engine": "tesseract"
+                })
+        return results
+
+    def stats(self):
+        """Requests, images read, batches run and images dropped past their deadline"""
+        with self.lock:
+            return {
+                "engine": "easyocr" if self.easyocr_available else "tesseract" if self.tesseract_available else None,
+                "workers": len(self.threads),
+                "requests": self.requests,
+                "images": self.images,
+                "batches": self.batches,
+                "expired": self.expired,
+                "queued": self.queue.qsize(),
+            }
+
+    def shutdown(self):
+        for _ in self.threads:
+            self.queue.put((float('-inf'), next(self._seq), None, None))
+        for thread in self.threads:
+            thread.join(timeout=5.0)
+        # Nobody will serve what is still queued
+        while True:
+            try:
+                _, _, _, future = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("OCR service stopped"))
+
+
+# Singleton: every OCR caller in the process shares these warmed-up engines
+_service = None
+_service_lock = threading.Lock()
+
+def get_ocr_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = OCRService()
+        return _service
+
+def reset_ocr_service():
+    """Stop the shared service; the next get_ocr_service() reloads the engines"""
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.shutdown()
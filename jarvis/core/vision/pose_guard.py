@@ -5,8 +5,15 @@ from mediapipe.tasks.python import vision
 import numpy as np
 import os
 
+from .mediapipe_runner import MediaPipeRunner
+
 class PostureGuard:
-    def __init__(self):
+    def __init__(self, running_mode="live_stream", on_result=None):
+        """
+        Args:
+            running_mode: "live_stream" (async, tracked), "video" (sync, tracked) or "image"
+            on_result: fn(result, frame_ts) called with every analyzed frame
+        """
         # Path to the model file
         model_path = os.path.join(os.getcwd(), 'models', 'mediapipe', 'pose_landmarker_lite.task')
         
@@ -15,26 +22,37 @@ class PostureGuard:
             self.landmarker = None
             return
 
-        base_options = python.BaseOptions(model_asset_path=model_path)
-        options = vision.PoseLandmarkerOptions(base_options=base_options)
-        self.landmarker = vision.PoseLandmarker.create_from_options(options)
-        
         self.is_slouching = False
         self.slouch_counter = 0
-        print("PostureGuard: Modern MediaPipe Tasks Landmarker initialized.")
+        # Results are parsed in frame order, so the slouch counter needs no extra lock
+        self.landmarker = MediaPipeRunner(vision.PoseLandmarker, vision.PoseLandmarkerOptions,
+                                          model_path, "detect", self._parse, running_mode, on_result)
+        print(f"PostureGuard: Modern MediaPipe Tasks Landmarker initialized ({running_mode} mode).")
+
+    def submit(self, frame, frame_ts=None):
+        """
+        Queue a frame without waiting (live_stream mode); the result goes to
+        on_result. In video/image mode the frame is analyzed right away.
+        """
+        if self.landmarker is None or frame is None:
+            return None
+        return self.landmarker.submit(frame, frame_ts)
 
-    def check_posture(self, frame):
+    def check_posture(self, frame, frame_ts=None, timeout=1.0):
         """
-        Analyzes the user's posture using modern MediaPipe Tasks.
+        Analyzes the user's posture using modern MediaPipe Tasks (waits for the result).
         """
         if self.landmarker is None or frame is None:
             return {"success": False, "is_slouching": False}
 
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        
-        # Detect pose
-        detection_result = self.landmarker.detect(mp_image)
+        result = self.landmarker.run(frame, frame_ts, timeout)
+        return result or {"success": False, "is_slouching": False}
+
+    def stats(self):
+        return self.landmarker.stats() if self.landmarker else {}
 
+    def _parse(self, detection_result):
+        """Slouch check on a PoseLandmarkerResult (updates the slouch counter)"""
         if detection_result.pose_landmarks:
             # Key points: Nose (0), L Shoulder (11), R Shoulder (12)
             # Use landmark objects from the first detected person
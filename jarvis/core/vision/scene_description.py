@@ -3,10 +3,16 @@ Scene Description - Natural language scene understanding using BLIP
 Generates human-readable descriptions of what's in the camera view
 """
 
+import time
+import threading
+from collections import OrderedDict
+
 import cv2
 import numpy as np
 from PIL import Image
 
+from .frame_bundle import as_bundle
+
 try:
     from transformers import BlipProcessor, BlipForConditionalGeneration
     import torch
@@ -53,19 +59,43 @@ class SceneFuser:
 
 
 class SceneDescriptor:
-    """BLIP-based scene description generator"""
+    """
+    BLIP-based scene description generator
+
+    On CPU the model's Linear layers are dynamically quantized to int8.
+    The vision encoder runs once per frame: its output is kept for the
+    last few frames, so a caption and follow-up prompts on the same frame
+    share one image encoding. Generated text is cached per prompt until a
+    perceptual-hash check says the scene changed (or `max_caption_age`).
+    """
     
-    def __init__(self, model_name="Salesforce/blip-image-captioning-base"):
+    def __init__(self, model_name="Salesforce/blip-image-captioning-base", quantize=True,
+                 max_length=50, scene_change=0.08, max_caption_age=120.0):
         """
         Initialize Scene Descriptor
         
         Args:
             model_name: HuggingFace model name
+            quantize: int8 dynamic quantization when running on CPU
+            max_length: Token limit for generated text
+            scene_change: Fraction of hash bits that must change to invalidate captions
+            max_caption_age: Seconds after which a caption is regenerated anyway
         """
         self.processor = None
         self.model = None
         self.model_name = model_name
         self.device = "cuda" if BLIP_AVAILABLE and hasattr(torch, 'cuda') and torch.cuda.is_available() else "cpu"
+        self.quantize = quantize and self.device == "cpu"
+        self.max_length = max_length
+        self.scene_change = scene_change
+        self.max_caption_age = max_caption_age
+        
+        self.lock = threading.RLock()
+        self.embeddings = OrderedDict()  # frame key -> (frame, image_embeds)
+        self.captions = {}  # prompt -> caption, for the scene of scene_hash
+        self.scene_hash = None
+        self.scene_time = 0.0
+        self.counters = {'encodes': 0, 'generations': 0, 'caption_hits': 0, 'embedding_hits': 0}
         
         if not BLIP_AVAILABLE:
             print("[SceneDescriptor] BLIP not available")
@@ -76,7 +106,7 @@ class SceneDescriptor:
 
     def analyze_luminosity(self, frame):
         """Analyze frame brightness to detect night/dark scenes"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = as_bundle(frame).gray
         avg_brightness = np.mean(gray)
         return "night/dark" if avg_brightness < 40 else "day/bright"
     
@@ -86,19 +116,89 @@ class SceneDescriptor:
             print(f"[SceneDescriptor] Loading {self.model_name}...")
             try:
                 self.processor = BlipProcessor.from_pretrained(self.model_name)
-                self.model = BlipForConditionalGeneration.from_pretrained(self.model_name)
-                self.model.to(self.device)
-                self.model.eval()  # Set to evaluation mode
-                print(f"[SceneDescriptor] Model loaded successfully on {self.device}")
+                model = BlipForConditionalGeneration.from_pretrained(self.model_name)
+                model.eval()  # Set to evaluation mode
+                if self.quantize:
+                    # int8 weights for every Linear layer (most of BLIP's compute on CPU)
+                    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                self.model = model.to(self.device)
+                print(f"[SceneDescriptor] Model loaded successfully on {self.device}"
+                      f"{' (int8)' if self.quantize else ''}")
             except Exception as e:
                 print(f"[SceneDescriptor] Failed to load model: {e}")
+
+    # ---------------------------------------------------------
+    # Caches
+    # ---------------------------------------------------------
+
+    def _check_scene(self, bundle):
+        """Drop cached captions when the scene moved away from the one they describe"""
+        h = bundle.phash
+        now = time.time()
+        if self.scene_hash is not None and h.size == self.scene_hash.size:
+            changed = int(np.unpackbits(np.bitwise_xor(h, self.scene_hash)).sum())
+            if changed <= self.scene_change * h.size * 8 and now - self.scene_time < self.max_caption_age:
+                return False
+        self.captions.clear()
+        self.scene_hash = h
+        self.scene_time = now
+        return True
+
+    def _encode(self, bundle):
+        """
+        Vision-encoder output for a frame, reused only for the very same
+        read-only frame object (captured frames are). Frame ids restart when
+        the camera reopens, so they are not a safe key.
+        """
+        frame = bundle.image
+        key = id(frame) if not frame.flags.writeable else None
+        if key is not None and key in self.embeddings:
+            cached_frame, embeds = self.embeddings[key]
+            if cached_frame is frame:
+                self.counters['embedding_hits'] += 1
+                return embeds
+
+        # OpenCV BGR -> PIL RGB (shared RGB variant of the frame)
+        pixel_values = self.processor(images=Image.fromarray(bundle.rgb), return_tensors="pt").pixel_values
+        with torch.no_grad():
+            embeds = self.model.vision_model(pixel_values=pixel_values.to(self.device))[0]
+        self.counters['encodes'] += 1
+
+        if key is not None:
+            # Holding the frame keeps its id() from being reused while cached
+            self.embeddings[key] = (frame, embeds)
+            while len(self.embeddings) > 4:
+                self.embeddings.popitem(last=False)
+        return embeds
+
+    def _generate(self, image_embeds, prompt=None):
+        """BlipForConditionalGeneration.generate() on an already-encoded image"""
+        config = self.model.config.text_config
+        if prompt:
+            input_ids = self.processor(text=prompt, return_tensors="pt").input_ids.to(self.device)
+        else:
+            input_ids = torch.LongTensor([[self.model.decoder_input_ids, config.eos_token_id]]).to(self.device)
+        input_ids[:, 0] = config.bos_token_id
+        image_mask = torch.ones(image_embeds.size()[:-1], dtype=torch.long, device=image_embeds.device)
+
+        with torch.no_grad():
+            outputs = self.model.text_decoder.generate(
+                input_ids=input_ids[:, :-1],
+                eos_token_id=config.sep_token_id,
+                pad_token_id=config.pad_token_id,
+                encoder_hidden_states=image_embeds,
+                encoder_attention_mask=image_mask,
+                max_length=self.max_length,
+            )
+        self.counters['generations'] += 1
+        return self.processor.decode(outputs[0], skip_special_tokens=True)
     
     def describe(self, frame, prompt=None):
         """
         Generate natural language description of the scene
         
         Args:
-            frame: OpenCV BGR frame
+            frame: OpenCV BGR frame or FrameBundle
             prompt: Optional text prompt to guide generation
             
         Returns:
@@ -120,24 +220,19 @@ class SceneDescriptor:
             }
         
         try:
-            # Convert OpenCV BGR to PIL RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(rgb_frame)
-            
-            # Process image
-            if prompt:
-                # Conditional generation with prompt
-                inputs = self.processor(pil_image, prompt, return_tensors="pt").to(self.device)
-            else:
-                # Unconditional caption generation
-                inputs = self.processor(pil_image, return_tensors="pt").to(self.device)
-            
-            # Generate caption
-            with torch.no_grad():
-                outputs = self.model.generate(**inputs, max_length=50)
-            
-            # Decode caption
-            caption = self.processor.decode(outputs[0], skip_special_tokens=True)
+            bundle = as_bundle(frame)
+            with self.lock:
+                self._check_scene(bundle)
+                if prompt in self.captions:
+                    self.counters['caption_hits'] += 1
+                    return {
+                        'description': self.captions[prompt],
+                        'success': True,
+                        'cached': True
+                    }
+                
+                caption = self._generate(self._encode(bundle), prompt)
+                self.captions[prompt] = caption
             
             return {
                 'description': caption,
@@ -149,6 +244,10 @@ class SceneDescriptor:
                 'description': '',
                 'error': f'Failed to generate description: {str(e)}'
             }
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters, quantized=self.quantize, cached_prompts=len(self.captions))
     
     def describe_detailed(self, frame):
         """
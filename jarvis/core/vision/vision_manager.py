@@ -4,6 +4,8 @@ import threading
 import time
 import numpy as np
 
+from .frame_capture import FrameCapture
+
 class VisionManager:
     _instance = None
     _lock = threading.Lock()
@@ -20,6 +22,7 @@ class VisionManager:
             return
         
         self.cap = None
+        self.capture = None # FrameCapture thread that owns self.cap while active
         self.active_camera_index = None
         self.available_cameras = []
         self._available_cameras_cache = None # Cache for scanned camera indices
@@ -80,9 +83,10 @@ class VisionManager:
         self.available_cameras.sort(reverse=True)
         return self.available_cameras[0]
 
-    def open_vision(self):
+    def open_vision(self, source=None):
         """
-        Opens the best available camera.
+        Opens the best available camera, or `source` (anything with read(),
+        e.g. a VideoFileSource or SyntheticVideoSource) instead.
         Returns:
             dict: {"success": bool, "message": str, "camera_type": str}
         """
@@ -94,6 +98,17 @@ class VisionManager:
                     "camera_type": "current"
                 }
 
+            if source is not None:
+                self.cap = source
+                self.active_camera_index = None
+                self.is_active = True
+                self._start_capture()
+                return {
+                    "success": True,
+                    "message": "Using video source.",
+                    "camera_type": "source"
+                }
+
             best_index = self.select_best_camera()
             
             if best_index is None:
@@ -113,6 +128,7 @@ class VisionManager:
                 if self.cap.isOpened():
                     self.active_camera_index = best_index
                     self.is_active = True
+                    self._start_capture()
                     
                     # Determine type for feedback
                     cam_type = "external vision module" if best_index > 0 else "internal camera"
@@ -146,6 +162,9 @@ class VisionManager:
                 return
             
             print("VisionManager: Releasing camera resources...")
+            if self.capture is not None:
+                self.capture.stop()
+                self.capture = None
             if self.cap is not None:
                 try:
                     self.cap.release()
@@ -160,57 +179,49 @@ class VisionManager:
             cv2.destroyAllWindows()
             print("VisionManager: Resources fully purged.")
 
-    def get_frame(self):
-        """Returns the current frame, or None if failed"""
-        if not self.is_active or self.cap is None or not self.cap.isOpened():
+    def _start_capture(self):
+        self.capture = FrameCapture(self.cap)
+        self.capture.start()
+
+    def next_frame(self, after_id=0, timeout=1.0):
+        """Newest FrameBundle (image, frame_id, timestamp, variants) newer than after_id, or None"""
+        capture = self.capture
+        if not self.is_active or capture is None:
             return None
-        
-        try:
-            ret, frame = self.cap.read()
-            if ret:
-                return frame
-            else:
-                return None
-        except Exception as e:
-            print(f"VisionManager: Frame read error: {e}")
+        return capture.wait_for(after_id, timeout)
+
+    def wait_ready(self, frames=10, timeout=2.0):
+        """Wait until `frames` frames were captured (lets auto-exposure settle after opening)"""
+        capture = self.capture
+        if capture is None:
+            return False
+        return capture.wait_for(frames - 1, timeout) is not None
+
+    def get_frame(self):
+        """Returns the latest frame (read-only, shared; copy before drawing), or None if failed"""
+        capture = self.capture
+        if not self.is_active or capture is None:
             return None
+        frame = capture.latest() or capture.wait_for(0, timeout=1.0)
+        return frame.image if frame is not None else None
 
-    def get_stable_frame(self, sample_count=4, delay=0.04):
+    def get_stable_frame(self, sample_count=4, delay=None, bundle=False):
         """
-        Captures multiple frames and returns the sharpest one.
-        Technique: Variance of Laplacian.
-        Optimized for JARVIS: reduced default sample count for speed.
+        Returns the sharpest of the last `sample_count` captured frames
+        (its FrameBundle with bundle=True, keeping the gray variant it was scored on).
+        Technique: Variance of Laplacian. The frames already sit in the capture
+        ring, so this takes no extra capture time.
         """
-        if not self.is_active or self.cap is None:
+        capture = self.capture
+        if not self.is_active or capture is None:
             return None
-            
-        frames = []
-        with self.camera_lock:
-            for _ in range(sample_count):
-                frame = self.get_frame()
-                if frame is not None:
-                    frames.append(frame)
-                time.sleep(delay)
-                
-        if not frames:
+        
+        best = capture.sharpest(sample_count)
+        if best is None:
             return None
-            
-        # Calculate sharpness for each frame
-        best_frame = frames[0]
-        max_sharpness = 0
         
-        for f in frames:
-            try:
-                gray = cv2.cvtColor(f, cv2.COLOR_BGR2GRAY)
-                sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
-                if sharpness > max_sharpness:
-                    max_sharpness = sharpness
-                    best_frame = f
-            except Exception:
-                continue
-                
-        print(f"VisionManager: Selected sharpest frame (Score: {max_sharpness:.2f}) from {len(frames)} samples.")
-        return best_frame
+        print(f"VisionManager: Selected sharpest frame (Score: {best.sharpness:.2f}) from last {sample_count} frames.")
+        return best if bundle else best.image
 
     def get_status_message(self):
         if not self.is_active:
@@ -0,0 +1,283 @@
+"""
+Vision Scheduler - Multi-rate analyzers over the latest camera frame
+Each analyzer runs on its own worker at its own target rate, so a slow
+model (BLIP, DeepFace) never holds back a fast one (gestures, YOLO).
+"""
+
+import time
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class Analyzer:
+    """One vision task: fn(frame, frame_ts) -> result, run at `rate` Hz (None = on demand)"""
+
+    def __init__(self, name, fn, rate=None, on_result=None, enabled=True):
+        self.name = name
+        self.fn = fn
+        self.rate = rate
+        self.on_result = on_result  # fn(result, frame, frame_ts)
+        self.enabled = enabled
+
+        self.requested = False
+        self.next_due = 0.0
+        self.last_seq = 0
+        self.thread = None
+
+        # Counters
+        self.runs = 0
+        self.errors = 0
+        self.skipped_frames = 0
+        self.last_latency = 0.0
+        self.avg_latency = 0.0
+        self.frame_age = 0.0  # Completion time minus capture time of the frame it used
+        self.completions = deque(maxlen=30)
+
+    def fps(self):
+        if len(self.completions) < 2:
+            return 0.0
+        span = self.completions[-1] - self.completions[0]
+        return (len(self.completions) - 1) / span if span > 0 else 0.0
+
+
+class VisionScheduler:
+    """
+    Latest-frame scheduler for vision analyzers.
+
+    submit_frame() publishes a frame (it replaces, never queues). Every
+    analyzer's worker wakes when it is due and a newer frame exists, runs on
+    that newest frame and records (frame_ts, result); frames that arrived in
+    between are simply skipped. On-demand analyzers run only on request().
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.analyzers = {}
+        self.results = {}  # name -> (frame_ts, result, completed_at)
+        self.frame = None
+        self.frame_ts = 0.0
+        self.seq = 0
+        self.running = False
+
+    # ---------------------------------------------------------
+    # Configuration
+    # ---------------------------------------------------------
+
+    def add_analyzer(self, name, fn, rate=None, on_result=None, enabled=True):
+        analyzer = Analyzer(name, fn, rate, on_result, enabled)
+        with self.cond:
+            self.analyzers[name] = analyzer
+        if self.running:
+            self._start_worker(analyzer)
+        return analyzer
+
+    def set_rate(self, name, rate):
+        """Target runs per second (None = on demand only)"""
+        with self.cond:
+            self.analyzers[name].rate = rate
+            self.cond.notify_all()
+
+    def set_enabled(self, name, enabled):
+        with self.cond:
+            analyzer = self.analyzers[name]
+            if analyzer.enabled != enabled:
+                analyzer.enabled = enabled
+                self.cond.notify_all()
+
+    # ---------------------------------------------------------
+    # Frames and results
+    # ---------------------------------------------------------
+
+    def submit_frame(self, frame, frame_ts=None):
+        """Publish the newest frame; analyzers must treat it as read-only"""
+        with self.cond:
+            self.frame = frame
+            self.frame_ts = time.time() if frame_ts is None else frame_ts
+            self.seq += 1
+            self.cond.notify_all()
+
+    def latest_frame(self):
+        with self.cond:
+            return self.frame, self.frame_ts
+
+    def result(self, name):
+        """(frame_ts, result) of the analyzer's latest run, or (0.0, None)"""
+        with self.cond:
+            frame_ts, result, _ = self.results.get(name, (0.0, None, 0.0))
+            return frame_ts, result
+
+    def request(self, name, timeout=None):
+        """
+        Run an analyzer on the latest frame as soon as possible.
+        With a timeout, wait for that run and return its result (None on timeout).
+        """
+        with self.cond:
+            analyzer = self.analyzers[name]
+            runs = analyzer.runs + analyzer.errors
+            analyzer.requested = True
+            self.cond.notify_all()
+            if timeout is None:
+                return None
+            if self.cond.wait_for(lambda: analyzer.runs + analyzer.errors > runs or not self.running, timeout):
+                if analyzer.runs + analyzer.errors > runs and name in self.results:
+                    return self.results[name][1]
+            return None
+
+    # ---------------------------------------------------------
+    # Workers
+    # ---------------------------------------------------------
+
+    def start(self):
+        with self.cond:
+            if self.running:
+                return
+            self.running = True
+            analyzers = list(self.analyzers.values())
+        for analyzer in analyzers:
+            self._start_worker(analyzer)
+
+    def stop(self, timeout=2.0):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+            threads = [a.thread for a in self.analyzers.values() if a.thread]
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        for analyzer in self.analyzers.values():
+            analyzer.thread = None
+
+    def _start_worker(self, analyzer):
+        if analyzer.thread is None:
+            analyzer.thread = threading.Thread(target=self._run, args=(analyzer,),
+                                               name=f"vision-{analyzer.name}", daemon=True)
+            analyzer.thread.start()
+
+    def _next_job(self, analyzer):
+        """Wait (holding the condition) until the analyzer should run; None when stopping"""
+        while self.running:
+            if analyzer.requested and self.frame is not None:
+                return True
+            if analyzer.enabled and analyzer.rate and self.seq > analyzer.last_seq:
+                wait = analyzer.next_due - time.monotonic()
+                if wait <= 0:
+                    return True
+                self.cond.wait(wait)
+            else:
+                self.cond.wait()
+        return None
+
+    def _run(self, analyzer):
+        while True:
+            with self.cond:
+                if self._next_job(analyzer) is None:
+                    return
+                frame, frame_ts, seq = self.frame, self.frame_ts, self.seq
+                if analyzer.last_seq:
+                    analyzer.skipped_frames += max(0, seq - analyzer.last_seq - 1)
+                analyzer.last_seq = seq
+                analyzer.requested = False
+                start = time.monotonic()
+                if analyzer.rate:
+                    analyzer.next_due = start + 1.0 / analyzer.rate
+
+            try:
+                result = analyzer.fn(frame, frame_ts)
+            except Exception as e:
+                print(f"VisionScheduler: {analyzer.name} failed: {e}")
+                with self.cond:
+                    analyzer.errors += 1
+                    self.cond.notify_all()
+                continue
+
+            latency = time.monotonic() - start
+            with self.cond:
+                analyzer.runs += 1
+                analyzer.last_latency = latency
+                analyzer.avg_latency = latency if analyzer.runs == 1 else 0.9 * analyzer.avg_latency + 0.1 * latency
+                analyzer.frame_age = time.time() - frame_ts
+                analyzer.completions.append(time.monotonic())
+                self.results[analyzer.name] = (frame_ts, result, time.time())
+                self.cond.notify_all()
+
+            if analyzer.on_result:
+                try:
+                    analyzer.on_result(result, frame, frame_ts)
+                except Exception as e:
+                    print(f"VisionScheduler: {analyzer.name} result handler failed: {e}")
+
+    def stats(self):
+        """Per-analyzer rate and latency counters"""
+        with self.cond:
+            return {
+                name: {
+                    "enabled": a.enabled,
+                    "target_fps": a.rate,
+                    "fps": round(a.fps(), 2),
+                    "runs": a.runs,
+                    "errors": a.errors,
+                    "skipped_frames": a.skipped_frames,
+                    "latency_ms": round(a.last_latency * 1000, 1),
+                    "avg_latency_ms": round(a.avg_latency * 1000, 1),
+                    "frame_age_ms": round(a.frame_age * 1000, 1),
+                }
+                for name, a in self.analyzers.items()
+            }
+
+
+class SyntheticVideoSource:
+    """
+    Fake camera with the CameraManager interface (and cv2.VideoCapture's
+    read()): a square moving across a dark frame at `fps`. The frame index is written into the first pixel
+    row so tests can tell which frame an analyzer saw.
+    """
+
+    def __init__(self, fps=30, size=(480, 640), realtime=True):
+        self.fps = fps
+        self.size = size
+        self.realtime = realtime
+        self.index = 0
+        self.start_time = None
+        self.is_active = False
+
+    def open_camera(self, camera_id=0):
+        self.is_active = True
+        self.index = 0
+        self.start_time = time.monotonic()
+        return True
+
+    def close_camera(self):
+        self.is_active = False
+
+    def get_frame(self):
+        if not self.is_active:
+            return None
+        if self.realtime:
+            delay = self.start_time + self.index / self.fps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        h, w = self.size
+        frame = np.full((h, w, 3), 20, dtype=np.uint8)
+        x = (self.index * 8) % max(1, w - 60)
+        frame[h // 2 - 30:h // 2 + 30, x:x + 60] = (0, 200, 255)
+        frame[0, :4, 0] = np.frombuffer(np.uint32(self.index).tobytes(), dtype=np.uint8)
+        self.index += 1
+        return frame
+
+    # cv2.VideoCapture-style interface, for FrameCapture
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if not self.is_active:
+            self.open_camera()
+        return True, self.get_frame()
+
+    def release(self):
+        self.close_camera()
+
+    @staticmethod
+    def frame_index(frame):
+        return int(np.frombuffer(frame[0, :4, 0].tobytes(), dtype=np.uint32)[0])
@@ -0,0 +1,421 @@
+"""
+YOLO Backend - Exported YOLO11 models with a per-frame latency budget
+Each tier is exported once (ONNX with a dynamic batch/size axis, or
+OpenVINO) into models/yolo/ and reused from there; a ladder of
+(tier, imgsz) configurations is walked down or up to stay within budget.
+"""
+
+import os
+import ast
+import json
+import time
+import shutil
+import threading
+
+import numpy as np
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+try:
+    import openvino  # noqa: F401 (used through ultralytics)
+    OPENVINO_AVAILABLE = True
+except ImportError:
+    OPENVINO_AVAILABLE = False
+
+try:
+    from ultralytics import YOLO
+    YOLO_AVAILABLE = True
+except ImportError:
+    YOLO_AVAILABLE = False
+
+
+TIERS = ("n", "s", "m", "x")
+IMGSZ_CHOICES = (640, 512, 416, 320)
+
+# Relative cost of each tier at 640 (YOLO11 GFLOPs)
+TIER_GFLOPS = {"n": 6.5, "s": 21.5, "m": 68.0, "x": 194.9}
+
+
+def rung_cost(tier, imgsz):
+    """Estimated relative cost of one inference (GFLOPs scale with image area)"""
+    return TIER_GFLOPS[tier] * (imgsz / 640.0) ** 2
+
+
+def build_ladder(tiers=TIERS, sizes=IMGSZ_CHOICES):
+    """All (tier, imgsz) configurations, most expensive (most accurate) first"""
+    return sorted(((t, s) for t in tiers for s in sizes), key=lambda r: rung_cost(*r), reverse=True)
+
+
+def parse_model_name(model_name):
+    """'yolo11x.pt' -> 'x' (None if the name is not a YOLO11 tier)"""
+    stem = os.path.splitext(os.path.basename(model_name))[0]
+    if stem.startswith("yolo11") and stem[6:] in TIERS:
+        return stem[6:]
+    return None
+
+
+# ---------------------------------------------------------
+# Pre / post processing
+# ---------------------------------------------------------
+
+def _resize(image, width, height):
+    if CV2_AVAILABLE:
+        return cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+    rows = (np.arange(height) * image.shape[0] / height).astype(np.intp)
+    cols = (np.arange(width) * image.shape[1] / width).astype(np.intp)
+    return image[rows][:, cols]
+
+
+def letterbox(image, size):
+    """
+    Fit a BGR frame into a size x size square (aspect kept, grey padding).
+    Returns (CHW float32 RGB in 0..1, scale, (pad_x, pad_y)).
+    """
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    nh, nw = int(round(h * scale)), int(round(w * scale))
+    pad_y, pad_x = (size - nh) // 2, (size - nw) // 2
+
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[pad_y:pad_y + nh, pad_x:pad_x + nw] = _resize(image, nw, nh)
+    blob = canvas[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return blob, scale, (pad_x, pad_y)
+
+
+def box_iou(box, boxes):
+    """IoU of one xyxy box against an (N, 4) array"""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def nms(boxes, scores, iou_threshold=0.45):
+    """Indices kept by greedy non-maximum suppression, best first"""
+    order = np.argsort(-scores)
+    keep = []
+    while len(order):
+        best = order[0]
+        keep.append(best)
+        if len(order) == 1:
+            break
+        rest = order[1:]
+        order = rest[box_iou(boxes[best], boxes[rest]) <= iou_threshold]
+    return np.array(keep, dtype=np.intp)
+
+
+def decode_predictions(pred, names, conf_threshold, scale, pad, shape, iou_threshold=0.45, max_det=100):
+    """
+    One image of a YOLO11 export output, (4 + classes, anchors) with boxes
+    as cx, cy, w, h in letterbox pixels, into detect() detail dicts.
+    """
+    pred = pred.T
+    scores = pred[:, 4:]
+    cls = scores.argmax(axis=1)
+    conf = scores[np.arange(len(cls)), cls]
+    mask = conf >= conf_threshold
+    if not mask.any():
+        return []
+    pred, cls, conf = pred[mask], cls[mask], conf[mask]
+
+    boxes = np.empty((len(pred), 4), dtype=np.float32)
+    boxes[:, 0] = pred[:, 0] - pred[:, 2] / 2
+    boxes[:, 1] = pred[:, 1] - pred[:, 3] / 2
+    boxes[:, 2] = pred[:, 0] + pred[:, 2] / 2
+    boxes[:, 3] = pred[:, 1] + pred[:, 3] / 2
+
+    # Class-aware NMS in one pass: shift each class into its own region
+    offsets = cls[:, None].astype(np.float32) * 4096.0
+    keep = nms(boxes + offsets, conf, iou_threshold)[:max_det]
+
+    h, w = shape[:2]
+    boxes = boxes[keep]
+    boxes[:, [0, 2]] = np.clip((boxes[:, [0, 2]] - pad[0]) / scale, 0, w)
+    boxes[:, [1, 3]] = np.clip((boxes[:, [1, 3]] - pad[1]) / scale, 0, h)
+
+    details = []
+    for box, c, p in zip(boxes, cls[keep], conf[keep]):
+        details.append({
+            'name': names.get(int(c), f"class_{int(c)}"),
+            'confidence': float(p),
+            'bbox': tuple(int(v) for v in box)
+        })
+    return details
+
+
+# ---------------------------------------------------------
+# Backends: infer(frames, imgsz, conf) -> one detail list per frame
+# ---------------------------------------------------------
+
+class OnnxYoloBackend:
+    """ONNX Runtime session over an export with dynamic batch and image size"""
+
+    name = "onnx"
+
+    def __init__(self, model_path, num_threads=None):
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider")
+                     if p in ort.get_available_providers()]
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+
+        meta = self.session.get_modelmeta().custom_metadata_map
+        try:
+            self.names = {int(k): v for k, v in ast.literal_eval(meta.get("names", "{}")).items()}
+        except (ValueError, SyntaxError):
+            self.names = {}
+
+    def infer(self, frames, imgsz, conf):
+        blobs, transforms = [], []
+        for frame in frames:
+            blob, scale, pad = letterbox(frame, imgsz)
+            blobs.append(blob)
+            transforms.append((scale, pad, frame.shape))
+        output = self.session.run(None, {self.input_name: np.stack(blobs)})[0]
+        return [decode_predictions(pred, self.names, conf, scale, pad, shape)
+                for pred, (scale, pad, shape) in zip(output, transforms)]
+
+
+class UltralyticsYoloBackend:
+    """Any model ultralytics can load: .pt on torch, or an OpenVINO export directory"""
+
+    def __init__(self, model_path, name="torch"):
+        self.name = name
+        self.model = YOLO(model_path, task="detect")
+        if name == "torch":
+            import torch
+            self.model.to("cuda" if torch.cuda.is_available() else "cpu")
+
+    def infer(self, frames, imgsz, conf):
+        results = self.model(list(frames), imgsz=imgsz, conf=conf, verbose=False)
+        batch = []
+        for result in results:
+            details = []
+            for box in result.boxes:
+                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
+                details.append({
+                    'name': self.model.names[int(box.cls[0])],
+                    'confidence': float(box.conf[0]),
+                    'bbox': (x1, y1, x2, y2)
+                })
+            batch.append(details)
+        return batch
+
+
+def pick_backend(backend="auto"):
+    """Resolve 'auto' to the fastest runtime installed"""
+    if backend != "auto":
+        return backend
+    if ORT_AVAILABLE:
+        return "onnx"
+    if OPENVINO_AVAILABLE and YOLO_AVAILABLE:
+        return "openvino"
+    return "torch"
+
+
+def export_model(tier, backend, cache_dir):
+    """
+    Path of the cached export of yolo11<tier> for `backend`, exporting it on
+    first use. Exports keep dynamic batch and image size, so every imgsz of
+    a tier shares one file.
+    """
+    weights = f"yolo11{tier}.pt"
+    if backend == "torch":
+        return weights
+
+    suffix = ".onnx" if backend == "onnx" else "_openvino_model"
+    target = os.path.join(cache_dir, f"yolo11{tier}{suffix}")
+    if os.path.exists(target):
+        return target
+    if not YOLO_AVAILABLE:
+        raise RuntimeError(f"{target} is missing and ultralytics is not installed to export it")
+
+    print(f"[YOLOBackend] Exporting {weights} to {backend} (one-time)...")
+    start = time.perf_counter()
+    exported = YOLO(weights).export(format=backend, dynamic=True, imgsz=640, half=False)
+    os.makedirs(cache_dir, exist_ok=True)
+    shutil.move(str(exported), target)
+    print(f"[YOLOBackend] Cached {target} in {time.perf_counter() - start:.1f}s")
+    return target
+
+
+# ---------------------------------------------------------
+# Latency budget
+# ---------------------------------------------------------
+
+class LatencyBudget:
+    """
+    Picks the most accurate (tier, imgsz) that fits `budget_ms`.
+
+    Measured latencies are kept per rung (EMA) and persisted, so the next
+    start goes straight to a rung that fits. Unmeasured rungs are estimated
+    from the nearest measured one by relative cost. After `patience`
+    over-budget runs the ladder steps down; every `probe_every` runs it
+    re-checks whether a more accurate rung would now fit.
+    """
+
+    def __init__(self, budget_ms, ladder=None, profile_path=None, headroom=0.9,
+                 patience=3, probe_every=100, start=("s", 640)):
+        self.budget_ms = budget_ms
+        self.ladder = ladder or build_ladder()
+        self.profile_path = profile_path
+        self.headroom = headroom
+        self.patience = patience
+        self.probe_every = probe_every
+        self.profile = self._load_profile()
+
+        self.over_budget = 0
+        self.runs = 0
+        self.current = self.select(default=start if start in self.ladder else self.ladder[-1])
+
+    def _load_profile(self):
+        if self.profile_path and os.path.exists(self.profile_path):
+            try:
+                with open(self.profile_path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def save(self):
+        if not self.profile_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
+            with open(self.profile_path, 'w') as f:
+                json.dump(self.profile, f, indent=2)
+        except OSError as e:
+            print(f"[YOLOBackend] Could not save latency profile: {e}")
+
+    @staticmethod
+    def key(rung):
+        return f"{rung[0]}_{rung[1]}"
+
+    def estimate(self, rung):
+        """Expected ms per frame for a rung (None when nothing has been measured)"""
+        measured = self.profile.get(self.key(rung))
+        if measured is not None:
+            return measured
+        known = [(r, self.profile[self.key(r)]) for r in self.ladder if self.key(r) in self.profile]
+        if not known:
+            return None
+        # Prefer a measurement of the same tier (same network, only the image size differs)
+        same_tier = [(r, ms) for r, ms in known if r[0] == rung[0]]
+        ref, ms = min(same_tier or known, key=lambda item: abs(np.log(rung_cost(*item[0]) / rung_cost(*rung))))
+        return ms * rung_cost(*rung) / rung_cost(*ref)
+
+    def select(self, default=None):
+        """Most accurate rung whose estimate fits the budget (cheapest if none fits)"""
+        limit = self.budget_ms * self.headroom
+        estimates = [(r, self.estimate(r)) for r in self.ladder]
+        if all(ms is None for _, ms in estimates):
+            return default or self.ladder[-1]
+        for rung, ms in estimates:
+            if ms is not None and ms <= limit:
+                return rung
+        return self.ladder[-1]
+
+    def record(self, rung, latency_ms, frames=1):
+        """Feed one measured inference; returns the rung to use next"""
+        per_frame = latency_ms / max(1, frames)
+        key = self.key(rung)
+        previous = self.profile.get(key)
+        self.profile[key] = per_frame if previous is None else 0.8 * previous + 0.2 * per_frame
+        self.runs += 1
+
+        if self.profile[key] > self.budget_ms:
+            self.over_budget += 1
+        else:
+            self.over_budget = 0
+
+        if self.over_budget >= self.patience or self.runs % self.probe_every == 0:
+            self.over_budget = 0
+            choice = self.select(default=rung)
+            if choice != self.current:
+                print(f"[YOLOBackend] {self.key(self.current)} -> {self.key(choice)} "
+                      f"({self.profile[key]:.0f}ms/frame, budget {self.budget_ms:.0f}ms)")
+                self.current = choice
+                self.save()
+        return self.current
+
+
+# ---------------------------------------------------------
+# Micro-batching
+# ---------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Coalesces concurrent run(item) calls into one run_batch(items) call.
+    The first caller becomes the leader: it waits up to `max_wait` for
+    others to queue, runs the batch and hands every caller its result.
+    """
+
+    def __init__(self, run_batch, max_batch=8, max_wait=0.004):
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.cond = threading.Condition()
+        self.pending = []
+        self.leader_active = False
+
+        self.batches = 0
+        self.items = 0
+
+    def run(self, item):
+        slot = {"item": item, "done": False, "result": None, "error": None}
+        with self.cond:
+            self.pending.append(slot)
+            self.cond.notify_all()
+            if self.leader_active:
+                self.cond.wait_for(lambda: slot["done"])
+                return self._unwrap(slot)
+            self.leader_active = True
+
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: len(self.pending) >= self.max_batch, self.max_wait)
+                batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+            self._run(batch)
+            with self.cond:
+                # Hand off leadership under the lock so no late caller is left waiting
+                if slot["done"] and not self.pending:
+                    self.leader_active = False
+                    self.cond.notify_all()
+                    break
+        return self._unwrap(slot)
+
+    def _run(self, batch):
+        try:
+            results = self.run_batch([slot["item"] for slot in batch])
+            error = None
+        except Exception as e:
+            results, error = [None] * len(batch), e
+        with self.cond:
+            for slot, result in zip(batch, results):
+                slot["result"], slot["error"], slot["done"] = result, error, True
+            self.batches += 1
+            self.items += len(batch)
+            self.cond.notify_all()
+
+    @staticmethod
+    def _unwrap(slot):
+        if slot["error"] is not None:
+            raise slot["error"]
+        return slot["result"]
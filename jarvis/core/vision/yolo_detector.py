@@ -3,64 +3,158 @@ YOLO Detector - Object detection using YOLO11
 Real-time object detection and tracking
 """
 
+import os
+import time
+import threading
 import cv2
 from pathlib import Path
 
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
-    print("[YOLODetector] Warning: ultralytics not installed. Object detection disabled.")
+from .frame_bundle import as_image
+from .yolo_backend import (
+    YOLO_AVAILABLE, ORT_AVAILABLE, TIERS, IMGSZ_CHOICES,
+    OnnxYoloBackend, UltralyticsYoloBackend, LatencyBudget, MicroBatcher,
+    build_ladder, export_model, parse_model_name, pick_backend
+)
+
+if not (YOLO_AVAILABLE or ORT_AVAILABLE):
+    print("[YOLODetector] Warning: neither ultralytics nor onnxruntime installed. Object detection disabled.")
+
+DEFAULT_BUDGET_MS = 120
 
 
 class YOLODetector:
     """YOLO11 object detection wrapper"""
     
-    def __init__(self, model_name="yolo11x.pt"):
+    def __init__(self, model_name=None, budget_ms=None, backend="auto", imgsz=640,
+                 cache_dir=None, max_batch=8):
         """
         Initialize YOLO detector
         
         Args:
-            model_name: YOLO model to use (yolo11n, yolo11s, yolo11m, yolo11l, yolo11x)
+            model_name: Fixed YOLO model (yolo11n, yolo11s, yolo11m, yolo11x). When
+                omitted, the tier and input size are picked to fit budget_ms.
             'n' = nano (fastest), 'm' = medium (balanced), 'x' = extra large (accurate)
+            budget_ms: Per-frame latency budget (default DEFAULT_BUDGET_MS without model_name)
+            backend: "onnx", "openvino", "torch" or "auto" (fastest installed)
+            imgsz: Input size for a fixed model
+            cache_dir: Where exported models and the latency profile live
         """
-        self.model = None
-        self.model_name = model_name
+        self.backend_name = pick_backend(backend)
+        self.cache_dir = cache_dir or os.path.join(os.getcwd(), 'models', 'yolo')
+        self.backends = {}  # tier -> loaded backend
+        self.failed_tiers = set()
         self.failed_to_load = False # CIRCUIT BREAKER
+        self.load_lock = threading.Lock()
+
+        tier = parse_model_name(model_name) if model_name else None
+        if model_name and tier is None:
+            print(f"[YOLODetector] Unknown model {model_name}, using the latency budget instead")
+        if budget_ms is None and tier is None:
+            budget_ms = DEFAULT_BUDGET_MS
+
+        if budget_ms is not None:
+            tiers = (tier,) if tier else TIERS
+            profile = os.path.join(self.cache_dir, f"latency_{self.backend_name}.json")
+            self.budget = LatencyBudget(budget_ms, build_ladder(tiers, IMGSZ_CHOICES), profile)
+        else:
+            self.budget = None
+            self.fixed = (tier, imgsz)
+
+        self.batcher = MicroBatcher(self._run_batch, max_batch=max_batch)
+        self.inferences = 0
+        self.last_latency_ms = 0.0
         
-        if not YOLO_AVAILABLE:
+        if not (YOLO_AVAILABLE or ORT_AVAILABLE):
             print("[YOLODetector] YOLO not available")
             return
         
         # Lazy loading - load on first detection
-        print(f"[YOLODetector] Initialized (model will load on first use)")
+        tier, size = self.current_config()
+        print(f"[YOLODetector] Initialized: {self.backend_name} backend, yolo11{tier}@{size} "
+              f"(budget {budget_ms}ms, model will load on first use)")
+
+    @property
+    def model_name(self):
+        return f"yolo11{self.current_config()[0]}.pt"
+
+    @property
+    def model(self):
+        return self.backends.get(self.current_config()[0])
+
+    def current_config(self):
+        """(tier, imgsz) the next inference will use"""
+        return self.budget.current if self.budget else self.fixed
     
-    def _load_model(self):
-        """Lazy load YOLO model with GPU acceleration"""
-        if self.model is None and YOLO_AVAILABLE and not self.failed_to_load:
-            print(f"[YOLODetector] Loading {self.model_name} on CUDA...")
+    def _load_model(self, tier=None):
+        """Lazy load (exporting on first use) the backend of a tier"""
+        tier = tier or self.current_config()[0]
+        with self.load_lock:
+            if tier in self.backends or tier in self.failed_tiers or self.failed_to_load:
+                return self.backends.get(tier)
+            start = time.perf_counter()
             try:
-                # Force CUDA if available, fallback to CPU
-                import torch
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                self.model = YOLO(self.model_name)
-                self.model.to(device)
-                print(f"[YOLODetector] Model loaded successfully on {device}")
+                if self.backend_name == "onnx":
+                    backend = OnnxYoloBackend(export_model(tier, "onnx", self.cache_dir))
+                else:
+                    path = export_model(tier, self.backend_name, self.cache_dir)
+                    backend = UltralyticsYoloBackend(path, self.backend_name)
+                self.backends[tier] = backend
+                print(f"[YOLODetector] yolo11{tier} loaded on {self.backend_name} "
+                      f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+                return backend
             except Exception as e:
-                print(f"[YOLODetector] Failed to load model: {e}")
+                print(f"[YOLODetector] Failed to load yolo11{tier}: {e}")
                 if "failed reading zip archive" in str(e).lower() or "central directory" in str(e).lower():
                     print("[YOLODetector] CRITICAL: Model file is corrupted.")
-                    self.failed_to_load = True # Stop trying
-                # Set a temporary cooldown or flag to avoid spam
-                self.failed_to_load = True 
+                self.failed_tiers.add(tier)
+                if self.budget:
+                    # Drop the tier from the ladder; give up once nothing is left
+                    self.budget.ladder = [r for r in self.budget.ladder if r[0] != tier]
+                    if self.budget.ladder:
+                        self.budget.current = self.budget.select(default=self.budget.ladder[-1])
+                        return None
+                self.failed_to_load = True # Stop trying
+                return None
+
+    def _run_batch(self, items):
+        """MicroBatcher callback: items are (frame, confidence_threshold)"""
+        backend = None
+        while backend is None and not self.failed_to_load:
+            tier, imgsz = self.current_config()
+            backend = self._load_model(tier)
+        if backend is None:
+            return [None] * len(items)
+
+        conf = min(c for _, c in items)
+        start = time.perf_counter()
+        batch = backend.infer([frame for frame, _ in items], imgsz, conf)
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.inferences += len(items)
+        self.last_latency_ms = latency_ms
+        if self.budget:
+            self.budget.record((tier, imgsz), latency_ms, len(items))
+
+        # One threshold per batch: callers asking for more confidence filter their own
+        return [[d for d in details if d['confidence'] >= c] for details, (_, c) in zip(batch, items)]
+
+    @staticmethod
+    def _result(details, error=None):
+        if error is not None:
+            return {'objects': [], 'count': 0, 'details': [], 'error': error}
+        return {
+            'objects': [d['name'] for d in details],
+            'count': len(details),
+            'details': details
+        }
     
     def detect(self, frame, confidence_threshold=0.45):
         """
         Detect objects in frame
         
+        Calls from several threads at once are batched into one inference.
+        
         Args:
-            frame: OpenCV BGR frame
+            frame: OpenCV BGR frame or FrameBundle
             confidence_threshold: Minimum confidence (0.0-1.0)
             
         Returns:
@@ -69,62 +163,45 @@ class YOLODetector:
                 - count: total count
                 - details: list of dicts with name, confidence, bbox
         """
-        if not YOLO_AVAILABLE:
-            return {
-                'objects': [],
-                'count': 0,
-                'details': [],
-                'error': 'YOLO not available'
-            }
-        
-        # Load model if not loaded
-        self._load_model()
-        
-        if self.model is None:
-            return {
-                'objects': [],
-                'count': 0,
-                'details': [],
-                'error': 'Model failed to load'
-            }
+        if not (YOLO_AVAILABLE or ORT_AVAILABLE):
+            return self._result([], 'YOLO not available')
+        if self.failed_to_load:
+            return self._result([], 'Model failed to load')
         
         try:
-            # Run inference
-            results = self.model(frame, verbose=False, conf=confidence_threshold)
-            
-            objects = []
-            details = []
-            
-            for result in results:
-                for box in result.boxes:
-                    # Get box coordinates
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                    
-                    # Get confidence and class
-                    conf = float(box.conf[0])
-                    cls = int(box.cls[0])
-                    label = self.model.names[cls]
-                    
-                    objects.append(label)
-                    details.append({
-                        'name': label,
-                        'confidence': conf,
-                        'bbox': (x1, y1, x2, y2)
-                    })
-            
-            return {
-                'objects': objects,
-                'count': len(objects),
-                'details': details
-            }
-            
+            details = self.batcher.run((as_image(frame), confidence_threshold))
         except Exception as e:
-            return {
-                'objects': [],
-                'count': 0,
-                'details': [],
-                'error': str(e)
-            }
+            return self._result([], str(e))
+        if details is None:
+            return self._result([], 'Model failed to load')
+        return self._result(details)
+
+    def detect_batch(self, frames, confidence_threshold=0.45):
+        """detect() over several frames or crops in one inference; one result per frame"""
+        if not frames:
+            return []
+        if not (YOLO_AVAILABLE or ORT_AVAILABLE):
+            return [self._result([], 'YOLO not available') for _ in frames]
+        try:
+            batch = []
+            for i in range(0, len(frames), self.batcher.max_batch):
+                chunk = frames[i:i + self.batcher.max_batch]
+                batch.extend(self._run_batch([(as_image(f), confidence_threshold) for f in chunk]))
+        except Exception as e:
+            return [self._result([], str(e)) for _ in frames]
+        return [self._result(d) if d is not None else self._result([], 'Model failed to load') for d in batch]
+
+    def stats(self):
+        tier, imgsz = self.current_config()
+        return {
+            'backend': self.backend_name,
+            'tier': tier,
+            'imgsz': imgsz,
+            'budget_ms': self.budget.budget_ms if self.budget else None,
+            'last_latency_ms': round(self.last_latency_ms, 1),
+            'inferences': self.inferences,
+            'batches': self.batcher.batches,
+        }
     
     def detect_and_draw(self, frame, confidence_threshold=0.45):
         """
@@ -139,25 +216,27 @@ class YOLODetector:
         """
         results = self.detect(frame, confidence_threshold)
         annotated_frame = frame.copy()
-        
-        # Draw bounding boxes
+        self.draw_detections(annotated_frame, results)
+        return annotated_frame, results
+    
+    def draw_detections(self, frame, results):
+        """Draw the boxes of detect() results onto frame in place"""
         for detail in results.get('details', []):
             x1, y1, x2, y2 = detail['bbox']
             label = f"{detail['name']} {detail['confidence']:.2f}"
             
             # Draw rectangle
-            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
             
             # Draw label background
             label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
-            cv2.rectangle(annotated_frame, (x1, y1 - label_size[1] - 10), 
+            cv2.rectangle(frame, (x1, y1 - label_size[1] - 10), 
                          (x1 + label_size[0], y1), (0, 255, 0), -1)
             
             # Draw label text
-            cv2.putText(annotated_frame, label, (x1, y1 - 5),
+            cv2.putText(frame, label, (x1, y1 - 5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 2)
-        
-        return annotated_frame, results
+        return frame
     
     def count_objects(self, frame, object_name=None, confidence_threshold=0.5):
         """
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy import signal
+from numpy.lib.stride_tricks import sliding_window_view
 import threading
 import time
 from collections import deque
@@ -8,39 +8,44 @@ from collections import deque
 class AdvancedAEC:
     """
     Advanced Acoustic Echo Canceller with double-talk detection and adaptive filtering.
-    This implementation improves upon the basic AEC with more sophisticated algorithms.
+
+    The echo path is modelled by a partitioned-block frequency-domain adaptive
+    filter (PBFDAF / MDF): the `filter_length` taps are split into
+    `filter_length / frame_size` partitions, each adapted per frequency bin with
+    an overlap-save, power-normalized (NLMS) update. A frame costs a handful of
+    FFTs instead of one filter update per sample.
     """
     
-    def __init__(self, frame_size=512, filter_length=1024, step_size=0.025):
+    def __init__(self, frame_size=512, filter_length=1024, step_size=0.5):
         self.frame_size = frame_size
         self.filter_length = filter_length
-        self.step_size = step_size  # Learning rate
-        
-        # Adaptive filter coefficients
-        self.h = np.zeros(filter_length)
+        self.step_size = step_size  # Learning rate (normalized, per frequency bin)
+
+        # Partitioned filter: P blocks of frame_size taps, kept in the frequency domain
+        self.fft_size = frame_size * 2
+        self.num_partitions = max(1, -(-filter_length // frame_size))
+        self.num_bins = self.fft_size // 2 + 1
+        self.W = np.zeros((self.num_partitions, self.num_bins), dtype=np.complex128)
+
+        # Reference history: the overlap-save window of every partition ends in it
+        self.ref_history = np.zeros((self.num_partitions + 1) * frame_size)
+
+        # Smoothed per-bin reference power for the normalized step
+        self.ref_psd = np.zeros(self.num_bins)
+        self.psd_smoothing = 0.7
+        self.regularization = 1e-6 * self.fft_size
+        self.leakage = 0.99995  # Slow leak to prevent drift
         
         # Double-talk detector parameters
-        self.dt_threshold = 0.1
+        self.dt_threshold = 1.0  # Echo path assumed not to amplify: mic above ref means near-end talk
         self.dt_counter = 0
         self.dt_max_count = 5
         self.double_talk_active = False
         
-        # Echo path estimation
-        self.echo_path_estimator = np.zeros(filter_length)
-        self.echo_path_learning_rate = 0.001
-        
         # Energy calculation for double-talk detection
         self.mic_energy_threshold = 0.001
         self.ref_energy_threshold = 0.001
         
-        # Frequency domain processing for efficiency
-        self.fft_size = frame_size * 2
-        self.freq_buffer = np.zeros(self.fft_size, dtype=complex)
-        
-        # Memory for delay compensation
-        self.ref_delay_buffer = np.zeros(filter_length)
-        self.delay_pos = 0
-        
         # Lock for thread safety
         self.lock = threading.Lock()
         
@@ -49,10 +54,13 @@ class AdvancedAEC:
             'echo_return_loss': 0.0,
             'double_talk_events': 0,
             'adaptation_stops': 0,
+            'frames': 0,
+            'avg_frame_ms': 0.0,
             'last_update': time.time()
         }
         
-        print(f"AdvancedAEC initialized: frame_size={frame_size}, filter_length={filter_length}")
+        print(f"AdvancedAEC initialized: frame_size={frame_size}, filter_length={filter_length}, "
+              f"partitions={self.num_partitions}")
 
     def _calculate_energy(self, audio_signal):
         """Calculate RMS energy of audio signal"""
@@ -66,39 +74,71 @@ class AdvancedAEC:
 
     def _double_talk_detection(self, mic_power, ref_power):
         """
-        Detect double-talk situation where both near-end and far-end speak
+        Detect double-talk situation where both near-end and far-end speak.
+        Geigel-style power test: the loudspeaker echo alone cannot make the
+        microphone louder than the reference, so anything above it is near-end speech.
         """
-        # Calculate signal-to-noise ratio
-        snr = mic_power / (ref_power + 1e-10)
-        
-        # Double-talk if both signals are strong and SNR is moderate
-        double_talk = (mic_power > self.mic_energy_threshold and 
-                      ref_power > self.ref_energy_threshold and
-                      0.1 < snr < 10.0)  # Both active, neither dominant
-        
-        return double_talk
+        return (mic_power > self.mic_energy_threshold and
+                ref_power > self.ref_energy_threshold and
+                mic_power > self.dt_threshold * ref_power)
 
-    def _update_statistics(self, mic_power, ref_power, echo_reduction_db):
+    def _update_statistics(self, mic_power, ref_power, echo_reduction_db, elapsed):
         """Update AEC performance statistics"""
         self.stats['echo_return_loss'] = echo_reduction_db
+        self.stats['frames'] += 1
+        self.stats['avg_frame_ms'] += (elapsed * 1000.0 - self.stats['avg_frame_ms']) / self.stats['frames']
         self.stats['last_update'] = time.time()
 
+    def _process_block(self, mic, ref, adapt):
+        """Cancel echo in one block of up to frame_size samples; returns the error signal"""
+        n = len(mic)
+        B, N = self.frame_size, self.fft_size
+
+        history = self.ref_history
+        history[:-n] = history[n:]
+        history[-n:] = ref
+
+        # Spectra of the 2B-sample windows ending 0, B, 2B, ... samples ago (newest first)
+        windows = sliding_window_view(history, N)[::B][::-1]
+        X = np.fft.rfft(windows, axis=1)
+
+        # Echo estimate: last n samples of the overlap-save convolution
+        echo = np.fft.irfft(np.einsum('pk,pk->k', self.W, X), N)[-n:]
+        error = mic - echo
+
+        if adapt:
+            self.ref_psd *= self.psd_smoothing
+            self.ref_psd += (1.0 - self.psd_smoothing) * np.sum(np.abs(X) ** 2, axis=0)
+
+            E = np.fft.rfft(np.concatenate((np.zeros(N - n), error)))
+            G = np.conj(X) * (self.step_size * E / (self.ref_psd + self.regularization))
+
+            # Gradient constraint: keep each partition a linear (not circular) B-tap filter
+            g = np.fft.irfft(G, N, axis=1)
+            g[:, B:] = 0.0
+            self.W *= self.leakage
+            self.W += np.fft.rfft(g, axis=1)
+
+        return error
+
     def process(self, mic_signal, ref_signal):
         """
         Process microphone and reference signals to remove echo
         Returns: (clean_signal, echo_reduction_db)
         """
         with self.lock:
-            # Convert to float32
+            start = time.perf_counter()
+
+            # Convert to float
             if isinstance(mic_signal, bytes):
-                mic = np.frombuffer(mic_signal, dtype=np.int16).astype(np.float32) / 32768.0
+                mic = np.frombuffer(mic_signal, dtype=np.int16) / 32768.0
             else:
-                mic = mic_signal.astype(np.float32)
+                mic = np.asarray(mic_signal, dtype=np.float64)
                 
             if isinstance(ref_signal, bytes):
-                ref = np.frombuffer(ref_signal, dtype=np.int16).astype(np.float32) / 32768.0
+                ref = np.frombuffer(ref_signal, dtype=np.int16) / 32768.0
             else:
-                ref = ref_signal.astype(np.float32)
+                ref = np.asarray(ref_signal, dtype=np.float64)
             
             # Ensure same length
             min_len = min(len(mic), len(ref))
@@ -106,8 +146,8 @@ class AdvancedAEC:
             ref = ref[:min_len]
             
             # Calculate powers for double-talk detection (frame-level)
-            mic_power = np.mean(mic ** 2)
-            ref_power = np.mean(ref ** 2)
+            mic_power = np.mean(mic ** 2) if min_len else 0.0
+            ref_power = np.mean(ref ** 2) if min_len else 0.0
             
             # Double-talk detection
             current_double_talk = self._double_talk_detection(mic_power, ref_power)
@@ -122,48 +162,25 @@ class AdvancedAEC:
                 self.dt_counter = max(0, self.dt_counter - 1)
                 if self.dt_counter == 0:
                     self.double_talk_active = False
-            
-            # --- Time-Domain NLMS (Normalized Least Mean Squares) AEC ---
-            # This is more robust for short frames than circular FFT convolution
-            
-            clean_signal_float = np.zeros(min_len)
-            
-            for i in range(min_len):
-                # Shift reference buffer
-                self.ref_delay_buffer = np.roll(self.ref_delay_buffer, 1)
-                self.ref_delay_buffer[0] = ref[i]
-                
-                # Estimate echo: y_hat = h . x
-                echo_estimate = np.dot(self.h, self.ref_delay_buffer)
-                
-                # Error signal: e = d - y_hat
-                error = mic[i] - echo_estimate
-                clean_signal_float[i] = error
-                
-                # Double-talk detection logic (for conditional adaptation)
-                # mic_pwr = mic[i]**2 # Instantaneous mic power
-                # ref_pwr = self.ref_delay_buffer[0]**2 # Instantaneous ref power
-                
-                if not self.double_talk_active:
-                    # Update filter coefficients: h = h + step * e * x / (||x||^2 + eps)
-                    # Using a small regularization term (1e-6) to avoid division by zero
-                    norm_factor = self.ref_delay_buffer @ self.ref_delay_buffer + 1e-6
-                    self.h += (self.step_size * error * self.ref_delay_buffer) / norm_factor
-                    
-                    # Periodic leak to prevent drift
-                    if i % 100 == 0:
-                        self.h *= 0.9999
-            
-            # Inverse FFT to get cleaned signal is no longer needed
-            clean_signal = clean_signal_float
+
+            # Freeze the filter from the first suspect frame until the hangover ends,
+            # and while there is no far-end signal to learn from
+            adapt = (not current_double_talk and not self.double_talk_active and
+                     ref_power > self.ref_energy_threshold)
+
+            # --- Partitioned-block frequency-domain NLMS AEC ---
+            clean_signal = np.empty(min_len)
+            for i in range(0, min_len, self.frame_size):
+                j = min(i + self.frame_size, min_len)
+                clean_signal[i:j] = self._process_block(mic[i:j], ref[i:j], adapt)
             
             # Calculate echo reduction for stats
-            original_power = mic_power
-            residual_power = np.mean(clean_signal ** 2) + 1e-10
+            original_power = mic_power + 1e-10
+            residual_power = (np.mean(clean_signal ** 2) if min_len else 0.0) + 1e-10
             echo_reduction_db = 10 * np.log10(original_power / residual_power)
             
             # Update statistics
-            self._update_statistics(mic_power, ref_power, echo_reduction_db)
+            self._update_statistics(mic_power, ref_power, echo_reduction_db, time.perf_counter() - start)
             
             # Convert back to int16
             clean_signal = np.clip(clean_signal * 32768.0, -32768, 32767).astype(np.int16)
@@ -177,21 +194,24 @@ class AdvancedAEC:
     def reset(self):
         """Reset AEC state"""
         with self.lock:
-            self.h.fill(0)
-            self.echo_path_estimator.fill(0)
+            self.W.fill(0)
+            self.ref_history.fill(0)
+            self.ref_psd.fill(0)
             self.dt_counter = 0
             self.double_talk_active = False
             self.stats = {
                 'echo_return_loss': 0.0,
                 'double_talk_events': 0,
                 'adaptation_stops': 0,
+                'frames': 0,
+                'avg_frame_ms': 0.0,
                 'last_update': time.time()
             }
 
     def set_adaptation_rate(self, rate):
         """Adjust adaptation rate (learning rate)"""
         with self.lock:
-            self.step_size = max(0.001, min(0.1, rate))
+            self.step_size = max(0.001, min(1.0, rate))
 
 
 class EnhancedAECWithNR:
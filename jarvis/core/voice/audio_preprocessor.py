@@ -15,6 +15,7 @@ class AudioPreprocessor:
     def __init__(self, target_sample_rate=16000):
         self.target_sample_rate = target_sample_rate
         self.noise_profile = None
+        self.noise_profile_float = None
         self.noise_profile_frames = []
         self.learning_noise = True
         self.noise_samples_needed = 10  # ~0.3 seconds of noise profile
@@ -30,6 +31,7 @@ class AudioPreprocessor:
                 # Combine all noise frames
                 combined = b''.join(self.noise_profile_frames)
                 self.noise_profile = combined
+                self.noise_profile_float = self.bytes_to_float32(combined)
                 self.learning_noise = False
                 print("AudioPreprocessor: Noise profile learned")
     
@@ -73,18 +75,19 @@ class AudioPreprocessor:
         
         try:
             # Use noisereduce with learned noise profile
-            noise_float = self.bytes_to_float32(self.noise_profile)
+            if self.noise_profile_float is None:
+                self.noise_profile_float = self.bytes_to_float32(self.noise_profile)
             
             # Perform noise reduction
             denoised = nr.reduce_noise(
                 y=audio_float32,
                 sr=self.target_sample_rate,
-                y_noise=noise_float,
+                y_noise=self.noise_profile_float,
                 stationary=True,
                 prop_decrease=0.5  # Reduced from 0.8
             )
             
-            return denoised
+            return denoised.astype(np.float32, copy=False)
         except Exception as e:
             print(f"AudioPreprocessor: Denoising failed - {e}")
             return audio_float32
@@ -139,28 +142,21 @@ class AudioPreprocessor:
         
         return audio_chunk_bytes
     
-    def process_complete_audio(self, audio_buffer_list):
+    def process_complete_array(self, audio_float):
         """
-        Process complete buffered audio before transcription.
+        Process a complete float32 utterance before transcription.
         This is where we do the heavy preprocessing.
         
         Args:
-            audio_buffer_list: List of audio chunk bytes
+            audio_float: float32 samples in [-1, 1] (not modified)
         
         Returns:
-            Processed audio as bytes
+            Processed float32 audio, or None if the quality is too low
         """
-        # Combine all chunks
-        combined_bytes = b''.join(audio_buffer_list)
-        
-        # Convert to float32
-        audio_float = self.bytes_to_float32(combined_bytes)
-        
         # 1. Denoise (most important for accuracy)
         audio_float = self.denoise_audio(audio_float)
         
-        # 2. Normalize volume   
-    
+        # 2. Normalize volume
         audio_float = self.normalize_audio(audio_float)
         
         # 3. Trim silence
@@ -171,12 +167,24 @@ class AudioPreprocessor:
             print("AudioPreprocessor: Low quality audio detected")
             return None
         
-        # Convert back to bytes
+        return audio_float
+
+    def process_complete_audio(self, audio_buffer_list):
+        """
+        Process complete buffered audio given as a list of int16 chunk bytes.
+        
+        Returns:
+            Processed audio as bytes, or None if the quality is too low
+        """
+        audio_float = self.process_complete_array(self.bytes_to_float32(b''.join(audio_buffer_list)))
+        if audio_float is None:
+            return None
         return self.float32_to_bytes(audio_float)
     
     def reset_noise_profile(self):
         """Reset noise profile (useful if environment changes)"""
         self.noise_profile = None
+        self.noise_profile_float = None
         self.noise_profile_frames = []
         self.learning_noise = True
         print("AudioPreprocessor: Noise profile reset")
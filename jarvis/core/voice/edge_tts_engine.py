@@ -4,9 +4,12 @@ Uses Microsoft Edge's neural TTS for smooth, friendly voice output.
 
 Features:
 - Async streaming
+- Pipelined segments: the next segment is synthesized while the current one plays
+- In-memory streaming playback: MP3 is decoded as it arrives and played from
+  the first decodable frame (PyAV + sounddevice, see stream_player.py)
 - Natural neural voice (en-US-GuyNeural)
 - Adjustable pitch, rate, volume
-- Windows-native playback (no ffmpeg required)
+- Windows-native playback fallback (no ffmpeg required)
 """
 import asyncio
 import threading
@@ -17,6 +20,8 @@ import os
 import wave
 import struct
 
+from .stream_player import StreamingPlayer, MP3StreamDecoder, STREAMING_PLAYBACK_AVAILABLE
+
 # Check if edge_tts is available
 try:
     import edge_tts
@@ -40,65 +45,98 @@ class EdgeTTSEngine:
         "tony": "en-AU-WilliamNeural",      # Australian male
     }
     
-    def __init__(self, voice="guy", on_audio_chunk=None):
+    def __init__(self, voice="guy", on_audio_chunk=None, streaming=None):
         """
         Initialize Edge TTS engine.
         
         Args:
             voice: Voice name key from VOICES dict
-            on_audio_chunk: Callback for AEC (receives raw audio bytes)
+            on_audio_chunk: Callback for AEC (receives 16 kHz int16 bytes as they play)
+            streaming: Decode and play MP3 incrementally (default: if PyAV and sounddevice exist)
         """
         self.voice = self.VOICES.get(voice, self.VOICES["guy"])
         self.on_audio_chunk = on_audio_chunk
+
+        self.streaming = STREAMING_PLAYBACK_AVAILABLE if streaming is None else streaming
+        self.player = StreamingPlayer(on_audio_chunk=on_audio_chunk) if self.streaming else None
         
-        # Speech queue for async processing
+        # Two-stage pipeline: text -> synthesis worker -> audio -> playback worker.
+        # In streaming mode the synthesis worker writes PCM straight into the player
+        # and queues ("start"/"end", position) markers for the playback worker.
         self.speech_queue = queue.Queue()
+        self.audio_queue = queue.Queue()
         self.is_playing = False
         self.stop_event = threading.Event()
+
+        # Every queued item carries the generation it was queued in; stop()
+        # bumps the generation so in-flight segments are dropped
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = 0  # Segments of the current generation not yet played
+
+        # Called from the playback thread when a segment starts playing
+        self.on_playback_start = None
         
         # Voice tuning (faster, energetic tone)
         self.rate = "+25%"    # 1.25x speed for snappy responses
         self.pitch = "+3Hz"   # Slightly higher pitch for friendliness
         self.volume = "+0%"   # Normal volume
         
-        # Start worker thread
+        # Start worker threads
         self.thread = threading.Thread(target=self._worker, daemon=True)
         self.thread.start()
+        self.playback_thread = threading.Thread(target=self._playback_worker, daemon=True)
+        self.playback_thread.start()
         
         print(f"EdgeTTS: Initialized with voice '{self.voice}'")
     
     def speak(self, text: str):
-        """Queue text for speaking (non-blocking)."""
+        """Interrupt anything pending and speak `text` (non-blocking)."""
         if not text or not text.strip():
             return
-            
-        # Clear pending speech (interrupt)
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-            except queue.Empty:
-                break
-        
-        self.stop_event.clear()
-        self.speech_queue.put(text)
-    
+        self._cancel_pending()
+        self.enqueue(text)
+
+    def enqueue(self, text: str):
+        """Queue a segment after those already queued (non-blocking)."""
+        if not text or not text.strip():
+            return
+        with self._lock:
+            self._pending += 1
+            self.stop_event.clear()
+            self.speech_queue.put((self._generation, text))
+
+    def _cancel_pending(self):
+        with self._lock:
+            self._generation += 1
+            self._pending = 0
+            self.stop_event.set()
+        if self.player:
+            self.player.clear()
+        for q in (self.speech_queue, self.audio_queue):
+            while not q.empty():
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _is_current(self, generation) -> bool:
+        return generation is None or generation == self._generation
+
+    def _segment_done(self, generation):
+        with self._lock:
+            if generation == self._generation and self._pending > 0:
+                self._pending -= 1
+
     def stop(self):
         """Stop current speech immediately."""
-        self.stop_event.set()
+        self._cancel_pending()
         self.is_playing = False
-        
-        # Clear queue
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-            except queue.Empty:
-                break
-        
         print("EdgeTTS: Stopped")
-    
+
     def is_speaking(self) -> bool:
-        """Check if currently speaking."""
-        return self.is_playing or not self.speech_queue.empty()
+        """Check if currently speaking or has segments queued."""
+        return self.is_playing or self._pending > 0
     
     # API compatibility aliases (for AudioEngine)
     def start_tts_stream(self, text: str):
@@ -120,69 +158,151 @@ class EdgeTTSEngine:
             time.sleep(0.1)
     
     def _worker(self):
-        """Worker thread - processes speech queue with async event loop."""
+        """Synthesis thread - turns queued text into audio for the playback thread."""
         # Create event loop for this thread
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        
+
         while True:
             try:
-                text = self.speech_queue.get(timeout=1)
-                if text is None:
+                item = self.speech_queue.get(timeout=1)
+                if item is None:
+                    self.audio_queue.put(None)
                     break
-                
-                self.is_playing = True
-                self.stop_event.clear()
-                
+
+                generation, text = item
+                if not self._is_current(generation):
+                    continue
+
                 # Run async TTS
-                loop.run_until_complete(self._speak_async(text))
-                
-                self.is_playing = False
-                
+                if self.streaming:
+                    loop.run_until_complete(self._stream_segment(text, generation))
+                    continue
+                audio = loop.run_until_complete(self._synthesize(text, generation))
+                if audio and self._is_current(generation):
+                    self.audio_queue.put((generation, "audio", audio))
+                else:
+                    self._segment_done(generation)
+
             except queue.Empty:
                 continue
             except Exception as e:
                 print(f"EdgeTTS Worker Error: {e}")
+
+        loop.close()
+
+    def _playback_worker(self):
+        """Playback thread - plays synthesized segments in order."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        while True:
+            try:
+                item = self.audio_queue.get(timeout=1)
+                if item is None:
+                    break
+
+                generation, kind, payload = item
+                stale = lambda: not self._is_current(generation)
+                if stale():
+                    continue
+
+                if kind == "end":
+                    # Streaming: segment done once playback passes its last sample
+                    if self.player.wait_played(payload, stale):
+                        self._segment_done(generation)
+                        self.is_playing = self._pending > 0
+                    continue
+
+                if kind == "start" and not self.player.wait_played(payload + 1, stale):
+                    continue
+                self.is_playing = True
+                if self.on_playback_start:
+                    try:
+                        self.on_playback_start()
+                    except Exception as e:
+                        print(f"EdgeTTS: playback start callback failed: {e}")
+                if kind == "audio":
+                    loop.run_until_complete(self._play_audio(payload, generation))
+                    self.is_playing = False
+                    self._segment_done(generation)
+
+            except queue.Empty:
+                continue
+            except Exception as e:
+                print(f"EdgeTTS Playback Error: {e}")
                 self.is_playing = False
-        
+
         loop.close()
-    
-    async def _speak_async(self, text: str):
-        """Async TTS with streaming playback."""
+
+    async def _audio_source(self, text: str):
+        """Yield MP3 chunks for `text` as the service sends them."""
         if not EDGE_TTS_AVAILABLE:
             print("EdgeTTS: edge_tts not available, falling back to print")
             print(f"[SPEECH]: {text}")
             return
-        
+
+        # Create communicate object with voice settings
+        communicate = edge_tts.Communicate(
+            text=text,
+            voice=self.voice,
+            rate=self.rate,
+            pitch=self.pitch,
+            volume=self.volume
+        )
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+    async def _stream_segment(self, text: str, generation):
+        """Decode MP3 as it arrives and feed the player; playback starts on the first frame."""
+        stale = lambda: not self._is_current(generation)
+        started = False
         try:
-            # Create communicate object with voice settings
-            communicate = edge_tts.Communicate(
-                text=text,
-                voice=self.voice,
-                rate=self.rate,
-                pitch=self.pitch,
-                volume=self.volume
-            )
-            
-            # Collect audio chunks
-            audio_chunks = []
-            
-            async for chunk in communicate.stream():
-                if self.stop_event.is_set():
+            decoder = MP3StreamDecoder(reference_rate=self.player.reference_rate if self.on_audio_chunk else None)
+
+            async def play(pcm, ref):
+                nonlocal started
+                if not len(pcm):
+                    return True
+                if not started:
+                    self.audio_queue.put((generation, "start", self.player.written))
+                    started = True
+                if self.player.stream is not None and self.player.pcm.space() >= len(pcm):
+                    return self.player.write(pcm, ref, decoder.sample_rate, stale)
+                # Buffer full: wait for playback without blocking this event loop
+                return await asyncio.to_thread(self.player.write, pcm, ref, decoder.sample_rate, stale)
+
+            async for data in self._audio_source(text):
+                if stale() or not await play(*decoder.decode(data)):
                     return
-                    
-                if chunk["type"] == "audio":
-                    audio_chunks.append(chunk["data"])
-            
-            # Play collected audio
-            if audio_chunks and not self.stop_event.is_set():
-                await self._play_audio(b"".join(audio_chunks))
-                
+            if not stale():
+                await play(*decoder.flush())
+
+        except Exception as e:
+            print(f"EdgeTTS Speak Error: {e}")
+        finally:
+            if started and not stale():
+                self.audio_queue.put((generation, "end", self.player.written))
+            elif not started:
+                self._segment_done(generation)
+
+    async def _synthesize(self, text: str, generation=None):
+        """Fetch the whole MP3 for `text` (fallback path); None if unavailable or cancelled."""
+        try:
+            audio_chunks = []
+            async for data in self._audio_source(text):
+                if not self._is_current(generation):
+                    return None
+                audio_chunks.append(data)
+            return b"".join(audio_chunks) or None
+
         except Exception as e:
             print(f"EdgeTTS Speak Error: {e}")
+            return None
     
-    async def _play_audio(self, audio_data: bytes):
-        """Play MP3 audio data using Windows-native methods."""
+    async def _play_audio(self, audio_data: bytes, generation=None):
+        """Play a complete MP3 using Windows-native methods (when streaming playback is unavailable)."""
         temp_mp3 = None
         temp_wav = None
         
@@ -203,7 +323,7 @@ class EdgeTTSEngine:
                 
                 # Wait for playback to complete
                 while pygame.mixer.music.get_busy():
-                    if self.stop_event.is_set():
+                    if self.stop_event.is_set() or not self._is_current(generation):
                         pygame.mixer.music.stop()
                         break
                     await asyncio.sleep(0.1)
@@ -228,7 +348,7 @@ class EdgeTTSEngine:
                 )
                 
                 while play_obj.is_playing():
-                    if self.stop_event.is_set():
+                    if self.stop_event.is_set() or not self._is_current(generation):
                         play_obj.stop()
                         break
                     await asyncio.sleep(0.1)
@@ -317,7 +437,7 @@ class EdgeTTSEngine:
     
     def __del__(self):
         """Cleanup resources."""
-        self.speech_queue.put(None)  # Signal worker to stop
+        self.speech_queue.put(None)  # Signal workers to stop
 
 
 # Singleton accessor
@@ -0,0 +1,338 @@
+import os
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def mel_filterbank(sample_rate, n_fft, n_mels, fmin=20.0, fmax=None):
+    """Triangular mel filters, shape (n_mels, n_fft // 2 + 1)"""
+    fmax = fmax or sample_rate / 2.0
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(fmin), _hz_to_mel(fmax), n_mels + 2))
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def dct_matrix(n_in, n_out):
+    """Orthonormal DCT-II rows 0..n_out-1"""
+    k = np.arange(n_out)[:, None]
+    n = np.arange(n_in)[None, :]
+    m = np.cos(np.pi * k * (2 * n + 1) / (2.0 * n_in)) * np.sqrt(2.0 / n_in)
+    m[0] /= np.sqrt(2.0)
+    return m.astype(np.float32)
+
+
+class MFCCExtractor:
+    """
+    Streaming MFCCs: 25 ms frames every 10 ms, c1..c12 (c0 dropped so
+    loudness does not matter), with running cepstral mean normalization.
+    process() accepts arbitrary chunk sizes and returns the frames they
+    completed, plus each frame's log energy.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=25, hop_ms=10, n_fft=512, n_mels=26,
+                 n_mfcc=13, cmn_seconds=3.0):
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.n_fft = n_fft
+        self.window = np.hamming(self.frame_len).astype(np.float32)
+        self.mel = mel_filterbank(sample_rate, n_fft, n_mels)
+        self.dct = dct_matrix(n_mels, n_mfcc)[1:]
+        self.dims = n_mfcc - 1
+        self.cmn_alpha = np.exp(-1.0 / (cmn_seconds * 1000.0 / hop_ms))
+        self.reset()
+
+    def reset(self):
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.last_sample = 0.0
+        self.mean = None
+
+    def process(self, samples):
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if len(samples) == 0:
+            return np.zeros((0, self.dims), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        # Pre-emphasis, continued across chunks
+        emphasized = np.empty_like(samples)
+        emphasized[0] = samples[0] - 0.97 * self.last_sample
+        emphasized[1:] = samples[1:] - 0.97 * samples[:-1]
+        self.last_sample = samples[-1]
+
+        x = np.concatenate((self.pending, emphasized))
+        n = 0 if len(x) < self.frame_len else 1 + (len(x) - self.frame_len) // self.hop
+        self.pending = x[n * self.hop:]
+        if n == 0:
+            return np.zeros((0, self.dims), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        frames = sliding_window_view(x, self.frame_len)[::self.hop][:n] * self.window
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2
+        log_mel = np.log(power @ self.mel.T + 1e-10)
+        mfcc = log_mel @ self.dct.T
+        energy = np.log(np.sum(frames ** 2, axis=1) + 1e-10)
+
+        # Running mean over a few seconds, updated per block
+        block_mean = mfcc.mean(axis=0)
+        if self.mean is None:
+            self.mean = block_mean
+        else:
+            decay = self.cmn_alpha ** n
+            self.mean = decay * self.mean + (1.0 - decay) * block_mean
+        return (mfcc - self.mean).astype(np.float32), energy.astype(np.float32)
+
+
+class FeatureRing:
+    """Preallocated ring of the most recent feature frames"""
+
+    def __init__(self, capacity, dims):
+        self.data = np.zeros((capacity, dims), dtype=np.float32)
+        self.energy = np.full(capacity, -23.0, dtype=np.float32)  # log(1e-10)
+        self.capacity = capacity
+        self.count = 0  # Frames ever pushed
+
+    def push(self, feats, energy):
+        n = len(feats)
+        if n > self.capacity:
+            feats, energy = feats[-self.capacity:], energy[-self.capacity:]
+            self.count += n - self.capacity
+            n = self.capacity
+        idx = (self.count + np.arange(n)) % self.capacity
+        self.data[idx] = feats
+        self.energy[idx] = energy
+        self.count += n
+
+    def last(self, n):
+        """The n most recent frames (oldest first) and their energies"""
+        n = min(n, self.count, self.capacity)
+        idx = (self.count - n + np.arange(n)) % self.capacity
+        return self.data[idx], self.energy[idx]
+
+
+def subsequence_dtw(template, window):
+    """
+    Best alignment of the whole `template` (L, d) ending at each frame of
+    `window` (W, d), starting anywhere. Local steps (1,1), (1,2), (2,1) let
+    the spoken word run between half and twice the template's speed; each
+    template frame is paid exactly once, so costs are mean frame distances.
+    Returns (W,) costs (inf where no alignment fits).
+    """
+    L, W = len(template), len(window)
+    sq = (np.sum(template ** 2, axis=1)[:, None] + np.sum(window ** 2, axis=1)[None, :]
+          - 2.0 * template @ window.T)
+    cost = np.sqrt(np.maximum(sq, 0.0) / template.shape[1])
+
+    inf = np.float32(np.inf)
+    prev2 = np.full(W, inf, dtype=np.float32)
+    prev1 = cost[0].copy()
+    best = np.empty(W, dtype=np.float32)
+    for i in range(1, L):
+        best.fill(inf)
+        np.minimum(best[1:], prev1[:-1], out=best[1:])
+        np.minimum(best[2:], prev1[:-2], out=best[2:])
+        if i >= 2:
+            # Skips template frame i-1: charge it against input frame j
+            np.minimum(best[1:], prev2[:-1] + cost[i - 1, 1:], out=best[1:])
+        prev2, prev1 = prev1, cost[i] + best
+    return prev1 / L
+
+
+class KeywordSpotter:
+    """
+    Always-on wake word spotter: MFCC templates of each keyword, matched
+    against a streaming feature ring with subsequence DTW.
+
+    Templates come from enroll() (a few recordings per keyword) and are
+    stored in models/wake_words/templates.npz. Matching runs every
+    `eval_ms`, only when the recent frames carry speech-level energy, and
+    only over the frames that arrived since the last evaluation, so one
+    utterance fires once. A keyword fires when its best template cost drops
+    below its threshold (derived from enrollment spread, or `threshold`).
+    """
+
+    def __init__(self, keywords=None, templates_path=None, threshold=0.9, eval_ms=100,
+                 refractory_s=1.5, energy_margin=2.5, sample_rate=16000):
+        self.keywords = list(keywords or [])
+        self.templates_path = templates_path or os.path.join(os.getcwd(), 'models', 'wake_words', 'templates.npz')
+        self.default_threshold = threshold
+        self.features = MFCCExtractor(sample_rate=sample_rate)
+        self.eval_frames = max(1, int(eval_ms / 10))
+        self.refractory_frames = int(refractory_s * 100)
+        self.energy_margin = energy_margin  # Natural-log units above the noise floor (~11 dB)
+
+        self.templates = {}  # keyword -> [ (L, d) arrays ]
+        self.thresholds = {}  # keyword -> cost threshold
+        self.ring = FeatureRing(capacity=400, dims=self.features.dims)
+        self.noise_floor = None
+        self.last_eval = 0
+        self.last_fire = -10 ** 9
+
+        # Monitoring
+        self.evaluations = 0
+        self.seconds = 0.0
+        self.last_score = None
+
+        if os.path.exists(self.templates_path):
+            self.load()
+
+    # ---------------------------------------------------------
+    # Enrollment
+    # ---------------------------------------------------------
+
+    def extract(self, audio):
+        """Template features of one recorded keyword, trimmed to its voiced part"""
+        # Streamed like live audio, so the running mean sees the same lead-in background
+        extractor = MFCCExtractor()
+        chunks = [extractor.process(audio[i:i + 512]) for i in range(0, len(audio), 512)]
+        feats = np.concatenate([f for f, _ in chunks])
+        energy = np.concatenate([e for _, e in chunks])
+        floor = np.percentile(energy, 10)
+        voiced = np.where(energy > max(floor + self.energy_margin, energy.max() - 7.0))[0]
+        if len(voiced) == 0:
+            raise ValueError("No speech found in enrollment audio")
+        return feats[voiced[0]:voiced[-1] + 1]
+
+    def enroll(self, keyword, audio):
+        """Add one recording (float32, 16 kHz) of `keyword`"""
+        keyword = keyword.lower()
+        if keyword not in self.keywords:
+            self.keywords.append(keyword)
+        self.templates.setdefault(keyword, []).append(self.extract(audio))
+        self._calibrate(keyword)
+        self._resize_ring()
+
+    def _calibrate(self, keyword):
+        """Threshold from how far apart the enrolled recordings are from each other"""
+        templates = self.templates.get(keyword, [])
+        if len(templates) < 2:
+            self.thresholds[keyword] = self.default_threshold
+            return
+        costs = []
+        for a in templates:
+            for b in templates:
+                if a is not b:
+                    costs.append(float(np.min(subsequence_dtw(a, b))))
+        finite = [c for c in costs if np.isfinite(c)]
+        self.thresholds[keyword] = 1.25 * max(finite) if finite else self.default_threshold
+
+    def _resize_ring(self):
+        longest = max((len(t) for ts in self.templates.values() for t in ts), default=0)
+        needed = 2 * longest + 2 * self.eval_frames
+        if needed > self.ring.capacity:
+            self.ring = FeatureRing(needed, self.features.dims)
+
+    def has_templates(self):
+        return any(self.templates.get(k) for k in self.keywords)
+
+    def save(self, path=None):
+        path = path or self.templates_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {}
+        for keyword, templates in self.templates.items():
+            for i, t in enumerate(templates):
+                arrays[f"{keyword}|{i}"] = t
+        np.savez(path, **arrays)
+        print(f"KeywordSpotter: Saved {len(arrays)} templates to {path}")
+
+    def load(self, path=None):
+        path = path or self.templates_path
+        with np.load(path) as data:
+            for name in sorted(data.files, key=lambda n: (n.split("|")[0], int(n.split("|")[1]))):
+                keyword = name.split("|")[0]
+                self.templates.setdefault(keyword, []).append(data[name])
+                if keyword not in self.keywords:
+                    self.keywords.append(keyword)
+        for keyword in self.templates:
+            self._calibrate(keyword)
+        self._resize_ring()
+        print(f"KeywordSpotter: Loaded templates for {sorted(self.templates)}")
+
+    # ---------------------------------------------------------
+    # Streaming detection
+    # ---------------------------------------------------------
+
+    def reset(self):
+        self.features.reset()
+        self.ring = FeatureRing(self.ring.capacity, self.features.dims)
+        self.last_eval = 0
+        self.last_fire = -10 ** 9
+
+    def _update_noise_floor(self, energy):
+        # Quick to follow quiet frames, slow to rise during speech
+        e = float(energy.min())
+        if self.noise_floor is None:
+            self.noise_floor = e
+        elif e < self.noise_floor:
+            self.noise_floor = 0.7 * self.noise_floor + 0.3 * e
+        else:
+            self.noise_floor = 0.999 * self.noise_floor + 0.001 * e
+
+    def process(self, audio):
+        """
+        Feed float32 samples. Returns (keyword, confidence) when a keyword
+        ended in this audio, else None.
+        """
+        feats, energy = self.features.process(audio)
+        if len(feats) == 0:
+            return None
+        self.ring.push(feats, energy)
+        self._update_noise_floor(energy)
+
+        new = self.ring.count - self.last_eval
+        if new < self.eval_frames or not self.has_templates():
+            return None
+        self.last_eval = self.ring.count
+        if self.ring.count - self.last_fire < self.refractory_frames:
+            return None
+
+        start = time.perf_counter()
+        try:
+            return self._evaluate(new)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def _evaluate(self, new):
+        # Skip matching unless something louder than the background happened lately
+        _, recent_energy = self.ring.last(new + 30)
+        if recent_energy.max() < self.noise_floor + self.energy_margin:
+            return None
+
+        self.evaluations += 1
+        best = None
+        for keyword in self.keywords:
+            templates = self.templates.get(keyword)
+            if not templates:
+                continue
+            threshold = self.thresholds.get(keyword, self.default_threshold)
+            for template in templates:
+                window, _ = self.ring.last(2 * len(template) + new)
+                if len(window) < len(template) // 2:
+                    continue
+                # Only alignments ending in frames that arrived since the last evaluation
+                score = float(np.min(subsequence_dtw(template, window)[-new:]))
+                if score < threshold and (best is None or score / threshold < best[1]):
+                    best = (keyword, score / threshold)
+                if self.last_score is None or score < self.last_score:
+                    self.last_score = score
+
+        if best is None:
+            return None
+        self.last_fire = self.ring.count
+        keyword, ratio = best
+        return keyword, float(max(0.0, min(1.0, 1.0 - ratio / 2.0)))
+
+    def stats(self):
+        return {
+            "evaluations": self.evaluations,
+            "avg_eval_ms": self.seconds / self.evaluations * 1000 if self.evaluations else 0.0,
+            "keywords": {k: len(self.templates.get(k, [])) for k in self.keywords},
+            "thresholds": dict(self.thresholds),
+        }
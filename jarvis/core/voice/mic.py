@@ -1,26 +1,231 @@
-import pyaudio
+import time
+import wave
+import threading
+import numpy as np
+
+from .vad import reset_vad
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+
+class AudioRingBuffer:
+    """
+    Preallocated int16 capture ring, split into fixed-size frames.
+
+    One writer (the audio callback) copies samples in and then publishes
+    the new write position; readers never block it. Frame `seq` covers
+    samples [seq * frame_size, (seq + 1) * frame_size) of the stream and
+    carries the capture time of its first sample. A reader that falls
+    more than the capacity behind simply finds its frame gone; the last
+    GUARD_FRAMES slots count as gone already because a write of up to one
+    frame may be landing in them before it is published.
+    """
+
+    GUARD_FRAMES = 2
+
+    def __init__(self, capacity_frames=320, frame_size=512, rate=16000):
+        self.frame_size = frame_size
+        self.rate = rate
+        self.capacity_frames = capacity_frames
+        self.capacity = capacity_frames * frame_size
+        self.data = np.zeros(self.capacity, dtype=np.int16)
+        self.timestamps = np.zeros(capacity_frames, dtype=np.float64)
+        self.write_pos = 0  # Absolute sample position, published after the copy
+        self.cond = threading.Condition()
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the next frame to complete (= number of complete frames)"""
+        return self.write_pos // self.frame_size
+
+    @property
+    def oldest_seq(self) -> int:
+        """Oldest frame still held"""
+        return max(0, self.latest_seq - self.capacity_frames + self.GUARD_FRAMES)
+
+    def write(self, samples, capture_time):
+        """Append samples whose first one was captured at `capture_time` (time.monotonic())"""
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)[-self.capacity:]
+        n = len(samples)
+        if n == 0:
+            return
+        pos = self.write_pos
+        start = pos % self.capacity
+        first = min(n, self.capacity - start)
+        self.data[start:start + first] = samples[:first]
+        self.data[:n - first] = samples[first:]
+
+        # Timestamp every frame that starts inside this block
+        seq = -(-pos // self.frame_size)
+        while seq * self.frame_size < pos + n:
+            self.timestamps[seq % self.capacity_frames] = capture_time + (seq * self.frame_size - pos) / self.rate
+            seq += 1
+
+        completed = (pos + n) // self.frame_size > pos // self.frame_size
+        self.write_pos = pos + n
+        if completed:
+            self.wake()
+
+    def frame(self, seq):
+        """(samples copy, capture_time) of frame `seq`, or None if not written yet or overwritten"""
+        if seq >= self.latest_seq or seq < self.oldest_seq:
+            return None
+        start = (seq * self.frame_size) % self.capacity
+        samples = self.data[start:start + self.frame_size].copy()
+        timestamp = self.timestamps[seq % self.capacity_frames]
+        # The writer may have lapped us while copying
+        if seq < self.oldest_seq:
+            return None
+        return samples, timestamp
+
+    def wait(self, seq, timeout):
+        """Block until frame `seq` is complete, wake() is called or `timeout` passes"""
+        with self.cond:
+            if seq >= self.latest_seq:
+                self.cond.wait(timeout)
+        return seq < self.latest_seq
+
+    def wake(self):
+        with self.cond:
+            self.cond.notify_all()
+
+    def clear(self):
+        self.write_pos = 0
+        self.timestamps.fill(0)
+
+
+class PyAudioInput:
+    """Default capture device: a PyAudio input stream in callback mode."""
+
+    def __init__(self):
+        self.p = pyaudio.PyAudio()
+
+    def open(self, rate, chunk, on_samples):
+        def callback(in_data, frame_count, time_info, status):
+            # Capture time of the first sample: the block just finished recording
+            on_samples(np.frombuffer(in_data, dtype=np.int16), time.monotonic() - frame_count / rate, bool(status))
+            return (None, pyaudio.paContinue)
+
+        return self.p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            input=True,
+            frames_per_buffer=chunk,
+            stream_callback=callback
+        )
+
+    def terminate(self):
+        self.p.terminate()
+
+
+class _WavStream:
+    def __init__(self):
+        self.running = True
+        self.thread = None
+
+    def start(self, target):
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+
+    def is_active(self):
+        return self.running and self.thread.is_alive()
+
+    def stop_stream(self):
+        self.running = False
+
+    def close(self):
+        self.running = False
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+
+
+class WavFileInput:
+    """
+    Fake capture device that plays a 16-bit mono WAV file into the callback,
+    in real time or as fast as possible. Used for tests and offline replays.
+    """
+
+    def __init__(self, path, realtime=True, block=512):
+        self.path = path
+        self.realtime = realtime
+        self.block = block
+        self.done = threading.Event()
+
+    def open(self, rate, chunk, on_samples):
+        with wave.open(self.path, 'rb') as wf:
+            if wf.getframerate() != rate or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError(f"{self.path}: expected {rate} Hz mono 16-bit PCM")
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        self.done.clear()
+        stream = _WavStream()
+
+        def run():
+            start = time.monotonic()
+            for pos in range(0, len(samples), self.block):
+                if not stream.running:
+                    break
+                capture_time = start + pos / rate
+                if self.realtime:
+                    # Deliver each block once it would have been recorded
+                    delay = capture_time + self.block / rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                on_samples(samples[pos:pos + self.block], capture_time, False)
+            stream.running = False
+            self.done.set()
+
+        stream.start(run)
+        return stream
+
+    def terminate(self):
+        pass
+
 
 class Microphone:
-    def __init__(self, rate=16000, chunk=512):
+    """
+    Callback-driven microphone. Capture runs on the device's callback thread
+    and lands in an AudioRingBuffer; consumers pull frames by sequence number.
+    read_chunk() keeps one default cursor for the main loop and blocks on the
+    ring's condition (or wake()) instead of polling.
+    """
+
+    def __init__(self, rate=16000, chunk=512, buffer_seconds=10.0, device=None):
         self.rate = rate
         self.chunk = chunk
-        self.p = pyaudio.PyAudio()
+        self.device = device
+        self.ring = AudioRingBuffer(max(4, int(buffer_seconds * rate / chunk)), chunk, rate)
         self.stream = None
         self.is_running = False
 
+        self.next_seq = 0  # Cursor used by read_chunk()
+        self.last_seq = None  # Sequence number of the frame read_chunk() returned last
+        self.last_capture_time = None  # Its capture time
+        self.dropped_frames = 0  # Frames the cursor lost by falling behind the ring
+        self.overflows = 0  # Device-reported input overflows
+
+    def _on_samples(self, samples, capture_time, overflow):
+        if overflow:
+            self.overflows += 1
+        self.ring.write(samples, capture_time)
+
     def start(self):
         if self.is_running:
             print("Microphone: Already running")
             return
 
         try:
-            self.stream = self.p.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
+            if self.device is None:
+                self.device = PyAudioInput()
+            self.ring.clear()
+            self.next_seq = 0
+            # Frame numbers restart at 0: results the VAD memoized by seq are stale
+            reset_vad()
+            self.stream = self.device.open(self.rate, self.chunk, self._on_samples)
             self.is_running = True
             print(f"Microphone: Started (rate={self.rate}, chunk={self.chunk})")
 
@@ -29,15 +234,43 @@ class Microphone:
             self.is_running = False
             raise
 
-    def read_chunk(self):
-        if not self.is_running or not self.stream:
+    @property
+    def latest_seq(self) -> int:
+        return self.ring.latest_seq
+
+    def read_frame(self, seq, timeout=0.1):
+        """(pcm bytes, capture_time) of frame `seq`, waiting up to `timeout` for it; None otherwise"""
+        if not self.ring.wait(seq, timeout):
+            return None
+        frame = self.ring.frame(seq)
+        if frame is None:
             return None
+        samples, capture_time = frame
+        return samples.tobytes(), capture_time
 
-        try:
-            # Windows PyAudio supports overflow handling ONLY inside .read()
-            return self.stream.read(self.chunk, exception_on_overflow=False)
-        except:
+    def read_chunk(self, timeout=0.1):
+        """Next frame after the cursor as bytes; None on timeout, wake() or when stopped"""
+        if not self.is_running:
+            # Still wait, so a loop around read_chunk() never spins
+            self.ring.wait(self.ring.latest_seq, timeout)
+            return None
+
+        oldest = self.ring.oldest_seq
+        if self.next_seq < oldest:
+            self.dropped_frames += oldest - self.next_seq
+            self.next_seq = oldest
+
+        frame = self.read_frame(self.next_seq, timeout)
+        if frame is None:
             return None
+        self.last_seq = self.next_seq
+        self.last_capture_time = frame[1]
+        self.next_seq += 1
+        return frame[0]
+
+    def wake(self):
+        """Interrupt a blocked read_chunk() (e.g. a reply is ready)"""
+        self.ring.wake()
 
     def stop(self):
         if not self.is_running:
@@ -50,11 +283,13 @@ class Microphone:
             except Exception:
                 pass
             self.stream = None
+        self.ring.wake()
         print("Microphone: Stopped")
 
     def terminate(self):
         self.stop()
         try:
-            self.p.terminate()
+            if self.device:
+                self.device.terminate()
         except Exception:
             pass
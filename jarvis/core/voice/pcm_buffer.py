@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class PCMBuffer:
+    """
+    Growable float32 utterance buffer.
+
+    int16 PCM frames are converted straight into preallocated storage, so an
+    utterance ends up as one contiguous array that can be handed to Whisper
+    without joining bytes or writing a WAV file. clear() keeps the storage
+    for the next utterance; capacity doubles when it runs out.
+    """
+
+    def __init__(self, initial_seconds=10.0, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self.data = np.zeros(max(1, int(initial_seconds * sample_rate)), dtype=np.float32)
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def duration(self) -> float:
+        return self.length / float(self.sample_rate)
+
+    def _reserve(self, extra):
+        needed = self.length + extra
+        if needed > len(self.data):
+            capacity = len(self.data)
+            while capacity < needed:
+                capacity *= 2
+            grown = np.zeros(capacity, dtype=np.float32)
+            grown[:self.length] = self.data[:self.length]
+            self.data = grown
+
+    def append(self, frame):
+        """Append int16 PCM bytes (or an int16 / float array)"""
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(frame, dtype=np.int16)
+        else:
+            samples = np.asarray(frame).reshape(-1)
+        n = len(samples)
+        if n == 0:
+            return
+        self._reserve(n)
+        out = self.data[self.length:self.length + n]
+        if samples.dtype == np.int16:
+            np.multiply(samples, 1.0 / 32768.0, out=out, casting='unsafe')
+        else:
+            out[:] = samples
+        self.length += n
+
+    def view(self) -> np.ndarray:
+        """The buffered samples (a view into the storage, valid until the next append/clear)"""
+        return self.data[:self.length]
+
+    def clear(self):
+        self.length = 0
@@ -0,0 +1,60 @@
+import re
+
+class SentenceSegmenter:
+    """
+    Cuts a stream of LLM text deltas into speakable segments.
+
+    A segment ends at a sentence boundary (. ! ? or newline followed by
+    whitespace), or at a clause boundary (, ; :) once it is long enough to
+    be worth synthesizing on its own. The first segment uses a shorter
+    clause limit so the first audio starts as early as possible.
+    """
+
+    SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+    CLAUSE_END = re.compile(r'[,;:]\s+')
+    ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "no", "approx"}
+
+    def __init__(self, first_clause_chars=25, clause_chars=60):
+        self.first_clause_chars = first_clause_chars
+        self.clause_chars = clause_chars
+        self.buffer = ""
+        self.emitted = 0
+
+    def _is_abbreviation(self, text, end):
+        words = text[:end].rstrip('.!?"\')] \n').split()
+        return bool(words) and words[-1].lower().rstrip('.') in self.ABBREVIATIONS
+
+    def _next_cut(self):
+        for m in self.SENTENCE_END.finditer(self.buffer):
+            if m.group().startswith('.') and self._is_abbreviation(self.buffer, m.start() + 1):
+                continue
+            return m.end()
+
+        min_chars = self.clause_chars if self.emitted else self.first_clause_chars
+        for m in self.CLAUSE_END.finditer(self.buffer):
+            if m.start() >= min_chars:
+                return m.end()
+        return None
+
+    def feed(self, delta: str):
+        """Add a text delta; return the segments it completed"""
+        self.buffer += delta
+        segments = []
+        cut = self._next_cut()
+        while cut is not None:
+            segment = self.buffer[:cut].strip()
+            self.buffer = self.buffer[cut:]
+            if segment:
+                segments.append(segment)
+                self.emitted += 1
+            cut = self._next_cut()
+        return segments
+
+    def flush(self):
+        """Return whatever is left at the end of the stream"""
+        segment = self.buffer.strip()
+        self.buffer = ""
+        if segment:
+            self.emitted += 1
+            return [segment]
+        return []
@@ -1,103 +1,70 @@
-import torch
 import numpy as np
-import torchaudio
-from sklearn.metrics.pairwise import cosine_similarity
-from collections import defaultdict, deque
+from numpy.lib.stride_tricks import sliding_window_view
+from collections import deque
 import threading
-import pickle
+import time
 import os
 from typing import Optional, Tuple, Dict, List
 
+from .keyword_spotter import mel_filterbank, dct_matrix
+
 
 class SpeakerEmbeddingExtractor:
     """
-    Extracts speaker embeddings using a pre-trained model.
-    For this implementation, we'll use a simplified approach that could be
-    replaced with a full model like ECAPA-TDNN in production.
+    Extracts speaker embeddings: mean and standard deviation of 40 MFCCs
+    over the voiced frames of the audio. Filterbank, DCT matrix and window
+    are built once; extraction is plain numpy.
+    Could be replaced with a full model like ECAPA-TDNN in production.
     """
     
-    def __init__(self):
-        self.embedding_dim = 192  # Standard dimension for speaker embeddings
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
-        # Audio preprocessing
-        self.mfcc_transform = torchaudio.transforms.MFCC(
-            sample_rate=16000,
-            n_mfcc=40,
-            melkwargs={'n_fft': 512, 'hop_length': 160, 'n_mels': 40}
-        )
-        
-        # Initialize a simple model (in practice, use pre-trained ECAPA-TDNN)
-        self._init_simple_model()
-        
-        print(f"SpeakerEmbeddingExtractor initialized on {self.device}")
-    
-    def _init_simple_model(self):
-        """
-        Initialize a simple model for demonstration.
-        In production, load a pre-trained ECAPA-TDNN or similar model.
-        """
-        # This is a placeholder - in real implementation, you'd load a pre-trained model
-        # For example: torch.hub.load('mravanelli/pytorch-kaldi', 'tdnn', pretrained=True)
+    def __init__(self, n_mfcc: int = 40, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * 0.025)
+        self.hop = int(sample_rate * 0.010)
+        self.n_fft = 512
+        self.window = np.hamming(self.frame_len).astype(np.float32)
+        self.mel = mel_filterbank(sample_rate, self.n_fft, 40)
+        self.dct = dct_matrix(40, n_mfcc)
+        self.embedding_dim = 2 * n_mfcc
         self.model = None
-        print("Using simplified embedding extraction (replace with pre-trained model for production)")
+        
+        print("SpeakerEmbeddingExtractor initialized (MFCC statistics)")
     
     def extract_embedding(self, audio_data: np.ndarray) -> np.ndarray:
         """
         Extract speaker embedding from audio data.
         
         Args:
-            audio_data: Audio as numpy array or bytes
+            audio_data: Audio as float32 numpy array or int16 bytes
             
         Returns:
-            Speaker embedding vector (192-dimensional)
+            Speaker embedding vector (embedding_dim floats)
         """
-        if isinstance(audio_data, bytes):
-            audio_tensor = torch.FloatTensor(
-                np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-            ) / 32768.0
+        if isinstance(audio_data, (bytes, bytearray)):
+            audio = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
         else:
-            audio_tensor = torch.FloatTensor(audio_data)
+            audio = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        if len(audio) < self.frame_len:
+            audio = np.pad(audio, (0, self.frame_len - len(audio)))
         
-        # Ensure audio is properly shaped
-        if audio_tensor.dim() == 1:
-            audio_tensor = audio_tensor.unsqueeze(0)
+        frames = sliding_window_view(audio, self.frame_len)[::self.hop] * self.window
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2
+        mfcc = np.log(power @ self.mel.T + 1e-10) @ self.dct.T
         
-        # For this implementation, we'll use MFCC statistics as a simple embedding
-        # In production, use a proper speaker embedding model
-        try:
-            # Extract MFCC features
-            mfcc_features = self.mfcc_transform(audio_tensor)
-            
-            # Calculate statistics over time dimension
-            mean_features = torch.mean(mfcc_features, dim=-1)
-            std_features = torch.std(mfcc_features, dim=-1)
-            
-            # Concatenate mean and std to form embedding
-            embedding = torch.cat([mean_features, std_features], dim=-1)
-            
-            # Ensure embedding is the right size
-            if embedding.shape[-1] < self.embedding_dim:
-                # Pad with zeros
-                padding = torch.zeros(self.embedding_dim - embedding.shape[-1])
-                embedding = torch.cat([embedding.flatten(), padding])
-            elif embedding.shape[-1] > self.embedding_dim:
-                # Truncate
-                embedding = embedding.flatten()[:self.embedding_dim]
-            else:
-                embedding = embedding.flatten()
-            
-            return embedding.cpu().numpy().astype(np.float32)
-            
-        except Exception as e:
-            print(f"Error extracting embedding: {e}")
-            # Return a default embedding in case of error
-            return np.random.rand(self.embedding_dim).astype(np.float32)
+        # Statistics over voiced frames only (within ~26 dB of the loudest)
+        energy = np.log(np.sum(frames ** 2, axis=1) + 1e-10)
+        voiced = energy > energy.max() - 6.0
+        if np.count_nonzero(voiced) >= 10:
+            mfcc = mfcc[voiced]
+        
+        return np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)]).astype(np.float32)
 
 
 class SpeakerRecognizer:
     """
     Main speaker recognition system that handles enrollment and verification.
+    Enrolled embeddings are kept as one L2-normalized matrix (one row per
+    speaker), so scoring a candidate against everyone is a single matmul.
     """
     
     def __init__(self, verification_threshold: float = 0.7):
@@ -106,6 +73,10 @@ class SpeakerRecognizer:
         self.verification_threshold = verification_threshold
         self.enrollment_sessions: Dict[str, List[np.ndarray]] = {}
         
+        # Scoring matrix, rebuilt whenever enrollment changes
+        self.speaker_ids: List[str] = []
+        self.matrix = np.zeros((0, self.embedder.embedding_dim), dtype=np.float32)
+        
         # Anti-spoofing parameters
         self.anti_spoofing_enabled = True
         self.min_enrollment_samples = 3
@@ -116,6 +87,16 @@ class SpeakerRecognizer:
         
         print(f"SpeakerRecognizer initialized with threshold: {verification_threshold}")
     
+    def _rebuild_matrix(self):
+        """Stack and normalize the enrolled embeddings (call with the lock held)"""
+        self.speaker_ids = list(self.registered_speakers.keys())
+        if not self.speaker_ids:
+            self.matrix = np.zeros((0, self.embedder.embedding_dim), dtype=np.float32)
+            return
+        matrix = np.stack([self.registered_speakers[s] for s in self.speaker_ids]).astype(np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-10)
+        self.matrix = matrix
+    
     def enroll_speaker(self, speaker_id: str, audio_samples: List[np.ndarray]) -> bool:
         """
         Enroll a new speaker with multiple audio samples.
@@ -127,33 +108,50 @@ class SpeakerRecognizer:
         Returns:
             True if enrollment successful, False otherwise
         """
+        if len(audio_samples) < self.min_enrollment_samples:
+            print(f"Need at least {self.min_enrollment_samples} samples for enrollment")
+            return False
+        
+        # Extract embeddings for all samples
+        embeddings = []
+        for audio in audio_samples:
+            try:
+                embeddings.append(self.embedder.extract_embedding(audio))
+            except Exception as e:
+                print(f"Failed to extract embedding from sample: {e}")
+                continue
+        
+        if len(embeddings) < self.min_enrollment_samples:
+            print(f"Not enough valid embeddings extracted for enrollment")
+            return False
+        
+        # Average normalized embeddings for more robust representation
+        embeddings = np.stack(embeddings)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-10)
+        
         with self.lock:
-            if len(audio_samples) < self.min_enrollment_samples:
-                print(f"Need at least {self.min_enrollment_samples} samples for enrollment")
-                return False
-            
-            # Extract embeddings for all samples
-            embeddings = []
-            for audio in audio_samples:
-                try:
-                    emb = self.embedder.extract_embedding(audio)
-                    embeddings.append(emb)
-                except Exception as e:
-                    print(f"Failed to extract embedding from sample: {e}")
-                    continue
-            
-            if len(embeddings) < self.min_enrollment_samples:
-                print(f"Not enough valid embeddings extracted for enrollment")
-                return False
-            
-            # Average embeddings for more robust representation
-            avg_embedding = np.mean(embeddings, axis=0)
-            
-            # Store the registered speaker
-            self.registered_speakers[speaker_id] = avg_embedding.astype(np.float32)
-            
-            print(f"Speaker '{speaker_id}' enrolled successfully")
-            return True
+            self.registered_speakers[speaker_id] = embeddings.mean(axis=0).astype(np.float32)
+            self._rebuild_matrix()
+        
+        print(f"Speaker '{speaker_id}' enrolled successfully")
+        return True
+    
+    def score_embedding(self, embedding: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """Cosine similarity of an embedding to every enrolled speaker: (ids, scores)"""
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        embedding = embedding / max(float(np.linalg.norm(embedding)), 1e-10)
+        with self.lock:
+            return self.speaker_ids, self.matrix @ embedding
+    
+    def verify_embedding(self, embedding: np.ndarray) -> Tuple[Optional[str], float]:
+        """Best enrolled speaker above the threshold for an embedding, or (None, best score)"""
+        ids, scores = self.score_embedding(embedding)
+        if not ids:
+            return None, 0.0
+        best = int(np.argmax(scores))
+        if scores[best] >= self.verification_threshold:
+            return ids[best], float(scores[best])
+        return None, float(scores[best])
     
     def verify_speaker(self, audio_data: np.ndarray) -> Tuple[Optional[str], float]:
         """
@@ -165,33 +163,16 @@ class SpeakerRecognizer:
         Returns:
             Tuple of (speaker_id, confidence) or (None, 0.0) if no match
         """
-        with self.lock:
-            if not self.registered_speakers:
-                return None, 0.0
-            
-            # Extract embedding from input audio
-            try:
-                candidate_embedding = self.embedder.extract_embedding(audio_data)
-            except Exception as e:
-                print(f"Error extracting embedding for verification: {e}")
-                return None, 0.0
-            
-            best_match = None
-            best_confidence = 0.0
-            
-            # Compare against all registered speakers
-            for speaker_id, stored_embedding in self.registered_speakers.items():
-                # Calculate cosine similarity
-                similarity = cosine_similarity(
-                    candidate_embedding.reshape(1, -1),
-                    stored_embedding.reshape(1, -1)
-                )[0][0]
-                
-                if similarity > best_confidence and similarity >= self.verification_threshold:
-                    best_confidence = similarity
-                    best_match = speaker_id
-            
-            return best_match, float(best_confidence)
+        if not self.speaker_ids:
+            return None, 0.0
+        try:
+            candidate_embedding = self.embedder.extract_embedding(audio_data)
+        except Exception as e:
+            print(f"Error extracting embedding for verification: {e}")
+            return None, 0.0
+        
+        speaker_id, confidence = self.verify_embedding(candidate_embedding)
+        return (speaker_id, confidence) if speaker_id else (None, 0.0)
     
     def identify_speaker(self, audio_data: np.ndarray) -> Tuple[Optional[str], Dict[str, float]]:
         """
@@ -203,36 +184,21 @@ class SpeakerRecognizer:
         Returns:
             Tuple of (best_match_speaker_id, all_similarities_dict)
         """
-        with self.lock:
-            if not self.registered_speakers:
-                return None, {}
-            
-            try:
-                candidate_embedding = self.embedder.extract_embedding(audio_data)
-            except Exception as e:
-                print(f"Error extracting embedding for identification: {e}")
-                return None, {}
-            
-            similarities = {}
-            
-            # Calculate similarity with all registered speakers
-            for speaker_id, stored_embedding in self.registered_speakers.items():
-                similarity = cosine_similarity(
-                    candidate_embedding.reshape(1, -1),
-                    stored_embedding.reshape(1, -1)
-                )[0][0]
-                
-                similarities[speaker_id] = float(similarity)
-            
-            # Find the best match
-            if similarities:
-                best_match = max(similarities.keys(), key=lambda k: similarities[k])
-                best_score = similarities[best_match]
-                
-                if best_score >= self.verification_threshold:
-                    return best_match, similarities
-            
-            return None, similarities
+        if not self.speaker_ids:
+            return None, {}
+        try:
+            candidate_embedding = self.embedder.extract_embedding(audio_data)
+        except Exception as e:
+            print(f"Error extracting embedding for identification: {e}")
+            return None, {}
+        
+        ids, scores = self.score_embedding(candidate_embedding)
+        similarities = {speaker_id: float(score) for speaker_id, score in zip(ids, scores)}
+        if similarities:
+            best = int(np.argmax(scores))
+            if scores[best] >= self.verification_threshold:
+                return ids[best], similarities
+        return None, similarities
     
     def remove_speaker(self, speaker_id: str) -> bool:
         """Remove a registered speaker."""
@@ -241,6 +207,7 @@ class SpeakerRecognizer:
                 del self.registered_speakers[speaker_id]
                 if speaker_id in self.enrollment_sessions:
                     del self.enrollment_sessions[speaker_id]
+                self._rebuild_matrix()
                 print(f"Speaker '{speaker_id}' removed")
                 return True
             return False
@@ -256,34 +223,158 @@ class SpeakerRecognizer:
             return len(self.registered_speakers)
     
     def save_model(self, filepath: str):
-        """Save the registered speakers to a file."""
+        """Save the registered speakers to a .npz file (ids, embedding matrix, threshold)."""
         with self.lock:
-            data = {
-                'registered_speakers': self.registered_speakers,
-                'verification_threshold': self.verification_threshold
-            }
+            ids = list(self.registered_speakers.keys())
+            embeddings = (np.stack([self.registered_speakers[s] for s in ids]) if ids
+                          else np.zeros((0, self.embedder.embedding_dim), dtype=np.float32))
             with open(filepath, 'wb') as f:
-                pickle.dump(data, f)
+                np.savez(f, ids=np.array(ids, dtype=str), embeddings=embeddings.astype(np.float32),
+                         verification_threshold=np.float32(self.verification_threshold))
             print(f"Speaker model saved to {filepath}")
     
     def load_model(self, filepath: str):
-        """Load registered speakers from a file."""
+        """Load registered speakers from a .npz file written by save_model()."""
         with self.lock:
             if not os.path.exists(filepath):
                 print(f"Model file {filepath} does not exist")
                 return False
             
-            with open(filepath, 'rb') as f:
-                data = pickle.load(f)
+            with np.load(filepath, allow_pickle=False) as data:
+                ids = [str(s) for s in data['ids']]
+                embeddings = data['embeddings']
+                self.verification_threshold = float(data['verification_threshold'])
+            
+            if embeddings.shape[1:] != (self.embedder.embedding_dim,):
+                print(f"Model file {filepath} has {embeddings.shape[1:]} embeddings, expected {self.embedder.embedding_dim}")
+                return False
             
-            self.registered_speakers = data.get('registered_speakers', {})
-            self.verification_threshold = data.get('verification_threshold', 0.7)
+            self.registered_speakers = {s: e.astype(np.float32) for s, e in zip(ids, embeddings)}
+            self._rebuild_matrix()
             
             print(f"Speaker model loaded from {filepath}")
             print(f"Loaded {len(self.registered_speakers)} speakers")
             return True
 
 
+class RollingSpeakerVerifier:
+    """
+    Verifies whoever is speaking over the last `window_s` seconds of
+    observed speech instead of a single frame. observe() only copies the
+    frame into a rolling buffer; a background thread extracts the embedding
+    and scores it every `hop_s` of new audio, and latest() returns the most
+    recent result without blocking the audio loop.
+    """
+    
+    def __init__(self, recognizer: SpeakerRecognizer, window_s: float = 1.5, hop_s: float = 0.5,
+                 min_s: float = 0.5, sample_rate: int = 16000):
+        self.recognizer = recognizer
+        self.window = np.zeros(int(window_s * sample_rate), dtype=np.float32)
+        self.hop = int(hop_s * sample_rate)
+        self.min_samples = int(min_s * sample_rate)
+        self.sample_rate = sample_rate
+        
+        self.cond = threading.Condition()
+        self.filled = 0  # Valid samples at the end of self.window
+        self.pending = 0  # Samples observed since the last scoring
+        self.requested = False
+        self.result = (None, 0.0)
+        self.result_time = 0.0
+        self.evaluations = 0
+        self.eval_seconds = 0.0
+        
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+    
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+    
+    def observe(self, audio_chunk):
+        """Append a frame of speech (int16 bytes or float32 samples)"""
+        if isinstance(audio_chunk, (bytes, bytearray)):
+            audio = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
+        else:
+            audio = np.asarray(audio_chunk, dtype=np.float32).reshape(-1)
+        n = min(len(audio), len(self.window))
+        if n == 0:
+            return
+        with self.cond:
+            self.window[:-n] = self.window[n:]
+            self.window[-n:] = audio[-n:]
+            self.filled = min(len(self.window), self.filled + n)
+            self.pending += n
+            if self.pending >= self.hop and self.filled >= self.min_samples:
+                self.cond.notify_all()
+        self.start()
+    
+    def reset(self):
+        """Forget observed audio and results (e.g. a new conversation)"""
+        with self.cond:
+            self.filled = 0
+            self.pending = 0
+            self.result = (None, 0.0)
+            self.result_time = 0.0
+    
+    def latest(self, max_age: float = 3.0) -> Tuple[Optional[str], float]:
+        """Most recent (speaker_id, confidence), or (None, 0.0) if older than `max_age` seconds"""
+        with self.cond:
+            if time.monotonic() - self.result_time > max_age:
+                return None, 0.0
+            return self.result
+    
+    def verify_now(self, timeout: float = 0.3) -> Tuple[Optional[str], float]:
+        """Score the current window right away and wait up to `timeout` for the result"""
+        with self.cond:
+            if self.filled < self.min_samples:
+                return self.result if self.result_time else (None, 0.0)
+            requested_at = time.monotonic()
+            self.requested = True
+            self.cond.notify_all()
+        self.start()
+        with self.cond:
+            self.cond.wait_for(lambda: self.result_time >= requested_at, timeout)
+            return self.result
+    
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: not self.running or self.requested
+                                   or (self.pending >= self.hop and self.filled >= self.min_samples))
+                if not self.running:
+                    return
+                audio = self.window[-self.filled:].copy()
+                self.pending = 0
+                self.requested = False
+            
+            start = time.perf_counter()
+            try:
+                if self.recognizer.speaker_ids:
+                    result = self.recognizer.verify_embedding(self.recognizer.embedder.extract_embedding(audio))
+                else:
+                    result = (None, 0.0)
+            except Exception as e:
+                print(f"RollingSpeakerVerifier: verification failed: {e}")
+                result = (None, 0.0)
+            self.eval_seconds += time.perf_counter() - start
+            self.evaluations += 1
+            
+            with self.cond:
+                self.result = result
+                self.result_time = time.monotonic()
+                self.cond.notify_all()
+
+
 class SpeakerAuthenticator:
     """
     Higher-level class that integrates speaker recognition into the voice system.
@@ -299,6 +390,10 @@ class SpeakerAuthenticator:
         self.allowed_speakers = set()  # Empty means allow all
         self.access_logs = deque(maxlen=100)
         
+        # Rolling-window verification on a background thread
+        self.verifier = RollingSpeakerVerifier(self.recognizer)
+        self._logged_result_time = 0.0
+        
         print("SpeakerAuthenticator initialized")
     
     def authenticate(self, audio_data: np.ndarray) -> Tuple[bool, Optional[str], float]:
@@ -312,45 +407,54 @@ class SpeakerAuthenticator:
             Tuple of (is_authenticated, speaker_id, confidence)
         """
         speaker_id, confidence = self.recognizer.verify_speaker(audio_data)
+        return self._authorize(speaker_id, confidence)
+    
+    def observe(self, audio_chunk):
+        """Feed a frame of speech to the rolling verification window (cheap, non-blocking)"""
+        if self.recognizer.speaker_ids:
+            self.verifier.observe(audio_chunk)
+    
+    def authenticate_window(self, wait: bool = False, timeout: float = 0.3) -> Tuple[bool, Optional[str], float]:
+        """
+        Authorization status of whoever spoke in the rolling window.
+        wait=False returns the latest background result immediately;
+        wait=True scores the current window and waits up to `timeout`.
+        """
+        if not self.recognizer.speaker_ids:
+            return False, None, 0.0
+        if wait:
+            speaker_id, confidence = self.verifier.verify_now(timeout)
+        else:
+            speaker_id, confidence = self.verifier.latest()
         
+        # Log each background result once, not every time it is read
+        log = self.verifier.result_time != self._logged_result_time
+        self._logged_result_time = self.verifier.result_time
+        return self._authorize(speaker_id, confidence, log=log)
+    
+    def _authorize(self, speaker_id: Optional[str], confidence: float, log: bool = True) -> Tuple[bool, Optional[str], float]:
+        """Apply the allowed-speaker list to a recognition result and log it"""
         if speaker_id:
             # Check if speaker is allowed (if access control is enabled)
             is_allowed = (not self.allowed_speakers or 
                          speaker_id in self.allowed_speakers)
-            
             if is_allowed:
                 self.current_speaker = speaker_id
                 self.last_verification_time = 0  # Reset timeout tracking
-                
-                # Log access
-                self.access_logs.append({
-                    'speaker_id': speaker_id,
-                    'confidence': confidence,
-                    'timestamp': 0,  # Would be actual timestamp
-                    'granted': True
-                })
-                
-                return True, speaker_id, confidence
-            else:
-                # Speaker recognized but not authorized
-                self.access_logs.append({
-                    'speaker_id': speaker_id,
-                    'confidence': confidence,
-                    'timestamp': 0,
-                    'granted': False
-                })
-                
-                return False, speaker_id, confidence
         else:
             # Speaker not recognized
+            is_allowed = False
+            confidence = 0.0
+        
+        if log:
             self.access_logs.append({
-                'speaker_id': 'unknown',
+                'speaker_id': speaker_id or 'unknown',
                 'confidence': confidence,
-                'timestamp': 0,
-                'granted': False
+                'timestamp': time.time(),
+                'granted': is_allowed
             })
-            
-            return False, None, 0.0
+        
+        return is_allowed, speaker_id, confidence
     
     def enroll_current_speaker(self, speaker_id: str, audio_samples: List[np.ndarray]) -> bool:
         """Enroll the current speaker."""
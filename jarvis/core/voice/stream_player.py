@@ -0,0 +1,228 @@
+"""
+Streaming playback for compressed TTS audio.
+
+MP3 bytes are decoded incrementally (PyAV) into int16 PCM, written into a
+ring buffer and pulled by an output stream callback (sounddevice), so
+playback starts with the first decodable frame. The callback also hands a
+16 kHz copy of exactly the samples it just played to `on_audio_chunk`,
+which is what the echo canceller needs as its reference signal.
+"""
+import threading
+import numpy as np
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDDEVICE_AVAILABLE = False
+
+STREAMING_PLAYBACK_AVAILABLE = AV_AVAILABLE and SOUNDDEVICE_AVAILABLE
+
+
+class PCMRingBuffer:
+    """Fixed-size int16 ring. write() blocks while full, read_into() never blocks."""
+
+    def __init__(self, capacity: int, start: int = 0):
+        self.data = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        # Absolute sample positions (never wrap), so they double as stream positions
+        self.read_pos = start
+        self.write_pos = start
+        self.cond = threading.Condition()
+
+    def available(self) -> int:
+        return self.write_pos - self.read_pos
+
+    def space(self) -> int:
+        return self.capacity - self.available()
+
+    def write(self, samples, should_abort=None, timeout=0.05) -> bool:
+        """Append all of `samples`; False if `should_abort()` became true while waiting"""
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        done = 0
+        while done < len(samples):
+            with self.cond:
+                free = self.space()
+                if free == 0:
+                    self.cond.wait(timeout)
+                    if should_abort and should_abort():
+                        return False
+                    continue
+                n = min(free, len(samples) - done)
+                start = self.write_pos % self.capacity
+                first = min(n, self.capacity - start)
+                self.data[start:start + first] = samples[done:done + first]
+                self.data[:n - first] = samples[done + first:done + n]
+                self.write_pos += n
+                done += n
+                self.cond.notify_all()
+        return True
+
+    def read_into(self, out) -> int:
+        """Copy up to len(out) samples into `out`; returns how many"""
+        with self.cond:
+            n = min(len(out), self.available())
+            if n:
+                start = self.read_pos % self.capacity
+                first = min(n, self.capacity - start)
+                out[:first] = self.data[start:start + first]
+                out[first:n] = self.data[:n - first]
+                self.read_pos += n
+                self.cond.notify_all()
+            return n
+
+    def clear(self):
+        """Drop everything not read yet"""
+        with self.cond:
+            self.read_pos = self.write_pos
+            self.cond.notify_all()
+
+
+class MP3StreamDecoder:
+    """Incremental MP3 -> int16 mono PCM, plus an optional resampled reference copy."""
+
+    def __init__(self, reference_rate=None):
+        self.codec = av.CodecContext.create("mp3", "r")
+        self.play_resampler = av.AudioResampler(format="s16", layout="mono")
+        self.ref_resampler = (
+            av.AudioResampler(format="s16", layout="mono", rate=reference_rate) if reference_rate else None
+        )
+        self.sample_rate = None
+
+    def _convert(self, frames):
+        play, ref = [], []
+        for frame in frames:
+            self.sample_rate = self.sample_rate or frame.sample_rate
+            for out in self.play_resampler.resample(frame):
+                play.append(out.to_ndarray().reshape(-1))
+            if self.ref_resampler:
+                for out in self.ref_resampler.resample(frame):
+                    ref.append(out.to_ndarray().reshape(-1))
+        empty = np.zeros(0, dtype=np.int16)
+        return (np.concatenate(play) if play else empty,
+                np.concatenate(ref) if ref else (empty if self.ref_resampler else None))
+
+    def decode(self, data: bytes):
+        """Feed MP3 bytes; returns (pcm, reference_pcm) for every complete frame so far"""
+        frames = []
+        for packet in self.codec.parse(data):
+            frames.extend(self.codec.decode(packet))
+        return self._convert(frames)
+
+    def flush(self):
+        """Decode what the parser still holds at end of stream"""
+        frames = []
+        try:
+            for packet in self.codec.parse(None):
+                frames.extend(self.codec.decode(packet))
+            frames.extend(self.codec.decode(None))
+        except Exception:
+            pass
+        return self._convert(frames)
+
+
+def _sounddevice_stream(rate, blocksize, callback):
+    return sd.OutputStream(samplerate=rate, channels=1, dtype="int16", blocksize=blocksize, callback=callback)
+
+
+class StreamingPlayer:
+    """
+    Ring-buffered output stream. Producers write() PCM as it is decoded;
+    the device callback drains it and reports the played reference audio.
+    `played`/`written` are absolute sample positions used to track segments.
+    """
+
+    def __init__(self, on_audio_chunk=None, reference_rate=16000, buffer_seconds=30.0,
+                 block_ms=20, stream_factory=None):
+        self.on_audio_chunk = on_audio_chunk
+        self.reference_rate = reference_rate
+        self.buffer_seconds = buffer_seconds
+        self.block_ms = block_ms
+        self.stream_factory = stream_factory or _sounddevice_stream
+
+        self.rate = None
+        self.stream = None
+        self.pcm = PCMRingBuffer(1)
+        self.ref = None
+        self._ref_due = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def played(self) -> int:
+        return self.pcm.read_pos
+
+    @property
+    def written(self) -> int:
+        return self.pcm.write_pos
+
+    def _open(self, rate):
+        """(Re)open the output stream at `rate`, keeping positions continuous"""
+        self.close()
+        with self._lock:
+            position = self.pcm.write_pos
+            self.rate = rate
+            self.pcm = PCMRingBuffer(int(rate * self.buffer_seconds), start=position)
+            self.ref = PCMRingBuffer(int(self.reference_rate * self.buffer_seconds)) if self.on_audio_chunk else None
+            self._ref_due = 0.0
+        self.stream = self.stream_factory(rate, int(rate * self.block_ms / 1000), self._callback)
+        self.stream.start()
+        print(f"StreamingPlayer: Output stream opened at {rate} Hz")
+
+    def write(self, pcm, ref=None, rate=None, should_abort=None) -> bool:
+        """Queue decoded samples; opens the stream on the first write. False if aborted."""
+        if len(pcm) == 0:
+            return True
+        if self.stream is None or (rate and rate != self.rate):
+            self._open(rate or self.rate)
+        if self.ref is not None and ref is not None and len(ref):
+            self.ref.write(ref, should_abort)
+        return self.pcm.write(pcm, should_abort)
+
+    def _callback(self, outdata, frames, time_info, status):
+        out = outdata[:, 0] if outdata.ndim > 1 else outdata
+        with self._lock:
+            n = self.pcm.read_into(out[:frames])
+            out[n:frames] = 0
+            if n and self.ref is not None:
+                # Reference samples covering exactly the n samples just played
+                self._ref_due += n * self.reference_rate / self.rate
+                k = int(self._ref_due)
+                self._ref_due -= k
+                if k:
+                    ref = np.empty(k, dtype=np.int16)
+                    got = self.ref.read_into(ref)
+                    if got:
+                        self.on_audio_chunk(ref[:got].tobytes())
+
+    def wait_played(self, position, should_abort=None, poll=0.01) -> bool:
+        """Block until playback passes `position`; False if aborted first"""
+        while self.played < position:
+            if should_abort and should_abort():
+                return False
+            with self.pcm.cond:
+                if self.played < position:
+                    self.pcm.cond.wait(poll)
+        return True
+
+    def clear(self):
+        """Silence immediately: drop all queued audio"""
+        with self._lock:
+            self.pcm.clear()
+            if self.ref is not None:
+                self.ref.clear()
+            self._ref_due = 0.0
+
+    def close(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"StreamingPlayer: Error closing stream: {e}")
+            self.stream = None
@@ -0,0 +1,125 @@
+import re
+import threading
+
+
+def _norm(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class IncrementalTranscriber:
+    """
+    Partial transcription of an utterance that is still being recorded.
+
+    Every `interval` seconds of new speech, the audio after the committed
+    prefix is decoded again (`decode(audio, prompt) -> [(word, start, end)]`,
+    times in seconds relative to `audio`). Words on which two consecutive
+    hypotheses agree are committed (LocalAgreement-2): their text is final
+    and their audio is never decoded again, so end-of-speech only has to
+    decode the remaining tail.
+    """
+
+    def __init__(self, buffer, decode, interval=0.4, pad=0.3, min_window=0.5, on_partial=None):
+        self.buffer = buffer  # PCMBuffer, appended to under self.lock
+        self.decode = decode
+        self.sample_rate = buffer.sample_rate
+        self.interval = int(interval * self.sample_rate)
+        self.pad = int(pad * self.sample_rate)
+        self.min_window = int(min_window * self.sample_rate)
+        self.on_partial = on_partial  # fn(partial_text, stable_text)
+
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = None
+        self.decodes = 0
+        self.utterance = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance; results of an in-flight decode are dropped"""
+        with self.lock:
+            self.utterance += 1
+            self.committed = []
+            self.committed_samples = 0
+            self.hypothesis = []
+            self.speech_end = 0
+            self.decoded_end = 0
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(w for w, _, _ in self.committed).strip()
+
+    def mark_speech(self):
+        """The audio buffered so far ends in speech"""
+        self.speech_end = len(self.buffer)
+        if self.speech_end - self.decoded_end >= self.interval:
+            self.wakeup.set()
+
+    def step(self) -> bool:
+        """Run one partial decode if enough new speech arrived; True if it did"""
+        with self.lock:
+            utterance = self.utterance
+            start = self.committed_samples
+            # Trailing silence beyond a short pad is never decoded here
+            end = min(len(self.buffer), self.speech_end + self.pad)
+            if end - start < self.min_window or end - self.decoded_end < self.interval:
+                return False
+            audio = self.buffer.data[start:end].copy()
+            prompt = self.committed_text
+
+        words = self.decode(audio, prompt)
+        self.decodes += 1
+
+        with self.lock:
+            if utterance != self.utterance or start != self.committed_samples:
+                return False
+            self.decoded_end = end
+
+            agreed = 0
+            for (new, _, _), (old, _, _) in zip(words, self.hypothesis):
+                if _norm(new) != _norm(old):
+                    break
+                agreed += 1
+
+            if agreed:
+                self.committed.extend(words[:agreed])
+                self.committed_samples = start + min(len(audio), int(words[agreed - 1][2] * self.sample_rate))
+            self.hypothesis = words[agreed:]
+            stable = self.committed_text
+            partial = (stable + "".join(w for w, _, _ in self.hypothesis)).strip()
+
+        if self.on_partial and partial:
+            try:
+                self.on_partial(partial, stable)
+            except Exception as e:
+                print(f"IncrementalTranscriber: partial callback failed: {e}")
+        return True
+
+    def finish(self):
+        """End of speech: (committed_text, committed_samples); stops further partials"""
+        with self.lock:
+            self.utterance += 1
+            return self.committed_text, self.committed_samples
+
+    def _run(self):
+        period = self.interval / float(self.sample_rate)
+        while self.running:
+            self.wakeup.wait(period)
+            self.wakeup.clear()
+            try:
+                self.step()
+            except Exception as e:
+                print(f"IncrementalTranscriber: partial decode failed: {e}")
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
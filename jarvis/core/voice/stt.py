@@ -1,11 +1,14 @@
-import wave
+import threading
 from faster_whisper import WhisperModel
-import os
 from .audio_preprocessor import AudioPreprocessor
+from .pcm_buffer import PCMBuffer
+from .streaming_stt import IncrementalTranscriber
+
+COMMAND_PROMPT = "Hey Jarvis, turn on wifi, turn off bluetooth, enable hotspot, open chrome, set volume, set brightness"
 
 
 class SpeechToTextEngine:
-    def __init__(self, model_size="small.en", device=None, compute_type=None):
+    def __init__(self, model_size="small.en", device=None, compute_type=None, streaming=True):
         """
         Initialize Faster Whisper with GPU acceleration support.
         Using small.en for better accuracy - downloads ~460MB on first run.
@@ -48,24 +51,60 @@ class SpeechToTextEngine:
         # Audio preprocessing
         self.preprocessor = AudioPreprocessor(target_sample_rate=16000)
 
-        self.buffer = []
-        self.temp_filename = "temp_buffer.wav"
         self.sample_rate = 16000
+        # One float32 utterance buffer, reused between utterances
+        self.buffer = PCMBuffer(initial_seconds=30.0, sample_rate=self.sample_rate)
+
+        # Incremental mode: partial decodes while the user speaks, only the tail at the end
+        self.streaming = streaming and self.model is not None
+        self.on_partial = None  # fn(partial_text, stable_text), called from the decode thread
+        self.model_lock = threading.Lock()
+        self.incremental = IncrementalTranscriber(self.buffer, self._decode_partial,
+                                                  on_partial=self._emit_partial)
+        if self.streaming:
+            self.incremental.start()
 
     # ---------------------------------------------------------
     # Buffer management
     # ---------------------------------------------------------
 
-    def buffer_frame(self, frame: bytes):
+    def buffer_frame(self, frame: bytes, is_speech=True):
         """
         Add one audio frame to the buffer, with lightweight preprocessing.
         This also lets the AudioPreprocessor learn the noise profile online.
+        `is_speech=False` marks trailing silence, which partial decodes skip.
         """
         processed = self.preprocessor.process_chunk(frame)
-        self.buffer.append(processed)
+        with self.incremental.lock:
+            self.buffer.append(processed)
+        if is_speech and self.streaming:
+            self.incremental.mark_speech()
 
     def clear_buffer(self):
-        self.buffer = []
+        self.incremental.reset()
+        with self.incremental.lock:
+            self.buffer.clear()
+
+    def _emit_partial(self, partial_text, stable_text):
+        if self.on_partial:
+            self.on_partial(partial_text, stable_text)
+
+    def _decode_words(self, audio, prompt, beam_size):
+        """Whisper with word timestamps -> [(word, start, end)]"""
+        with self.model_lock:
+            segments, info = self.model.transcribe(
+                audio,
+                beam_size=beam_size,
+                language="en",
+                condition_on_previous_text=False,
+                initial_prompt=prompt or COMMAND_PROMPT,
+                word_timestamps=True
+            )
+            return [(w.word, w.start, w.end) for segment in segments for w in (segment.words or [])]
+
+    def _decode_partial(self, audio, prompt):
+        # Greedy is enough for hypotheses that must agree twice before they count
+        return self._decode_words(audio, prompt, beam_size=1)
 
     # ---------------------------------------------------------
     # Main transcription path
@@ -75,49 +114,50 @@ class SpeechToTextEngine:
         if not self.buffer:
             return ""
 
+        # Words already committed by partial decodes are final; only the rest is decoded
+        committed_text, committed_samples = self.incremental.finish() if self.streaming else ("", 0)
+        if committed_text:
+            print(f"STT: Committed prefix ({committed_samples / self.sample_rate:.2f}s): {committed_text}")
+
         print("STT: Preprocessing audio...")
 
-        # Heavy preprocessing on the whole utterance
-        processed_audio = self.preprocessor.process_complete_audio(self.buffer)
+        # Heavy preprocessing on the whole utterance (or its tail), kept as float32 end to end
+        processed_audio = self.preprocessor.process_complete_array(self.buffer.view()[committed_samples:])
 
         if processed_audio is None:
+            if committed_text:
+                return committed_text
             print("STT: Audio quality too low, skipping transcription")
             return ""
 
         # Minimum duration check (avoid transcribing tiny/noisy chunks)
-        total_samples = len(processed_audio) // 2  # int16 => 2 bytes
-        duration_sec = total_samples / float(self.sample_rate)
+        duration_sec = len(processed_audio) / float(self.sample_rate)
         if duration_sec < 0.2:
+            if committed_text:
+                return committed_text
             print(f"STT: Utterance too short ({duration_sec:.2f}s), ignoring")
             return ""
 
-        # Save preprocessed audio to WAV
         try:
-            with wave.open(self.temp_filename, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)  # 16-bit
-                wf.setframerate(self.sample_rate)
-                wf.writeframes(processed_audio)
-
             print("STT: Running Whisper transcription...")
+            # 16 kHz float32 goes straight to faster-whisper, no WAV round trip
             # Use better beam size and initial prompt for command recognition
-            segments, info = self.model.transcribe(
-                self.temp_filename,
-                beam_size=5,             # Better accuracy (was 1)
-                language="en",
-                condition_on_previous_text=False,
-                initial_prompt="Hey Jarvis, turn on wifi, turn off bluetooth, enable hotspot, open chrome, set volume, set brightness"  # Bias towards common commands
-            )
-            text = " ".join([segment.text for segment in segments]).strip()
+            with self.model_lock:
+                segments, info = self.model.transcribe(
+                    processed_audio,
+                    beam_size=5,             # Better accuracy (was 1)
+                    language="en",
+                    condition_on_previous_text=False,
+                    initial_prompt=committed_text or COMMAND_PROMPT  # Bias towards common commands
+                )
+                text = " ".join([segment.text for segment in segments]).strip()
+            text = f"{committed_text} {text}".strip()
 
             print(f"STT: Transcription complete - {len(text)} chars")
             return text
         except Exception as e:
             print(f"STT: Transcription Error - {e}")
-            return ""
-        finally:
-            if os.path.exists(self.temp_filename):
-                os.remove(self.temp_filename)
+            return committed_text
 
     def transcribe(self, audio_data):
         """
@@ -127,14 +167,15 @@ class SpeechToTextEngine:
             return ""
 
         try:
-            segments, info = self.model.transcribe(
-                audio_data,
-                beam_size=5,
-                language="en",
-                condition_on_previous_text=False,
-                initial_prompt="Hey Jarvis, turn on wifi, turn off bluetooth, enable hotspot, open chrome"
-            )
-            text = " ".join([segment.text for segment in segments])
+            with self.model_lock:
+                segments, info = self.model.transcribe(
+                    audio_data,
+                    beam_size=5,
+                    language="en",
+                    condition_on_previous_text=False,
+                    initial_prompt="Hey Jarvis, turn on wifi, turn off bluetooth, enable hotspot, open chrome"
+                )
+                text = " ".join([segment.text for segment in segments])
             return text.strip()
         except Exception as e:
             print(f"STT: Transcription Error - {e}")
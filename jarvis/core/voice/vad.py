@@ -1,19 +1,178 @@
-import torch
+import os
+import time
+import threading
 import numpy as np
-from collections import deque
+from collections import deque, OrderedDict
 
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
 
-class VoiceActivityDetector:
-    def __init__(self):
-        # Load Silero VAD
-        self.model, utils = torch.hub.load(
-            repo_or_dir='snakers4/silero-vad',
-            model='silero_vad',
-            force_reload=False,
-            trust_repo=True
-        )
+SILERO_VAD_URL = "https://github.com/snakers4/silero-vad/raw/master/src/silero_vad/data/silero_vad.onnx"
+
+
+class SileroVAD:
+    """
+    The one Silero VAD model of the voice pipeline (ONNX Runtime, CPU).
+
+    Silero is a streaming model: its recurrent state and the last 64 samples
+    of context are carried from frame to frame, so every frame must go
+    through it exactly once and in order. probability(frame, seq) memoizes
+    results by the microphone frame sequence number, so the VAD, the wake
+    word detector and anyone else looking at the same frame share one
+    inference. Frames without a seq are always run.
+    """
+
+    CONTEXT = 64  # Samples of the previous frame the 16 kHz model expects in front
+    WINDOW = 512  # Samples per inference at 16 kHz
+
+    def __init__(self, model_path=None, num_threads=1, session=None, cache_size=16):
+        self.model_path = model_path or os.path.join(os.getcwd(), 'models', 'silero', 'silero_vad.onnx')
+        self.num_threads = num_threads
+        self.sample_rate = 16000
+        self.session = session
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+        self.inferences = 0
+        self.inference_seconds = 0.0
+        self.load_seconds = 0.0
+
+        if self.session is None:
+            self.session = self._load_session()
+        self.reset()
+
+    def _load_session(self):
+        if not ORT_AVAILABLE:
+            print("SileroVAD: onnxruntime not installed, using energy fallback")
+            return None
+        if not os.path.exists(self.model_path):
+            self._download()
+        start = time.perf_counter()
+        try:
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.num_threads
+            options.inter_op_num_threads = 1
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            session = ort.InferenceSession(self.model_path, sess_options=options,
+                                           providers=["CPUExecutionProvider"])
+        except Exception as e:
+            print(f"SileroVAD: Failed to load {self.model_path}: {e}")
+            return None
+        self.load_seconds = time.perf_counter() - start
+        print(f"SileroVAD: ONNX model loaded in {self.load_seconds * 1000:.0f}ms ({self.num_threads} thread(s))")
+        return session
+
+    def _download(self):
+        import requests
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        print(f"SileroVAD: Downloading model to {self.model_path}...")
+        try:
+            response = requests.get(SILERO_VAD_URL, timeout=30)
+            response.raise_for_status()
+            with open(self.model_path, 'wb') as f:
+                f.write(response.content)
+        except Exception as e:
+            print(f"SileroVAD: Download failed: {e}")
+
+    def set_num_threads(self, num_threads):
+        """Intra-op thread count (like torch.set_num_threads); rebuilds the session"""
+        with self.lock:
+            if num_threads == self.num_threads or self.session is None:
+                self.num_threads = num_threads
+                return
+            self.num_threads = num_threads
+            self.session = self._load_session()
+
+    def reset(self):
+        """Drop the streaming state (e.g. after the stream was interrupted)"""
+        with self.lock:
+            self.state = np.zeros((2, 1, 128), dtype=np.float32)
+            self.context = np.zeros((1, self.CONTEXT), dtype=np.float32)
+            self.cache.clear()
+
+    def _infer(self, audio):
+        """One streaming step over WINDOW samples"""
+        if self.session is None:
+            # No model: map RMS energy onto a rough speech probability
+            return float(min(1.0, np.sqrt(np.mean(audio ** 2)) / 0.05))
+
+        x = np.concatenate((self.context, audio.reshape(1, -1)), axis=1)
+        start = time.perf_counter()
+        out, self.state = self.session.run(None, {
+            "input": x,
+            "state": self.state,
+            "sr": np.array(self.sample_rate, dtype=np.int64)
+        })
+        self.inference_seconds += time.perf_counter() - start
+        self.inferences += 1
+        self.context = x[:, -self.CONTEXT:]
+        return float(out.reshape(-1)[0])
+
+    def probability(self, frame, seq=None):
+        """Speech probability of a frame (int16 bytes or float32 samples)"""
+        with self.lock:
+            if seq is not None and seq in self.cache:
+                return self.cache[seq]
+
+            if isinstance(frame, (bytes, bytearray)):
+                audio = np.frombuffer(frame, dtype=np.int16).astype(np.float32) / 32768.0
+            else:
+                audio = np.asarray(frame, dtype=np.float32).reshape(-1)
+            if len(audio) == 0:
+                return 0.0
+
+            # Frames that are not exactly one window are split / padded
+            probs = []
+            for i in range(0, len(audio), self.WINDOW):
+                window = audio[i:i + self.WINDOW]
+                if len(window) < self.WINDOW:
+                    window = np.pad(window, (0, self.WINDOW - len(window)))
+                probs.append(self._infer(window))
+            prob = max(probs)
+
+            if seq is not None:
+                self.cache[seq] = prob
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            return prob
+
+    def stats(self):
+        return {
+            "load_ms": self.load_seconds * 1000,
+            "inferences": self.inferences,
+            "avg_inference_ms": self.inference_seconds / self.inferences * 1000 if self.inferences else 0.0,
+            "threads": self.num_threads,
+        }
+
+
+_vad_instance = None
+_vad_lock = threading.Lock()
+
+def get_vad() -> SileroVAD:
+    """The shared SileroVAD instance"""
+    global _vad_instance
+    with _vad_lock:
+        if _vad_instance is None:
+            _vad_instance = SileroVAD()
+        return _vad_instance
+
+def reset_vad():
+    """Reset the shared VAD's stream state and seq cache, if it was created.
+    Call whenever microphone frame numbering restarts."""
+    with _vad_lock:
+        vad = _vad_instance
+    if vad is not None:
+        vad.reset()
 
-        (_, _, _, _, _) = utils
+
+class VoiceActivityDetector:
+    def __init__(self, vad=None):
+        # Shared Silero VAD (ONNX)
+        self.model = vad or get_vad()
 
         self.sample_rate = 16000
 
@@ -28,14 +187,16 @@ class VoiceActivityDetector:
 
         # Smoothing (reduces false positives but kept shorter for responsiveness)
         self.smooth_window = deque(maxlen=3)  # Shorter window for faster response
+        self.last_seq = None
 
         print("VAD: Loaded + smoothing + noise calibration enabled")
 
-    def is_speech(self, frame_bytes, strict=False, tts_energy=0.0):
+    def is_speech(self, frame_bytes, strict=False, tts_energy=0.0, seq=None):
         """
         strict=True used during SPEAKING (interrupt detection)
         strict=False used during LISTENING
         tts_energy = RMS of TTS output for echo suppression
+        seq = microphone frame number; repeated calls for one frame share one inference
         """
         if not frame_bytes:
             return False
@@ -45,15 +206,18 @@ class VoiceActivityDetector:
             return False
 
         float_audio = audio / 32768.0
-        tensor = torch.tensor(float_audio).unsqueeze(0)
 
         try:
-            prob = float(self.model(tensor, self.sample_rate).item())
+            prob = self.model.probability(float_audio, seq)
         except Exception:
             return False
 
+        # Calibration and smoothing advance once per frame
+        new_frame = seq is None or seq != self.last_seq
+        self.last_seq = seq
+
         # Noise calibration
-        if not self.noise_learned:
+        if new_frame and not self.noise_learned:
             self.noise_probs.append(prob)
             if len(self.noise_probs) >= self.noise_frames_needed:
                 noise_level = np.mean(self.noise_probs)
@@ -64,7 +228,8 @@ class VoiceActivityDetector:
                 print(f"VAD: Noise learned → baseline={noise_level:.2f} threshold={self.dynamic_threshold:.2f}")
 
         # Smoothing
-        self.smooth_window.append(prob)
+        if new_frame:
+            self.smooth_window.append(prob)
         smooth_prob = float(np.mean(self.smooth_window))
 
         # Echo suppression – if TTS is loud, raise threshold
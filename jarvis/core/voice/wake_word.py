@@ -1,9 +1,9 @@
-import torch
 import numpy as np
-import torchaudio
 from collections import deque
 import threading
 import time
+from .vad import get_vad
+from .keyword_spotter import KeywordSpotter
 
 
 class WakeWordDetector:
@@ -16,17 +16,11 @@ class WakeWordDetector:
     """
     
     def __init__(self, sensitivity=0.5):
-        # Load Silero VAD model (which can also be used for wake word detection)
+        # Shared Silero VAD (which can also be used for wake word detection)
         try:
-            self.model, utils = torch.hub.load(
-                repo_or_dir='snakers4/silero-vad',
-                model='silero_vad',
-                force_reload=False,
-                trust_repo=True
-            )
-            (_, _, _, _, _) = utils
+            self.model = get_vad()
             self.sample_rate = 16000
-            print("WakeWordDetector: Silero VAD model loaded for wake word detection")
+            print("WakeWordDetector: Using shared Silero VAD for wake word detection")
         except Exception as e:
             print(f"WakeWordDetector: Failed to load Silero model: {e}")
             self.model = None
@@ -82,9 +76,10 @@ class WakeWordDetector:
         """Check if wake word was detected recently (debouncing)"""
         return (time.time() - self.last_detection_time) < self.debounce_interval
 
-    def detect_wake_word(self, audio_chunk):
+    def detect_wake_word(self, audio_chunk, seq=None):
         """
         Detect wake word in audio chunk
+        seq = microphone frame number, shares the VAD inference with other consumers
         Returns: (is_wake_word_detected, confidence_score)
         """
         with self.lock:
@@ -102,18 +97,13 @@ class WakeWordDetector:
                 return False, 0.0
             
             # Add to buffer for potential full analysis
-            for sample in audio_data:
-                self.audio_buffer.append(sample)
+            self.audio_buffer.extend(audio_data)
             
             # Use Silero model if available
             if self.model is not None:
                 try:
-                    # Convert to tensor
-                    tensor = torch.tensor(audio_data).unsqueeze(0)
-                    
                     # Get probability from model
-                    with torch.no_grad():
-                        prob = float(self.model(tensor, self.sample_rate).item())
+                    prob = self.model.probability(audio_data, seq)
                     
                     # Update adaptive threshold
                     self.update_dynamic_threshold(prob)
@@ -165,59 +155,60 @@ class WakeWordDetector:
 
 class MultiKeywordWakeWordDetector:
     """
-    Enhanced wake word detector supporting multiple keywords/phrases
+    Wake word detector for the configured keywords.
+
+    An always-on KeywordSpotter (MFCC templates + DTW) listens for the
+    keywords themselves; nothing heavier runs until it fires. Without
+    enrolled templates (scripts/enroll_wake_word.py) it falls back to the
+    speech-probability detector, which wakes on any speech.
     """
-    
-    def __init__(self, keywords=None, sensitivity=0.5):
+
+    def __init__(self, keywords=None, sensitivity=0.5, spotter=None):
         self.wake_word_detector = WakeWordDetector(sensitivity=sensitivity)
-        
+
         if keywords is None:
             self.keywords = ["hey jarvis", "jarvis", "wake up", "hello jarvis"]
         else:
             self.keywords = [kw.lower() for kw in keywords]
-        
-        # Initialize speech recognition for keyword verification
-        # Note: This is a simplified approach - in practice, you'd use a 
-        # lightweight keyword spotter rather than full STT
-        self.keyword_buffer = deque(maxlen=32000)  # 2 seconds at 16kHz
+
+        self.spotter = spotter or KeywordSpotter(self.keywords)
+        self.spotter.keywords = self.keywords
         self.detection_history = deque(maxlen=10)
-    
-    def detect_wake_word(self, audio_chunk):
+        self.last_keyword = None
+
+        if not self.spotter.has_templates():
+            print("MultiKeywordWakeWordDetector: No keyword templates enrolled, "
+                  "waking on any speech (run scripts/enroll_wake_word.py)")
+
+    def detect_wake_word(self, audio_chunk, seq=None):
         """
-        Enhanced detection that combines neural detection with keyword verification
+        Feed one audio chunk; True once a keyword has just been spoken
+        Returns: (is_wake_word_detected, confidence_score)
         """
-        # First, use the neural detector
-        is_detected, confidence = self.wake_word_detector.detect_wake_word(audio_chunk)
-        
-        if not is_detected:
-            return False, confidence
-        
-        # If neural detection triggers, add to keyword buffer for verification
+        if not self.spotter.has_templates():
+            return self.wake_word_detector.detect_wake_word(audio_chunk, seq)
+
         audio_data = self.wake_word_detector.preprocess_audio(audio_chunk)
-        for sample in audio_data:
-            self.keyword_buffer.append(sample)
-        
-        # If we have enough audio, try to verify it contains a keyword
-        if len(self.keyword_buffer) > 8000:  # 0.5 seconds of audio
-            # Convert buffer to numpy array
-            audio_array = np.array(list(self.keyword_buffer))
-            
-            # For now, we'll return the neural detection result
-            # In a full implementation, you'd run a keyword spotter here
-            verified = True  # Placeholder - would use actual keyword verification
-            
-            if verified:
-                # Clear buffer after successful detection
-                self.keyword_buffer.clear()
-                self.detection_history.append(time.time())
-                return True, confidence
-        
-        return False, confidence
-    
+        result = self.spotter.process(audio_data)
+        if result is None:
+            return False, 0.0
+
+        self.last_keyword, confidence = result
+        self.detection_history.append(time.time())
+        return True, confidence
+
+    def enroll(self, keyword, audio):
+        """Add a recording of `keyword` (float32 samples or int16 bytes) to the spotter"""
+        keyword = keyword.lower()
+        if keyword not in self.keywords:
+            self.keywords.append(keyword)
+        self.spotter.enroll(keyword, self.wake_word_detector.preprocess_audio(audio))
+
     def add_keyword(self, keyword):
         """Add a new wake word keyword"""
-        self.keywords.append(keyword.lower())
-    
+        if keyword.lower() not in self.keywords:
+            self.keywords.append(keyword.lower())
+
     def remove_keyword(self, keyword):
         """Remove a wake word keyword"""
         if keyword.lower() in self.keywords:
@@ -243,6 +243,7 @@ class JarvisGUI(QMainWindow):
             for state in self.engine.state_machine._valid_transitions.keys():
                 self.engine.state_machine.register_callback(state, self.handle_state_transition)
             self.engine.on_text_update = self.update_text_from_engine
+            self.engine.on_partial_transcript = self.update_partial_from_engine
             self.engine.on_audio_level = self.update_audio_level_from_engine
             self.engine.on_latency_update = self.update_latency_from_engine
             self.engine.on_intent_detected = self.update_intent_from_engine
@@ -265,6 +266,13 @@ class JarvisGUI(QMainWindow):
             "message": text
         })
 
+    def update_partial_from_engine(self, text):
+        # Live transcript: the HUD keeps one line and updates it in place ("" clears it)
+        self.ws_server.broadcast({
+            "type": "partial",
+            "message": text
+        })
+
     def update_audio_level_from_engine(self, level):
         # Level is 0.0 to ~1.0+ (RMS)
         self.ws_server.broadcast({
@@ -11,7 +11,7 @@ class CameraManager:
     def __init__(self):
         self.vm = get_vision_manager()
 
-    def open_camera(self, camera_id=0):
+    def open_camera(self, camera_id=0, source=None):
         """
         Delegates to VisionManager.open_vision().
         We ignore the specific camera_id=0 default to allow intelligent selection.
@@ -21,7 +21,7 @@ class CameraManager:
         # If the user specifically asks for a non-zero camera, we could force it, 
         # but VisionManager logic is "High Index = Priority".
         # Let's trust VisionManager's smart selection.
-        result = self.vm.open_vision()
+        result = self.vm.open_vision(source=source)
         return result["success"]
     
     def close_camera(self):
@@ -30,6 +30,12 @@ class CameraManager:
     def get_frame(self):
         return self.vm.get_frame()
 
+    def next_frame(self, after_id=0, timeout=1.0):
+        return self.vm.next_frame(after_id, timeout)
+
+    def wait_ready(self, frames=10, timeout=2.0):
+        return self.vm.wait_ready(frames, timeout)
+
     @property
     def is_active(self):
         return self.vm.is_active
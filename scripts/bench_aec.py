@@ -0,0 +1,75 @@
+import sys
+import os
+import time
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.voice.aec_enhanced import AdvancedAEC
+
+FS = 16000
+FRAME = 512
+
+def synthetic_echo(seconds=6, echo_gain=0.5, seed=0):
+    """Speech-like far-end signal and its echo through a random decaying room response"""
+    rng = np.random.default_rng(seed)
+    n = FS * seconds
+    far = np.convolve(rng.standard_normal(n), [1.0, 0.9, 0.5], 'same') * 0.1
+    far *= 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3 * np.arange(n) / FS))
+    rir = rng.standard_normal(800) * np.exp(-np.arange(800) / 120.0)
+    rir[:40] = 0.0
+    rir *= echo_gain / np.linalg.norm(rir)
+    return far, np.convolve(far, rir)[:n] + 1e-4 * rng.standard_normal(n)
+
+def to_bytes(x):
+    return np.clip(x * 32768.0, -32768, 32767).astype(np.int16).tobytes()
+
+def erle_db(mic, clean):
+    return 10 * np.log10(np.mean(mic ** 2) / (np.mean(clean ** 2) + 1e-12))
+
+class SampleNLMS:
+    """The previous canceller: time-domain NLMS, one filter update per sample"""
+
+    def __init__(self, filter_length=1024, step_size=0.025):
+        self.h = np.zeros(filter_length)
+        self.buf = np.zeros(filter_length)
+        self.step_size = step_size
+
+    def process(self, mic_bytes, ref_bytes):
+        mic = np.frombuffer(mic_bytes, dtype=np.int16) / 32768.0
+        ref = np.frombuffer(ref_bytes, dtype=np.int16) / 32768.0
+        out = np.zeros(len(mic))
+        for i in range(len(mic)):
+            self.buf = np.roll(self.buf, 1)
+            self.buf[0] = ref[i]
+            out[i] = mic[i] - np.dot(self.h, self.buf)
+            self.h += self.step_size * out[i] * self.buf / (self.buf @ self.buf + 1e-6)
+            if i % 100 == 0:
+                self.h *= 0.9999
+        return to_bytes(out), 0.0
+
+def measure(aec, mic, far):
+    frames = [(to_bytes(mic[i:i + FRAME]), to_bytes(far[i:i + FRAME])) for i in range(0, len(mic), FRAME)]
+    out, times = [], []
+    for m, r in frames:
+        start = time.perf_counter()
+        clean, _ = aec.process(m, r)
+        times.append(time.perf_counter() - start)
+        out.append(np.frombuffer(clean, dtype=np.int16) / 32768.0)
+    clean = np.concatenate(out)
+    tail = slice(len(mic) // 2, None)
+    return np.array(times) * 1000, erle_db(mic[tail], clean[tail])
+
+if __name__ == "__main__":
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    far, mic = synthetic_echo(seconds=seconds)
+    budget_ms = FRAME / FS * 1000
+
+    print("=" * 72)
+    print(f"ECHO CANCELLER ({seconds}s synthetic echo, {FRAME}-sample frames = {budget_ms:.0f} ms, 1024 taps)")
+    print("=" * 72)
+    for name, aec in (("per-sample NLMS", SampleNLMS()), ("partitioned FDAF", AdvancedAEC())):
+        times, erle = measure(aec, mic, far)
+        print(f"{name:<17} mean {times.mean():7.3f} ms  p99 {np.percentile(times, 99):7.3f} ms  "
+              f"real-time load {times.mean() / budget_ms * 100:6.1f}%  ERLE(2nd half) {erle:5.1f} dB")
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+import cv2
+from actions.input_actions import find_text_on_screen
+from core.vision.ocr_service import get_ocr_service
+
+def synthetic_screen(size=(1080, 1920)):
+    """A desktop-like screenshot: light background with rows of UI labels"""
+    screen = np.full(size + (3,), 240, dtype=np.uint8)
+    labels = ["File", "Edit", "View", "Search", "Settings", "Help", "Submit", "Cancel", "Open", "Save"]
+    for row in range(8):
+        for col, label in enumerate(labels):
+            cv2.putText(screen, label, (40 + col * 180, 80 + row * 120), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.9, (30, 30, 30), 2)
+    return screen
+
+def legacy_find(target_text, screenshot):
+    """The previous click_on_text lookup: a fresh easyocr.Reader on every call"""
+    import easyocr
+    reader = easyocr.Reader(['en'])
+    for (bbox, text, prob) in reader.readtext(screenshot):
+        if target_text.lower() in text.lower():
+            return (bbox[0][0] + bbox[1][0]) // 2, (bbox[0][1] + bbox[2][1]) // 2
+    return None
+
+def run(label, find, targets, screenshot):
+    times = []
+    found = 0
+    for target in targets:
+        start = time.perf_counter()
+        found += find(target, screenshot) is not None
+        times.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<22}{times[0]:>11.0f}{np.median(times[1:] or times):>11.0f}{sum(times) / 1000:>10.1f}{found:>7}/{len(targets)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Repeated click_on_text lookups: per-call Reader vs shared OCR service")
+    parser.add_argument("--calls", type=int, default=5, help="Lookups per run (like a TYPE_AT_TEXT plan)")
+    parser.add_argument("--screenshot", help="Screenshot to search instead of a synthetic screen")
+    args = parser.parse_args()
+
+    screenshot = cv2.imread(args.screenshot) if args.screenshot else synthetic_screen()
+    targets = (["Search", "Submit", "Settings", "Save", "Cancel"] * args.calls)[:args.calls]
+
+    print("=" * 72)
+    print(f"click_on_text lookup latency, {args.calls} calls on a {screenshot.shape[1]}x{screenshot.shape[0]} screen")
+    print("=" * 72)
+    print(f"{'path':<22}{'first ms':>11}{'p50 ms':>11}{'total s':>10}{'found':>10}")
+
+    run("per-call Reader", legacy_find, targets, screenshot)
+
+    start = time.perf_counter()
+    get_ocr_service()  # One-time engine load + warm-up, paid at first use
+    print(f"(shared service load: {(time.perf_counter() - start) * 1000:.0f} ms, once per process)")
+    run("shared OCR service", lambda t, s: find_text_on_screen(t, s), targets, screenshot)
+
+if __name__ == "__main__":
+    main()
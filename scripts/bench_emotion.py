@@ -0,0 +1,73 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+import cv2
+from core.vision.emotion_detector import EmotionDetector, DEEPFACE_AVAILABLE, ONNX_AVAILABLE
+
+def synthetic_frame(faces, rng, size=(480, 640)):
+    """Noise frame with `faces` boxes laid out in a row (throughput does not depend on content)"""
+    frame = rng.integers(0, 255, (*size, 3), dtype=np.uint8)
+    side = min(120, size[1] // max(1, faces) - 10)
+    boxes = [(100, 10 + i * (side + 10) + side, 100 + side, 10 + i * (side + 10)) for i in range(faces)]
+    return frame, boxes
+
+def legacy_analyze(frame):
+    """The previous detect_emotion: DeepFace's detector + emotion, age and gender on the full frame"""
+    from deepface import DeepFace
+    return DeepFace.analyze(frame, actions=['emotion', 'age', 'gender'], enforce_detection=False, silent=True)
+
+def measure(fn, frames, faces_per_frame):
+    fn(frames[0])  # Warm-up (model load)
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    wall = time.perf_counter() - start
+    return len(frames) * faces_per_frame / wall, wall / len(frames) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Emotion analysis throughput (faces/sec, CPU)")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--faces", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--image", help="Photo to use instead of a synthetic frame (boxes from YuNet/HOG)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    configs = []
+    if DEEPFACE_AVAILABLE:
+        configs.append(("legacy analyze (3 heads)", None))
+        configs.append(("deepface emotion, batched", EmotionDetector(backend="deepface")))
+    if ONNX_AVAILABLE:
+        configs.append(("FER+ onnx, batched", EmotionDetector(backend="onnx")))
+    if not configs:
+        print("Neither deepface nor onnxruntime is installed.")
+        return
+
+    print("=" * 72)
+    print(f"Emotion analysis throughput on CPU, {args.frames} frames per run")
+    print("=" * 72)
+    print(f"{'backend':<30}{'faces':>6}{'faces/s':>10}{'ms/frame':>11}")
+
+    for count in args.faces:
+        if args.image:
+            from core.vision.face_manager import FaceDetector
+            frame = cv2.imread(args.image)
+            boxes = FaceDetector().detect(frame)[:count]
+        else:
+            frame, boxes = synthetic_frame(count, rng)
+        frames = [frame] * args.frames
+        for label, detector in configs:
+            if detector is None:
+                fn = legacy_analyze
+            else:
+                fn = lambda f, d=detector: d.detect_emotion(f, boxes)
+            faces_per_s, ms = measure(fn, frames, len(boxes))
+            print(f"{label:<30}{len(boxes):>6}{faces_per_s:>10.1f}{ms:>11.1f}")
+
+if __name__ == "__main__":
+    main()
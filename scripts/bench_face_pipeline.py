@@ -0,0 +1,90 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+import cv2
+import face_recognition
+from core.vision.face_manager import FaceManager
+
+def legacy_recognize(manager, frame):
+    """The previous recognize_faces: HOG + encodings on a half-size frame, every call"""
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    small_frame = cv2.resize(rgb_frame, (0, 0), fx=0.5, fy=0.5)
+    face_locations = face_recognition.face_locations(small_frame)
+    face_encodings = face_recognition.face_encodings(small_frame, face_locations)
+    results = []
+    for encoding, location in zip(face_encodings, face_locations):
+        name, confidence = "Unknown", 0.0
+        if manager.known_face_encodings:
+            distances = face_recognition.face_distance(manager.known_face_encodings, encoding)
+            best = int(np.argmin(distances))
+            confidence = 1 - distances[best]
+            if confidence > 0.5:
+                name = manager.known_face_names[best]
+        results.append({'name': name, 'location': tuple(v * 2 for v in location), 'confidence': confidence})
+    return results
+
+def load_clip(path, limit):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+def run(label, recognize, frames, fps, realtime):
+    faces = 0
+    names = {}
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for i, frame in enumerate(frames):
+        if realtime:
+            delay = wall_start + i / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        results = recognize(frame)
+        faces += len(results)
+        for r in results:
+            names[r['name']] = names.get(r['name'], 0) + 1
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    print(f"{label:<10}{len(frames) / wall:>10.1f}{faces / wall:>10.1f}"
+          f"{cpu / len(frames) * 1000:>14.1f}{cpu / wall * 100:>10.0f}%   {names}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame face recognition vs track-then-recognize")
+    parser.add_argument("clip", help="Recorded video with one or more people in view")
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--realtime", action="store_true", help="Pace frames at the clip fps (CPU %% at live rate)")
+    args = parser.parse_args()
+
+    frames, fps = load_clip(args.clip, args.limit)
+    if not frames:
+        print(f"Could not read frames from {args.clip}")
+        return
+
+    manager = FaceManager()
+
+    print("=" * 72)
+    print(f"{len(frames)} frames of {args.clip} ({fps:.0f} fps, {'paced' if args.realtime else 'flat out'}), "
+          f"{len(manager.known_face_names)} known faces, {manager.detector.name} detector")
+    print("=" * 72)
+    print(f"{'pipeline':<10}{'frames/s':>10}{'faces/s':>10}{'CPU ms/frame':>14}{'CPU':>11}   names")
+
+    run("legacy", lambda f: legacy_recognize(manager, f), frames, fps, args.realtime)
+    run("tracked", manager.recognize_faces, frames, fps, args.realtime)
+
+    stats = manager.stats()
+    print(f"\nTracked pipeline encoded {stats['encodings']} faces for {stats['faces']} detections "
+          f"({stats['encodings'] / max(1, stats['faces']):.1%})")
+
+if __name__ == "__main__":
+    main()
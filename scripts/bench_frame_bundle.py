@@ -0,0 +1,75 @@
+import sys
+import os
+import time
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.vision.frame_bundle import FrameBundle, perceptual_hash, resize, sharpness, to_gray, to_rgb
+
+try:
+    import mediapipe as mp
+except ImportError:
+    mp = None
+
+FRAMES = 100
+
+def mp_wrap(rgb):
+    if mp is not None:
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+    return rgb
+
+def separate(image):
+    """Every active analyzer converting the frame on its own, as before"""
+    # Faces: BGR->RGB, half-size detection input
+    rgb = to_rgb(image)
+    resize(rgb, 0.5)
+    # Gestures and posture: own RGB conversion + mp.Image each
+    mp_wrap(to_rgb(image))
+    mp_wrap(to_rgb(image))
+    # Scene (BLIP): RGB + scene-change hash
+    to_rgb(image)
+    perceptual_hash(image)
+    # Stable frame selection: gray + Laplacian
+    sharpness(to_gray(image))
+    # OCR: gray + cache hash; QR: gray
+    to_gray(image)
+    perceptual_hash(image)
+    to_gray(image)
+
+def shared(image):
+    """The same consumers reading one FrameBundle"""
+    bundle = FrameBundle(image)
+    bundle.rgb
+    bundle.scaled_rgb(0.5)
+    bundle.mp_image if mp is not None else bundle.rgb
+    bundle.mp_image if mp is not None else bundle.rgb
+    bundle.rgb
+    bundle.phash
+    bundle.sharpness
+    bundle.gray
+    bundle.phash
+    bundle.gray
+
+def cpu_ms(fn, frames):
+    start = time.process_time()
+    for image in frames:
+        fn(image)
+    return (time.process_time() - start) * 1000 / len(frames)
+
+def main():
+    rng = np.random.default_rng(0)
+    print("=" * 72)
+    print(f"Per-frame preprocessing CPU with all vision modes active ({FRAMES} frames, "
+          f"mediapipe {'on' if mp is not None else 'off'})")
+    print("=" * 72)
+    print(f"{'resolution':<14}{'separate ms':>13}{'bundle ms':>12}{'saved':>9}")
+    for h, w in ((480, 640), (720, 1280)):
+        frames = [rng.integers(0, 255, (h, w, 3), dtype=np.uint8) for _ in range(4)] * (FRAMES // 4)
+        before = cpu_ms(separate, frames)
+        after = cpu_ms(shared, frames)
+        print(f"{f'{w}x{h}':<14}{before:>13.2f}{after:>12.2f}{(1 - after / before) * 100:>8.0f}%")
+
+if __name__ == "__main__":
+    main()
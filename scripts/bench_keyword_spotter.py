@@ -0,0 +1,133 @@
+import sys
+import os
+import glob
+import tempfile
+import time
+import wave
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.voice.keyword_spotter import KeywordSpotter
+
+# Fixture layout:
+#   tests/fixtures/wake/enroll/<keyword>/*.wav    recordings used as templates
+#   tests/fixtures/wake/positive/<keyword>/*.wav  held-out clips containing the keyword
+#   tests/fixtures/wake/negative/*.wav            background speech, TV, noise (no keywords)
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'wake')
+SR = 16000
+CHUNK = 512
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wf:
+        if wf.getframerate() != SR or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16 kHz mono 16-bit PCM")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+
+def speech_end(audio):
+    """Last 10 ms frame within 30 dB of the loudest one, in seconds"""
+    frames = audio[:len(audio) // 160 * 160].reshape(-1, 160)
+    energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+    return (np.where(energy > energy.max() - 30)[0][-1] + 1) * 0.01
+
+def stream(spotter, audio):
+    """Feed mic-sized chunks; returns the stream times (s) at which the spotter fired"""
+    spotter.reset()
+    fired = []
+    for pos in range(0, len(audio), CHUNK):
+        if spotter.process(audio[pos:pos + CHUNK]):
+            fired.append((pos + CHUNK) / SR)
+    return fired
+
+def synthetic_fixtures():
+    """Stand-in set when no recordings exist: formant-synthesized words in noise"""
+    rng = np.random.default_rng(0)
+
+    def word(units, stretch):
+        parts = []
+        for f0, formants, d in units:
+            t = np.arange(int(d * stretch * SR)) / SR
+            x = sum((sum(np.exp(-((h * f0 - fc) / 150.0) ** 2) for fc in formants) + 0.02)
+                    * np.sin(2 * np.pi * h * f0 * t + rng.uniform(0, 6.3)) for h in range(1, int(4000 / f0)))
+            parts.append(x * np.hanning(len(t)))
+        x = np.concatenate(parts)
+        return 0.3 * x / np.abs(x).max()
+
+    def noise(n, level=0.003):
+        return rng.standard_normal(n) * level
+
+    keyword = [(130, (700, 1200), 0.18), (120, (300, 2300), 0.15), (110, (500, 1700), 0.2)]
+    others = [[(f0, (rng.uniform(300, 800), rng.uniform(900, 2400)), rng.uniform(0.1, 0.25))
+               for f0 in rng.uniform(100, 180, size=rng.integers(1, 4))] for _ in range(200)]
+
+    def clip(units, stretch):
+        w = word(units, stretch)
+        return np.concatenate((noise(SR // 2), w + noise(len(w)), noise(SR // 2))).astype(np.float32)
+
+    enroll = {"jarvis": [clip(keyword, s) for s in (0.9, 1.0, 1.1)]}
+    positive = {"jarvis": [clip(keyword, rng.uniform(0.8, 1.25)) for _ in range(20)]}
+    negative = [np.concatenate([clip(u, rng.uniform(0.8, 1.2)) for u in others]).astype(np.float32)]
+    return enroll, positive, negative
+
+def disk_fixtures():
+    enroll = {os.path.basename(d): [load_wav(p) for p in sorted(glob.glob(os.path.join(d, '*.wav')))]
+              for d in sorted(glob.glob(os.path.join(FIXTURES, 'enroll', '*')))}
+    positive = {os.path.basename(d): [load_wav(p) for p in sorted(glob.glob(os.path.join(d, '*.wav')))]
+                for d in sorted(glob.glob(os.path.join(FIXTURES, 'positive', '*')))}
+    negative = [load_wav(p) for p in sorted(glob.glob(os.path.join(FIXTURES, 'negative', '*.wav')))]
+    return enroll, positive, negative
+
+if __name__ == "__main__":
+    if glob.glob(os.path.join(FIXTURES, 'enroll', '*', '*.wav')):
+        source = FIXTURES
+        enroll, positive, negative = disk_fixtures()
+    else:
+        source = "synthetic (no recordings in tests/fixtures/wake)"
+        enroll, positive, negative = synthetic_fixtures()
+
+    spotter = KeywordSpotter(list(enroll), 
+                             templates_path=os.path.join(tempfile.mkdtemp(), 'templates.npz'))
+    for keyword, clips in enroll.items():
+        for audio in clips:
+            spotter.enroll(keyword, audio)
+
+    print("=" * 72)
+    print(f"KEYWORD SPOTTER  fixtures: {source}")
+    print("=" * 72)
+    print(f"Templates: {spotter.stats()['keywords']}  thresholds: "
+          + ", ".join(f"{k}={v:.2f}" for k, v in spotter.thresholds.items()))
+
+    audio_seconds = 0.0
+    cpu_seconds = 0.0
+    for keyword, clips in positive.items():
+        hits, latencies = 0, []
+        for audio in clips:
+            start = time.perf_counter()
+            fired = stream(spotter, audio)
+            cpu_seconds += time.perf_counter() - start
+            audio_seconds += len(audio) / SR
+            if fired:
+                hits += 1
+                latencies.append(fired[0] - speech_end(audio))
+        line = f"{keyword:>12}: detected {hits}/{len(clips)}"
+        if latencies:
+            line += (f"   latency after end of speech: median {np.median(latencies) * 1000:6.0f} ms"
+                     f"  max {np.max(latencies) * 1000:6.0f} ms")
+        print(line)
+
+    false_accepts, negative_seconds = 0, 0.0
+    for audio in negative:
+        start = time.perf_counter()
+        false_accepts += len(stream(spotter, audio))
+        cpu_seconds += time.perf_counter() - start
+        negative_seconds += len(audio) / SR
+    audio_seconds += negative_seconds
+    hours = negative_seconds / 3600.0
+    if hours:
+        print(f"False accepts: {false_accepts} in {negative_seconds / 60:.1f} min of negatives "
+              f"= {false_accepts / hours:.1f} per hour")
+
+    stats = spotter.stats()
+    print(f"CPU: {cpu_seconds / audio_seconds * 100:.2f}% of one core "
+          f"({stats['evaluations']} DTW evaluations, {stats['avg_eval_ms']:.2f} ms each)")
@@ -0,0 +1,87 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import zlib
+import contextlib
+import io
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.memory.structures import LongTermMemory
+from core.memory.entries import MemoryEntry, MemoryType
+
+DIM = 384
+QUERIES = 200
+
+class HashingEmbedder:
+    """Bag-of-words hashing embedder: stands in for SentenceTransformer so only index cost is measured"""
+    def get_sentence_embedding_dimension(self):
+        return DIM
+
+    def encode(self, texts, normalize_embeddings=True):
+        out = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.split():
+                out[i, zlib.crc32(word.encode()) % DIM] += 1.0
+        out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-9)
+        return out
+
+def make_corpus(size, rng):
+    """Sentences drawn from 200 topics, 30 words each, so embeddings cluster like real facts"""
+    topics = [[f"t{t}w{w}" for w in range(30)] for t in range(200)]
+    corpus = []
+    for i in range(size):
+        words = rng.choice(topics[i % 200], 6, replace=False)
+        corpus.append(" ".join(words) + f" n{i}")
+    return corpus
+
+def bench(size, rng):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'memory_long_term.json')
+        corpus = make_corpus(size, rng)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ltm = LongTermMemory(path, embeddings_model=HashingEmbedder())
+            start = time.perf_counter()
+            for chunk in range(0, size, 2000):
+                ltm.add_many([MemoryEntry(content=c, memory_type=MemoryType.LONG_TERM)
+                              for c in corpus[chunk:chunk + 2000]])
+            load_s = time.perf_counter() - start
+            if ltm.vectors.partition_min_size <= size:
+                ltm.vectors.build_partitions()
+
+            queries = [corpus[i] for i in rng.integers(0, size, QUERIES)]
+            start = time.perf_counter()
+            hits = 0
+            for q in queries:
+                result = ltm.search(q, threshold=0.3, top_k=3)
+                hits += bool(result) and result[0].content == q
+            semantic_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+            # Keyword fallback path over the same entries
+            ltm.vectors.close()
+            ltm.vectors, ltm.use_embeddings = None, False
+            start = time.perf_counter()
+            for q in queries:
+                ltm.search(q, threshold=0.3, top_k=3)
+            keyword_ms = (time.perf_counter() - start) / QUERIES * 1000
+            ltm.journal.close()
+
+        return load_s, semantic_ms, hits / QUERIES, keyword_ms
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print("=" * 72)
+    print("LONG-TERM MEMORY RETRIEVAL (excludes model encode time)")
+    print("=" * 72)
+    print(f"{'entries':>8} {'load s':>8} {'semantic ms':>12} {'recall@1':>9} {'keyword ms':>11}")
+    for size in [1000, 10000, 100000]:
+        load_s, semantic_ms, recall, keyword_ms = bench(size, rng)
+        print(f"{size:>8} {load_s:>8.1f} {semantic_ms:>12.3f} {recall:>9.2f} {keyword_ms:>11.3f}")
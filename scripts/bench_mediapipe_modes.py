@@ -0,0 +1,100 @@
+import sys
+import os
+import time
+import threading
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+import cv2
+from core.vision.frame_bundle import FrameBundle
+from core.vision.gesture_engine import GestureEngine
+from core.vision.pose_guard import PostureGuard
+
+def load_clip(path, limit):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+class LatencyProbe:
+    """Submit-to-result latency per frame, keyed by the frame's timestamp"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submitted = {}
+        self.latencies = []
+
+    def mark(self, frame_ts):
+        with self.lock:
+            self.submitted[frame_ts] = time.perf_counter()
+
+    def on_result(self, result, frame_ts):
+        with self.lock:
+            start = self.submitted.pop(frame_ts, None)
+            if start is not None:
+                self.latencies.append((time.perf_counter() - start) * 1000)
+
+def feed(engine, probe, frames, fps):
+    """Play the clip in real time (as the capture thread would) and submit every frame"""
+    start = time.perf_counter()
+    for i, image in enumerate(frames):
+        delay = start + i / fps - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        frame_ts = i / fps
+        probe.mark(frame_ts)
+        engine.submit(FrameBundle(image, i, frame_ts), frame_ts)
+    time.sleep(0.5)  # Let LIVE_STREAM callbacks drain
+
+def report(label, mode, probe, frames):
+    lat = np.array(probe.latencies) if probe.latencies else np.zeros(1)
+    print(f"{label:<10}{mode:<13}{np.percentile(lat, 50):>9.1f}{np.percentile(lat, 95):>9.1f}"
+          f"{len(probe.latencies):>10}/{len(frames)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaPipe gesture/pose latency per running mode on a recorded clip")
+    parser.add_argument("clip", help="Recorded webcam clip (hands and upper body visible)")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    frames, fps = load_clip(args.clip, args.frames)
+    if not frames:
+        print(f"Could not read {args.clip}")
+        return
+
+    print("=" * 72)
+    print(f"MediaPipe per-frame latency, {len(frames)} frames at {fps:.0f} fps (real time)")
+    print("=" * 72)
+    print(f"{'task':<10}{'mode':<13}{'p50 ms':>9}{'p95 ms':>9}{'results':>14}")
+
+    for mode in ("image", "video", "live_stream"):
+        for label, cls in (("gestures", GestureEngine), ("posture", PostureGuard)):
+            probe = LatencyProbe()
+            engine = cls(running_mode=mode, on_result=probe.on_result)
+            feed(engine, probe, frames, fps)
+            report(label, mode, probe, frames)
+
+        # Both tasks on the same frames at once, each fed from its own thread like the scheduler does
+        probes = {"gestures": LatencyProbe(), "posture": LatencyProbe()}
+        engines = {"gestures": GestureEngine(running_mode=mode, on_result=probes["gestures"].on_result),
+                   "posture": PostureGuard(running_mode=mode, on_result=probes["posture"].on_result)}
+        threads = [threading.Thread(target=feed, args=(engines[name], probes[name], frames, fps))
+                   for name in engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name in engines:
+            report(f"{name}+", mode, probes[name], frames)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import contextlib
+import io
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core import enhanced_memory
+from core.enhanced_memory import EnhancedMemory, set_memory
+from actions import memory_actions
+
+CALLS = 100
+SOURCE_MEMORY = os.path.join(os.path.dirname(__file__), '..', 'jarvis', 'config', 'memory.json')
+
+def make_memory_file(tmp_dir, extra_facts):
+    """Copy the shipped memory.json and pad it so parsing cost is visible"""
+    memory_file = os.path.join(tmp_dir, 'memory.json')
+    shutil.copy(SOURCE_MEMORY, memory_file)
+    mem = EnhancedMemory(memory_file=memory_file)
+    for i in range(extra_facts):
+        mem.long_term[f"fact_{i}"] = f"remembered fact number {i}"
+    mem.save_memory()
+    mem.journal.close()
+    return memory_file
+
+def time_actions():
+    timings = {}
+    for name, call in [
+        ("memorize_fact", lambda i: memory_actions.memorize_fact(f"bench fact {i}")),
+        ("update_memory", lambda i: memory_actions.update_memory(f"bench_{i}", i)),
+        ("list_memories", lambda i: memory_actions.list_memories()),
+        ("recall_task", lambda i: memory_actions.recall_task("missing")),
+    ]:
+        start = time.perf_counter()
+        for i in range(CALLS):
+            call(i)
+        timings[name] = (time.perf_counter() - start) / CALLS * 1000
+    return timings
+
+if __name__ == "__main__":
+    for extra in [0, 5000]:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            memory_file = make_memory_file(tmp_dir, extra)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                # Before: every action constructs (and parses) a fresh EnhancedMemory
+                original = enhanced_memory.get_memory
+                memory_actions.get_memory = lambda: EnhancedMemory(memory_file=memory_file)
+                before = time_actions()
+                memory_actions.get_memory = original
+
+                # After: one shared instance
+                shared = EnhancedMemory(memory_file=memory_file)
+                set_memory(shared)
+                after = time_actions()
+                set_memory(None)
+                shared.journal.close()
+
+            print(f"\n=== memory.json with {extra} extra facts ({os.path.getsize(memory_file) // 1024} KB) ===")
+            print(f"{'action':>15} {'fresh ms':>10} {'shared ms':>10}")
+            for name in before:
+                print(f"{name:>15} {before[name]:>10.3f} {after[name]:>10.3f}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
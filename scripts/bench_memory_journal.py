@@ -0,0 +1,57 @@
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.enhanced_memory import EnhancedMemory
+
+TURNS = 50
+
+def build_memory(memory_file, size):
+    """Create a memory file with `size` long-term facts"""
+    mem = EnhancedMemory(memory_file=memory_file)
+    for i in range(size):
+        mem.long_term[f"fact_{i}"] = f"This is remembered fact number {i} about the user's life"
+    mem.save_memory()
+    return mem
+
+def bench_full_rewrite(mem):
+    """Legacy behaviour: re-serialize everything on every turn"""
+    start = time.perf_counter()
+    for i in range(TURNS):
+        mem.short_term.append({'user': f"turn {i}", 'ai': "ok"})
+        with open(mem.memory_file, 'w', encoding='utf-8') as f:
+            json.dump(mem._to_dict(), f, indent=4, ensure_ascii=False)
+    return (time.perf_counter() - start) / TURNS * 1000
+
+def bench_journal(mem):
+    start = time.perf_counter()
+    for i in range(TURNS):
+        mem.remember_context({'user': f"turn {i}", 'ai': "ok"})
+    elapsed = (time.perf_counter() - start) / TURNS * 1000
+    mem.journal.wait_for_compaction()
+    return elapsed
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ENHANCED MEMORY: PER-TURN SAVE COST")
+    print("=" * 60)
+    print(f"{'facts':>8} {'file KB':>10} {'full rewrite ms':>16} {'journal ms':>12}")
+
+    for size in [100, 1000, 10000, 50000]:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            memory_file = os.path.join(tmp_dir, 'memory.json')
+            mem = build_memory(memory_file, size)
+            size_kb = os.path.getsize(memory_file) / 1024
+            journal_ms = bench_journal(mem)
+            rewrite_ms = bench_full_rewrite(mem)
+            mem.journal.close()
+            print(f"{size:>8} {size_kb:>10.0f} {rewrite_ms:>16.3f} {journal_ms:>12.3f}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,95 @@
+import sys
+import os
+import re
+import time
+import random
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.nlu.engine import NLUEngine
+
+PREFIXES = ["", "", "jarvis ", "hey jarvis ", "please ", "can you ", "could you please "]
+SUFFIXES = ["", "", " please", " now", " for me", "?"]
+
+TEMPLATES = [
+    "set the volume to {n}", "turn up the volume by {n}", "lower the volume", "mute the sound",
+    "set brightness to {n} percent", "dim the brightness", "what's the battery level", "take a screenshot",
+    "turn on the wifi", "wifi off", "disconnect bluetooth", "enable my hotspot", "turn of the hard spot",
+    "empty the recycle bin", "open {app}", "launch {app}", "close {app}", "quit {app}",
+    "delete {file}", "search for {topic} in browser", "google {topic}", "look up {topic}",
+    "my sister's name is {name}", "my birthday is {date}", "remember that {fact}", "note {fact}",
+    "{fact}, kindly memorize it", "what do you know about {topic}", "recall {topic}", "what's my {thing}",
+    "who is my {relation}", "when is my {thing}", "forget about {topic}", "read the screen",
+    "describe what is on the screen", "scan the qr code", "enable hand gestures", "what's my mood",
+    "check my posture", "record a video for {n} seconds", "deep vision scan", "read the text on the {thing}",
+    "what do you see", "list all the objects in front of me", "who is this person", "fix your camera",
+    "my name is {name}", "close your eyes", "analyze the room", "scan this document", "how am i sitting",
+    "track the {thing}", "what's the latest news", "check today's weather", "research {topic}",
+    "play some music", "pause the song", "skip this track", "go back to the previous song",
+    "set a timer for {n} minutes", "remind me to {fact}", "add to my todo list {fact}", "show my tasks",
+    "summarize the document at {file}", "explain the code in {file}", "analyze the project at {file}",
+    # Conversation that no rule handles -> every candidate is tried
+    "tell me a joke", "how are you today", "thanks a lot", "that's interesting", "good morning",
+    "i think {topic} is fascinating", "why is the sky blue", "sing me something", "you're awesome",
+]
+
+FILLERS = {
+    "n": [str(i) for i in range(5, 100, 5)],
+    "app": ["chrome", "microsoft edge", "spotify", "vs code", "notepad", "the calculator", "file explorer"],
+    "file": ["results.txt", "c:/docs/report.pdf", "my notes", "main.py", "d:/projects/jarvis"],
+    "topic": ["python tutorials", "black holes", "the stock market", "quantum computing", "pasta recipes"],
+    "name": ["alex", "priya", "sam", "jordan", "maria"],
+    "date": ["june 5th", "the 12th of march", "december 1"],
+    "fact": ["my car is parked on level 3", "the wifi password is hunter2", "call mom tomorrow",
+             "buy milk", "the meeting moved to friday"],
+    "thing": ["favorite color", "anniversary", "whiteboard", "cup", "book"],
+    "relation": ["father", "best friend", "manager"],
+}
+
+def make_corpus(size=5000, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        text = rng.choice(TEMPLATES)
+        text = re.sub(r"\{(\w+)\}", lambda m: rng.choice(FILLERS[m.group(1)]), text)
+        corpus.append(rng.choice(PREFIXES) + text + rng.choice(SUFFIXES))
+    return corpus
+
+def naive_match(rules, text):
+    """The previous dispatcher: re.search over every rule in order"""
+    for rule_id, (pattern, _, _) in enumerate(rules):
+        match = re.search(pattern, text)
+        if match:
+            return rule_id, match.span()
+    return None
+
+if __name__ == "__main__":
+    nlu = NLUEngine()
+    corpus = [t.lower() for t in make_corpus()]
+
+    start = time.perf_counter()
+    expected = [naive_match(nlu.rules, t) for t in corpus]
+    naive_s = time.perf_counter() - start
+
+    nlu.dispatcher.reset_stats()
+    start = time.perf_counter()
+    results = [nlu.dispatcher.match(t) for t in corpus]
+    compiled_s = time.perf_counter() - start
+
+    got = [(r[0], r[1].span()) if r else None for r in results]
+    mismatches = sum(a != b for a, b in zip(expected, got))
+
+    stats = nlu.rule_stats()
+    evaluations = sum(s["evaluations"] for s in stats)
+
+    print("=" * 72)
+    print(f"NLU RULE DISPATCH ({len(corpus)} transcripts, {len(nlu.rules)} rules)")
+    print("=" * 72)
+    print(f"naive loop:  {len(corpus) / naive_s:>10,.0f} utterances/s  ({naive_s / len(corpus) * 1e6:.1f} us each)")
+    print(f"dispatcher:  {len(corpus) / compiled_s:>10,.0f} utterances/s  ({compiled_s / len(corpus) * 1e6:.1f} us each)")
+    print(f"regex evaluations per utterance: {evaluations / len(corpus):.1f} (naive: up to {len(nlu.rules)})")
+    print(f"mismatches vs naive loop: {mismatches}")
+    print("\nBusiest rules:")
+    for s in sorted(stats, key=lambda s: s["evaluations"] * s["avg_us"], reverse=True)[:5]:
+        print(f"  #{s['rule']:<3} {s['intent']:<24} hits={s['hits']:<5} evals={s['evaluations']:<5} avg={s['avg_us']:.2f}us")
@@ -0,0 +1,65 @@
+import sys
+import os
+import glob
+import time
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+import cv2
+from core.vision.ocr_engine import OCREngine
+
+def load_images(folder, limit):
+    paths = sorted(p for ext in ("jpg", "jpeg", "png") for p in glob.glob(os.path.join(folder, f"*.{ext}")))
+    return [(os.path.basename(p), cv2.imread(p)) for p in paths[:limit]]
+
+def recapture(image, rng):
+    """The same page seen again: a little sensor noise"""
+    noisy = image.astype(np.float32) + rng.normal(0, 3.0, image.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+def timed(engine, image, budget):
+    start = time.perf_counter()
+    results = engine.detect_and_read(image, timeout=budget)
+    return (time.perf_counter() - start) * 1000, results
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR cold vs repeated-query latency and budget adherence")
+    parser.add_argument("images", nargs="?", default=os.path.join(os.getcwd(), "data", "documents"))
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=10.0, help="Wall-clock budget per query (s)")
+    args = parser.parse_args()
+
+    images = [(name, img) for name, img in load_images(args.images, args.limit) if img is not None]
+    if not images:
+        print(f"No document photos in {args.images} (jpg/png).")
+        return
+
+    engine = OCREngine()
+    rng = np.random.default_rng(0)
+    engine.detect_and_read(images[0][1])  # Model warm-up
+    engine.cache.clear()
+
+    print("=" * 72)
+    print(f"OCR on {len(images)} document photos, budget {args.budget:.1f}s per query")
+    print("=" * 72)
+    print(f"{'image':<28}{'cold ms':>10}{'repeat ms':>11}{'regions':>9}{'words':>7}{'same':>6}")
+
+    cold_times, warm_times, overshoots = [], [], []
+    for name, image in images:
+        cold, results = timed(engine, image, args.budget)
+        warm, again = timed(engine, recapture(image, rng), args.budget)
+        cold_times.append(cold)
+        warm_times.append(warm)
+        overshoots.append(max(0.0, cold - args.budget * 1000))
+        same = [r['detected_text'] for r in results] == [r['detected_text'] for r in again]
+        print(f"{name[:27]:<28}{cold:>10.0f}{warm:>11.1f}{len(engine._isolate_text_regions(image)[:2]):>9}"
+              f"{len(results):>7}{'yes' if same else 'no':>6}")
+
+    print(f"\nCold p50 {np.median(cold_times):.0f}ms, repeat p50 {np.median(warm_times):.1f}ms, "
+          f"max budget overshoot {max(overshoots):.0f}ms, cache hits {engine.cache.hits}/{engine.cache.hits + engine.cache.misses}")
+
+if __name__ == "__main__":
+    main()
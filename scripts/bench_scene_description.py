@@ -0,0 +1,86 @@
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # CPU numbers
+
+import cv2
+from core.vision.scene_description import SceneDescriptor
+
+QUESTION = "Is there a cat or dog here?"
+
+def read_only(frame):
+    frame = frame.copy()
+    frame.flags.writeable = False
+    return frame
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times)), result
+
+def bench(quantize, image, other, runs):
+    descriptor = SceneDescriptor(quantize=quantize)
+    start = time.perf_counter()
+    descriptor._load_model()
+    load_ms = (time.perf_counter() - start) * 1000
+    label = "int8" if descriptor.quantize else "fp32"
+
+    def cold_caption():
+        # New frame and new scene: encode + generate
+        descriptor.scene_hash = None
+        descriptor.embeddings.clear()
+        return descriptor.describe(read_only(image))
+
+    frame = read_only(image)
+
+    def vqa_same_frame():
+        # Follow-up prompt on an already encoded frame: only the decoder runs
+        descriptor.captions.pop(QUESTION, None)
+        return descriptor.answer_question(frame, QUESTION)
+
+    def caption_scene_changed():
+        descriptor.scene_hash = None
+        return descriptor.describe(read_only(other))
+
+    rows = [
+        ("caption, new scene", *timed(cold_caption, runs)),
+        ("caption, unchanged scene", *timed(lambda: descriptor.describe(read_only(image)), runs)),
+    ]
+    descriptor.describe(frame)
+    rows.append(("VQA, same frame", *timed(vqa_same_frame, runs)))
+    rows.append(("caption, scene changed", *timed(caption_scene_changed, runs)))
+
+    print(f"\n{label}: model load {load_ms:.0f}ms, {descriptor.stats()}")
+    for name, ms, result in rows:
+        text = result.get('description') or result.get('answer') or result.get('error', '')
+        print(f"  {name:<26}{ms:>9.0f}ms   {text[:40]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="BLIP latency per call type on CPU, fp32 vs int8")
+    parser.add_argument("image", nargs="?", help="Scene photo (default: synthetic frame)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.image:
+        image = cv2.imread(args.image)
+    else:
+        image = np.full((480, 640, 3), 90, dtype=np.uint8)
+        cv2.rectangle(image, (200, 150), (440, 330), (30, 160, 220), -1)
+    other = cv2.flip(image, 1) // 2
+
+    print("=" * 72)
+    print(f"BLIP captioning on CPU, median of {args.runs} runs per call type")
+    print("=" * 72)
+    bench(False, image, other, args.runs)
+    bench(True, image, other, args.runs)
+
+if __name__ == "__main__":
+    main()
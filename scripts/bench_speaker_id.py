@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.voice.speaker_id import SpeakerRecognizer, RollingSpeakerVerifier
+
+SR = 16000
+QUERIES = 500
+
+def loop_cosine(registered, candidate):
+    """The previous scoring: one cosine per enrolled speaker, in Python"""
+    try:
+        from sklearn.metrics.pairwise import cosine_similarity
+        score = lambda a, b: cosine_similarity(a.reshape(1, -1), b.reshape(1, -1))[0][0]
+    except ImportError:
+        score = lambda a, b: float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+    best, best_score = None, 0.0
+    for speaker_id, stored in registered.items():
+        s = score(candidate, stored)
+        if s > best_score:
+            best, best_score = speaker_id, s
+    return best, best_score
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+def bench_scoring(recognizer, n_speakers, rng):
+    recognizer.registered_speakers = {
+        f"speaker_{i}": rng.standard_normal(recognizer.embedder.embedding_dim).astype(np.float32)
+        for i in range(n_speakers)
+    }
+    recognizer._rebuild_matrix()
+    candidate = rng.standard_normal(recognizer.embedder.embedding_dim).astype(np.float32)
+    old = timed(lambda: loop_cosine(recognizer.registered_speakers, candidate), QUERIES)
+    new = timed(lambda: recognizer.verify_embedding(candidate), QUERIES)
+    return old, new
+
+def bench_torchaudio_chunk(chunk):
+    """Previous extraction: a torchaudio MFCC transform per 32 ms chunk"""
+    import torch
+    import torchaudio
+    transform = torchaudio.transforms.MFCC(sample_rate=SR, n_mfcc=40,
+                                           melkwargs={'n_fft': 512, 'hop_length': 160, 'n_mels': 40})
+    tensor = torch.FloatTensor(chunk).unsqueeze(0)
+    return timed(lambda: transform(tensor), 200)
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    recognizer = SpeakerRecognizer()
+    audio = (0.1 * rng.standard_normal(SR * 3)).astype(np.float32)
+
+    print("=" * 72)
+    print(f"SPEAKER ID ({QUERIES} verifications per size)")
+    print("=" * 72)
+    for n in (1, 10, 100):
+        old, new = bench_scoring(recognizer, n, rng)
+        print(f"{n:>4} speakers: per-speaker loop {old * 1e6:8.1f} us   matrix {new * 1e6:6.1f} us   "
+              f"({old / new:5.1f}x)")
+
+    print()
+    chunk = audio[:512]
+    try:
+        print(f"torchaudio MFCC per 32 ms chunk:    {bench_torchaudio_chunk(chunk) * 1000:.3f} ms on the audio loop")
+    except Exception as e:
+        print(f"torchaudio baseline skipped: {e}")
+    per_window = timed(lambda: recognizer.embedder.extract_embedding(audio[:int(1.5 * SR)]), 100)
+    print(f"numpy embedding of a 1.5 s window:  {per_window * 1000:.3f} ms on the verifier thread, every 0.5 s")
+
+    verifier = RollingSpeakerVerifier(recognizer)
+    frames = [audio[i:i + 512] for i in range(0, len(audio) - 512, 512)]
+    start = time.perf_counter()
+    for f in frames:
+        verifier.observe(f)
+    per_frame = (time.perf_counter() - start) / len(frames)
+    verifier.stop()
+    print(f"observe() per 32 ms frame:          {per_frame * 1000:.3f} ms on the audio loop")
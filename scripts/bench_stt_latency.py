@@ -0,0 +1,114 @@
+import sys
+import os
+import glob
+import time
+import wave
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.voice.stt import SpeechToTextEngine
+
+FRAME = 512
+SILENCE_FRAMES = 35  # AudioEngine.MAX_SILENCE_FRAMES: trailing silence before end-of-speech
+SPEECH_RMS = 300
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'speech', '*.wav')
+
+def load_frames(path):
+    """16 kHz mono int16 WAV -> list of 512-sample frames as the microphone delivers them"""
+    with wave.open(path, 'rb') as wf:
+        if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16 kHz mono 16-bit PCM")
+        pcm = wf.readframes(wf.getnframes())
+    step = FRAME * 2
+    frames = [pcm[i:i + step] for i in range(0, len(pcm), step)]
+    return frames + [bytes(step)] * SILENCE_FRAMES
+
+def is_speech(frame):
+    samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+    return len(samples) > 0 and np.sqrt(np.mean(samples ** 2)) > SPEECH_RMS
+
+def streaming_transcribe(stt, frames):
+    """Feed frames at microphone pace so partial decodes run while 'speaking'; time only the end"""
+    stt.clear_buffer()
+    for f in frames:
+        stt.buffer_frame(f, is_speech=is_speech(f))
+        time.sleep(FRAME / 16000.0)
+    start = time.perf_counter()
+    text = stt.transcribe_buffer()
+    return text, time.perf_counter() - start
+
+def legacy_transcribe(stt, frames, temp_filename="temp_buffer.wav"):
+    """The previous path: join bytes, int16 round trip, write a WAV, let Whisper re-decode it"""
+    processed = stt.preprocessor.process_complete_audio(frames)
+    if processed is None:
+        return ""
+    try:
+        with wave.open(temp_filename, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(stt.sample_rate)
+            wf.writeframes(processed)
+        segments, _ = stt.model.transcribe(
+            temp_filename, beam_size=5, language="en", condition_on_previous_text=False,
+            initial_prompt="Hey Jarvis, turn on wifi, turn off bluetooth, enable hotspot, open chrome, set volume, set brightness")
+        return " ".join(s.text for s in segments).strip()
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-of-speech to text latency")
+    parser.add_argument("wavs", nargs="*", help="16 kHz mono WAV fixtures (default: tests/fixtures/speech/*.wav)")
+    parser.add_argument("--model", default="small.en")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = args.wavs or sorted(glob.glob(DEFAULT_FIXTURES))
+    if not paths:
+        print("No WAV fixtures found; record some 16 kHz mono utterances into tests/fixtures/speech/")
+        sys.exit(1)
+
+    stt = SpeechToTextEngine(model_size=args.model)
+    # Warm up model and noise profile
+    for frame in load_frames(paths[0])[:20]:
+        stt.buffer_frame(frame)
+    stt.transcribe_buffer()
+    stt.clear_buffer()
+
+    print("=" * 72)
+    print(f"END-OF-SPEECH -> TEXT ({len(paths)} fixtures, {args.model}, best of {args.repeat})")
+    print("=" * 72)
+    modes = ("legacy", "in-memory", "streaming")
+    totals = dict.fromkeys(modes, 0.0)
+    for path in paths:
+        frames = load_frames(path)
+        audio_s = len(frames) * FRAME / 16000
+        best = dict.fromkeys(modes, float("inf"))
+        text = ""
+        for _ in range(args.repeat):
+            legacy_frames = [stt.preprocessor.process_chunk(f) for f in frames]
+            start = time.perf_counter()
+            legacy_transcribe(stt, legacy_frames)
+            best["legacy"] = min(best["legacy"], time.perf_counter() - start)
+
+            # Whole utterance decoded at end-of-speech, from memory
+            stt.streaming = False
+            stt.clear_buffer()
+            for f in frames:
+                stt.buffer_frame(f)
+            start = time.perf_counter()
+            stt.transcribe_buffer()
+            best["in-memory"] = min(best["in-memory"], time.perf_counter() - start)
+            stt.streaming = True
+
+            text, elapsed = streaming_transcribe(stt, frames)
+            best["streaming"] = min(best["streaming"], elapsed)
+        for k in totals:
+            totals[k] += best[k]
+        print(f"{os.path.basename(path):<24} {audio_s:5.2f}s  " +
+              "  ".join(f"{k} {best[k] * 1000:7.1f} ms" for k in modes) + f"  \"{text[:30]}\"")
+    print("\nmean end-of-speech -> text: " +
+          ", ".join(f"{k} {totals[k] / len(paths) * 1000:.1f} ms" for k in modes))
@@ -0,0 +1,68 @@
+import sys
+import os
+import time
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.voice.vad import SileroVAD, ORT_AVAILABLE
+
+FRAMES = 1000
+CONSUMERS = 3  # VAD relaxed + VAD strict + wake word look at the same frame
+
+def make_frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(512) / 16000
+    frames = []
+    for i in range(n):
+        voiced = (i // 25) % 2 == 0
+        x = 0.01 * rng.standard_normal(512)
+        if voiced:
+            x += 0.2 * np.sin(2 * np.pi * (120 + 40 * rng.random()) * t) * rng.random()
+        frames.append((x * 32768).astype(np.int16).tobytes())
+    return frames
+
+def bench_torch_hub(frames):
+    """The previous setup: torch.hub model, a fresh tensor per call, once per consumer"""
+    import torch
+    start = time.perf_counter()
+    model, _ = torch.hub.load(repo_or_dir='snakers4/silero-vad', model='silero_vad',
+                              force_reload=False, trust_repo=True)
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for f in frames:
+        for _ in range(CONSUMERS):
+            tensor = torch.tensor(np.frombuffer(f, dtype=np.int16).astype(np.float32) / 32768.0).unsqueeze(0)
+            model(tensor, 16000).item()
+    return load_s, (time.perf_counter() - start) / len(frames)
+
+def bench_onnx(frames, threads):
+    start = time.perf_counter()
+    vad = SileroVAD(num_threads=threads)
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for seq, f in enumerate(frames):
+        for _ in range(CONSUMERS):
+            vad.probability(f, seq=seq)
+    return load_s, (time.perf_counter() - start) / len(frames), vad.stats()
+
+if __name__ == "__main__":
+    frames = make_frames(FRAMES)
+    print("=" * 72)
+    print(f"SILERO VAD ({FRAMES} frames of 32 ms, {CONSUMERS} consumers per frame)")
+    print("=" * 72)
+
+    try:
+        load_s, per_frame = bench_torch_hub(frames)
+        print(f"torch.hub (per consumer):  startup {load_s * 1000:8.1f} ms   per frame {per_frame * 1000:.3f} ms")
+    except Exception as e:
+        print(f"torch.hub baseline skipped: {e}")
+
+    if not ORT_AVAILABLE:
+        print("onnxruntime not installed; ONNX numbers skipped")
+        sys.exit(0)
+    for threads in (1, 2, 4):
+        load_s, per_frame, stats = bench_onnx(frames, threads)
+        print(f"ONNX shared, {threads} thread(s):  startup {load_s * 1000:8.1f} ms   per frame {per_frame * 1000:.3f} ms"
+              f"   ({stats['inferences']} inferences, {stats['avg_inference_ms']:.3f} ms each)")
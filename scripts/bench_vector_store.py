@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.memory.vector_store import VectorStore
+
+DIM = 384  # all-MiniLM-L6-v2
+QUERIES = 200
+
+def random_unit(n, rng):
+    v = rng.standard_normal((n, DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+def bench(size, rng):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        base = os.path.join(tmp_dir, 'memory_vectors')
+        vectors = random_unit(size, rng)
+        ids = [f"fact:{i}" for i in range(size)]
+        texts = [f"remembered fact {i}" for i in ids]
+
+        start = time.perf_counter()
+        store = VectorStore(base, DIM)
+        store.upsert_many(ids, texts, vectors)
+        rebuild_s = time.perf_counter() - start
+        store.close()
+
+        start = time.perf_counter()
+        store = VectorStore(base, DIM)
+        reopen_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        store.upsert("fact:new", "one new fact", random_unit(1, rng)[0])
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        queries = random_unit(QUERIES, rng)
+        start = time.perf_counter()
+        for q in queries:
+            store.search(q, top_k=3)
+        query_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        # Old approach: in-RAM matrix + full argsort
+        start = time.perf_counter()
+        for q in queries:
+            np.argsort(vectors @ q)[-3:][::-1]
+        argsort_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        store.close()
+        return rebuild_s, reopen_ms, incremental_ms, query_ms, argsort_ms
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print("=" * 80)
+    print("MEMORY VECTOR STORE (excludes SentenceTransformer encode time)")
+    print("=" * 80)
+    print(f"{'memories':>9} {'rebuild s':>10} {'reopen ms':>10} {'+1 doc ms':>10} {'query ms':>10} {'argsort ms':>11}")
+    for size in [1000, 10000, 100000]:
+        rebuild_s, reopen_ms, incremental_ms, query_ms, argsort_ms = bench(size, rng)
+        print(f"{size:>9} {rebuild_s:>10.2f} {reopen_ms:>10.1f} {incremental_ms:>10.2f} {query_ms:>10.3f} {argsort_ms:>11.3f}")
@@ -0,0 +1,116 @@
+import sys
+import os
+import glob
+import time
+import argparse
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")  # CPU numbers
+
+import cv2
+from core.vision.yolo_backend import (
+    IMGSZ_CHOICES, TIERS, OnnxYoloBackend, UltralyticsYoloBackend, box_iou, export_model, pick_backend
+)
+
+def load_images(folder, limit):
+    paths = sorted(p for ext in ("jpg", "jpeg", "png") for p in glob.glob(os.path.join(folder, f"*.{ext}")))
+    images = [cv2.imread(p) for p in paths[:limit]]
+    return [img for img in images if img is not None]
+
+def average_precision(predictions, references, iou_threshold=0.5):
+    """
+    mAP proxy: AP@0.5 of `predictions` taking the reference model's boxes as
+    ground truth, averaged over the classes the reference found.
+    predictions / references: one detail list per image.
+    """
+    classes = {d['name'] for dets in references for d in dets}
+    aps = []
+    for name in classes:
+        truth = [np.array([d['bbox'] for d in dets if d['name'] == name], dtype=np.float32).reshape(-1, 4)
+                 for dets in references]
+        total = sum(len(t) for t in truth)
+        ranked = sorted(((d['confidence'], i, d['bbox']) for i, dets in enumerate(predictions)
+                         for d in dets if d['name'] == name), reverse=True)
+        used = [np.zeros(len(t), dtype=bool) for t in truth]
+        hits = []
+        for _, i, bbox in ranked:
+            hit = False
+            if len(truth[i]):
+                ious = box_iou(np.array(bbox, dtype=np.float32), truth[i])
+                ious[used[i]] = 0
+                best = int(ious.argmax())
+                if ious[best] >= iou_threshold:
+                    used[i][best] = True
+                    hit = True
+            hits.append(hit)
+        if not hits:
+            aps.append(0.0)
+            continue
+        tp = np.cumsum(hits)
+        precision = tp / np.arange(1, len(hits) + 1)
+        recall = tp / total
+        # All-point interpolation
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+        recall = np.concatenate(([0.0], recall))
+        aps.append(float(np.sum((recall[1:] - recall[:-1]) * precision)))
+    return float(np.mean(aps)) if aps else 1.0
+
+def load_backend(tier, backend, cache_dir):
+    path = export_model(tier, backend, cache_dir)
+    if backend == "onnx":
+        return OnnxYoloBackend(path)
+    return UltralyticsYoloBackend(path, backend)
+
+def run(backend, images, imgsz, conf, batch):
+    outputs = []
+    latencies = []
+    for i in range(0, len(images), batch):
+        chunk = images[i:i + batch]
+        start = time.perf_counter()
+        outputs.extend(backend.infer(chunk, imgsz, conf))
+        latencies.append((time.perf_counter() - start) * 1000 / len(chunk))
+    return outputs, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO tier / input size latency vs agreement on CPU")
+    parser.add_argument("images", nargs="?", default=os.path.join(os.getcwd(), "data", "bench_images"))
+    parser.add_argument("--backend", default="auto", choices=["auto", "onnx", "openvino", "torch"])
+    parser.add_argument("--tiers", default="".join(TIERS))
+    parser.add_argument("--sizes", default=",".join(str(s) for s in IMGSZ_CHOICES))
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--conf", type=float, default=0.25)
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.limit)
+    if not images:
+        print(f"No images in {args.images} (jpg/png); pass a folder of sample frames.")
+        return
+
+    backend_name = pick_backend(args.backend)
+    cache_dir = os.path.join(os.getcwd(), "models", "yolo")
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print("=" * 72)
+    print(f"YOLO11 on {len(images)} images, {backend_name} backend, batch {args.batch}")
+    print("Agreement: AP@0.5 against yolo11x@640 taken as ground truth")
+    print("=" * 72)
+
+    reference_backend = load_backend("x", backend_name, cache_dir)
+    references, _ = run(reference_backend, images, 640, args.conf, args.batch)
+    del reference_backend
+
+    print(f"{'model':<14}{'ms/frame p50':>14}{'p95':>10}{'fps':>8}{'AP@0.5':>10}")
+    for tier in args.tiers:
+        backend = load_backend(tier, backend_name, cache_dir)
+        for imgsz in sizes:
+            run(backend, images[:2], imgsz, args.conf, args.batch)  # Warm-up
+            outputs, latencies = run(backend, images, imgsz, args.conf, args.batch)
+            p50, p95 = np.percentile(latencies, [50, 95])
+            ap = average_precision(outputs, references)
+            print(f"yolo11{tier}@{imgsz:<7}{p50:>14.1f}{p95:>10.1f}{1000 / p50:>8.1f}{ap:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import sys
+import os
+import argparse
+import wave
+import numpy as np
+
+# Add project paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jarvis'))
+
+from core.voice.keyword_spotter import KeywordSpotter
+from core.voice.mic import Microphone
+
+SR = 16000
+
+def record(mic, seconds):
+    frames = []
+    for _ in range(int(seconds * SR / mic.chunk)):
+        chunk = mic.read_chunk(timeout=1.0)
+        if chunk:
+            frames.append(chunk)
+    return np.frombuffer(b"".join(frames), dtype=np.int16).astype(np.float32) / 32768.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enroll wake word templates for the keyword spotter")
+    parser.add_argument("keyword", help='e.g. "hey jarvis"')
+    parser.add_argument("--takes", type=int, default=4, help="recordings to take from the microphone")
+    parser.add_argument("--seconds", type=float, default=2.0, help="length of each recording")
+    parser.add_argument("--wav", nargs="*", help="enroll from 16 kHz mono WAV files instead")
+    parser.add_argument("--out", help="templates file (default models/wake_words/templates.npz)")
+    args = parser.parse_args()
+
+    spotter = KeywordSpotter([args.keyword.lower()], templates_path=args.out)
+
+    if args.wav:
+        for path in args.wav:
+            with wave.open(path, 'rb') as wf:
+                audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+            spotter.enroll(args.keyword, audio)
+            print(f"Enrolled {path}")
+    else:
+        mic = Microphone()
+        mic.start()
+        try:
+            for take in range(args.takes):
+                input(f"[{take + 1}/{args.takes}] Press Enter, then say \"{args.keyword}\"...")
+                mic.next_seq = mic.latest_seq
+                spotter.enroll(args.keyword, record(mic, args.seconds))
+                print("  ok")
+        finally:
+            mic.terminate()
+
+    print(f"Threshold for \"{args.keyword}\": {spotter.thresholds[args.keyword.lower()]:.2f}")
+    spotter.save()
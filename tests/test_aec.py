@@ -0,0 +1,97 @@
+import sys
+import os
+import time
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.aec_enhanced import AdvancedAEC, EnhancedAECWithNR
+
+FS = 16000
+FRAME = 512
+
+def synthetic_echo(seconds=6, echo_gain=0.5, seed=0):
+    """Speech-like far-end signal and its echo through a random decaying room response"""
+    rng = np.random.default_rng(seed)
+    n = FS * seconds
+    far = np.convolve(rng.standard_normal(n), [1.0, 0.9, 0.5], 'same') * 0.1
+    far *= 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3 * np.arange(n) / FS))
+    rir = rng.standard_normal(800) * np.exp(-np.arange(800) / 120.0)
+    rir[:40] = 0.0  # Acoustic delay
+    rir *= echo_gain / np.linalg.norm(rir)
+    echo = np.convolve(far, rir)[:n]
+    return far, echo + 1e-4 * rng.standard_normal(n), rng
+
+def to_bytes(x):
+    return np.clip(x * 32768.0, -32768, 32767).astype(np.int16).tobytes()
+
+def run(aec, mic, ref, frame=FRAME):
+    out = []
+    for i in range(0, len(mic), frame):
+        clean, _ = aec.process(to_bytes(mic[i:i + frame]), to_bytes(ref[i:i + frame]))
+        out.append(np.frombuffer(clean, dtype=np.int16) / 32768.0)
+    return np.concatenate(out)
+
+def erle_db(mic, clean):
+    return 10 * np.log10(np.mean(mic ** 2) / (np.mean(clean ** 2) + 1e-12))
+
+class TestPartitionedAEC(unittest.TestCase):
+
+    def test_erle_on_synthetic_echo(self):
+        far, mic, _ = synthetic_echo()
+        clean = run(AdvancedAEC(frame_size=FRAME, filter_length=1024), mic, far)
+        tail = slice(3 * FS, None)
+        self.assertGreater(erle_db(mic[tail], clean[tail]), 30.0)
+
+    def test_odd_chunk_sizes(self):
+        far, mic, _ = synthetic_echo(seconds=4)
+        clean = run(AdvancedAEC(frame_size=FRAME, filter_length=1024), mic, far, frame=320)
+        self.assertEqual(len(clean), len(mic))
+        tail = slice(2 * FS, None)
+        self.assertGreater(erle_db(mic[tail], clean[tail]), 25.0)
+
+    def test_double_talk_freezes_adaptation(self):
+        far, mic, rng = synthetic_echo(seconds=4)
+        aec = AdvancedAEC(frame_size=FRAME, filter_length=1024)
+        run(aec, mic[:2 * FS], far[:2 * FS])
+        converged = aec.W.copy()
+
+        # Loud near-end talker on top of the echo
+        near = 0.3 * np.sin(2 * np.pi * 220 * np.arange(2 * FS) / FS) * rng.standard_normal(2 * FS)
+        clean = run(aec, mic[2 * FS:] + near, far[2 * FS:])
+
+        stats = aec.get_statistics()
+        self.assertGreater(stats['double_talk_events'], 0)
+        self.assertTrue(aec.double_talk_active)
+        drift = np.linalg.norm(aec.W - converged) / np.linalg.norm(converged)
+        self.assertLess(drift, 0.1)
+        # The near-end talker passes through (echo removed, speech kept)
+        self.assertLess(abs(erle_db(near[FS:], clean[FS:])), 1.0)
+
+    def test_frame_time(self):
+        far, mic, _ = synthetic_echo(seconds=2)
+        aec = AdvancedAEC(frame_size=FRAME, filter_length=1024)
+        frames = [(to_bytes(mic[i:i + FRAME]), to_bytes(far[i:i + FRAME])) for i in range(0, len(mic), FRAME)]
+        start = time.perf_counter()
+        for m, r in frames:
+            aec.process(m, r)
+        per_frame_ms = (time.perf_counter() - start) / len(frames) * 1000
+        self.assertLess(per_frame_ms, 1.0)
+        self.assertEqual(aec.get_statistics()['frames'], len(frames))
+
+    def test_statistics_and_reset(self):
+        far, mic, _ = synthetic_echo(seconds=1)
+        aec = EnhancedAECWithNR()
+        clean, reduction = aec.process_with_noise_reduction(to_bytes(mic[:FRAME]), to_bytes(far[:FRAME]))
+        self.assertEqual(len(clean), FRAME * 2)
+        stats = aec.get_statistics()
+        for key in ('echo_return_loss', 'double_talk_events', 'adaptation_stops',
+                    'noise_spectrum_estimated', 'noise_estimation_progress'):
+            self.assertIn(key, stats)
+        aec.aec.reset()
+        self.assertFalse(aec.aec.W.any())
+        self.assertEqual(aec.aec.get_statistics()['frames'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision import emotion_detector
+from core.vision.emotion_detector import EmotionDetector
+
+
+class RecordingHead:
+    """Head stand-in that records the batches it receives"""
+
+    def __init__(self, action, fields):
+        self.action = action
+        self.name = f"recording-{action}"
+        self.fields = fields
+        self.batches = []
+
+    def predict(self, crops):
+        self.batches.append([crop.shape for crop in crops])
+        return [dict(self.fields) for _ in crops]
+
+
+class TestEmotionDetector(unittest.TestCase):
+    def setUp(self):
+        # The heads are stand-ins: run as if a backend were installed
+        availability = patch.object(emotion_detector, 'ONNX_AVAILABLE', True)
+        availability.start()
+        self.addCleanup(availability.stop)
+        self.detector = EmotionDetector(margin=0.0)
+        self.loaded = []
+        self.heads = {
+            'emotion': RecordingHead('emotion', {'emotion': 'happy', 'confidence': 0.9, 'all_emotions': {}}),
+            'age': RecordingHead('age', {'age': 30}),
+        }
+        self.detector._load_head = lambda action: self.loaded.append(action) or self.heads[action]
+        self.frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    def test_faces_share_one_batch(self):
+        faces = [(10, 60, 60, 10), (100, 200, 200, 100), (20, 300, 50, 270)]
+        results = self.detector.analyze_faces(self.frame, faces)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(self.heads['emotion'].batches, [[(50, 50, 3), (100, 100, 3), (30, 30, 3)]])
+        self.assertEqual(self.loaded, ['emotion'])
+
+    def test_extra_heads_only_on_demand(self):
+        results = self.detector.analyze_faces(self.frame, [(10, 60, 60, 10)], actions=('emotion', 'age'))
+        self.assertEqual(self.loaded, ['emotion', 'age'])
+        self.assertEqual(results[0]['age'], 30)
+        self.assertEqual(results[0]['emotion'], 'happy')
+
+    def test_tracked_faces_keep_track_id(self):
+        faces = [{'name': 'Unknown', 'location': (0, 40, 40, 0), 'track_id': 7},
+                 {'name': 'Ada', 'location': (50, 250, 230, 100), 'track_id': 9}]
+        result = self.detector.detect_emotion(self.frame, faces)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['track_id'], 9)  # Largest face
+        self.assertEqual([f['track_id'] for f in result['faces']], [7, 9])
+
+    def test_tiny_faces_are_skipped(self):
+        result = self.detector.detect_emotion(self.frame, [(10, 14, 14, 10)])
+        self.assertEqual(result['error'], 'No face detected in frame')
+        self.assertEqual(self.heads['emotion'].batches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.face_tracker import FaceTracker, box_iou_matrix, nearest_known
+
+def box(x, y, size=100):
+    """(top, right, bottom, left) of a square face at x, y"""
+    return (y, x + size, y + size, x)
+
+class TestFaceTracker(unittest.TestCase):
+
+    def test_iou_matrix(self):
+        iou = box_iou_matrix([box(0, 0)], [box(0, 0), box(50, 0), box(300, 300)])
+        np.testing.assert_allclose(iou[0], [1.0, 1 / 3, 0.0], atol=1e-6)
+
+    def test_identity_follows_moving_face(self):
+        tracker = FaceTracker()
+        first = tracker.update([box(100, 100), box(400, 100)], now=0.0)
+        tracker.assign(first[0], "alice", 0.8, now=0.0)
+        # Both move; the order of detections changes
+        second = tracker.update([box(420, 110), box(115, 105)], now=0.1)
+        self.assertIs(second[1], first[0])
+        self.assertEqual(second[1].name, "alice")
+        self.assertIs(second[0], first[1])
+
+    def test_fast_motion_uses_centroid(self):
+        tracker = FaceTracker()
+        small = tracker.update([box(100, 100, 40)], now=0.0)[0]
+        # Too little overlap for IoU, but within one face size of the old centre
+        moved = tracker.update([box(132, 100, 40)], now=0.05)[0]
+        self.assertLess(box_iou_matrix([box(100, 100, 40)], [box(132, 100, 40)])[0, 0], 0.3)
+        self.assertIs(moved, small)
+
+    def test_stale_tracks_expire(self):
+        tracker = FaceTracker(max_age=1.0)
+        old = tracker.update([box(100, 100)], now=0.0)[0]
+        new = tracker.update([box(100, 100)], now=2.0)[0]
+        self.assertIsNot(new, old)
+        self.assertEqual(len(tracker.tracks), 1)
+
+    def test_reencode_policy(self):
+        tracker = FaceTracker(reencode_s=3.0, unknown_reencode_s=1.0, sharpness_gain=1.3)
+        track = tracker.update([box(100, 100)], now=0.0)[0]
+        self.assertTrue(tracker.needs_encoding(track, 100, now=0.0))
+        tracker.assign(track, "alice", 0.8, sharpness=100, now=0.0)
+        self.assertFalse(tracker.needs_encoding(track, 110, now=1.5))
+        self.assertTrue(tracker.needs_encoding(track, 150, now=1.5))
+        self.assertTrue(tracker.needs_encoding(track, 100, now=3.0))
+        tracker.assign(track, "Unknown", 0.3, sharpness=100, now=3.0)
+        self.assertTrue(tracker.needs_encoding(track, 100, now=4.0))
+
+    def test_nearest_known_matches_loop(self):
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((20, 128)) * 0.1
+        encodings = matrix[[3, 7]] + rng.standard_normal((2, 128)) * 0.01
+        idx, dist = nearest_known(matrix, encodings)
+        self.assertEqual(list(idx), [3, 7])
+        expected = [np.linalg.norm(matrix - e, axis=1).min() for e in encodings]
+        np.testing.assert_allclose(dist, expected, rtol=1e-6)
+        idx, dist = nearest_known(np.zeros((0, 128)), encodings)
+        self.assertTrue(np.isinf(dist).all())
+
+if __name__ == '__main__':
+    unittest.main()
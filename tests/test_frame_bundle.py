@@ -0,0 +1,58 @@
+import sys
+import os
+import threading
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.frame_bundle import FrameBundle, as_bundle, as_image, perceptual_hash, sharpness
+
+def frame():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    image[:, :, 0] = 10  # Blue channel constant: easy to check BGR -> RGB
+    image.flags.writeable = False
+    return image
+
+class TestFrameBundle(unittest.TestCase):
+
+    def test_variants_are_memoized_and_read_only(self):
+        bundle = FrameBundle(frame(), frame_id=7, timestamp=1.0)
+        self.assertIs(bundle.rgb, bundle.rgb)
+        self.assertIs(bundle.gray, bundle.gray)
+        self.assertIs(bundle.half, bundle.scaled(0.5))
+        for variant in (bundle.rgb, bundle.gray, bundle.half, bundle.quarter):
+            self.assertFalse(variant.flags.writeable)
+
+    def test_variant_contents(self):
+        bundle = FrameBundle(frame())
+        self.assertTrue((bundle.rgb[:, :, 2] == 10).all())
+        self.assertEqual(bundle.gray.shape, (480, 640))
+        self.assertEqual(bundle.half.shape, (240, 320, 3))
+        self.assertEqual(bundle.quarter.shape, (120, 160, 3))
+        self.assertEqual(bundle.scaled_rgb(0.5).shape, (240, 320, 3))
+        self.assertIs(bundle.scaled(1.0), bundle.image)
+        self.assertAlmostEqual(bundle.sharpness, sharpness(bundle.image), places=6)
+        self.assertTrue((bundle.phash == perceptual_hash(bundle.image)).all())
+
+    def test_concurrent_access_computes_once(self):
+        bundle = FrameBundle(frame())
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(bundle.gray)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(g is seen[0] for g in seen))
+
+    def test_raw_arrays_are_wrapped(self):
+        image = frame()
+        bundle = as_bundle(image)
+        self.assertIs(bundle.image, image)
+        self.assertIs(as_bundle(bundle), bundle)
+        self.assertIs(as_image(bundle), image)
+        self.assertIs(as_image(image), image)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.frame_capture import FrameCapture
+from core.vision.vision_scheduler import SyntheticVideoSource
+
+class ScriptedSource:
+    """read() plays a fixed list of frames, then reports finished"""
+    def __init__(self, frames, delay=0.01):
+        self.frames = list(frames)
+        self.delay = delay
+        self.finished = False
+
+    def read(self):
+        time.sleep(self.delay)
+        if not self.frames:
+            self.finished = True
+            return False, None
+        return True, self.frames.pop(0)
+
+class StalledSource:
+    def __init__(self):
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return False, None
+
+class TestFrameCapture(unittest.TestCase):
+
+    def test_publishes_read_only_frames_with_ids(self):
+        capture = FrameCapture(SyntheticVideoSource(fps=60))
+        capture.start()
+        try:
+            first = capture.wait_for(0, timeout=1.0)
+            second = capture.wait_for(first.frame_id, timeout=1.0)
+        finally:
+            capture.stop()
+        self.assertGreater(second.frame_id, first.frame_id)
+        self.assertGreaterEqual(second.timestamp, first.timestamp)
+        with self.assertRaises(ValueError):
+            second.image[0, 0, 0] = 1
+
+    def test_consumers_share_the_frame_without_copying(self):
+        capture = FrameCapture(ScriptedSource([np.zeros((4, 4, 3), np.uint8)]))
+        capture.start()
+        frame = capture.wait_for(0, timeout=1.0)
+        capture.stop()
+        self.assertIs(capture.latest().image, frame.image)
+
+    def test_sharpest_of_recent_frames(self):
+        rng = np.random.default_rng(0)
+        flat = [np.full((48, 64, 3), 100, np.uint8) for _ in range(5)]
+        sharp = rng.integers(0, 255, (48, 64, 3), dtype=np.uint8)
+        capture = FrameCapture(ScriptedSource(flat[:2] + [sharp] + flat[2:]), ring_size=8)
+        capture.start()
+        best = capture.sharpest(6, timeout=1.0)
+        capture.stop()
+        self.assertEqual(best.frame_id, 3)
+        self.assertEqual(len(capture.recent(4)), 4)
+
+    def test_finished_source_stops_thread(self):
+        capture = FrameCapture(ScriptedSource([np.zeros((4, 4, 3), np.uint8)] * 3))
+        capture.start()
+        capture.thread.join(timeout=1.0)
+        self.assertFalse(capture.running)
+        self.assertEqual(capture.stats()["frames"], 3)
+        self.assertIsNone(capture.wait_for(3, timeout=0.1))
+
+    def test_stalled_device_backs_off(self):
+        source = StalledSource()
+        capture = FrameCapture(source)
+        capture.start()
+        time.sleep(0.3)
+        capture.stop()
+        self.assertLess(source.reads, 30)
+        self.assertEqual(capture.stats()["read_errors"], source.reads)
+
+if __name__ == '__main__':
+    unittest.main()
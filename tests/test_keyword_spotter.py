@@ -0,0 +1,115 @@
+import sys
+import os
+import unittest
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.keyword_spotter import MFCCExtractor, FeatureRing, KeywordSpotter, subsequence_dtw
+
+SR = 16000
+
+def syllable(f0, formants, seconds, rng):
+    """Voiced sound: harmonics of f0 weighted by two formant peaks"""
+    t = np.arange(int(seconds * SR)) / SR
+    out = np.zeros_like(t)
+    for h in range(1, int(4000 / f0)):
+        f = h * f0
+        gain = sum(np.exp(-((f - fc) / 150.0) ** 2) for fc in formants) + 0.02
+        out += gain * np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi))
+    return out * np.hanning(len(t))
+
+def word(units, stretch=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    parts = [syllable(f0, formants, d * stretch, rng) for f0, formants, d in units]
+    audio = np.concatenate(parts)
+    return (0.3 * audio / np.abs(audio).max()).astype(np.float32)
+
+JARVIS = [(130, (700, 1200), 0.18), (120, (300, 2300), 0.15), (110, (500, 1700), 0.2)]
+OTHER = [(150, (300, 900), 0.2), (140, (650, 1000), 0.15), (160, (400, 2000), 0.15)]
+
+def noise(seconds, level=0.003, seed=1):
+    return (np.random.default_rng(seed).standard_normal(int(seconds * SR)) * level).astype(np.float32)
+
+def feed(spotter, audio, chunk=512):
+    """Stream audio in mic-sized chunks; returns (sample_end, result) of each firing"""
+    fired = []
+    for pos in range(0, len(audio), chunk):
+        result = spotter.process(audio[pos:pos + chunk])
+        if result:
+            fired.append((pos + chunk, result))
+    return fired
+
+def enrolled(keyword="jarvis"):
+    spotter = KeywordSpotter([keyword], templates_path=os.path.join(tempfile.gettempdir(), "none.npz"))
+    for i, stretch in enumerate((0.9, 1.0, 1.1)):
+        spotter.enroll(keyword, np.concatenate((noise(0.3, seed=i), word(JARVIS, stretch, seed=i) + noise(len(word(JARVIS, stretch)) / SR, seed=10 + i), noise(0.3, seed=20 + i))))
+    return spotter
+
+class TestFeatures(unittest.TestCase):
+
+    def test_streaming_matches_one_shot(self):
+        audio = word(JARVIS)
+        whole, _ = MFCCExtractor(cmn_seconds=1e9).process(audio)
+        streamed = MFCCExtractor(cmn_seconds=1e9)
+        parts = [streamed.process(audio[i:i + 333])[0] for i in range(0, len(audio), 333)]
+        streamed = np.concatenate(parts)
+        self.assertEqual(len(whole), len(streamed))
+        # Only the running mean differs between the two; the deltas match
+        np.testing.assert_allclose(np.diff(whole, axis=0), np.diff(streamed, axis=0), atol=1e-3)
+
+    def test_ring_returns_latest_in_order(self):
+        ring = FeatureRing(8, 2)
+        for i in range(20):
+            ring.push(np.full((1, 2), i, dtype=np.float32), np.array([i], dtype=np.float32))
+        feats, energy = ring.last(5)
+        self.assertEqual(list(energy), [15, 16, 17, 18, 19])
+        self.assertEqual(len(ring.last(100)[0]), 8)
+
+    def test_dtw_tolerates_time_warp(self):
+        template, _ = MFCCExtractor().process(word(JARVIS))
+        warped, _ = MFCCExtractor().process(word(JARVIS, stretch=1.3, seed=3))
+        other, _ = MFCCExtractor().process(word(OTHER, stretch=1.3, seed=3))
+        self.assertLess(np.min(subsequence_dtw(template, warped)), np.min(subsequence_dtw(template, other)))
+
+class TestKeywordSpotter(unittest.TestCase):
+
+    def test_fires_once_at_end_of_keyword(self):
+        spotter = enrolled()
+        kw = word(JARVIS, stretch=1.05, seed=7)
+        audio = np.concatenate((noise(1.0), kw, noise(1.0, seed=2)))
+        audio[SR:SR + len(kw)] += noise(len(kw) / SR, seed=3)
+        fired = feed(spotter, audio)
+        self.assertEqual(len(fired), 1)
+        end, (keyword, confidence) = fired[0]
+        self.assertEqual(keyword, "jarvis")
+        # Fires within 300 ms of the keyword ending
+        latency = (end - (SR + len(kw))) / SR
+        self.assertLess(latency, 0.3)
+        self.assertGreater(latency, -0.2)
+
+    def test_ignores_other_words_and_noise(self):
+        spotter = enrolled()
+        audio = np.concatenate([noise(0.5, seed=s) if s % 2 else word(OTHER, 0.9 + 0.05 * s, seed=s)
+                                for s in range(12)])
+        audio = np.concatenate((audio, noise(3.0, level=0.02, seed=99)))
+        self.assertEqual(feed(spotter, audio), [])
+
+    def test_silence_skips_matching(self):
+        spotter = enrolled()
+        feed(spotter, noise(3.0))
+        self.assertEqual(spotter.evaluations, 0)
+
+    def test_save_and_load(self):
+        spotter = enrolled()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "templates.npz")
+            spotter.save(path)
+            loaded = KeywordSpotter(["jarvis"], templates_path=path)
+        self.assertEqual(len(loaded.templates["jarvis"]), 3)
+        self.assertAlmostEqual(loaded.thresholds["jarvis"], spotter.thresholds["jarvis"], places=4)
+        self.assertTrue(loaded.has_templates())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+sys.path.append(os.path.dirname(__file__))
+
+from core.memory.structures import LongTermMemory
+from core.memory.entries import MemoryEntry, MemoryType
+from test_vector_store import FakeEmbedder
+
+def fact(content):
+    return MemoryEntry(content=content, memory_type=MemoryType.LONG_TERM)
+
+class TestLongTermSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'memory_long_term.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_keyword_fallback_respects_threshold(self):
+        ltm = LongTermMemory(self.path, use_embeddings=False)
+        ltm.add(fact("My car's plate number is ABC 789"))
+        ltm.add(fact("My favorite coffee is a double espresso"))
+
+        self.assertEqual(ltm.search("What is my car's plate?", threshold=0.3)[0].content,
+                         "My car's plate number is ABC 789")
+        # Only 1 of 3 keywords matches -> below 0.5
+        self.assertEqual(ltm.search("coffee tea juice", threshold=0.5), [])
+        self.assertEqual(len(ltm.search("coffee tea juice", threshold=0.3)), 1)
+
+    def test_semantic_search_and_near_duplicates(self):
+        ltm = LongTermMemory(self.path, embeddings_model=FakeEmbedder())
+        first = fact("My favorite color is blue")
+        self.assertIs(ltm.add(first), first)
+        ltm.add(fact("The lab door code is 4242"))
+
+        # Same words, different punctuation/case -> reinforced, not duplicated
+        again = ltm.add(fact("my favorite COLOR is blue!"))
+        self.assertIs(again, first)
+        self.assertEqual(len(ltm.entries), 2)
+
+        scored = ltm.search_with_scores("lab door code", threshold=0.3, top_k=1)
+        self.assertEqual(scored[0][0].content, "The lab door code is 4242")
+        self.assertEqual(ltm.search("weather in paris", threshold=0.5), [])
+
+    def test_reload_and_legacy_migration(self):
+        legacy = [fact("Legacy fact about pizza").to_dict()]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        ltm = LongTermMemory(self.path, use_embeddings=False)
+        self.assertEqual([e.content for e in ltm.entries], ["Legacy fact about pizza"])
+        ltm.add(fact("New fact about pasta"))
+        ltm.journal.close()
+
+        reloaded = LongTermMemory(self.path, use_embeddings=False)
+        self.assertEqual([e.content for e in reloaded.entries],
+                         ["Legacy fact about pizza", "New fact about pasta"])
+        self.assertEqual(reloaded.search("pasta")[0].content, "New fact about pasta")
+
+if __name__ == '__main__':
+    unittest.main()
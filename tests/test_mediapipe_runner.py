@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.frame_bundle import FrameBundle
+from core.vision.mediapipe_runner import MediaPipeRunner
+
+
+class FakeOptions:
+    def __init__(self, base_options, running_mode, result_callback=None):
+        self.running_mode = running_mode
+        self.result_callback = result_callback
+
+
+class FakeTask:
+    """Stands in for a MediaPipe task: echoes timestamps, async results come in order from another thread"""
+
+    drop = set()
+
+    def __init__(self, options):
+        self.options = options
+        self.timestamps = []
+        self.graph = ThreadPoolExecutor(1)
+
+    @classmethod
+    def create_from_options(cls, options):
+        return cls(options)
+
+    def detect(self, image):
+        return {"timestamp": None}
+
+    def detect_for_video(self, image, timestamp_ms):
+        self.timestamps.append(timestamp_ms)
+        return {"timestamp": timestamp_ms}
+
+    def detect_async(self, image, timestamp_ms):
+        self.timestamps.append(timestamp_ms)
+        if timestamp_ms not in self.drop:
+            self.graph.submit(self.options.result_callback, {"timestamp": timestamp_ms}, image, timestamp_ms)
+
+
+def frame(ts):
+    return FrameBundle(np.zeros((4, 4, 3), dtype=np.uint8), 0, ts)
+
+
+class TestMediaPipeRunner(unittest.TestCase):
+    def make(self, mode):
+        self.results = []
+        return MediaPipeRunner(FakeTask, FakeOptions, "model.task", "detect", dict, mode,
+                               lambda result, frame_ts: self.results.append((frame_ts, result)))
+
+    def setUp(self):
+        # Skip building the mediapipe.Image: the fake task never looks at it
+        self._mp_image = FrameBundle.mp_image
+        FrameBundle.mp_image = property(lambda self: None)
+
+    def tearDown(self):
+        FrameBundle.mp_image = self._mp_image
+        FakeTask.drop = set()
+
+    def test_timestamps_strictly_increase(self):
+        runner = self.make("video")
+        for ts in (10.0, 10.0, 9.5, 10.0021):
+            runner.submit(frame(ts))
+        self.assertEqual(runner.task.timestamps, [10000, 10001, 10002, 10003])
+
+    def test_video_mode_delivers_synchronously(self):
+        runner = self.make("video")
+        result = runner.submit(frame(1.0))
+        self.assertEqual(result, {"timestamp": 1000})
+        self.assertEqual(self.results, [(1.0, {"timestamp": 1000})])
+
+    def test_live_stream_run_waits_for_its_frame(self):
+        runner = self.make("live_stream")
+        self.assertIsNone(runner.submit(frame(1.0)))
+        result = runner.run(frame(2.0), timeout=2.0)
+        self.assertEqual(result, {"timestamp": 2000})
+        self.assertEqual(runner.stats()["in_flight"], 0)
+
+    def test_dropped_frames_do_not_linger(self):
+        runner = self.make("live_stream")
+        FakeTask.drop = {1000}
+        self.assertIsNone(runner.run(frame(1.0), timeout=0.2))
+        self.assertEqual(runner.run(frame(2.0), timeout=2.0), {"timestamp": 2000})
+        stats = runner.stats()
+        self.assertEqual((stats["submitted"], stats["completed"], stats["in_flight"]), (2, 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
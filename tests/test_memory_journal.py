@@ -0,0 +1,104 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.memory.journal import MemoryJournal, apply_record
+from core.enhanced_memory import EnhancedMemory
+
+class TestMemoryJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.memory_file = os.path.join(self.tmp_dir, 'memory.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_apply_record_ops(self):
+        state = {}
+        apply_record(state, {"op": "put", "path": ["long_term", "car"], "value": "red"})
+        apply_record(state, {"op": "append", "path": ["short_term"], "value": 1, "cap": 2})
+        apply_record(state, {"op": "append", "path": ["short_term"], "value": 2, "cap": 2})
+        apply_record(state, {"op": "append", "path": ["short_term"], "value": 3, "cap": 2})
+        apply_record(state, {"op": "add", "path": ["interests"], "value": "chess"})
+        apply_record(state, {"op": "add", "path": ["interests"], "value": "chess"})
+        apply_record(state, {"op": "del", "path": ["long_term", "car"]})
+        self.assertEqual(state, {"long_term": {}, "short_term": [2, 3], "interests": ["chess"]})
+
+    def test_mutations_survive_restart_without_snapshot_rewrite(self):
+        m1 = EnhancedMemory(memory_file=self.memory_file)
+        m1.set("car", "red")
+        m1.remember_conversation("Hello Jarvis", "Greetings Sir")
+        m1.add_task("report", {"status": "active"})
+        m1.complete_task("report")
+
+        # Nothing but the WAL has been written so far
+        self.assertFalse(os.path.exists(self.memory_file))
+        self.assertTrue(os.path.exists(m1.journal.wal_path))
+        m1.journal.close()
+
+        m2 = EnhancedMemory(memory_file=self.memory_file)
+        self.assertEqual(m2.get("car"), "red")
+        self.assertEqual(m2.short_term[-1]['user'], "Hello Jarvis")
+        self.assertNotIn("report", m2.tasks)
+        m2.journal.close()
+
+    def test_checkpoint_truncates_wal(self):
+        m1 = EnhancedMemory(memory_file=self.memory_file)
+        m1.set("car", "red")
+        m1.save_memory()
+        self.assertFalse(os.path.exists(m1.journal.wal_path))
+        m1.set("bike", "blue")
+        m1.journal.close()
+
+        with open(self.memory_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['long_term'], {"car": "red"})
+
+        m2 = EnhancedMemory(memory_file=self.memory_file)
+        self.assertEqual(m2.long_term, {"car": "red", "bike": "blue"})
+        m2.journal.close()
+
+    def test_compaction_folds_wal_into_snapshot(self):
+        journal = MemoryJournal(self.memory_file, compact_every=0)
+        for i in range(20):
+            journal.append("put", ["long_term", f"k{i}"], i)
+        journal.compact()
+        journal.append("put", ["long_term", "k0"], "updated")
+        journal.close()
+
+        with open(journal.wal_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        reloaded = MemoryJournal(self.memory_file)
+        state = reloaded.load()
+        self.assertEqual(state['long_term']['k0'], "updated")
+        self.assertEqual(state['long_term']['k19'], 19)
+        self.assertEqual(reloaded.seq, 21)
+
+    def test_background_compaction(self):
+        journal = MemoryJournal(self.memory_file, compact_every=10)
+        for i in range(10):
+            journal.append("append", ["sessions"], {"summary": str(i)}, cap=50)
+        journal.wait_for_compaction(timeout=5)
+        journal.close()
+
+        self.assertTrue(os.path.exists(self.memory_file))
+        self.assertEqual(len(MemoryJournal(self.memory_file).load()['sessions']), 10)
+
+    def test_torn_wal_tail_is_ignored(self):
+        journal = MemoryJournal(self.memory_file, compact_every=0)
+        journal.append("put", ["long_term", "a"], 1)
+        journal.close()
+        with open(journal.wal_path, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 2, "op": "put", "path": ["long_te')
+
+        state = MemoryJournal(self.memory_file).load()
+        self.assertEqual(state, {"long_term": {"a": 1}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.enhanced_memory import EnhancedMemory, get_memory, set_memory
+from actions import memory_actions
+
+class TestMemoryService(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.memory = EnhancedMemory(memory_file=os.path.join(self.tmp_dir, 'memory.json'))
+        set_memory(self.memory)
+
+    def tearDown(self):
+        set_memory(None)
+        self.memory.journal.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_actions_share_one_instance(self):
+        self.assertIs(get_memory(), self.memory)
+        memory_actions.memorize_fact("the lab code is 4242")
+        memory_actions.remember_user_preference("coffee", "espresso")
+        memory_actions.remember_task("report", "finish the report")
+
+        self.assertEqual(self.memory.get_facts("general"), ["the lab code is 4242"])
+        self.assertEqual(self.memory.get_preference("coffee"), "espresso")
+        self.assertIn("report", memory_actions.list_tasks())
+
+    def test_delete_memory_is_journaled(self):
+        memory_actions.update_memory("car", "red")
+        memory_actions.remember_user_preference("coffee", "espresso")
+        self.assertEqual(memory_actions.delete_memory("coffee"), "Deleted preference for coffee")
+        self.assertEqual(memory_actions.delete_memory("car"), "Deleted memory for car")
+        self.assertEqual(memory_actions.delete_memory("car"), "No memory found for car")
+
+        self.memory.journal.close()
+        reloaded = EnhancedMemory(memory_file=self.memory.memory_file)
+        self.assertNotIn("car", reloaded.long_term)
+        self.assertEqual(reloaded.long_term.get("preferences"), {})
+        reloaded.journal.close()
+
+    def test_concurrent_writers(self):
+        def writer(n):
+            for i in range(50):
+                self.memory.add_fact(f"thread{n}", f"fact {i}")
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.memory.journal.close()
+        reloaded = EnhancedMemory(memory_file=self.memory.memory_file)
+        for n in range(4):
+            self.assertEqual(len(reloaded.get_facts(f"thread{n}")), 50)
+        reloaded.journal.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import sys
+import os
+import time
+import wave
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice import vad
+from core.voice.mic import AudioRingBuffer, Microphone, WavFileInput
+
+RATE = 16000
+CHUNK = 512
+
+def write_wav(path, samples):
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(samples.astype(np.int16).tobytes())
+
+class TestAudioRingBuffer(unittest.TestCase):
+
+    def test_frames_and_timestamps_across_odd_blocks(self):
+        ring = AudioRingBuffer(capacity_frames=8, frame_size=4, rate=RATE)
+        samples = np.arange(40, dtype=np.int16)
+        pos = 0
+        for block in (3, 5, 7, 1, 9, 6, 9):
+            ring.write(samples[pos:pos + block], 100.0 + pos / RATE)
+            pos += block
+        self.assertEqual(ring.latest_seq, 10)
+        self.assertIsNone(ring.frame(10))
+        data, ts = ring.frame(5)
+        np.testing.assert_array_equal(data, samples[20:24])
+        self.assertAlmostEqual(ts, 100.0 + 20 / RATE)
+        # Frames that were lapped are gone instead of returning garbage
+        self.assertIsNone(ring.frame(0))
+        self.assertEqual(ring.oldest_seq, 10 - 8 + AudioRingBuffer.GUARD_FRAMES)
+
+    def test_wait_wakes_on_write_and_wake(self):
+        ring = AudioRingBuffer(capacity_frames=8, frame_size=4)
+        threading.Timer(0.05, ring.write, args=(np.ones(4, dtype=np.int16), 0.0)).start()
+        start = time.monotonic()
+        self.assertTrue(ring.wait(0, timeout=2.0))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+        threading.Timer(0.05, ring.wake).start()
+        start = time.monotonic()
+        self.assertFalse(ring.wait(1, timeout=2.0))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+class TestMicrophoneWavInput(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "speech.wav")
+        rng = np.random.default_rng(0)
+        self.samples = rng.integers(-3000, 3000, CHUNK * 20).astype(np.int16)
+        write_wav(self.path, self.samples)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reads_every_frame_in_order(self):
+        device = WavFileInput(self.path, realtime=True)
+        mic = Microphone(rate=RATE, chunk=CHUNK, device=device)
+        mic.start()
+        chunks, stamps = [], []
+        while len(chunks) < 20:
+            chunk = mic.read_chunk(timeout=1.0)
+            self.assertIsNotNone(chunk)
+            chunks.append(chunk)
+            stamps.append(mic.last_capture_time)
+        mic.stop()
+        self.assertEqual(b"".join(chunks), self.samples.tobytes())
+        np.testing.assert_allclose(np.diff(stamps), CHUNK / RATE, atol=1e-9)
+        self.assertEqual(mic.dropped_frames, 0)
+
+    def test_slow_consumer_skips_lapped_frames(self):
+        device = WavFileInput(self.path, realtime=False)
+        mic = Microphone(rate=RATE, chunk=CHUNK, buffer_seconds=8 * CHUNK / RATE, device=device)
+        mic.start()
+        self.assertTrue(device.done.wait(2.0))
+        first = mic.read_chunk(timeout=0.1)
+        self.assertIsNotNone(first)
+        self.assertGreater(mic.dropped_frames, 0)
+        seq = mic.next_seq - 1
+        self.assertEqual(first, self.samples[seq * CHUNK:(seq + 1) * CHUNK].tobytes())
+
+    def test_read_frame_by_sequence(self):
+        device = WavFileInput(self.path, realtime=False)
+        mic = Microphone(rate=RATE, chunk=CHUNK, device=device)
+        mic.start()
+        self.assertTrue(device.done.wait(2.0))
+        data, _ = mic.read_frame(7)
+        self.assertEqual(data, self.samples[7 * CHUNK:8 * CHUNK].tobytes())
+        self.assertIsNone(mic.read_frame(20, timeout=0.01))
+
+    def test_stopped_mic_read_blocks_instead_of_spinning(self):
+        mic = Microphone(rate=RATE, chunk=CHUNK, device=WavFileInput(self.path))
+        start = time.monotonic()
+        self.assertIsNone(mic.read_chunk(timeout=0.05))
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_restart_drops_vad_results_of_old_frame_numbers(self):
+        shared = vad.SileroVAD(session=object())  # Never run: every lookup below is a cache hit or a miss
+        previous, vad._vad_instance = vad._vad_instance, shared
+        self.addCleanup(setattr, vad, '_vad_instance', previous)
+        shared.cache[0] = 0.9  # Frame 0 of the previous session was speech
+
+        mic = Microphone(rate=RATE, chunk=CHUNK, device=WavFileInput(self.path, realtime=False))
+        mic.start()
+        mic.stop()
+        self.assertNotIn(0, shared.cache)
+
+if __name__ == '__main__':
+    unittest.main()
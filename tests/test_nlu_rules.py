@@ -0,0 +1,54 @@
+import sys
+import os
+import re
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.nlu.engine import NLUEngine
+from core.nlu.intents import IntentType
+from core.nlu.rule_dispatcher import required_literals, TriggerIndex
+
+class TestRuleDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.nlu = NLUEngine()
+
+    def test_required_literals(self):
+        self.assertEqual(required_literals(r"(?:take\s+a?)?\s*screenshot"), {"screenshot"})
+        self.assertEqual(required_literals(r"(?:wi-?fi|wifi|wireless)\s+off"), {"off"})
+        self.assertEqual(required_literals(r"(mute|unmute|silence)"), {"mute", "silence"})
+        # Nothing is guaranteed to appear -> always tried
+        self.assertIsNone(required_literals(r"(?:play)?\s*(.+)"))
+
+    def test_trigger_index_finds_overlapping_words(self):
+        index = TriggerIndex()
+        for rule_id, word in enumerate(["he", "she", "hers", "his"]):
+            index.add(word, rule_id)
+        index.build()
+        self.assertEqual(index.scan("ushers"), {0, 1, 2})
+
+    def test_first_match_wins_like_plain_loop(self):
+        utterances = [
+            "jarvis set the volume to 40", "open google chrome", "delete my results.txt",
+            "search for python tutorials in browser", "read the screen", "what's my favorite color",
+            "the wifi password is hunter2, kindly memorize it", "turn of the wifi", "tell me a joke",
+        ]
+        for text in utterances:
+            expected = None
+            for rule_id, (pattern, _, _) in enumerate(self.nlu.rules):
+                if re.search(pattern, text.lower()):
+                    expected = rule_id
+                    break
+            result = self.nlu.dispatcher.match(text.lower())
+            self.assertEqual(result[0] if result else None, expected, text)
+
+    def test_rule_stats(self):
+        intent = self.nlu.parse("Take a screenshot")
+        self.assertEqual(intent.intent_type, IntentType.SYSTEM_CONTROL)
+        stats = [s for s in self.nlu.rule_stats() if s["hits"]]
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["pattern"], r"(?:take\s+a?)?\s*screenshot")
+        self.assertGreater(stats[0]["avg_us"], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import os
+import unittest
+import numpy as np
+import cv2
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.ocr_engine import OCRCache, perceptual_hash
+
+def page(seed, noise=0.0, shape=(480, 640)):
+    """Random 'text lines' on white paper, with optional sensor noise"""
+    rng = np.random.default_rng(seed)
+    img = np.full(shape + (3,), 235, dtype=np.float32)
+    for _ in range(12):
+        y, x = rng.integers(20, shape[0] - 30), rng.integers(20, shape[1] // 2)
+        img[y:y + 12, x:x + rng.integers(80, shape[1] // 2)] = 30
+    if noise:
+        img += np.random.default_rng(seed + 100).normal(0, noise, img.shape)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+def distance(a, b):
+    return int(np.unpackbits(np.bitwise_xor(a, b)).sum())
+
+def invoice(payee, noise=0.0, seed=0):
+    """A rendered 640x480 invoice; only the payee line varies"""
+    img = np.full((480, 640, 3), 245, dtype=np.uint8)
+    lines = ["INVOICE #20931", "Date: 2024-03-14", f"Pay to: {payee}", "Amount due: $1,250.00", "Thank you!"]
+    for i, line in enumerate(lines):
+        cv2.putText(img, line, (40, 60 + i * 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (20, 20, 20), 2)
+    if noise:
+        noisy = img.astype(np.float32) + np.random.default_rng(seed).normal(0, noise, img.shape)
+        img = np.clip(noisy, 0, 255).astype(np.uint8)
+    return img
+
+class TestOCRCache(unittest.TestCase):
+
+    def test_hash_tolerates_noise_not_content(self):
+        base = perceptual_hash(page(1))
+        self.assertLess(distance(base, perceptual_hash(page(1, noise=4.0))), 0.02 * base.size * 8)
+        self.assertGreater(distance(base, perceptual_hash(page(2))), 0.02 * base.size * 8)
+
+    def test_near_identical_frame_hits(self):
+        cache = OCRCache()
+        results, h = cache.get("frame", page(1))
+        self.assertIsNone(results)
+        cache.put("frame", page(1), h, [{"detected_text": "hello", "confidence": 0.9}])
+        hit, _ = cache.get("frame", page(1, noise=4.0))
+        self.assertEqual(hit[0]["detected_text"], "hello")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_one_changed_word_misses(self):
+        cache = OCRCache()
+        _, h = cache.get("frame", invoice("Alice Smith"))
+        cache.put("frame", invoice("Alice Smith"), h, [{"detected_text": "Pay to: Alice Smith"}])
+        self.assertIsNone(cache.get("frame", invoice("Bob Jones"))[0])
+        # The same invoice captured again still hits
+        self.assertIsNotNone(cache.get("frame", invoice("Alice Smith", noise=4.0, seed=1))[0])
+
+    def test_different_page_tag_or_shape_misses(self):
+        cache = OCRCache()
+        _, h = cache.get("frame", page(1))
+        cache.put("frame", page(1), h, ["a"])
+        self.assertIsNone(cache.get("frame", page(2))[0])
+        self.assertIsNone(cache.get("image", page(1))[0])
+        self.assertIsNone(cache.get("frame", page(1, shape=(240, 320)))[0])
+
+    def test_eviction_and_age(self):
+        cache = OCRCache(max_items=2, max_age=60.0)
+        for seed in range(3):
+            _, h = cache.get("frame", page(seed))
+            cache.put("frame", page(seed), h, [seed])
+        self.assertEqual(len(cache.entries), 2)
+        self.assertIsNone(cache.get("frame", page(0))[0])
+        cache.max_age = 0.0
+        self.assertIsNone(cache.get("frame", page(2))[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import time
+import threading
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.ocr_service import OCRService
+
+def word(text, x=0, y=0, w=40, h=10):
+    return ([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], text, 0.9)
+
+class FakeReader:
+    """EasyOCR stand-in: the first call blocks until released, every call is recorded"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def readtext(self, image):
+        self.release.wait(5.0)
+        self.calls.append(("single", [image.shape]))
+        return [word(f"img{int(image[0, 0])}")]
+
+    def readtext_batched(self, images, batch_size=1):
+        self.calls.append(("batched", [img.shape for img in images]))
+        # One word at the origin of each canvas, one far out in the padding
+        return [[word(f"img{int(img[0, 0])}"), word("pad", x=img.shape[1] - 5, y=img.shape[0] - 5)]
+                for img in images]
+
+class FakeService(OCRService):
+    def _load_engines(self):
+        self.reader = FakeReader()
+        self.easyocr_available = True
+
+def image(value, shape=(50, 100)):
+    return np.full(shape, value, dtype=np.uint8)
+
+class TestOCRService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = FakeService(workers=1)
+
+    def tearDown(self):
+        self.service.reader.release.set()
+        self.service.shutdown()
+
+    def test_queued_crops_are_batched(self):
+        first = self.service.submit([image(1)])
+        time.sleep(0.1)  # Worker is now busy with the first image
+        futures = self.service.submit([image(2), image(3, (40, 90)), image(4)])
+        self.service.reader.release.set()
+        results = [f.result(timeout=5.0) for f in first + futures]
+        self.assertEqual([r[0]["detected_text"] for r in results], ["img1", "img2", "img3", "img4"])
+        self.assertEqual(self.service.reader.calls[1], ("batched", [(50, 100)] * 3))
+        # The smaller crop's padding detection is dropped
+        self.assertEqual(len(results[2]), 1)
+
+    def test_expired_requests_are_not_run(self):
+        self.service.submit([image(1)])
+        time.sleep(0.1)
+        started = time.time()
+        self.assertEqual(self.service.read(image(2), timeout=0.2), [])
+        self.assertLess(time.time() - started, 1.0)
+        self.service.reader.release.set()
+        time.sleep(0.2)
+        self.assertEqual(self.service.stats()["expired"], 1)
+        self.assertEqual(len(self.service.reader.calls), 1)
+
+    def test_earliest_deadline_first(self):
+        self.service.max_batch = 1
+        self.service.submit([image(1)])
+        time.sleep(0.1)
+        late = self.service.submit([image(2)], time.time() + 60)
+        soon = self.service.submit([image(3)], time.time() + 30)
+        self.service.reader.release.set()
+        late[0].result(timeout=5.0)
+        self.assertTrue(soon[0].done())
+        self.assertEqual([c[0] for c in self.service.reader.calls], ["single"] * 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+import time
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.ollama_brain import OllamaBrain
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Emulates /api/generate NDJSON streaming with chunked transfer encoding"""
+    protocol_version = "HTTP/1.1"
+    tokens = ["Hello", " there", ",", " sir", "."]
+    delay = 0.0
+    connections = set()
+
+    def log_message(self, *args):
+        pass
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        StubOllama.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in self.tokens:
+                time.sleep(self.delay)
+                self._chunk(json.dumps({"model": body["model"], "response": token, "done": False}).encode() + b"\n")
+            final = {"model": body["model"], "response": "", "done": True,
+                     "eval_count": len(self.tokens), "eval_duration": 500_000_000}
+            self._chunk(json.dumps(final).encode() + b"\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+class TestOllamaStreaming(unittest.TestCase):
+    def setUp(self):
+        StubOllama.delay = 0.0
+        StubOllama.connections = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.brain = OllamaBrain(base_url=f"http://127.0.0.1:{self.server.server_address[1]}")
+
+    def tearDown(self):
+        self.brain.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_streams_tokens_and_reports_metrics(self):
+        tokens = list(self.brain.stream_chat("hi", context=None))
+        self.assertEqual(tokens, StubOllama.tokens)
+        metrics = self.brain.last_metrics
+        self.assertIsNotNone(metrics["ttft"])
+        self.assertEqual(metrics["tokens"], 5)
+        self.assertAlmostEqual(metrics["tokens_per_sec"], 10.0)
+        self.assertFalse(metrics["cancelled"])
+
+    def test_blocking_calls_reuse_connection(self):
+        self.assertEqual(self.brain.chat_with_context("hi", "ctx"), "Hello there, sir.")
+        self.assertEqual(self.brain.generate_response("hi"), "Hello there, sir.")
+        self.assertEqual(len(StubOllama.connections), 1)
+
+    def test_cancel_mid_generation(self):
+        StubOllama.delay = 0.2
+        received = []
+        start = time.perf_counter()
+        for token in self.brain.stream_chat("hi", context=None):
+            received.append(token)
+            # Barge-in from another thread while the next token is pending
+            threading.Timer(0.05, self.brain.cancel).start()
+        self.assertEqual(received, ["Hello"])
+        self.assertTrue(self.brain.last_metrics["cancelled"])
+        self.assertLess(time.perf_counter() - start, 0.6)
+
+        # Later generations are unaffected
+        StubOllama.delay = 0.0
+        self.assertEqual(self.brain.chat_with_context("again", None), "Hello there, sir.")
+
+if __name__ == '__main__':
+    unittest.main()
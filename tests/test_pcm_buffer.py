@@ -0,0 +1,42 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.pcm_buffer import PCMBuffer
+
+class TestPCMBuffer(unittest.TestCase):
+
+    def test_append_converts_int16_bytes(self):
+        buf = PCMBuffer(initial_seconds=1.0)
+        self.assertFalse(buf)
+        frame = np.array([0, 16384, -32768, 32767], dtype=np.int16)
+        buf.append(frame.tobytes())
+        self.assertTrue(buf)
+        self.assertEqual(buf.view().dtype, np.float32)
+        np.testing.assert_allclose(buf.view(), frame / 32768.0)
+
+    def test_grows_and_keeps_contents(self):
+        buf = PCMBuffer(initial_seconds=0.01, sample_rate=16000)  # 160 samples
+        frames = [np.random.randint(-2000, 2000, 512).astype(np.int16) for _ in range(10)]
+        for f in frames:
+            buf.append(f.tobytes())
+        self.assertEqual(len(buf), 5120)
+        self.assertGreaterEqual(len(buf.data), 5120)
+        np.testing.assert_allclose(buf.view(), np.concatenate(frames) / 32768.0)
+        self.assertAlmostEqual(buf.duration, 0.32)
+
+    def test_clear_reuses_storage(self):
+        buf = PCMBuffer(initial_seconds=1.0)
+        buf.append(np.ones(512, dtype=np.int16).tobytes())
+        storage = buf.data
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+        buf.append(np.full(256, 2, dtype=np.int16).tobytes())
+        self.assertIs(buf.data, storage)
+        np.testing.assert_allclose(buf.view(), np.full(256, 2 / 32768.0))
+
+if __name__ == '__main__':
+    unittest.main()
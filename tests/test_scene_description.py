@@ -0,0 +1,153 @@
+import unittest
+import sys
+import os
+import contextlib
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision import scene_description
+from core.vision.frame_bundle import FrameBundle
+from core.vision.scene_description import SceneDescriptor
+
+
+class FakeTensor:
+    """The few torch.Tensor operations the descriptor uses, over a numpy array"""
+
+    def __init__(self, data):
+        self.data = np.array(data)
+        self.device = "cpu"
+
+    def to(self, device):
+        return self
+
+    def size(self):
+        return self.data.shape
+
+    def __getitem__(self, index):
+        return FakeTensor(self.data[index])
+
+    def __setitem__(self, index, value):
+        self.data[index] = value
+
+
+fake_torch = SimpleNamespace(
+    no_grad=contextlib.nullcontext,
+    LongTensor=FakeTensor,
+    long="long",
+    ones=lambda shape, dtype=None, device=None: FakeTensor(np.ones(shape)),
+    cuda=SimpleNamespace(is_available=lambda: False),
+)
+
+
+class FakeProcessor:
+    """Image -> mean pixel value, prompt -> its length; decode names what it was given"""
+
+    def __call__(self, images=None, text=None, return_tensors=None):
+        if images is not None:
+            return SimpleNamespace(pixel_values=FakeTensor([[float(np.asarray(images).mean())]]))
+        return SimpleNamespace(input_ids=FakeTensor([[0, len(text), 102]]))
+
+    def decode(self, ids, skip_special_tokens=True):
+        return f"scene {ids[0]:.1f} prompt {ids[1]}"
+
+
+class FakeModel:
+    def __init__(self):
+        self.config = SimpleNamespace(text_config=SimpleNamespace(
+            bos_token_id=0, eos_token_id=102, sep_token_id=102, pad_token_id=0))
+        self.decoder_input_ids = 0
+        self.vision_calls = 0
+        self.text_decoder = SimpleNamespace(generate=self.generate)
+
+    def vision_model(self, pixel_values):
+        self.vision_calls += 1
+        return [FakeTensor(pixel_values.data.reshape(1, 1, 1))]
+
+    def generate(self, input_ids, encoder_hidden_states, **kwargs):
+        return [[float(encoder_hidden_states.data.ravel()[0]), input_ids.data.shape[1]]]
+
+
+def scene(seed, size=(120, 160)):
+    """A read-only captured frame: blocky random scene"""
+    rng = np.random.default_rng(seed)
+    blocks = rng.integers(0, 255, (size[0] // 20, size[1] // 20, 3), dtype=np.uint8)
+    image = np.kron(blocks, np.ones((20, 20, 1), dtype=np.uint8))
+    image.flags.writeable = False
+    return image
+
+
+def recapture(image, seed=1):
+    """The same view captured again: a new frame with a little sensor noise"""
+    rng = np.random.default_rng(seed)
+    noisy = np.clip(image.astype(np.int16) + rng.integers(-2, 3, image.shape), 0, 255).astype(np.uint8)
+    noisy.flags.writeable = False
+    return noisy
+
+
+class TestSceneDescriptor(unittest.TestCase):
+    def setUp(self):
+        # Run the caching paths without transformers/torch installed
+        for name, value in (('BLIP_AVAILABLE', True), ('torch', fake_torch)):
+            patcher = patch.object(scene_description, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.descriptor = SceneDescriptor()
+        self.descriptor.processor = FakeProcessor()
+        self.descriptor.model = FakeModel()
+
+    def test_recaptured_frame_hits_caption(self):
+        frame = scene(0)
+        first = self.descriptor.describe(frame)
+        second = self.descriptor.describe(recapture(frame))
+        self.assertTrue(first['success'])
+        self.assertTrue(second.get('cached'))
+        self.assertEqual(second['description'], first['description'])
+        self.assertEqual(self.descriptor.counters['generations'], 1)
+        self.assertEqual(self.descriptor.counters['caption_hits'], 1)
+
+    def test_scene_change_misses_caption(self):
+        frame, other = scene(0), scene(1)
+        changed = np.unpackbits(np.bitwise_xor(FrameBundle(frame).phash, FrameBundle(other).phash)).sum()
+        self.assertGreater(changed, self.descriptor.scene_change * FrameBundle(frame).phash.size * 8)
+
+        self.descriptor.describe(frame)
+        result = self.descriptor.describe(other)
+        self.assertNotIn('cached', result)
+        self.assertEqual(self.descriptor.counters['generations'], 2)
+
+    def test_old_caption_misses(self):
+        frame = scene(0)
+        self.descriptor.describe(frame)
+        self.descriptor.scene_time -= self.descriptor.max_caption_age + 1
+        result = self.descriptor.describe(recapture(frame))
+        self.assertNotIn('cached', result)
+        self.assertEqual(self.descriptor.counters['generations'], 2)
+
+    def test_caption_and_question_share_one_encoding(self):
+        bundle = FrameBundle(scene(0), 1, 0.0)
+        caption = self.descriptor.describe(bundle)
+        answer = self.descriptor.answer_question(bundle, "Is there a cat or dog here?")
+        self.assertTrue(answer['success'])
+        self.assertNotEqual(answer['answer'], caption['description'])
+        self.assertEqual(self.descriptor.counters['encodes'], 1)
+        self.assertEqual(self.descriptor.counters['embedding_hits'], 1)
+        self.assertEqual(self.descriptor.model.vision_calls, 1)
+
+    def test_no_embedding_reuse_across_frames(self):
+        # Frame ids restart at 1 when the camera reopens: equal ids, different frames
+        first, second = FrameBundle(scene(0), 1, 0.0), FrameBundle(scene(1), 1, 5.0)
+        self.descriptor.describe(first, prompt="a photo of")
+        # An older frame filed under the key the new frame will use (as when id() is reused)
+        self.descriptor.embeddings[id(second.image)] = (first.image, self.descriptor.embeddings[id(first.image)][1])
+        result = self.descriptor.describe(second, prompt="a photo of")
+        self.assertEqual(self.descriptor.counters['encodes'], 2)
+        self.assertEqual(self.descriptor.counters['embedding_hits'], 0)
+        self.assertTrue(result['description'].startswith(f"scene {second.image.mean():.1f}"))
+
+
+if __name__ == '__main__':
+    unittest.main()
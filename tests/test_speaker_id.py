@@ -0,0 +1,117 @@
+import sys
+import os
+import time
+import unittest
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.speaker_id import SpeakerRecognizer, SpeakerAuthenticator, RollingSpeakerVerifier
+
+SR = 16000
+
+def voice(f0, formants, seconds=1.0, seed=0):
+    """Harmonic source shaped by a fixed set of formants: a crude but consistent 'speaker'"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SR)) / SR
+    pitch = f0 * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(2, 4) * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / SR
+    x = np.zeros_like(t)
+    for h in range(1, int(4000 / f0)):
+        gain = sum(np.exp(-((h * f0 - fc) / 200.0) ** 2) for fc in formants) + 0.01
+        x += gain * np.sin(h * phase)
+    x += 0.002 * rng.standard_normal(len(t))
+    return (0.3 * x / np.abs(x).max()).astype(np.float32)
+
+SPEAKERS = {
+    "alice": (210, (850, 1600, 2900)),
+    "bob": (110, (500, 1100, 2400)),
+    "carol": (170, (350, 2200, 3100)),
+}
+
+def enrolled(threshold=0.9):
+    recognizer = SpeakerRecognizer(verification_threshold=threshold)
+    for name, (f0, formants) in SPEAKERS.items():
+        recognizer.enroll_speaker(name, [voice(f0, formants, seed=i) for i in range(3)])
+    return recognizer
+
+class TestSpeakerRecognizer(unittest.TestCase):
+
+    def test_matrix_scores_match_per_speaker_cosine(self):
+        recognizer = enrolled()
+        emb = recognizer.embedder.extract_embedding(voice(*SPEAKERS["bob"], seed=9))
+        ids, scores = recognizer.score_embedding(emb)
+        for speaker_id, score in zip(ids, scores):
+            stored = recognizer.registered_speakers[speaker_id]
+            cosine = emb @ stored / (np.linalg.norm(emb) * np.linalg.norm(stored))
+            self.assertAlmostEqual(float(score), float(cosine), places=5)
+
+    def test_identifies_each_speaker(self):
+        recognizer = enrolled()
+        for name, (f0, formants) in SPEAKERS.items():
+            best, similarities = recognizer.identify_speaker(voice(f0, formants, seed=42))
+            self.assertEqual(max(similarities, key=similarities.get), name)
+
+    def test_remove_rebuilds_matrix(self):
+        recognizer = enrolled()
+        recognizer.remove_speaker("bob")
+        self.assertEqual(recognizer.matrix.shape[0], 2)
+        self.assertNotIn("bob", recognizer.speaker_ids)
+
+    def test_save_load_without_pickle(self):
+        recognizer = enrolled(threshold=0.8)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "speakers.npz")
+            recognizer.save_model(path)
+            with np.load(path, allow_pickle=False) as data:
+                self.assertEqual(list(data['ids']), list(SPEAKERS))
+            loaded = SpeakerRecognizer()
+            self.assertTrue(loaded.load_model(path))
+        self.assertAlmostEqual(loaded.verification_threshold, 0.8, places=5)
+        np.testing.assert_allclose(loaded.matrix, recognizer.matrix, atol=1e-6)
+
+class TestRollingVerification(unittest.TestCase):
+
+    def test_window_verified_in_background(self):
+        recognizer = enrolled()
+        verifier = RollingSpeakerVerifier(recognizer)
+        audio = voice(*SPEAKERS["carol"], seconds=1.5, seed=7)
+        try:
+            for pos in range(0, len(audio), 512):
+                verifier.observe(audio[pos:pos + 512])
+            speaker_id, confidence = verifier.verify_now(timeout=2.0)
+        finally:
+            verifier.stop()
+        self.assertEqual(speaker_id, "carol")
+        self.assertGreaterEqual(verifier.evaluations, 1)
+
+    def test_observe_does_not_block_on_scoring(self):
+        recognizer = enrolled()
+        verifier = RollingSpeakerVerifier(recognizer)
+        frame = (voice(*SPEAKERS["alice"], seconds=0.032) * 32768).astype(np.int16).tobytes()
+        try:
+            start = time.perf_counter()
+            for _ in range(100):
+                verifier.observe(frame)
+            per_frame = (time.perf_counter() - start) / 100
+        finally:
+            verifier.stop()
+        self.assertLess(per_frame, 0.002)
+
+    def test_authenticator_applies_allowed_list(self):
+        auth = SpeakerAuthenticator(verification_threshold=0.9)
+        auth.recognizer = enrolled()
+        auth.verifier = RollingSpeakerVerifier(auth.recognizer)
+        auth.add_allowed_speaker("alice")
+        try:
+            auth.observe(voice(*SPEAKERS["bob"], seconds=1.5, seed=3))
+            is_auth, speaker_id, _ = auth.authenticate_window(wait=True, timeout=2.0)
+        finally:
+            auth.verifier.stop()
+        self.assertFalse(is_auth)
+        self.assertEqual(speaker_id, "bob")
+        self.assertFalse(auth.get_access_logs(1)[0]['granted'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import time
+import asyncio
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.sentence_segmenter import SentenceSegmenter
+from core.voice.edge_tts_engine import EdgeTTSEngine
+
+class TestSentenceSegmenter(unittest.TestCase):
+    def feed_tokens(self, segmenter, text):
+        # LLM-style deltas: a few characters at a time
+        segments = []
+        for i in range(0, len(text), 3):
+            segments.extend(segmenter.feed(text[i:i + 3]))
+        return segments + segmenter.flush()
+
+    def test_sentences_and_abbreviations(self):
+        text = "Good morning. Dr. Smith called at 3.30 today! Want me to call back?"
+        self.assertEqual(self.feed_tokens(SentenceSegmenter(), text),
+                         ["Good morning.", "Dr. Smith called at 3.30 today!", "Want me to call back?"])
+
+    def test_long_clause_is_cut_early(self):
+        text = "Well, after checking the forecast for the whole week ahead, it looks sunny"
+        segments = self.feed_tokens(SentenceSegmenter(first_clause_chars=25), text)
+        self.assertEqual(segments, ["Well, after checking the forecast for the whole week ahead,", "it looks sunny"])
+
+    def test_segment_waits_for_boundary(self):
+        segmenter = SentenceSegmenter()
+        self.assertEqual(segmenter.feed("Hello there"), [])
+        self.assertEqual(segmenter.feed(". How"), ["Hello there."])
+        self.assertEqual(segmenter.flush(), ["How"])
+
+class RecordingTTS(EdgeTTSEngine):
+    """EdgeTTSEngine with synthesis/playback replaced by timed stand-ins"""
+    def __init__(self):
+        self.events = []
+        super().__init__(streaming=False)
+
+    async def _synthesize(self, text, generation=None):
+        self.events.append(("synth", text, time.perf_counter()))
+        await asyncio.sleep(0.05)
+        return text.encode()
+
+    async def _play_audio(self, audio_data, generation=None):
+        self.events.append(("play", audio_data.decode(), time.perf_counter()))
+        for _ in range(10):
+            if not self._is_current(generation):
+                return
+            await asyncio.sleep(0.01)
+
+def wait_idle(tts, timeout=3.0):
+    deadline = time.time() + timeout
+    while tts.is_speaking() and time.time() < deadline:
+        time.sleep(0.01)
+
+class TestEdgeTTSPipeline(unittest.TestCase):
+    def test_segments_play_in_order_and_synthesis_overlaps_playback(self):
+        tts = RecordingTTS()
+        for segment in ["One.", "Two.", "Three."]:
+            tts.enqueue(segment)
+        self.assertTrue(tts.is_speaking())
+        wait_idle(tts)
+        self.assertFalse(tts.is_speaking())
+
+        plays = [e for e in tts.events if e[0] == "play"]
+        self.assertEqual([e[1] for e in plays], ["One.", "Two.", "Three."])
+        # "Two." was synthesized while "One." was playing
+        synth_two = next(e[2] for e in tts.events if e[:2] == ("synth", "Two."))
+        self.assertLess(synth_two, plays[0][2] + 0.1)
+
+    def test_stop_drops_queued_segments(self):
+        tts = RecordingTTS()
+        for segment in ["One.", "Two.", "Three."]:
+            tts.enqueue(segment)
+        time.sleep(0.08)
+        tts.stop()
+        self.assertFalse(tts.is_speaking())
+        time.sleep(0.3)
+        self.assertNotIn("Three.", [e[1] for e in tts.events if e[0] == "play"])
+
+        # A new utterance after barge-in plays normally
+        tts.speak("Yes?")
+        wait_idle(tts)
+        self.assertEqual(tts.events[-1][:2], ("play", "Yes?"))
+
+if __name__ == '__main__':
+    unittest.main()
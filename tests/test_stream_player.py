@@ -0,0 +1,135 @@
+import sys
+import os
+import io
+import time
+import asyncio
+import threading
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.stream_player import PCMRingBuffer, StreamingPlayer, AV_AVAILABLE
+from core.voice.edge_tts_engine import EdgeTTSEngine
+
+class FakeOutputStream:
+    """Stands in for sounddevice.OutputStream; pump() plays blocks on demand"""
+    def __init__(self, rate, blocksize, callback, realtime=False):
+        self.rate, self.blocksize, self.callback = rate, blocksize, callback
+        self.realtime = realtime
+        self.played = []
+        self.running = False
+
+    def pump(self, blocks=1):
+        for _ in range(blocks):
+            out = np.zeros((self.blocksize, 1), dtype=np.int16)
+            self.callback(out, self.blocksize, None, None)
+            self.played.append(out[:, 0].copy())
+
+    def _run(self):
+        while self.running:
+            self.pump()
+            time.sleep(self.blocksize / self.rate if self.realtime else 0.001)
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        pass
+
+class TestRingBufferAndPlayer(unittest.TestCase):
+    def test_ring_wraparound_and_clear(self):
+        ring = PCMRingBuffer(8)
+        out = np.zeros(8, dtype=np.int16)
+        ring.write(np.arange(6))
+        self.assertEqual(ring.read_into(out[:4]), 4)
+        ring.write(np.arange(6, 12))  # Wraps around the end
+        self.assertEqual(ring.read_into(out), 8)
+        np.testing.assert_array_equal(out, np.arange(4, 12))
+
+        # A full ring makes write() wait; an abort releases it
+        ring.write(np.arange(8))
+        self.assertFalse(ring.write(np.arange(4), should_abort=lambda: True))
+        ring.clear()
+        self.assertEqual(ring.available(), 0)
+
+    def test_reference_follows_playback_position(self):
+        refs = []
+        streams = []
+        def factory(rate, blocksize, callback):
+            streams.append(FakeOutputStream(rate, blocksize, callback))
+            streams[-1].start = lambda: None  # Pumped manually below
+            return streams[-1]
+
+        player = StreamingPlayer(on_audio_chunk=refs.append, reference_rate=16000, stream_factory=factory)
+        pcm = np.arange(2400, dtype=np.int16)           # 100ms at 24 kHz
+        ref = np.arange(1600, dtype=np.int16)           # The same 100ms at 16 kHz
+        player.write(pcm, ref, rate=24000)
+        stream = streams[0]
+        self.assertEqual(stream.blocksize, 480)
+
+        stream.pump(2)  # 40ms played
+        self.assertEqual(player.played, 960)
+        self.assertEqual(sum(len(r) for r in refs) // 2, 640)
+
+        stream.pump(4)  # Runs past the end: silence, no extra reference
+        played = np.concatenate(stream.played)
+        np.testing.assert_array_equal(played[:2400], pcm)
+        self.assertFalse(played[2400:].any())
+        np.testing.assert_array_equal(np.frombuffer(b"".join(refs), dtype=np.int16), ref)
+
+@unittest.skipUnless(AV_AVAILABLE, "PyAV not installed")
+class TestEdgeTTSStreaming(unittest.TestCase):
+    @staticmethod
+    def make_mp3(seconds=1.0, rate=24000):
+        import av
+        buf = io.BytesIO()
+        with av.open(buf, "w", format="mp3") as container:
+            stream = container.add_stream("mp3", rate=rate)
+            stream.codec_context.layout = "mono"
+            t = np.arange(int(seconds * rate)) / rate
+            samples = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+            for start in range(0, len(samples), 1152):
+                frame = av.AudioFrame.from_ndarray(samples[None, start:start + 1152], format="fltp", layout="mono")
+                frame.sample_rate = rate
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+        return buf.getvalue()
+
+    def test_playback_starts_before_source_finishes(self):
+        mp3 = self.make_mp3()
+        chunks = [mp3[i:i + 2048] for i in range(0, len(mp3), 2048)]
+        refs, streams, source_done = [], [], []
+
+        class FakeSourceTTS(EdgeTTSEngine):
+            async def _audio_source(self, text):
+                for chunk in chunks:
+                    await asyncio.sleep(0.02)
+                    yield chunk
+                source_done.append(time.perf_counter())
+
+        tts = FakeSourceTTS(on_audio_chunk=refs.append, streaming=True)
+        tts.player.stream_factory = lambda rate, bs, cb: streams.append(FakeOutputStream(rate, bs, cb, realtime=True)) or streams[-1]
+        started = []
+        tts.on_playback_start = lambda: started.append(time.perf_counter())
+
+        tts.enqueue("Hello.")
+        deadline = time.time() + 5
+        while tts.is_speaking() and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertFalse(tts.is_speaking())
+        self.assertLess(started[0], source_done[0])
+        played = np.concatenate(streams[0].played)
+        self.assertGreater(np.count_nonzero(played), 0.9 * 24000)
+        ref_samples = sum(len(r) for r in refs) // 2
+        self.assertAlmostEqual(ref_samples / 16000, tts.player.played / 24000, delta=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.pcm_buffer import PCMBuffer
+from core.voice.streaming_stt import IncrementalTranscriber
+
+FS = 16000
+FRAME = 512
+
+class ScriptedDecoder:
+    """Fake Whisper: one word per 0.5 s of audio read off a script; a word cut off by the window end is garbled"""
+    def __init__(self, words):
+        self.words = words
+        self.calls = []
+
+    def __call__(self, audio, prompt):
+        # Offset of the window = how many words were already committed
+        skip = len(prompt.split()) if prompt else 0
+        self.calls.append((len(audio), prompt))
+        seconds = len(audio) / FS
+        out = []
+        i = 0
+        while i * 0.5 + 0.2 < seconds:
+            word = self.words[skip + i] if skip + i < len(self.words) else "uh"
+            if (i + 1) * 0.5 > seconds:
+                word = word[:2] + "x"  # Still being spoken
+            out.append((" " + word, i * 0.5, min(seconds, (i + 1) * 0.5)))
+            i += 1
+        return out
+
+def feed(buf, transcriber, seconds, speech=True):
+    for _ in range(int(seconds * FS / FRAME)):
+        with transcriber.lock:
+            buf.append(np.zeros(FRAME, dtype=np.int16).tobytes())
+        if speech:
+            transcriber.mark_speech()
+        transcriber.step()
+
+class TestIncrementalTranscriber(unittest.TestCase):
+
+    def setUp(self):
+        self.buf = PCMBuffer(initial_seconds=5.0)
+        self.partials = []
+        self.decoder = ScriptedDecoder(["turn", "on", "the", "wifi", "please", "now"])
+        self.tr = IncrementalTranscriber(self.buf, self.decoder, interval=0.4,
+                                         on_partial=lambda p, s: self.partials.append((p, s)))
+
+    def test_commits_agreed_prefix_and_trims_audio(self):
+        feed(self.buf, self.tr, 2.5)
+        self.assertTrue(self.partials)
+        self.assertTrue(self.tr.committed_text.startswith("turn on"))
+        # Committed words are never decoded again
+        self.assertGreater(self.tr.committed_samples, 0)
+        last_len, last_prompt = self.decoder.calls[-1]
+        self.assertLess(last_len, len(self.buf))
+        self.assertTrue(self.tr.committed_text.startswith(last_prompt))
+        self.assertTrue(last_prompt)
+        # Partial hypotheses extend the stable text
+        partial, stable = self.partials[-1]
+        self.assertTrue(partial.startswith(stable))
+
+    def test_trailing_silence_is_not_decoded(self):
+        feed(self.buf, self.tr, 2.0)
+        decodes = self.tr.decodes
+        feed(self.buf, self.tr, 1.1, speech=False)
+        # At most one more decode covering the pad after the last speech
+        self.assertLessEqual(self.tr.decodes - decodes, 1)
+
+    def test_reset_and_finish_drop_state(self):
+        feed(self.buf, self.tr, 2.5)
+        text, samples = self.tr.finish()
+        self.assertEqual(text, self.tr.committed_text)
+        self.assertGreater(samples, 0)
+        decodes = self.tr.decodes
+        self.tr.step()  # Finished utterance: nothing new is due
+        self.assertEqual(self.tr.decodes, decodes)
+
+        self.tr.reset()
+        self.buf.clear()
+        self.assertEqual(self.tr.committed_text, "")
+        self.assertEqual(self.tr.committed_samples, 0)
+
+    def test_stale_decode_is_discarded(self):
+        feed(self.buf, self.tr, 1.0)
+        original = self.tr.decode
+
+        def decode_then_reset(audio, prompt):
+            result = original(audio, prompt)
+            self.tr.reset()  # New utterance started while decoding
+            return result
+
+        self.tr.decode = decode_then_reset
+        with self.tr.lock:
+            self.buf.append(np.zeros(FS, dtype=np.int16).tobytes())
+        self.tr.mark_speech()
+        self.assertFalse(self.tr.step())
+        self.assertEqual(self.tr.committed, [])
+
+if __name__ == '__main__':
+    unittest.main()
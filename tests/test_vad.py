@@ -0,0 +1,87 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.voice.vad import SileroVAD, VoiceActivityDetector
+
+class FakeSession:
+    """Stands in for the ONNX session: prob = frame energy, state counts steps"""
+    def __init__(self):
+        self.inputs = []
+
+    def run(self, outputs, feeds):
+        self.inputs.append({k: np.array(v, copy=True) for k, v in feeds.items()})
+        x = feeds["input"]
+        prob = np.array([[min(1.0, float(np.abs(x[:, SileroVAD.CONTEXT:]).mean()) * 10)]], dtype=np.float32)
+        return prob, feeds["state"] + 1.0
+
+def frame(level, n=512, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(n) * level * 32768).clip(-32768, 32767).astype(np.int16).tobytes()
+
+class TestSileroVAD(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession()
+        self.vad = SileroVAD(session=self.session)
+
+    def test_streaming_state_and_context_carry_over(self):
+        a, b = frame(0.1, seed=1), frame(0.1, seed=2)
+        self.vad.probability(a, seq=0)
+        self.vad.probability(b, seq=1)
+        first, second = self.session.inputs
+        self.assertEqual(first["input"].shape, (1, 512 + SileroVAD.CONTEXT))
+        self.assertFalse(first["state"].any())
+        self.assertTrue((second["state"] == 1.0).all())
+        # The last 64 samples of frame 0 are prepended to frame 1
+        tail = np.frombuffer(a, dtype=np.int16)[-SileroVAD.CONTEXT:].astype(np.float32) / 32768.0
+        np.testing.assert_allclose(second["input"][0, :SileroVAD.CONTEXT], tail)
+
+    def test_same_frame_shares_one_inference(self):
+        f = frame(0.05)
+        p1 = self.vad.probability(f, seq=7)
+        p2 = self.vad.probability(f, seq=7)
+        self.assertEqual(p1, p2)
+        self.assertEqual(len(self.session.inputs), 1)
+        self.vad.probability(f)  # No seq: always runs
+        self.assertEqual(len(self.session.inputs), 2)
+
+    def test_odd_frame_lengths_are_windowed(self):
+        self.vad.probability(frame(0.05, n=800))
+        self.assertEqual(len(self.session.inputs), 2)
+        for feeds in self.session.inputs:
+            self.assertEqual(feeds["input"].shape[1], 512 + SileroVAD.CONTEXT)
+
+    def test_reset_clears_state_and_cache(self):
+        self.vad.probability(frame(0.05), seq=1)
+        self.vad.reset()
+        self.vad.probability(frame(0.05), seq=1)
+        self.assertEqual(len(self.session.inputs), 2)
+        self.assertFalse(self.session.inputs[1]["state"].any())
+
+    def test_detector_consumers_share_frames(self):
+        detector = VoiceActivityDetector(vad=self.vad)
+        loud = frame(0.2)
+        for seq in range(20):
+            detector.is_speech(loud, seq=seq)
+            detector.is_speech(loud, strict=True, seq=seq)
+            self.vad.probability(loud, seq=seq)  # e.g. the wake word detector
+        self.assertEqual(len(self.session.inputs), 20)
+        self.assertEqual(len(detector.noise_probs), detector.noise_frames_needed)
+        self.assertTrue(detector.is_speech(loud, seq=19))
+        self.assertFalse(detector.is_speech(bytes(1024), seq=20))
+
+class TestEnergyFallback(unittest.TestCase):
+
+    def test_no_model_uses_energy(self):
+        vad = SileroVAD(model_path=os.devnull, session=None)
+        if vad.session is not None:
+            self.skipTest("onnxruntime loaded a session")
+        self.assertLess(vad.probability(bytes(1024)), 0.01)
+        self.assertGreater(vad.probability(frame(0.2)), 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import sys
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import weakref
+import zlib
+from unittest import mock
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.memory.vector_store import VectorStore
+from core.enhanced_memory import EnhancedMemory
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embedder standing in for SentenceTransformer"""
+    DIM = 64
+
+    def __init__(self):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return self.DIM
+
+    def encode(self, texts, normalize_embeddings=False):
+        self.encoded.extend(texts)
+        out = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+", text.lower()):
+                out[i, zlib.crc32(word.encode()) % self.DIM] += 1.0
+        if normalize_embeddings:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-9)
+        return out
+
+class TestVectorStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.base = os.path.join(self.tmp_dir, 'vectors')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_upsert_search_delete_and_growth(self):
+        store = VectorStore(self.base, dim=8, initial_capacity=2)
+        eye = np.eye(8, dtype=np.float32)
+        store.upsert_many([f"d{i}" for i in range(5)], [f"text {i}" for i in range(5)], eye[:5])
+        self.assertEqual(len(store), 5)
+        self.assertGreaterEqual(store.matrix.shape[0], 5)
+
+        self.assertEqual(store.search(eye[3], top_k=1)[0][0], "d3")
+        self.assertTrue(store.delete("d3"))
+        self.assertNotIn("d3", [d for d, _, _ in store.search(eye[3], top_k=5)])
+
+        # Overwrite in place keeps the row
+        row = store.row_of["d1"]
+        store.upsert("d1", "moved", eye[7])
+        self.assertEqual(store.row_of["d1"], row)
+        self.assertEqual(store.search(eye[7], top_k=1)[0][1], "moved")
+        store.close()
+
+    def test_growth_releases_old_mapping(self):
+        store = VectorStore(self.base, dim=8, initial_capacity=2)
+        eye = np.eye(8, dtype=np.float32)
+        store.upsert_many(["a", "b"], ["A", "B"], eye[:2])
+        store.build_partitions(n_lists=1)
+        old_matrix = weakref.ref(store.matrix)
+        old_assign = weakref.ref(store.assign)
+
+        # Windows refuses to replace a file that is still mapped: record what is alive at each replace
+        alive = []
+        real_replace = os.replace
+        def replace(src, dst):
+            alive.append((os.path.basename(dst), old_matrix() is not None, old_assign() is not None))
+            real_replace(src, dst)
+
+        # Past the initial capacity: both files are rewritten and swapped in
+        with mock.patch("core.memory.vector_store.os.replace", replace):
+            store.upsert_many(["c", "d", "e"], ["C", "D", "E"], eye[2:5])
+        self.assertGreaterEqual(store.matrix.shape[0], 5)
+        self.assertEqual(store.assign.shape[0], store.matrix.shape[0])
+        self.assertEqual(len(alive), 2)
+        self.assertFalse(alive[0][1], "old matrix still mapped when its file was replaced")
+        self.assertFalse(alive[1][2], "old assignments still mapped when their file was replaced")
+        self.assertFalse([f for f in os.listdir(self.tmp_dir) if f.endswith(".tmp")])
+        self.assertEqual([store.search(eye[i], top_k=1)[0][0] for i in range(5)], list("abcde"))
+        store.close()
+
+        reopened = VectorStore(self.base, dim=8)
+        self.assertEqual(reopened.documents(), {"a": "A", "b": "B", "c": "C", "d": "D", "e": "E"})
+        self.assertEqual(reopened.search(eye[1], top_k=1)[0][0], "b")
+        reopened.close()
+
+    def test_reopen_from_disk(self):
+        store = VectorStore(self.base, dim=8)
+        eye = np.eye(8, dtype=np.float32)
+        store.upsert_many(["a", "b", "c"], ["A", "B", "C"], eye[:3])
+        store.delete("b")
+        store.close()
+
+        reopened = VectorStore(self.base, dim=8)
+        self.assertEqual(reopened.documents(), {"a": "A", "c": "C"})
+        self.assertEqual(reopened.search(eye[2], top_k=1)[0][0], "c")
+        reopened.close()
+
+        # A different model name invalidates the stored vectors
+        other = VectorStore(self.base, dim=8, model_name="other")
+        self.assertEqual(len(other), 0)
+        other.close()
+
+    def test_partitioned_search_matches_exact(self):
+        rng = np.random.default_rng(0)
+        centers = rng.standard_normal((20, 16)).astype(np.float32)
+        labels = rng.integers(0, 20, 2000)
+        vectors = centers[labels] + 0.05 * rng.standard_normal((2000, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        store = VectorStore(self.base, dim=16, nprobe=4)
+        store.upsert_many([f"d{i}" for i in range(2000)], [str(i) for i in range(2000)], vectors)
+        exact = [store.search(v, top_k=1)[0][0] for v in vectors[:50]]
+        store.build_partitions(n_lists=20)
+        self.assertIsNotNone(store.centroids)
+        self.assertEqual([store.search(v, top_k=1)[0][0] for v in vectors[:50]], exact)
+
+        # New rows are assigned to a partition and survive a reopen
+        store.upsert("extra", "extra", vectors[7])
+        self.assertGreaterEqual(int(store.assign[store.row_of["extra"]]), 0)
+        store.close()
+        reopened = VectorStore(self.base, dim=16, nprobe=4)
+        self.assertIsNotNone(reopened.centroids)
+        self.assertIn(reopened.search(vectors[7], top_k=2)[0][0], {"d7", "extra"})
+        reopened.close()
+
+class TestEnhancedMemorySearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.memory_file = os.path.join(self.tmp_dir, 'memory.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _memory(self, embedder):
+        mem = EnhancedMemory(memory_file=self.memory_file)
+        mem.embeddings_model = embedder
+        return mem
+
+    def test_incremental_updates_and_forget(self):
+        embedder = FakeEmbedder()
+        mem = self._memory(embedder)
+        mem.set("car", "red tesla")
+        mem.add_session("talked about the weather forecast")
+        self.assertIn("car: red tesla", mem.search_memory("tesla car", top_k=1))
+
+        # New facts are visible immediately and only they get embedded
+        embedder.encoded.clear()
+        mem.add_fact("coffee", "double espresso every morning")
+        self.assertEqual(mem.search_memory("espresso coffee", top_k=1), ["coffee: double espresso every morning"])
+        self.assertEqual(embedder.encoded[0], "coffee: double espresso every morning")
+
+        mem.forget_this("car")
+        self.assertNotIn("long_term:car", mem.vector_store)
+        mem.vector_store.close()
+        mem.journal.close()
+
+    def test_restart_reuses_persisted_vectors(self):
+        mem = self._memory(FakeEmbedder())
+        mem.set("car", "red tesla")
+        mem.remember_semantic_fact("pets", "has a cat named milo")
+        mem.search_memory("cat", top_k=1)
+        mem.vector_store.close()
+        mem.journal.close()
+
+        embedder = FakeEmbedder()
+        restarted = self._memory(embedder)
+        self.assertEqual(restarted.search_memory("milo cat pets", top_k=1), ["pets: has a cat named milo"])
+        # Only the query was encoded, nothing was rebuilt
+        self.assertEqual(embedder.encoded, ["milo cat pets"])
+        restarted.vector_store.close()
+        restarted.journal.close()
+
+if __name__ == '__main__':
+    unittest.main()
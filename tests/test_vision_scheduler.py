@@ -0,0 +1,88 @@
+import sys
+import os
+import time
+import threading
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.vision_scheduler import VisionScheduler, SyntheticVideoSource
+
+def pump(scheduler, source, seconds):
+    """Play the synthetic camera into the scheduler like _vision_loop does"""
+    source.open_camera()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        scheduler.submit_frame(source.get_frame())
+    source.close_camera()
+
+class TestVisionScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = VisionScheduler()
+        self.source = SyntheticVideoSource(fps=30)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_slow_analyzer_does_not_hold_back_fast_one(self):
+        self.scheduler.add_analyzer("fast", lambda f, ts: SyntheticVideoSource.frame_index(f), rate=15)
+        self.scheduler.add_analyzer("slow", lambda f, ts: time.sleep(0.25), rate=10)
+        self.scheduler.start()
+        pump(self.scheduler, self.source, 1.5)
+        stats = self.scheduler.stats()
+        self.assertGreater(stats["fast"]["fps"], 11)
+        self.assertLessEqual(stats["fast"]["fps"], 17)
+        self.assertLess(stats["slow"]["fps"], 5)
+        self.assertGreater(stats["slow"]["avg_latency_ms"], 200)
+
+    def test_runs_on_latest_frame(self):
+        seen = []
+        def analyze(frame, ts):
+            seen.append(SyntheticVideoSource.frame_index(frame))
+            time.sleep(0.2)
+        self.scheduler.add_analyzer("slow", analyze, rate=50)
+        self.scheduler.start()
+        pump(self.scheduler, self.source, 1.0)
+        # Frames that arrived while busy are skipped, not queued
+        self.assertTrue(all(b - a >= 4 for a, b in zip(seen, seen[1:])))
+        self.assertGreater(self.scheduler.stats()["slow"]["skipped_frames"], 0)
+
+    def test_on_demand_runs_only_when_requested(self):
+        calls = []
+        self.scheduler.add_analyzer("caption", lambda f, ts: calls.append(ts) or "a square", rate=None)
+        self.scheduler.start()
+        thread = threading.Thread(target=pump, args=(self.scheduler, self.source, 0.6))
+        thread.start()
+        time.sleep(0.3)
+        self.assertEqual(calls, [])
+        self.assertEqual(self.scheduler.request("caption", timeout=1.0), "a square")
+        thread.join()
+        self.assertEqual(len(calls), 1)
+        frame_ts, result = self.scheduler.result("caption")
+        self.assertEqual(result, "a square")
+        self.assertEqual(frame_ts, calls[0])
+
+    def test_disabled_analyzer_idles_until_enabled(self):
+        self.scheduler.add_analyzer("faces", lambda f, ts: [], rate=10, enabled=False)
+        self.scheduler.start()
+        pump(self.scheduler, self.source, 0.3)
+        self.assertEqual(self.scheduler.stats()["faces"]["runs"], 0)
+        self.scheduler.set_enabled("faces", True)
+        pump(self.scheduler, self.source, 0.5)
+        self.assertGreater(self.scheduler.stats()["faces"]["runs"], 2)
+
+    def test_results_handler_gets_frame_timestamp(self):
+        got = []
+        self.scheduler.add_analyzer("objects", lambda f, ts: {"objects": []}, rate=10,
+                                    on_result=lambda res, frame, ts: got.append((ts, frame.shape)))
+        self.scheduler.start()
+        self.scheduler.submit_frame(self.source.open_camera() and self.source.get_frame(), 123.0)
+        deadline = time.monotonic() + 1.0
+        while not got and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(got[0], (123.0, (480, 640, 3)))
+        self.assertEqual(self.scheduler.result("objects"), (123.0, {"objects": []}))
+
+if __name__ == '__main__':
+    unittest.main()
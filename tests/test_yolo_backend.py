@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jarvis')))
+
+from core.vision.yolo_backend import (
+    LatencyBudget, MicroBatcher, build_ladder, decode_predictions, letterbox, nms, parse_model_name
+)
+
+class TestPostprocessing(unittest.TestCase):
+
+    def test_letterbox_keeps_aspect(self):
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        blob, scale, pad = letterbox(frame, 320)
+        self.assertEqual(blob.shape, (3, 320, 320))
+        self.assertAlmostEqual(scale, 0.5)
+        self.assertEqual(pad, (0, 40))
+        self.assertAlmostEqual(float(blob[0, 0, 0]), 114 / 255.0, places=5)
+
+    def test_nms_suppresses_overlaps(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60]], dtype=np.float32)
+        scores = np.array([0.6, 0.9, 0.8], dtype=np.float32)
+        self.assertEqual(list(nms(boxes, scores, 0.45)), [1, 2])
+
+    def test_decode_maps_back_to_frame(self):
+        # Two anchors, two classes: one confident "cup" at letterbox (160, 120) size 40x20
+        pred = np.zeros((6, 2), dtype=np.float32)
+        pred[:4, 0] = (160, 120, 40, 20)
+        pred[5, 0] = 0.9
+        pred[4, 1] = 0.1
+        details = decode_predictions(pred, {1: "cup"}, 0.45, scale=0.5, pad=(0, 40), shape=(480, 640, 3))
+        self.assertEqual(len(details), 1)
+        self.assertEqual(details[0]['name'], "cup")
+        self.assertEqual(details[0]['bbox'], (280, 140, 360, 180))
+
+class TestLatencyBudget(unittest.TestCase):
+
+    def test_ladder_and_names(self):
+        ladder = build_ladder()
+        self.assertEqual(ladder[0], ("x", 640))
+        self.assertEqual(ladder[-1], ("n", 320))
+        self.assertEqual(parse_model_name("yolo11x.pt"), "x")
+        self.assertIsNone(parse_model_name("custom.pt"))
+
+    def test_steps_down_until_within_budget(self):
+        budget = LatencyBudget(50, patience=2, start=("s", 640))
+        rung = budget.current
+        # Pretend latency is proportional to cost: s@640 takes 100ms
+        cost = lambda r: 100 * (r[1] / 640) ** 2 * {"n": 0.3, "s": 1, "m": 3.2, "x": 9}[r[0]]
+        for _ in range(10):
+            rung = budget.record(rung, cost(rung))
+        self.assertLessEqual(cost(rung), 50)
+        self.assertLess(budget.ladder.index(("s", 640)), budget.ladder.index(rung))
+
+    def test_profile_persists(self):
+        path = os.path.join(tempfile.mkdtemp(), "latency.json")
+        budget = LatencyBudget(50, profile_path=path, patience=1)
+        budget.record(("s", 640), 200)
+        restarted = LatencyBudget(50, profile_path=path)
+        self.assertNotEqual(restarted.current, ("s", 640))
+        self.assertLessEqual(restarted.estimate(restarted.current), 50)
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def test_concurrent_calls_share_a_batch(self):
+        sizes = []
+        def run_batch(items):
+            sizes.append(len(items))
+            time.sleep(0.05)
+            return [x * 2 for x in items]
+        batcher = MicroBatcher(run_batch, max_batch=8, max_wait=0.02)
+        results = {}
+        threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.run(i))) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=2)
+        self.assertEqual(results, {i: i * 2 for i in range(6)})
+        self.assertLess(len(sizes), 6)
+        self.assertEqual(sum(sizes), 6)
+
+    def test_errors_reach_every_caller(self):
+        def run_batch(items):
+            raise RuntimeError("boom")
+        batcher = MicroBatcher(run_batch)
+        with self.assertRaises(RuntimeError):
+            batcher.run(1)
+        self.assertFalse(batcher.leader_active)
+
+if __name__ == '__main__':
+    unittest.main()